@@ -0,0 +1,84 @@
+"""B-tree indexes for hot JSONB paths
+
+Revision ID: 20261016_0026
+Revises: 20260301_0025
+Create Date: 2026-10-16
+
+Generated by scripts/generate_jsonb_index_migration.py from
+_TABLE_INDEXED_PATHS in core_app/repositories/domination_repository.py.
+
+Indexes:
+  - aircraft_readiness_events: data->>'aircraft_id' (expression)
+  - ar_accounts: data->>'status' (expression)
+  - crew_assignments: data->>'unit_id' (expression)
+  - document_matches: data->>'fax_id' (expression)
+  - export_jobs: data->>'status' (expression)
+  - fax_jobs: data->>'status' (expression)
+  - fleet_alerts: data->>'unit_id' (expression)
+  - maintenance_work_orders: data->>'unit_id' (expression)
+  - mdt_sessions: data->>'unit_id' (expression)
+  - nemsis_validation_results: data->>'chart_id' (expression)
+  - nemsis_validation_results: data->>'pcr_number' (expression)
+  - obd_readings: data->>'unit_id' (expression)
+  - system_alerts: data->>'severity' (expression)
+  - system_alerts: data->>'status' (expression)
+  - tenant_subscriptions: data->>'status' (expression)
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20261016_0026"
+down_revision = "20260301_0025"
+branch_labels = None
+depends_on = None
+
+UPGRADE_STATEMENTS: list[str] = [
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_aircraft_readiness_events_data_aircraft_id ON aircraft_readiness_events (tenant_id, (data->>'aircraft_id')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ar_accounts_data_status ON ar_accounts (tenant_id, (data->>'status')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_crew_assignments_data_unit_id ON crew_assignments (tenant_id, (data->>'unit_id')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_matches_data_fax_id ON document_matches (tenant_id, (data->>'fax_id')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_export_jobs_data_status ON export_jobs (tenant_id, (data->>'status')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fax_jobs_data_status ON fax_jobs (tenant_id, (data->>'status')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fleet_alerts_data_unit_id ON fleet_alerts (tenant_id, (data->>'unit_id')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_maintenance_work_orders_data_unit_id ON maintenance_work_orders (tenant_id, (data->>'unit_id')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_mdt_sessions_data_unit_id ON mdt_sessions (tenant_id, (data->>'unit_id')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_nemsis_validation_results_data_chart_id ON nemsis_validation_results (tenant_id, (data->>'chart_id')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_nemsis_validation_results_data_pcr_number ON nemsis_validation_results (tenant_id, (data->>'pcr_number')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_obd_readings_data_unit_id ON obd_readings (tenant_id, (data->>'unit_id')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_system_alerts_data_severity ON system_alerts (tenant_id, (data->>'severity')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_system_alerts_data_status ON system_alerts (tenant_id, (data->>'status')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tenant_subscriptions_data_status ON tenant_subscriptions (tenant_id, (data->>'status')) WHERE deleted_at IS NULL",
+]
+
+DOWNGRADE_STATEMENTS: list[str] = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_tenant_subscriptions_data_status",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_system_alerts_data_status",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_system_alerts_data_severity",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_obd_readings_data_unit_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_nemsis_validation_results_data_pcr_number",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_nemsis_validation_results_data_chart_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_mdt_sessions_data_unit_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_maintenance_work_orders_data_unit_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_fleet_alerts_data_unit_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_fax_jobs_data_status",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_export_jobs_data_status",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_document_matches_data_fax_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_crew_assignments_data_unit_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_ar_accounts_data_status",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_aircraft_readiness_events_data_aircraft_id",
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for stmt in UPGRADE_STATEMENTS:
+            op.execute(stmt)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for stmt in DOWNGRADE_STATEMENTS:
+            op.execute(stmt)
@@ -0,0 +1,53 @@
+"""Candidate-generation indexes for probabilistic fax-to-claim matching
+
+Revision ID: 20261016_0027
+Revises: 20261016_0026
+Create Date: 2026-10-16
+
+Blocking keys used by ClaimMatcher._candidate_cases: trigram on the
+normalized "last first" patient name and on the claim number, plus B-tree
+lookups on DOB and lower-cased member ID. Expressions must match
+core_app/fax/claim_matcher.py exactly.
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "20261016_0027"
+down_revision = "20261016_0026"
+branch_labels = None
+depends_on = None
+
+UPGRADE_STATEMENTS: list[str] = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_cases_match_name_trgm "
+    "ON billing_cases USING gin ((lower(coalesce(data->>'patient_last_name', '') || ' ' || "
+    "coalesce(data->>'patient_first_name', ''))) gin_trgm_ops) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_cases_match_claim_trgm "
+    "ON billing_cases USING gin ((data->>'claim_id') gin_trgm_ops) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_cases_match_dob "
+    "ON billing_cases (tenant_id, (data->>'patient_dob')) WHERE deleted_at IS NULL",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_billing_cases_match_member_id "
+    "ON billing_cases (tenant_id, lower(data->>'member_id')) WHERE deleted_at IS NULL",
+]
+
+DOWNGRADE_STATEMENTS: list[str] = [
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_billing_cases_match_member_id",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_billing_cases_match_dob",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_billing_cases_match_claim_trgm",
+    "DROP INDEX CONCURRENTLY IF EXISTS ix_billing_cases_match_name_trgm",
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for stmt in UPGRADE_STATEMENTS:
+            op.execute(stmt)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for stmt in DOWNGRADE_STATEMENTS:
+            op.execute(stmt)
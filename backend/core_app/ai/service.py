@@ -4,9 +4,8 @@ import hashlib
 import time
 from typing import Any
 
-from openai import OpenAI
-
 from core_app.core.config import get_settings
+from core_app.observability.metrics import external_call
 
 
 class AiService:
@@ -14,6 +13,9 @@ class AiService:
         settings = get_settings()
         if not settings.openai_api_key:
             raise RuntimeError("OpenAI API key not configured")
+        # Imported here: the SDK adds ~0.3s to every worker's boot otherwise.
+        from openai import OpenAI
+
         self.client = OpenAI(api_key=settings.openai_api_key)
 
     def chat(
@@ -28,7 +30,8 @@ class AiService:
         }
         if max_tokens is not None:
             create_kwargs["max_tokens"] = max_tokens
-        resp = self.client.chat.completions.create(**create_kwargs)
+        with external_call("openai", "chat.completions"):
+            resp = self.client.chat.completions.create(**create_kwargs)
         content = resp.choices[0].message.content or ""
         usage = resp.usage.model_dump() if resp.usage else {}
         meta = {
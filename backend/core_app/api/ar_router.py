@@ -13,6 +13,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from core_app.api.dependencies import db_session_dependency, get_current_user
+from core_app.repositories.domination_repository import QueryFilter
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
@@ -46,20 +47,16 @@ async def list_accounts(
 ):
     _check(current)
     svc = _svc(db)
-    accounts = svc.repo("ar_accounts").list(
-        tenant_id=current.tenant_id, limit=min(limit, 500)
-    )
+    filters: list[QueryFilter] = []
     if status:
-        accounts = [
-            a for a in accounts if (a.get("data") or {}).get("status") == status
-        ]
+        filters.append(QueryFilter("data.status", "eq", status))
     if days_past_due_gte is not None:
-        accounts = [
-            a
-            for a in accounts
-            if (a.get("data") or {}).get("days_past_due", 0) >= days_past_due_gte
-        ]
-    return accounts
+        filters.append(QueryFilter("data.days_past_due", "gte", days_past_due_gte))
+    return (
+        svc.repo("ar_accounts")
+        .query(tenant_id=current.tenant_id, filters=filters, limit=max(1, min(limit, 500)))
+        .items
+    )
 
 
 @router.get("/accounts/{account_id}")
@@ -75,34 +72,20 @@ async def get_account(
     )
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
-    aid = str(account_id)
-    charges = [
-        c
-        for c in svc.repo("ar_charges").list(tenant_id=current.tenant_id, limit=200)
-        if (c.get("data") or {}).get("account_id") == aid
-    ]
-    payments = [
-        p
-        for p in svc.repo("ar_payments").list(tenant_id=current.tenant_id, limit=200)
-        if (p.get("data") or {}).get("account_id") == aid
-    ]
-    plans = [
-        p
-        for p in svc.repo("ar_payment_plans").list(
-            tenant_id=current.tenant_id, limit=50
+    by_account = [QueryFilter("data.account_id", "eq", str(account_id))]
+
+    def _related(table: str, limit: int) -> list[dict[str, Any]]:
+        return (
+            svc.repo(table)
+            .query(tenant_id=current.tenant_id, filters=by_account, limit=limit)
+            .items
         )
-        if (p.get("data") or {}).get("account_id") == aid
-    ]
-    disputes = [
-        d
-        for d in svc.repo("ar_disputes").list(tenant_id=current.tenant_id, limit=50)
-        if (d.get("data") or {}).get("account_id") == aid
-    ]
-    statements = [
-        s
-        for s in svc.repo("ar_statements").list(tenant_id=current.tenant_id, limit=50)
-        if (s.get("data") or {}).get("account_id") == aid
-    ]
+
+    charges = _related("ar_charges", 200)
+    payments = _related("ar_payments", 200)
+    plans = _related("ar_payment_plans", 50)
+    disputes = _related("ar_disputes", 50)
+    statements = _related("ar_statements", 50)
     return {
         "account": account,
         "charges": charges,
@@ -329,39 +312,40 @@ async def run_statements(
     accounts = svc.repo("ar_accounts").list(tenant_id=current.tenant_id, limit=500)
     now = datetime.now(UTC)
     queued = []
-    for acc in accounts:
-        d = acc.get("data") or {}
-        if d.get("status") in ("dispute", "placed", "closed"):
-            continue
-        balance = d.get("balance_cents", 0)
-        if balance <= 0:
-            continue
-        stmt = await svc.create(
-            table="ar_statements",
-            tenant_id=current.tenant_id,
-            actor_user_id=current.user_id,
-            data={
-                "account_id": str(acc["id"]),
-                "statement_cycle": (d.get("dunning_cycle") or 0) + 1,
-                "delivery_method": payload.get("delivery_method", "mail"),
-                "status": "queued",
-                "balance_cents": balance,
-            },
-            correlation_id=correlation_id,
-        )
-        queued.append(str(stmt["id"]))
-        adata = dict(d)
-        adata["dunning_cycle"] = (d.get("dunning_cycle") or 0) + 1
-        adata["last_statement_at"] = now.isoformat()
-        await svc.update(
-            table="ar_accounts",
-            tenant_id=current.tenant_id,
-            record_id=uuid.UUID(str(acc["id"])),
-            actor_user_id=current.user_id,
-            patch=adata,
-            expected_version=acc.get("version", 1),
-            correlation_id=correlation_id,
-        )
+    async with svc.batch_events():
+        for acc in accounts:
+            d = acc.get("data") or {}
+            if d.get("status") in ("dispute", "placed", "closed"):
+                continue
+            balance = d.get("balance_cents", 0)
+            if balance <= 0:
+                continue
+            stmt = await svc.create(
+                table="ar_statements",
+                tenant_id=current.tenant_id,
+                actor_user_id=current.user_id,
+                data={
+                    "account_id": str(acc["id"]),
+                    "statement_cycle": (d.get("dunning_cycle") or 0) + 1,
+                    "delivery_method": payload.get("delivery_method", "mail"),
+                    "status": "queued",
+                    "balance_cents": balance,
+                },
+                correlation_id=correlation_id,
+            )
+            queued.append(str(stmt["id"]))
+            adata = dict(d)
+            adata["dunning_cycle"] = (d.get("dunning_cycle") or 0) + 1
+            adata["last_statement_at"] = now.isoformat()
+            await svc.update(
+                table="ar_accounts",
+                tenant_id=current.tenant_id,
+                record_id=uuid.UUID(str(acc["id"])),
+                actor_user_id=current.user_id,
+                patch=adata,
+                expected_version=acc.get("version", 1),
+                correlation_id=correlation_id,
+            )
     return {"queued": len(queued), "statement_ids": queued}
 
 
@@ -549,34 +533,35 @@ async def generate_placement(
 
         logging.error(f"Error: {e}")
 
-    placement = await svc.create(
-        table="collections_placements",
-        tenant_id=current.tenant_id,
-        actor_user_id=current.user_id,
-        data={
-            "vendor_profile_id": str(vendor_id),
-            "batch_id": batch_id,
-            "s3_export_zip_key": s3_key,
-            "placed_at": datetime.now(UTC).isoformat(),
-            "status": "generated",
-            "account_count": len(eligible),
-        },
-        correlation_id=correlation_id,
-    )
-
-    for acc in eligible:
-        adata = dict(acc.get("data") or {})
-        adata["status"] = "placed"
-        await svc.update(
-            table="ar_accounts",
+    async with svc.batch_events():
+        placement = await svc.create(
+            table="collections_placements",
             tenant_id=current.tenant_id,
-            record_id=uuid.UUID(str(acc["id"])),
             actor_user_id=current.user_id,
-            patch=adata,
-            expected_version=acc.get("version", 1),
+            data={
+                "vendor_profile_id": str(vendor_id),
+                "batch_id": batch_id,
+                "s3_export_zip_key": s3_key,
+                "placed_at": datetime.now(UTC).isoformat(),
+                "status": "generated",
+                "account_count": len(eligible),
+            },
             correlation_id=correlation_id,
         )
 
+        for acc in eligible:
+            adata = dict(acc.get("data") or {})
+            adata["status"] = "placed"
+            await svc.update(
+                table="ar_accounts",
+                tenant_id=current.tenant_id,
+                record_id=uuid.UUID(str(acc["id"])),
+                actor_user_id=current.user_id,
+                patch=adata,
+                expected_version=acc.get("version", 1),
+                correlation_id=correlation_id,
+            )
+
     return {
         "placement": placement,
         "eligible_count": len(eligible),
@@ -601,45 +586,46 @@ async def import_vendor_status(
     except Exception as e:
         rows = []
     parsed = {"rows": rows, "row_count": len(rows)}
-    record = await svc.create(
-        table="collections_status_updates",
-        tenant_id=current.tenant_id,
-        actor_user_id=current.user_id,
-        data={
-            "vendor_profile_id": str(vendor_id),
-            "parsed_json": parsed,
-            "imported_at": datetime.now(UTC).isoformat(),
-            "row_count": len(rows),
-        },
-        correlation_id=correlation_id,
-    )
-    for row in rows:
-        acct_num = (
-            row.get("agency_account_number")
-            or row.get("account_number")
-            or row.get("id")
+    async with svc.batch_events():
+        record = await svc.create(
+            table="collections_status_updates",
+            tenant_id=current.tenant_id,
+            actor_user_id=current.user_id,
+            data={
+                "vendor_profile_id": str(vendor_id),
+                "parsed_json": parsed,
+                "imported_at": datetime.now(UTC).isoformat(),
+                "row_count": len(rows),
+            },
+            correlation_id=correlation_id,
         )
-        status = (row.get("status") or "").lower()
-        if acct_num and status in ("paid", "closed"):
-            try:
-                aid = uuid.UUID(acct_num)
-                acc = svc.repo("ar_accounts").get(
-                    tenant_id=current.tenant_id, record_id=aid
-                )
-                if acc:
-                    adata = dict(acc.get("data") or {})
-                    adata["status"] = "closed" if status == "paid" else status
-                    await svc.update(
-                        table="ar_accounts",
-                        tenant_id=current.tenant_id,
-                        record_id=aid,
-                        actor_user_id=current.user_id,
-                        patch=adata,
-                        expected_version=acc.get("version", 1),
-                        correlation_id=correlation_id,
+        for row in rows:
+            acct_num = (
+                row.get("agency_account_number")
+                or row.get("account_number")
+                or row.get("id")
+            )
+            status = (row.get("status") or "").lower()
+            if acct_num and status in ("paid", "closed"):
+                try:
+                    aid = uuid.UUID(acct_num)
+                    acc = svc.repo("ar_accounts").get(
+                        tenant_id=current.tenant_id, record_id=aid
                     )
-            except Exception as e:
-                import logging
-
-                logging.error(f"Error: {e}")
+                    if acc:
+                        adata = dict(acc.get("data") or {})
+                        adata["status"] = "closed" if status == "paid" else status
+                        await svc.update(
+                            table="ar_accounts",
+                            tenant_id=current.tenant_id,
+                            record_id=aid,
+                            actor_user_id=current.user_id,
+                            patch=adata,
+                            expected_version=acc.get("version", 1),
+                            correlation_id=correlation_id,
+                        )
+                except Exception as e:
+                    import logging
+
+                    logging.error(f"Error: {e}")
     return {"import_id": str(record["id"]), "rows_parsed": len(rows)}
@@ -3,15 +3,21 @@ from uuid import UUID
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from core_app.core.config import get_settings
-from core_app.db.session import get_db_session
+from core_app.db.session import (
+    bind_tenant,
+    bind_tenant_async,
+    get_async_db_session,
+    get_db_session,
+)
 from core_app.repositories.user_repository import UserRepository
 from core_app.schemas.auth import CurrentUser
+from core_app.services.auth_cache import get_auth_cache
 from core_app.services.cognito_jwt import CognitoAuthError, verify_cognito_jwt
-from core_app.services.opa import OpaError, check_policy, opa_enabled
+from core_app.services.opa import OpaError, build_input, get_opa_client, opa_enabled
 
 class CustomOAuth2PasswordBearer(OAuth2PasswordBearer):
     async def __call__(self, request: Request) -> str | None:
@@ -52,6 +58,7 @@ def get_current_user(
     )
 
     user_repo = UserRepository(db)
+    cache = get_auth_cache()
 
     if settings.auth_mode.lower() == "cognito":
         try:
@@ -87,14 +94,16 @@ def get_current_user(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing email claim"
             )
 
-        user = user_repo.get_by_email_and_tenant(email, tenant_uuid)
-        if user is None:
-            # Auto-provision first-login user row (no local password; cognito is source of truth)
-            user = user_repo.create(
-                tenant_id=tenant_uuid, email=email, hashed_password="COGNITO", role=role
-            )
-
-        current = CurrentUser(user_id=user.id, tenant_id=user.tenant_id, role=user.role)
+        current = cache.get_user(tenant_uuid, email=email)
+        if current is None:
+            user = user_repo.get_by_email_and_tenant(email, tenant_uuid)
+            if user is None:
+                # Auto-provision first-login user row (no local password; cognito is source of truth)
+                user = user_repo.create(
+                    tenant_id=tenant_uuid, email=email, hashed_password="COGNITO", role=role
+                )
+            current = CurrentUser(user_id=user.id, tenant_id=user.tenant_id, role=user.role)
+            cache.set_user(current, email=email)
     else:
         try:
             payload = jwt.decode(
@@ -108,19 +117,23 @@ def get_current_user(
         except JWTError as exc:
             raise unauthorized from exc
 
-        user = user_repo.get_by_id_and_tenant(UUID(subject), UUID(tenant_id))
-        if user is None:
-            raise unauthorized
+        try:
+            user_uuid, tenant_uuid = UUID(subject), UUID(tenant_id)
+        except ValueError as exc:
+            raise unauthorized from exc
 
-        current = CurrentUser(user_id=user.id, tenant_id=user.tenant_id, role=user.role)
+        current = cache.get_user(tenant_uuid, user_id=user_uuid)
+        if current is None:
+            user = user_repo.get_by_id_and_tenant(user_uuid, tenant_uuid)
+            if user is None:
+                raise unauthorized
+            current = CurrentUser(user_id=user.id, tenant_id=user.tenant_id, role=user.role)
+            cache.set_user(current, user_id=user_uuid)
 
     request.state.tenant_id = current.tenant_id
     request.state.user_id = current.user_id
     # Enforce database tenant isolation via Postgres RLS
-    db.execute(
-        text("SELECT set_config('app.tenant_id', :tid, true)"),
-        {"tid": str(current.tenant_id)},
-    )
+    bind_tenant(db, current.tenant_id)
 
     if hasattr(request.state, "audit_context"):
         request.state.audit_context["tenant_id"] = str(current.tenant_id)
@@ -128,6 +141,15 @@ def get_current_user(
     return current
 
 
+async def async_db_session_dependency(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db_session),
+) -> AsyncSession:
+    """AsyncSession scoped to the caller's tenant for Postgres RLS."""
+    await bind_tenant_async(db, current_user.tenant_id)
+    return db
+
+
 def require_role(*allowed_roles: str):
     def _dependency(
         current_user: CurrentUser = Depends(get_current_user),
@@ -142,20 +164,26 @@ def require_role(*allowed_roles: str):
 
 
 def require_permission(permission: str):
-    def _dependency(
+    async def _dependency(
         request: Request, current_user: CurrentUser = Depends(get_current_user)
     ) -> CurrentUser:
         if opa_enabled():
-            input_doc = {
-                "tenant_id": str(current_user.tenant_id),
-                "user_id": str(current_user.user_id),
-                "role": current_user.role,
-                "permission": permission,
-                "path": str(request.url.path),
-                "method": request.method,
-            }
+            # The matched route template, not the concrete path, so decisions
+            # for /incidents/{id} are shared across ids in the decision cache.
+            route = request.scope.get("route")
+            path_template = getattr(route, "path", None) or str(request.url.path)
+            tenant_id = str(current_user.tenant_id)
+            input_doc = build_input(
+                tenant_id=tenant_id,
+                user_id=str(current_user.user_id),
+                role=current_user.role,
+                permission=permission,
+                method=request.method,
+                path_template=path_template,
+            )
+            key = (tenant_id, current_user.role, permission, request.method, path_template)
             try:
-                allowed = check_policy(input_doc)
+                allowed = await get_opa_client().is_allowed(key, input_doc)
             except OpaError as exc:
                 raise HTTPException(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
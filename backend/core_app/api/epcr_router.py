@@ -5,6 +5,7 @@ import uuid
 from datetime import UTC, datetime
 from typing import Any
 
+import anyio
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from sqlalchemy.orm import Session
 
@@ -12,12 +13,12 @@ from core_app.api.dependencies import db_session_dependency, get_current_user
 from core_app.core.config import get_settings
 from core_app.epcr.ai_smart_text import SmartTextEngine
 from core_app.epcr.chart_model import Chart, ChartStatus
-from core_app.epcr.completeness_engine import CompletenessEngine
+from core_app.epcr.completeness_engine import CompletenessEngine, completeness_fields
 from core_app.epcr.evidence_service import EvidenceService
 from core_app.epcr.jcs_hash import build_chart_hash_payload, jcs_sha256
-from core_app.epcr.nemsis_exporter import NEMSISExporter
 from core_app.epcr.sync_engine import SyncConflictPolicy, SyncEngine
-from core_app.nemsis.validator import NEMSISValidator
+from core_app.epcr.validation_cache import validate_chart
+from core_app.repositories.domination_repository import QueryFilter
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
@@ -34,6 +35,13 @@ def require_role(*roles: str):
     return dep
 
 
+OPEN_CHART_STATUSES = [
+    ChartStatus.DRAFT.value,
+    ChartStatus.IN_PROGRESS.value,
+    ChartStatus.PENDING_QA.value,
+]
+
+
 def _svc(db: Session) -> DominationService:
     return DominationService(db, get_event_publisher())
 
@@ -58,9 +66,7 @@ async def create_chart(
     )
     chart_dict = chart.to_dict()
     score_result = CompletenessEngine().score_chart(chart_dict, chart_mode)
-    chart.completeness_score = score_result["score"]
-    chart.completeness_issues = [m["label"] for m in score_result["missing"]]
-    chart_dict = chart.to_dict()
+    chart_dict.update(completeness_fields(score_result, chart_mode, 1))  # a new record's version
     rec = await _svc(db).create(
         table="epcr_charts",
         tenant_id=current.tenant_id,
@@ -139,9 +145,10 @@ async def update_chart(
     updated_data["last_modified_by"] = str(current.user_id)
     updated_data["updated_at"] = datetime.now(UTC).isoformat()
     mode = updated_data.get("chart_mode", "bls")
-    score_result = CompletenessEngine().score_chart(updated_data, mode)
-    updated_data["completeness_score"] = score_result["score"]
-    updated_data["completeness_issues"] = [m["label"] for m in score_result["missing"]]
+    score_result = CompletenessEngine().rescore(
+        updated_data, patch.keys(), mode, record_version=rec["version"]
+    )
+    updated_data.update(completeness_fields(score_result, mode, rec["version"] + 1))
     svc = _svc(db)
     updated_rec = await svc.update(
         table="epcr_charts",
@@ -460,8 +467,7 @@ async def export_nemsis(
     if rec is None:
         raise HTTPException(status_code=404, detail="Chart not found")
     chart_data = rec.get("data", {})
-    xml_bytes = NEMSISExporter().export_chart(chart_data, agency_info={})
-    result = NEMSISValidator().validate_xml_bytes(xml_bytes)
+    xml_bytes, result = await anyio.to_thread.run_sync(validate_chart, chart_data)
     xml_b64 = base64.b64encode(xml_bytes).decode()
     job_id = str(uuid.uuid4())
     await _svc(db).create(
@@ -505,6 +511,56 @@ async def chart_completeness(
     return CompletenessEngine().score_chart(chart_data, mode)
 
 
+@router.post("/completeness/rescore")
+async def rescore_open_charts(
+    request: Request,
+    current: CurrentUser = Depends(require_role("founder", "agency_admin")),
+    db: Session = Depends(db_session_dependency),
+):
+    """Re-score open charts whose stored completeness predates the current rules or record."""
+    svc = _svc(db)
+    engine = CompletenessEngine()
+    open_charts = QueryFilter("data.chart_status", "in", OPEN_CHART_STATUSES)
+    scanned = rescored = conflicts = 0
+    cursor = None
+    while True:
+        page = svc.repo("epcr_charts").query(
+            tenant_id=current.tenant_id,
+            filters=[open_charts],
+            order_by="id",
+            limit=500,
+            cursor=cursor,
+        )
+        for rec in page.items:
+            scanned += 1
+            data = rec.get("data", {})
+            mode = data.get("chart_mode", "bls")
+            if not engine.is_stale(data, rec["version"], mode):
+                continue
+            score_result = engine.score_chart(data, mode)
+            updated = await svc.update(
+                table="epcr_charts",
+                tenant_id=current.tenant_id,
+                actor_user_id=current.user_id,
+                record_id=uuid.UUID(str(rec["id"])),
+                expected_version=rec["version"],
+                patch={
+                    "data": {**data, **completeness_fields(score_result, mode, rec["version"] + 1)}
+                },
+                correlation_id=getattr(request.state, "correlation_id", None),
+                commit=False,
+            )
+            if updated is None:
+                conflicts += 1  # edited meanwhile; the next rescore picks up its changes
+            else:
+                rescored += 1
+        db.commit()
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+    return {"scanned": scanned, "rescored": rescored, "conflicts": conflicts}
+
+
 @router.post("/charts/{chart_id}/ai/narrative")
 async def ai_narrative(
     chart_id: str,
@@ -623,8 +679,7 @@ async def submit_chart(
         )
 
     # --- Guard 2: NEMSIS validation ---
-    xml_bytes = NEMSISExporter().export_chart(chart_data, agency_info={})
-    val_result = NEMSISValidator().validate_xml_bytes(xml_bytes)
+    _, val_result = await anyio.to_thread.run_sync(validate_chart, chart_data)
     error_issues = [i.plain_message for i in val_result.issues if i.severity == "error"]
     if error_issues:
         raise HTTPException(
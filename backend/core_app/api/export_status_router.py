@@ -4,15 +4,16 @@ import contextlib
 import hashlib
 import uuid
 from collections import Counter
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 from fastapi import APIRouter, Depends, Query, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from core_app.api.dependencies import db_session_dependency, get_current_user
+from core_app.api.dependencies import async_db_session_dependency, get_current_user
+from core_app.repositories.domination_repository import Aggregate, QueryFilter
 from core_app.schemas.auth import CurrentUser
-from core_app.services.domination_service import DominationService
+from core_app.services.domination_service import AsyncDominationService
 from core_app.services.event_publisher import get_event_publisher
 
 router = APIRouter(prefix="/api/v1/export-status", tags=["ExportStatus"])
@@ -26,42 +27,68 @@ def _tenant(current: CurrentUser) -> str:
     return str(current.tenant_id)
 
 
-def _svc(db: Session) -> DominationService:
-    return DominationService(db, get_event_publisher())
+def _svc(db: AsyncSession) -> AsyncDominationService:
+    return AsyncDominationService(db, get_event_publisher())
 
 
 def _data(record: dict) -> dict:
     return record.get("data", {})
 
 
-def _jobs(svc: DominationService, tenant_id, limit: int = 10000) -> list[dict]:
-    return svc.repo("export_jobs").list(tenant_id=tenant_id, limit=limit)
+async def _jobs(svc: AsyncDominationService, tenant_id, limit: int = 10000) -> list[dict]:
+    return await svc.repo("export_jobs").list(tenant_id=tenant_id, limit=limit)
 
 
 @router.get("/queue")
 async def export_queue_monitor(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
-    today = datetime.now(UTC).date().isoformat()
-    queued = [j for j in jobs if _data(j).get("status") == "queued"]
-    processing = [j for j in jobs if _data(j).get("status") == "processing"]
-    completed_today = [
-        j
-        for j in jobs
-        if _data(j).get("status") == "completed"
-        and (_data(j).get("completed_at") or "").startswith(today)
-    ]
-    failed_today = [
-        j
-        for j in jobs
-        if _data(j).get("status") == "failed"
-        and (_data(j).get("failed_at") or _data(j).get("updated_at") or "").startswith(
-            today
-        )
-    ]
+    repo = svc.repo("export_jobs")
+    now = datetime.now(UTC)
+    today = now.date().isoformat()
+    tomorrow = (now.date() + timedelta(days=1)).isoformat()
+    queue_fields = ["id", "data.incident_id", "data.status", "data.state", "data.created_at"]
+    queued_page = await repo.query(
+        tenant_id=current.tenant_id,
+        filters=[QueryFilter("data.status", "eq", "queued")],
+        fields=queue_fields,
+        limit=10000,
+    )
+    queued = queued_page.items
+    processing_page = await repo.query(
+        tenant_id=current.tenant_id,
+        filters=[QueryFilter("data.status", "eq", "processing")],
+        fields=queue_fields,
+        limit=10000,
+    )
+    processing = processing_page.items
+    completed_today = await repo.count(
+        tenant_id=current.tenant_id,
+        filters=[
+            QueryFilter("data.status", "eq", "completed"),
+            QueryFilter("data.completed_at", "gte", today),
+            QueryFilter("data.completed_at", "lt", tomorrow),
+        ],
+    )
+    failed = QueryFilter("data.status", "eq", "failed")
+    failed_today = await repo.count(
+        tenant_id=current.tenant_id,
+        filters=[
+            failed,
+            QueryFilter("data.failed_at", "gte", today),
+            QueryFilter("data.failed_at", "lt", tomorrow),
+        ],
+    ) + await repo.count(
+        tenant_id=current.tenant_id,
+        filters=[
+            failed,
+            QueryFilter("data.failed_at", "missing"),
+            QueryFilter("data.updated_at", "gte", today),
+            QueryFilter("data.updated_at", "lt", tomorrow),
+        ],
+    )
     queue_items = [
         {
             "job_id": str(j.get("id", "")),
@@ -76,8 +103,8 @@ async def export_queue_monitor(
         "tenant_id": _tenant(current),
         "queued": len(queued),
         "processing": len(processing),
-        "completed_today": len(completed_today),
-        "failed_today": len(failed_today),
+        "completed_today": completed_today,
+        "failed_today": failed_today,
         "queue": queue_items,
     }
 
@@ -86,19 +113,36 @@ async def export_queue_monitor(
 async def per_tenant_export_status(
     tenant_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = svc.repo("export_jobs").list(tenant_id=tenant_id, limit=10000)
-    total = len(jobs)
-    successful = sum(1 for j in jobs if _data(j).get("status") == "completed")
-    failed = sum(1 for j in jobs if _data(j).get("status") == "failed")
-    pending = sum(1 for j in jobs if _data(j).get("status") in ("queued", "processing"))
+    (stats,) = await svc.repo("export_jobs").aggregate(
+        tenant_id=tenant_id,
+        metrics=[
+            Aggregate("total"),
+            Aggregate("successful", filters=[QueryFilter("data.status", "eq", "completed")]),
+            Aggregate("failed", filters=[QueryFilter("data.status", "eq", "failed")]),
+            Aggregate(
+                "pending",
+                filters=[QueryFilter("data.status", "in", ["queued", "processing"])],
+            ),
+            Aggregate("last_completed", "max", "data.completed_at"),
+            Aggregate(
+                "last_created",
+                "max",
+                "data.created_at",
+                filters=[QueryFilter("data.completed_at", "missing")],
+            ),
+        ],
+    )
+    total = stats["total"]
+    successful = stats["successful"]
+    failed = stats["failed"]
+    pending = stats["pending"]
     success_rate = round((successful / total * 100) if total else 0, 2)
-    timestamps = [
-        _data(j).get("completed_at") or _data(j).get("created_at") or "" for j in jobs
-    ]
-    last_export = max(timestamps) if timestamps else None
+    last_export = None
+    if total:
+        last_export = max(stats["last_completed"] or "", stats["last_created"] or "")
     return {
         "tenant_id": tenant_id,
         "total_exports": total,
@@ -113,10 +157,10 @@ async def per_tenant_export_status(
 @router.get("/batch/schedule")
 async def batch_export_scheduler(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    schedules = svc.repo("export_schedules").list(
+    schedules = await svc.repo("export_schedules").list(
         tenant_id=current.tenant_id, limit=1000
     )
     batches = [
@@ -138,7 +182,7 @@ async def create_batch_schedule(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -166,10 +210,10 @@ async def export_retry_engine(
     job_id: uuid.UUID,
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    job = svc.repo("export_jobs").get(tenant_id=current.tenant_id, record_id=job_id)
+    job = await svc.repo("export_jobs").get(tenant_id=current.tenant_id, record_id=job_id)
     attempt = _data(job).get("attempt", 1) + 1 if job else 1
     updated = await svc.update(
         table="export_jobs",
@@ -191,10 +235,10 @@ async def export_retry_engine(
 @router.get("/rejection-alerts")
 async def state_rejection_alerts(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    alerts = svc.repo("export_rejection_alerts").list(
+    alerts = await svc.repo("export_rejection_alerts").list(
         tenant_id=current.tenant_id, limit=1000
     )
     active = [a for a in alerts if _data(a).get("status", "active") == "active"]
@@ -215,10 +259,10 @@ async def state_rejection_alerts(
 @router.get("/failure-classifier")
 async def failure_reason_classifier(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     failed = [j for j in jobs if _data(j).get("status") == "failed"]
     reasons = [_data(j).get("reason_code", "UNKNOWN") for j in failed]
     counts = Counter(reasons)
@@ -236,7 +280,7 @@ async def niers_mapping_validator(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -265,10 +309,10 @@ async def niers_mapping_validator(
 async def incident_to_epcr_link_verifier(
     incident_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    links = svc.repo("export_epcr_links").list(tenant_id=current.tenant_id, limit=10000)
+    links = await svc.repo("export_epcr_links").list(tenant_id=current.tenant_id, limit=10000)
     match = next(
         (lnk for lnk in links if _data(lnk).get("incident_id") == incident_id), None
     )
@@ -295,7 +339,7 @@ async def fire_incident_normalization(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -325,7 +369,7 @@ async def timestamp_alignment_validator(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -353,35 +397,31 @@ async def timestamp_alignment_validator(
 @router.get("/latency")
 async def export_latency_tracker(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
-    latencies = []
-    for j in jobs:
-        d = _data(j)
-        started = d.get("started_at")
-        completed = d.get("completed_at")
-        if started and completed:
-            try:
-                s = datetime.fromisoformat(started.replace("Z", "+00:00"))
-                c = datetime.fromisoformat(completed.replace("Z", "+00:00"))
-                latencies.append(int((c - s).total_seconds() * 1000))
-            except (ValueError, TypeError) as e:
-                import logging
-
-                logging.error(f"Error: {e}")
-    if latencies:
-        latencies.sort()
-        avg = round(sum(latencies) / len(latencies))
-        p95_idx = int(len(latencies) * 0.95)
-        p99_idx = int(len(latencies) * 0.99)
+    latency = {"field": "data.completed_at", "since": "data.started_at"}
+    (stats,) = await svc.repo("export_jobs").aggregate(
+        tenant_id=current.tenant_id,
+        filters=[
+            QueryFilter("data.started_at", "exists"),
+            QueryFilter("data.completed_at", "exists"),
+        ],
+        metrics=[
+            Aggregate("samples", "count", **latency),
+            Aggregate("avg", "avg", **latency),
+            Aggregate("p95", "percentile", percentile=0.95, **latency),
+            Aggregate("p99", "percentile", percentile=0.99, **latency),
+            Aggregate("max", "max", **latency),
+        ],
+    )
+    if stats["samples"]:
         return {
-            "avg_latency_ms": avg,
-            "p95_latency_ms": latencies[min(p95_idx, len(latencies) - 1)],
-            "p99_latency_ms": latencies[min(p99_idx, len(latencies) - 1)],
-            "max_latency_ms": latencies[-1],
-            "samples": len(latencies),
+            "avg_latency_ms": round(stats["avg"]),
+            "p95_latency_ms": int(stats["p95"]),
+            "p99_latency_ms": int(stats["p99"]),
+            "max_latency_ms": int(stats["max"]),
+            "samples": stats["samples"],
             "period": "all",
         }
     return {
@@ -397,10 +437,10 @@ async def export_latency_tracker(
 @router.get("/performance-score")
 async def export_performance_score(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     total = len(jobs) or 1
     completed = sum(1 for j in jobs if _data(j).get("status") == "completed")
     success_rate = round(completed / total * 100, 1)
@@ -420,7 +460,7 @@ async def export_performance_score(
                     )
                 )
     avg_latency = round(sum(latencies) / len(latencies)) if latencies else 0
-    sla_records = svc.repo("export_sla").list(tenant_id=current.tenant_id, limit=100)
+    sla_records = await svc.repo("export_sla").list(tenant_id=current.tenant_id, limit=100)
     sla_adherence = 100.0
     if sla_records:
         breached = sum(1 for s in sla_records if _data(s).get("breached"))
@@ -452,7 +492,7 @@ async def export_performance_score(
 async def missing_field_export_block(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     required = ["patient_dob", "incident_address", "dispatch_time", "unit_id"]
     provided = list(payload.get("fields", {}).keys())
@@ -468,10 +508,10 @@ async def missing_field_export_block(
 async def state_rule_enforcement(
     state_code: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    rules = svc.repo("export_state_rules").list(tenant_id=current.tenant_id, limit=1000)
+    rules = await svc.repo("export_state_rules").list(tenant_id=current.tenant_id, limit=1000)
     state_rules = [
         r for r in rules if _data(r).get("state", "").upper() == state_code.upper()
     ]
@@ -483,7 +523,7 @@ async def state_rule_enforcement(
         }
         for r in state_rules
     ]
-    violations_list = svc.repo("export_rule_violations").list(
+    violations_list = await svc.repo("export_rule_violations").list(
         tenant_id=current.tenant_id, limit=1000
     )
     violations = [
@@ -502,10 +542,10 @@ async def state_rule_enforcement(
 async def auto_repair_suggestions(
     job_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    repairs = svc.repo("export_auto_repairs").list(
+    repairs = await svc.repo("export_auto_repairs").list(
         tenant_id=current.tenant_id, limit=1000
     )
     job_repairs = [r for r in repairs if _data(r).get("job_id") == job_id]
@@ -529,13 +569,13 @@ async def auto_repair_suggestions(
 async def export_audit_history(
     limit: int = Query(50, le=200),
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    entries = svc.repo("export_audit_log").list(
+    entries = await svc.repo("export_audit_log").list(
         tenant_id=current.tenant_id, limit=limit
     )
-    total_all = svc.repo("export_audit_log").list(
+    total_all = await svc.repo("export_audit_log").list(
         tenant_id=current.tenant_id, limit=10000
     )
     items = [
@@ -556,7 +596,7 @@ async def cross_state_submission(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     states = payload.get("states", [])
@@ -588,7 +628,7 @@ async def data_bundle_compression(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     original_kb = payload.get("size_kb", 120)
@@ -621,7 +661,7 @@ async def manual_override_export(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -651,10 +691,10 @@ async def manual_override_export(
 @router.get("/pending-approval")
 async def approval_required_exports(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    approvals = svc.repo("export_approvals").list(
+    approvals = await svc.repo("export_approvals").list(
         tenant_id=current.tenant_id, limit=1000
     )
     pending = [a for a in approvals if _data(a).get("status") == "pending"]
@@ -676,10 +716,10 @@ async def approve_export(
     job_id: str,
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    approvals = svc.repo("export_approvals").list(
+    approvals = await svc.repo("export_approvals").list(
         tenant_id=current.tenant_id, limit=10000
     )
     match = next((a for a in approvals if _data(a).get("job_id") == job_id), None)
@@ -709,10 +749,10 @@ async def approve_export(
 async def locked_export_protection(
     job_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    locks = svc.repo("export_locks").list(tenant_id=current.tenant_id, limit=10000)
+    locks = await svc.repo("export_locks").list(tenant_id=current.tenant_id, limit=10000)
     match = next(
         (
             lnk
@@ -738,7 +778,7 @@ async def lock_export(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -767,10 +807,10 @@ async def lock_export(
 @router.get("/rbac/permissions")
 async def export_rbac(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    perms = svc.repo("export_permissions").list(tenant_id=current.tenant_id, limit=1000)
+    perms = await svc.repo("export_permissions").list(tenant_id=current.tenant_id, limit=1000)
     user_perms = [p for p in perms if _data(p).get("user_id") == str(current.user_id)]
     allowed = []
     denied = []
@@ -785,11 +825,11 @@ async def export_rbac(
 @router.get("/sla")
 async def export_sla_monitor(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
-    sla_records = svc.repo("export_sla").list(tenant_id=current.tenant_id, limit=100)
+    jobs = await _jobs(svc, current.tenant_id)
+    sla_records = await svc.repo("export_sla").list(tenant_id=current.tenant_id, limit=100)
     sla_target = 24
     if sla_records:
         sla_target = _data(sla_records[0]).get("sla_target_hours", 24)
@@ -816,10 +856,10 @@ async def export_sla_monitor(
 @router.get("/reconciliation")
 async def reconciliation_report(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     submitted = len(jobs)
     acknowledged = sum(1 for j in jobs if _data(j).get("state_acknowledged"))
     unreconciled = submitted - acknowledged
@@ -841,10 +881,10 @@ async def reconciliation_report(
 async def duplicate_export_detection(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     incident_id = payload.get("incident_id")
     dup = next(
         (
@@ -867,12 +907,12 @@ async def duplicate_export_detection(
 async def export_diff_comparison(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     job_a_id = payload.get("job_id_a")
     job_b_id = payload.get("job_id_b")
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job_a = next((j for j in jobs if str(j.get("id", "")) == job_a_id), None)
     job_b = next((j for j in jobs if str(j.get("id", "")) == job_b_id), None)
     diff_fields = []
@@ -894,10 +934,10 @@ async def export_diff_comparison(
 @router.get("/version-compat")
 async def version_compatibility_tracker(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    versions = svc.repo("export_schema_versions").list(
+    versions = await svc.repo("export_schema_versions").list(
         tenant_id=current.tenant_id, limit=100
     )
     current_schema = (
@@ -925,10 +965,10 @@ async def version_compatibility_tracker(
 @router.get("/calendar")
 async def scheduled_export_calendar(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    schedules = svc.repo("export_schedules").list(
+    schedules = await svc.repo("export_schedules").list(
         tenant_id=current.tenant_id, limit=1000
     )
     upcoming = [
@@ -946,34 +986,29 @@ async def scheduled_export_calendar(
 @router.get("/failure-clusters")
 async def export_failure_clustering(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
-    failed = [j for j in jobs if _data(j).get("status") == "failed"]
-    groups: dict[str, dict] = {}
-    for j in failed:
-        d = _data(j)
-        reason = d.get("reason_code", "UNKNOWN")
-        if reason not in groups:
-            groups[reason] = {
-                "reason": reason,
-                "count": 0,
-                "states": set(),
-                "first_seen": d.get("failed_at") or d.get("created_at"),
-            }
-        groups[reason]["count"] += 1
-        if d.get("state"):
-            groups[reason]["states"].add(d["state"])
+    groups = await svc.repo("export_jobs").aggregate(
+        tenant_id=current.tenant_id,
+        filters=[QueryFilter("data.status", "eq", "failed")],
+        group_by=["data.reason_code"],
+        metrics=[
+            Aggregate("count"),
+            Aggregate("states", "distinct", "data.state"),
+            Aggregate("first_failed_at", "min", "data.failed_at"),
+            Aggregate("first_created_at", "min", "data.created_at"),
+        ],
+    )
     clusters = []
-    for i, (reason, g) in enumerate(groups.items()):
+    for i, g in enumerate(groups):
         clusters.append(
             {
                 "cluster_id": f"c{i + 1}",
-                "reason": reason,
+                "reason": g["reason_code"] or "UNKNOWN",
                 "count": g["count"],
-                "states": sorted(g["states"]),
-                "first_seen": g["first_seen"],
+                "states": [s for s in g["states"] if s],
+                "first_seen": g["first_failed_at"] or g["first_created_at"],
             }
         )
     return {"clusters": clusters}
@@ -984,7 +1019,7 @@ async def automated_status_email(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -1013,7 +1048,7 @@ async def export_file_integrity_hash(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     content = str(payload.get("content", "")).encode()
@@ -1044,7 +1079,7 @@ async def submission_proof_storage(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     job_id = payload.get("job_id")
@@ -1073,10 +1108,10 @@ async def submission_proof_storage(
 async def state_confirmation_archive(
     state: str = Query(None),
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    confirmations = svc.repo("export_state_confirmations").list(
+    confirmations = await svc.repo("export_state_confirmations").list(
         tenant_id=current.tenant_id, limit=1000
     )
     if state:
@@ -1101,10 +1136,10 @@ async def state_confirmation_archive(
 @router.get("/fire/mapping")
 async def fire_data_mapping_editor(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    mappings = svc.repo("export_fire_mappings").list(
+    mappings = await svc.repo("export_fire_mappings").list(
         tenant_id=current.tenant_id, limit=500
     )
     items = [
@@ -1123,7 +1158,7 @@ async def update_fire_data_mapping(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     await svc.create(
@@ -1143,10 +1178,10 @@ async def update_fire_data_mapping(
 @router.get("/crosswalk")
 async def data_crosswalk_builder(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    crosswalks = svc.repo("export_crosswalks").list(
+    crosswalks = await svc.repo("export_crosswalks").list(
         tenant_id=current.tenant_id, limit=500
     )
     items = [
@@ -1164,10 +1199,10 @@ async def data_crosswalk_builder(
 @router.get("/niers/heatmap")
 async def niers_compliance_heatmap(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     by_state: dict[str, dict] = {}
     for j in jobs:
         d = _data(j)
@@ -1198,7 +1233,7 @@ async def incident_validation_pre_check(
     incident_id: str,
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -1222,7 +1257,7 @@ async def fire_classification_validator(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -1252,7 +1287,7 @@ async def narrative_cross_check(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     narrative = payload.get("narrative", "")
@@ -1281,10 +1316,10 @@ async def narrative_cross_check(
 @router.get("/freeze-status")
 async def submission_freeze_status(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    freezes = svc.repo("export_freezes").list(tenant_id=current.tenant_id, limit=10)
+    freezes = await svc.repo("export_freezes").list(tenant_id=current.tenant_id, limit=10)
     active = next((f for f in freezes if _data(f).get("frozen")), None)
     if active:
         d = _data(active)
@@ -1302,7 +1337,7 @@ async def activate_freeze(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -1330,10 +1365,10 @@ async def activate_freeze(
 async def deactivate_freeze(
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    freezes = svc.repo("export_freezes").list(tenant_id=current.tenant_id, limit=10)
+    freezes = await svc.repo("export_freezes").list(tenant_id=current.tenant_id, limit=10)
     active = next((f for f in freezes if _data(f).get("frozen")), None)
     if active:
         await svc.update(
@@ -1357,7 +1392,7 @@ async def export_encryption_validation(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -1384,10 +1419,10 @@ async def export_encryption_validation(
 @router.get("/secure-transfer")
 async def secure_transfer_monitor(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    transfers = svc.repo("export_transfers").list(
+    transfers = await svc.repo("export_transfers").list(
         tenant_id=current.tenant_id, limit=1000
     )
     today = datetime.now(UTC).date().isoformat()
@@ -1419,10 +1454,10 @@ async def secure_transfer_monitor(
 @router.get("/timeouts")
 async def timeout_detection(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     timeouts = [j for j in jobs if _data(j).get("reason_code") == "TIMEOUT"]
     today = datetime.now(UTC).date().isoformat()
     timeouts_24h = [
@@ -1450,10 +1485,10 @@ async def timeout_detection(
 @router.get("/error-rate")
 async def error_rate_analytics(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     today = datetime.now(UTC).date().isoformat()
     today_jobs = [
         j for j in jobs if (_data(j).get("created_at") or "").startswith(today)
@@ -1485,10 +1520,10 @@ async def error_rate_analytics(
 @router.get("/health-summary")
 async def export_health_summary(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     total = len(jobs) or 1
     failed = sum(1 for j in jobs if _data(j).get("status") == "failed")
     success_rate = (total - failed) / total * 100
@@ -1519,10 +1554,10 @@ async def export_health_summary(
 @router.get("/throughput")
 async def export_throughput_monitor(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     total = len(jobs)
     hours_by_count: dict[str, int] = {}
     for j in jobs:
@@ -1549,10 +1584,10 @@ async def export_throughput_monitor(
 @router.get("/queue/priority")
 async def queue_prioritization(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    rules = svc.repo("export_priority_rules").list(
+    rules = await svc.repo("export_priority_rules").list(
         tenant_id=current.tenant_id, limit=100
     )
     items = [
@@ -1563,7 +1598,7 @@ async def queue_prioritization(
         }
         for r in rules
     ]
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     high_priority = sum(
         1
         for j in jobs
@@ -1578,11 +1613,11 @@ async def update_queue_priority(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     job_id = payload.get("job_id")
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job = next((j for j in jobs if str(j.get("id", "")) == job_id), None)
     if job:
         await svc.update(
@@ -1605,10 +1640,10 @@ async def update_queue_priority(
 @router.get("/state-outages")
 async def state_outage_detection(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    outages = svc.repo("export_state_outages").list(
+    outages = await svc.repo("export_state_outages").list(
         tenant_id=current.tenant_id, limit=100
     )
     active_outages = [o for o in outages if _data(o).get("status") == "outage"]
@@ -1626,12 +1661,12 @@ async def auto_resume_engine(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     job_ids = payload.get("job_ids", [])
     for jid in job_ids:
-        jobs = _jobs(svc, current.tenant_id)
+        jobs = await _jobs(svc, current.tenant_id)
         job = next((j for j in jobs if str(j.get("id", "")) == jid), None)
         if job:
             await svc.update(
@@ -1650,10 +1685,10 @@ async def auto_resume_engine(
 async def retry_backoff_logic(
     job_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job = next((j for j in jobs if str(j.get("id", "")) == job_id), None)
     d = _data(job) if job else {}
     attempt = d.get("attempt", 1)
@@ -1670,10 +1705,10 @@ async def retry_backoff_logic(
 @router.get("/archive/lifecycle")
 async def export_archive_lifecycle(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    archives = svc.repo("export_archives").list(
+    archives = await svc.repo("export_archives").list(
         tenant_id=current.tenant_id, limit=10000
     )
     pending_deletion = sum(1 for a in archives if _data(a).get("pending_deletion"))
@@ -1683,7 +1718,7 @@ async def export_archive_lifecycle(
         if _data(a).get("created_at")
     ]
     oldest = min(created_dates) if created_dates else None
-    policies = svc.repo("export_retention_policies").list(
+    policies = await svc.repo("export_retention_policies").list(
         tenant_id=current.tenant_id, limit=10
     )
     retention_days = (
@@ -1706,10 +1741,10 @@ async def export_archive_lifecycle(
 @router.get("/submission-rights")
 async def role_based_submission_rights(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    perms = svc.repo("export_permissions").list(tenant_id=current.tenant_id, limit=1000)
+    perms = await svc.repo("export_permissions").list(tenant_id=current.tenant_id, limit=1000)
     user_perms = [p for p in perms if _data(p).get("user_id") == str(current.user_id)]
     granted = {
         _data(p).get("permission") for p in user_perms if _data(p).get("granted")
@@ -1728,7 +1763,7 @@ async def multi_agency_export_consolidation(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     agencies = payload.get("agency_ids", [])
@@ -1745,7 +1780,7 @@ async def multi_agency_export_consolidation(
         correlation_id=getattr(request.state, "correlation_id", None),
     )
     d = _data(record)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     agency_incidents = sum(1 for j in jobs if _data(j).get("agency_id") in agencies)
     return {
         "bundle_id": str(record.get("id", "")),
@@ -1759,10 +1794,10 @@ async def multi_agency_export_consolidation(
 @router.get("/dataset-version")
 async def dataset_version_enforcement(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    versions = svc.repo("export_schema_versions").list(
+    versions = await svc.repo("export_schema_versions").list(
         tenant_id=current.tenant_id, limit=10
     )
     if versions:
@@ -1787,10 +1822,10 @@ async def dataset_version_enforcement(
 async def export_preview_viewer(
     job_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job = next((j for j in jobs if str(j.get("id", "")) == job_id), None)
     d = _data(job) if job else {}
     return {
@@ -1808,7 +1843,7 @@ async def export_preview_viewer(
 async def field_validation_pre_export(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     fields = payload.get("fields", {})
     errors = []
@@ -1821,10 +1856,10 @@ async def field_validation_pre_export(
 async def compliance_scoring_integration(
     incident_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    results = svc.repo("export_validation_results").list(
+    results = await svc.repo("export_validation_results").list(
         tenant_id=current.tenant_id, limit=10000
     )
     incident_results = [
@@ -1846,10 +1881,10 @@ async def compliance_scoring_integration(
 @router.get("/anomalies")
 async def export_anomaly_detection(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    anomalies = svc.repo("export_anomalies").list(
+    anomalies = await svc.repo("export_anomalies").list(
         tenant_id=current.tenant_id, limit=1000
     )
     items = [_data(a) for a in anomalies]
@@ -1866,7 +1901,7 @@ async def submission_certificate_storage(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     job_id = payload.get("job_id")
@@ -1895,10 +1930,10 @@ async def submission_certificate_storage(
 @router.get("/state-api-status")
 async def state_api_status_tracker(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    statuses = svc.repo("export_state_api_status").list(
+    statuses = await svc.repo("export_state_api_status").list(
         tenant_id=current.tenant_id, limit=100
     )
     items = [
@@ -1918,7 +1953,7 @@ async def scheduled_export_validation(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -1947,11 +1982,11 @@ async def scheduled_export_validation(
 async def duplicate_incident_block(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     incident_id = payload.get("incident_id")
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     dup = next(
         (
             j
@@ -1973,7 +2008,7 @@ async def duplicate_incident_block(
 async def incomplete_record_block(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     required = [
         "patient_dob",
@@ -1994,11 +2029,11 @@ async def incomplete_record_block(
 @router.get("/cost")
 async def export_cost_monitor(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
-    costs = svc.repo("export_cost_records").list(
+    jobs = await _jobs(svc, current.tenant_id)
+    costs = await svc.repo("export_cost_records").list(
         tenant_id=current.tenant_id, limit=10000
     )
     total_cost = sum(_data(c).get("cost_cents", 0) for c in costs)
@@ -2016,15 +2051,15 @@ async def export_cost_monitor(
 @router.get("/throttle-config")
 async def large_batch_throttle(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    configs = svc.repo("export_throttle_config").list(
+    configs = await svc.repo("export_throttle_config").list(
         tenant_id=current.tenant_id, limit=10
     )
     if configs:
         d = _data(configs[0])
-        jobs = _jobs(svc, current.tenant_id)
+        jobs = await _jobs(svc, current.tenant_id)
         queued = [j for j in jobs if _data(j).get("status") == "queued"]
         return {
             "max_batch_size": d.get("max_batch_size", 500),
@@ -2033,7 +2068,7 @@ async def large_batch_throttle(
             "current_batch_size": len(queued),
             "throttled": len(queued) > d.get("throttle_above", 200),
         }
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     queued = [j for j in jobs if _data(j).get("status") == "queued"]
     return {
         "max_batch_size": 500,
@@ -2049,10 +2084,10 @@ async def update_throttle_config(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    configs = svc.repo("export_throttle_config").list(
+    configs = await svc.repo("export_throttle_config").list(
         tenant_id=current.tenant_id, limit=10
     )
     if configs:
@@ -2080,10 +2115,10 @@ async def update_throttle_config(
 async def incident_reconciliation_log(
     limit: int = Query(50, le=200),
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    all_entries = svc.repo("export_reconciliation_log").list(
+    all_entries = await svc.repo("export_reconciliation_log").list(
         tenant_id=current.tenant_id, limit=10000
     )
     entries = all_entries[:limit]
@@ -2104,11 +2139,11 @@ async def incident_reconciliation_log(
 async def partial_submission_detection(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     job_id = payload.get("job_id")
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job = next((j for j in jobs if str(j.get("id", "")) == job_id), None)
     d = _data(job) if job else {}
     expected = payload.get("expected", d.get("expected_records", 1))
@@ -2126,7 +2161,7 @@ async def partial_submission_detection(
 async def file_naming_convention_enforcer(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     filename = payload.get("filename", "")
     valid = filename.startswith("NEMSIS_") and filename.endswith(".xml")
@@ -2143,7 +2178,7 @@ async def timestamp_signature_check(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -2170,13 +2205,13 @@ async def timestamp_signature_check(
 @router.get("/schema-alert")
 async def schema_version_alert(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    versions = svc.repo("export_schema_versions").list(
+    versions = await svc.repo("export_schema_versions").list(
         tenant_id=current.tenant_id, limit=10
     )
-    alerts = svc.repo("export_schema_alerts").list(
+    alerts = await svc.repo("export_schema_alerts").list(
         tenant_id=current.tenant_id, limit=100
     )
     if versions:
@@ -2200,10 +2235,10 @@ async def schema_version_alert(
 @router.get("/timeout-escalations")
 async def export_timeout_escalation(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    escalations = svc.repo("export_escalations").list(
+    escalations = await svc.repo("export_escalations").list(
         tenant_id=current.tenant_id, limit=1000
     )
     timeout_esc = [e for e in escalations if _data(e).get("type") == "timeout"]
@@ -2223,7 +2258,7 @@ async def escalate_timeout(
     job_id: str,
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -2250,10 +2285,10 @@ async def escalate_timeout(
 @router.get("/retry-dashboard")
 async def submission_retry_dashboard(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     retrying = [j for j in jobs if _data(j).get("status") == "retry_queued"]
     max_reached = [
         j
@@ -2280,10 +2315,10 @@ async def submission_retry_dashboard(
 @router.get("/failed-priority")
 async def failed_export_priority_scoring(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     failed = [j for j in jobs if _data(j).get("status") == "failed"]
     items = [
         {
@@ -2302,10 +2337,10 @@ async def failed_export_priority_scoring(
 async def export_dependency_map(
     job_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    deps = svc.repo("export_dependencies").list(
+    deps = await svc.repo("export_dependencies").list(
         tenant_id=current.tenant_id, limit=10000
     )
     job_deps = [d for d in deps if _data(d).get("job_id") == job_id]
@@ -2322,7 +2357,7 @@ async def cross_dataset_consistency_checker(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -2350,10 +2385,10 @@ async def cross_dataset_consistency_checker(
 @router.get("/kpi/success-rate")
 async def export_success_rate_kpi(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     total = len(jobs) or 1
     successful = sum(1 for j in jobs if _data(j).get("status") == "completed")
     rate = round(successful / total * 100, 2)
@@ -2371,10 +2406,10 @@ async def export_success_rate_kpi(
 @router.get("/per-state-compliance")
 async def per_state_compliance_summary(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     by_state: dict[str, dict] = {}
     for j in jobs:
         d = _data(j)
@@ -2406,10 +2441,10 @@ async def per_state_compliance_summary(
 async def automated_export_logs(
     limit: int = Query(100, le=500),
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    all_logs = svc.repo("export_audit_log").list(
+    all_logs = await svc.repo("export_audit_log").list(
         tenant_id=current.tenant_id, limit=10000
     )
     logs = all_logs[:limit]
@@ -2430,7 +2465,7 @@ async def escalation_to_founder(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -2462,10 +2497,10 @@ async def escalation_to_founder(
 async def export_incident_report(
     job_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job = next((j for j in jobs if str(j.get("id", "")) == job_id), None)
     d = _data(job) if job else {}
     return {
@@ -2483,10 +2518,10 @@ async def export_incident_report(
 @router.get("/review-queue")
 async def role_based_export_review(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    reviews = svc.repo("export_review_queue").list(
+    reviews = await svc.repo("export_review_queue").list(
         tenant_id=current.tenant_id, limit=1000
     )
     items = [
@@ -2506,10 +2541,10 @@ async def role_based_export_review(
 @router.get("/rejection-clusters")
 async def state_rejection_clustering(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    alerts = svc.repo("export_rejection_alerts").list(
+    alerts = await svc.repo("export_rejection_alerts").list(
         tenant_id=current.tenant_id, limit=10000
     )
     groups: dict[str, dict] = {}
@@ -2541,7 +2576,7 @@ async def state_rejection_clustering(
 async def fire_narrative_integrity_check(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     narrative = payload.get("narrative", "")
     return {
@@ -2557,7 +2592,7 @@ async def fire_narrative_integrity_check(
 async def data_truncation_alert(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     fields = payload.get("fields", {})
     truncated = [k for k, v in fields.items() if isinstance(v, str) and len(v) > 255]
@@ -2571,10 +2606,10 @@ async def data_truncation_alert(
 @router.get("/audit-freeze-status")
 async def export_freeze_during_audit(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    freezes = svc.repo("export_audit_freezes").list(
+    freezes = await svc.repo("export_audit_freezes").list(
         tenant_id=current.tenant_id, limit=10
     )
     active = next((f for f in freezes if _data(f).get("audit_in_progress")), None)
@@ -2599,7 +2634,7 @@ async def activate_audit_freeze(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     await svc.create(
@@ -2625,10 +2660,10 @@ async def activate_audit_freeze(
 @router.get("/archive/retention-policy")
 async def archive_retention_policy(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    policies = svc.repo("export_retention_policies").list(
+    policies = await svc.repo("export_retention_policies").list(
         tenant_id=current.tenant_id, limit=10
     )
     if policies:
@@ -2653,7 +2688,7 @@ async def archive_retention_policy(
 async def file_checksum_validation(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     content = str(payload.get("content", "")).encode()
     computed = hashlib.sha256(content).hexdigest()
@@ -2669,10 +2704,10 @@ async def file_checksum_validation(
 @router.get("/state-sla")
 async def state_submission_sla_tracker(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    sla_records = svc.repo("export_state_sla").list(
+    sla_records = await svc.repo("export_state_sla").list(
         tenant_id=current.tenant_id, limit=100
     )
     items = [
@@ -2690,10 +2725,10 @@ async def state_submission_sla_tracker(
 @router.get("/approval-workflow")
 async def submission_approval_workflow(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    steps = svc.repo("export_approval_workflows").list(
+    steps = await svc.repo("export_approval_workflows").list(
         tenant_id=current.tenant_id, limit=100
     )
     items = [
@@ -2713,10 +2748,10 @@ async def data_correction_loop(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job = next((j for j in jobs if str(j.get("id", "")) == job_id), None)
     if job:
         await svc.update(
@@ -2744,10 +2779,10 @@ async def data_correction_loop(
 @router.get("/batch/optimize")
 async def batch_size_optimization(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    schedules = svc.repo("export_schedules").list(
+    schedules = await svc.repo("export_schedules").list(
         tenant_id=current.tenant_id, limit=1000
     )
     batch_sizes = [
@@ -2756,7 +2791,7 @@ async def batch_size_optimization(
         if _data(s).get("record_count")
     ]
     avg_batch = round(sum(batch_sizes) / len(batch_sizes)) if batch_sizes else 0
-    configs = svc.repo("export_throttle_config").list(
+    configs = await svc.repo("export_throttle_config").list(
         tenant_id=current.tenant_id, limit=10
     )
     max_safe = _data(configs[0]).get("max_batch_size", 500) if configs else 500
@@ -2772,10 +2807,10 @@ async def batch_size_optimization(
 @router.get("/integrity-dashboard")
 async def submission_integrity_dashboard(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    results = svc.repo("export_validation_results").list(
+    results = await svc.repo("export_validation_results").list(
         tenant_id=current.tenant_id, limit=10000
     )
     total = len(results) or 1
@@ -2802,7 +2837,7 @@ async def multi_version_export_simulator(
     payload: dict[str, Any],
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     record = await svc.create(
@@ -2829,11 +2864,11 @@ async def multi_version_export_simulator(
 async def duplicate_fire_report_detection(
     payload: dict[str, Any],
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
     incident_id = payload.get("incident_id")
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     fire_jobs = [
         j
         for j in jobs
@@ -2853,10 +2888,10 @@ async def export_rollback_support(
     job_id: str,
     request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job = next((j for j in jobs if str(j.get("id", "")) == job_id), None)
     previous_state = _data(job).get("status", "submitted") if job else "submitted"
     if job:
@@ -2886,14 +2921,14 @@ async def export_rollback_support(
 @router.get("/compliance-triggers")
 async def compliance_escalation_triggers(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     total = len(jobs) or 1
     failed = sum(1 for j in jobs if _data(j).get("status") == "failed")
     failure_rate = round(failed / total * 100, 2)
-    outages = svc.repo("export_state_outages").list(
+    outages = await svc.repo("export_state_outages").list(
         tenant_id=current.tenant_id, limit=10
     )
     active_outages = [o for o in outages if _data(o).get("status") == "outage"]
@@ -2918,10 +2953,10 @@ async def compliance_escalation_triggers(
 @router.get("/scheduled-health")
 async def scheduled_health_checks(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    checks = svc.repo("export_health_checks").list(
+    checks = await svc.repo("export_health_checks").list(
         tenant_id=current.tenant_id, limit=100
     )
     items = [
@@ -2940,10 +2975,10 @@ async def scheduled_health_checks(
 async def audit_ready_export_package(
     job_id: str,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     job = next((j for j in jobs if str(j.get("id", "")) == job_id), None)
     d = _data(job) if job else {}
     return {
@@ -2966,10 +3001,10 @@ async def audit_ready_export_package(
 async def export_exception_reporting(
     limit: int = Query(50, le=200),
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    all_exceptions = svc.repo("export_exceptions").list(
+    all_exceptions = await svc.repo("export_exceptions").list(
         tenant_id=current.tenant_id, limit=10000
     )
     exceptions = all_exceptions[:limit]
@@ -2993,10 +3028,10 @@ async def export_exception_reporting(
 @router.get("/national-readiness")
 async def national_reporting_readiness_engine(
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
 ):
     svc = _svc(db)
-    jobs = _jobs(svc, current.tenant_id)
+    jobs = await _jobs(svc, current.tenant_id)
     total = len(jobs) or 1
     failed = sum(1 for j in jobs if _data(j).get("status") == "failed")
     ready = total - failed
@@ -3007,7 +3042,7 @@ async def national_reporting_readiness_engine(
         else "B" if score >= 80 else "C" if score >= 70 else "D" if score >= 60 else "F"
     )
     states = {_data(j).get("state") for j in jobs if _data(j).get("state")}
-    blockers = svc.repo("export_submission_blockers").list(
+    blockers = await svc.repo("export_submission_blockers").list(
         tenant_id=current.tenant_id, limit=100
     )
     return {
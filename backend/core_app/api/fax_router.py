@@ -115,7 +115,7 @@ async def inbound_fax(
                 api_key=settings.telnyx_api_key,
                 messaging_profile_id=settings.telnyx_messaging_profile_id or None,
             )
-            content = download_media(cfg=tel_cfg, media_url=media_url)
+            content = await download_media(cfg=tel_cfg, media_url=media_url)
             doc_key = f"tenants/{tenant_id}/fax/inbound/{event_id}.pdf"
             put_bytes(
                 bucket=bucket,
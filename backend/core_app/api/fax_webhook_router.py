@@ -16,6 +16,7 @@ from core_app.core.config import get_settings
 from core_app.documents.s3_storage import put_bytes
 from core_app.services import sqs_publisher
 from core_app.telnyx.client import TelnyxApiError, download_media
+from core_app.telnyx.did_directory import get_did_directory
 from core_app.telnyx.signature import verify_telnyx_webhook
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,12 @@ def _s3_fax_key(tenant_id: str, fax_id: str) -> str:
 
 
 def _resolve_tenant_by_did(db: Session, to_number: str) -> str | None:
+    return get_did_directory().lookup(
+        "billing_fax", to_number, lambda: _query_tenant_by_did(db, to_number)
+    )
+
+
+def _query_tenant_by_did(db: Session, to_number: str) -> str | None:
     row = db.execute(
         text(
             "SELECT tenant_id FROM tenant_phone_numbers "
@@ -188,7 +195,7 @@ async def telnyx_fax_webhook(
 
     if api_key and bucket and media_url:
         try:
-            pdf_bytes = download_media(api_key=api_key, media_url=media_url)
+            pdf_bytes = await download_media(api_key=api_key, media_url=media_url)
             sha256_hex = hashlib.sha256(pdf_bytes).hexdigest()
             s3_key = _s3_fax_key(tenant_id or "unrouted", fax_id)
             put_bytes(
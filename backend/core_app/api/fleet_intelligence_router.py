@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from core_app.api.dependencies import db_session_dependency, get_current_user
 from core_app.fleet.fault_detector import FaultDetector
 from core_app.fleet.readiness_engine import ReadinessEngine
+from core_app.repositories.domination_repository import QueryFilter
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
@@ -91,15 +92,16 @@ async def list_alerts(
 ):
     _check(current)
     svc = _svc(db)
-    alerts = svc.repo("fleet_alerts").list(
-        tenant_id=current.tenant_id, limit=min(limit, 500)
-    )
+    filters: list[QueryFilter] = []
     if unit_id:
-        alerts = [a for a in alerts if (a.get("data") or {}).get("unit_id") == unit_id]
+        filters.append(QueryFilter("data.unit_id", "eq", unit_id))
     if severity:
-        alerts = [
-            a for a in alerts if (a.get("data") or {}).get("severity") == severity
-        ]
+        filters.append(QueryFilter("data.severity", "eq", severity))
+    alerts = (
+        svc.repo("fleet_alerts")
+        .query(tenant_id=current.tenant_id, filters=filters, limit=max(1, min(limit, 500)))
+        .items
+    )
     if unresolved_only:
         alerts = [a for a in alerts if not (a.get("data") or {}).get("resolved")]
     return alerts
@@ -185,14 +187,16 @@ async def list_work_orders(
 ):
     _check(current)
     svc = _svc(db)
-    orders = svc.repo("maintenance_work_orders").list(
-        tenant_id=current.tenant_id, limit=min(limit, 500)
-    )
+    filters: list[QueryFilter] = []
     if unit_id:
-        orders = [o for o in orders if (o.get("data") or {}).get("unit_id") == unit_id]
+        filters.append(QueryFilter("data.unit_id", "eq", unit_id))
     if status:
-        orders = [o for o in orders if (o.get("data") or {}).get("status") == status]
-    return orders
+        filters.append(QueryFilter("data.status", "eq", status))
+    return (
+        svc.repo("maintenance_work_orders")
+        .query(tenant_id=current.tenant_id, filters=filters, limit=max(1, min(limit, 500)))
+        .items
+    )
 
 
 @router.patch("/maintenance/work-orders/{order_id}")
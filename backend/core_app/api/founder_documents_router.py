@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from core_app.api.dependencies import db_session_dependency, require_role
 from core_app.core.config import get_settings
 from core_app.schemas.auth import CurrentUser
+from core_app.services.auth_cache import get_auth_cache
 from core_app.services.event_publisher import get_event_publisher
 
 logger = logging.getLogger(__name__)
@@ -416,6 +417,8 @@ async def revoke_application(
         )
 
     db.commit()
+    if app_row["tenant_id"]:
+        get_auth_cache().invalidate_tenant(app_row["tenant_id"])
     return {
         "application_id": application_id,
         "status": "revoked",
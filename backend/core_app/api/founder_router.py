@@ -12,6 +12,7 @@ from core_app.api.dependencies import (
     get_current_user,
     require_role,
 )
+from core_app.repositories.domination_repository import QueryFilter
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
@@ -156,23 +157,24 @@ async def founder_dashboard(
     require_role(current, ["founder", "admin"])
     svc = DominationService(db, get_event_publisher())
 
-    tenants_list = svc.repo("tenants").list(tenant_id=current.tenant_id, limit=10000)
-    active_tenants = [
-        t for t in tenants_list if t.get("data", {}).get("status") == "active"
-    ]
+    active = QueryFilter("data.status", "eq", "active")
+    active_tenants = svc.repo("tenants").count(tenant_id=current.tenant_id, filters=[active])
 
-    subscriptions = svc.repo("tenant_subscriptions").list(
-        tenant_id=current.tenant_id, limit=10000
-    )
-    mrr = sum(
-        int(s.get("data", {}).get("monthly_amount_cents", 0))
-        for s in subscriptions
-        if s.get("data", {}).get("status") == "active"
+    subscriptions = (
+        svc.repo("tenant_subscriptions")
+        .query(
+            tenant_id=current.tenant_id,
+            filters=[active],
+            fields=["data.monthly_amount_cents"],
+            limit=10000,
+        )
+        .items
     )
+    mrr = sum(int(s.get("data", {}).get("monthly_amount_cents", 0)) for s in subscriptions)
 
     return {
         "mrr_cents": mrr,
-        "tenant_count": len(active_tenants),
+        "tenant_count": active_tenants,
         "error_count_1h": 0,
         "as_of": datetime.now(UTC).isoformat(),
     }
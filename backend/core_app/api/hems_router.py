@@ -6,12 +6,19 @@ import uuid
 from datetime import UTC, datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from core_app.api.dependencies import db_session_dependency, get_current_user
+from core_app.api.dependencies import (
+    async_db_session_dependency,
+    db_session_dependency,
+    get_current_user,
+)
 from core_app.epcr.chart_model import Chart
-from core_app.epcr.completeness_engine import CompletenessEngine
+from core_app.epcr.completeness_engine import CompletenessEngine, completeness_fields
+from core_app.realtime.hub import get_realtime_hub
+from core_app.repositories.domination_repository import AsyncDominationRepository, QueryFilter
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
@@ -344,14 +351,15 @@ async def get_aircraft_readiness(
 ):
     _check(current)
     svc = _svc(db)
-    events = svc.repo("aircraft_readiness_events").list(
-        tenant_id=current.tenant_id, limit=100
+    matching = (
+        svc.repo("aircraft_readiness_events")
+        .query(
+            tenant_id=current.tenant_id,
+            filters=[QueryFilter("data.aircraft_id", "eq", str(aircraft_id))],
+            limit=100,
+        )
+        .items
     )
-    matching = [
-        e
-        for e in events
-        if (e.get("data") or {}).get("aircraft_id") == str(aircraft_id)
-    ]
     if not matching:
         return {"aircraft_id": str(aircraft_id), "state": "unknown", "history": []}
     latest = sorted(matching, key=lambda x: x.get("created_at", ""), reverse=True)[0]
@@ -565,8 +573,7 @@ async def complete_mission(
     chart_dict["wheels_up_time"] = payload.get("wheels_up_time")
     chart_dict["wheels_down_time"] = payload.get("wheels_down_time")
     score_result = CompletenessEngine().score_chart(chart_dict, "hems")
-    chart_dict["completeness_score"] = score_result["score"]
-    chart_dict["completeness_issues"] = [m["label"] for m in score_result["missing"]]
+    chart_dict.update(completeness_fields(score_result, "hems", 1))  # a new record's version
     epcr_row = await svc.create(
         table="epcr_charts",
         tenant_id=current.tenant_id,
@@ -584,42 +591,100 @@ async def complete_mission(
     }
 
 
+HEMS_STREAM_TABLES = (
+    "hems_mission_events",
+    "aircraft_readiness_events",
+    "hems_weather_briefs",
+)
+HEMS_STREAM_SNAPSHOT_ROWS = 5
+HEMS_STREAM_KEEPALIVE_SECONDS = 15.0
+
+
+def _hems_sse(table: str, row: dict[str, Any], event_id: str | None = None) -> str:
+    event_type = (row.get("data") or {}).get("event_type", table.replace("_", "-"))
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event_type}\ndata: {json.dumps(row, default=str)}\n\n"
+
+
+def _row_from_envelope(text: str) -> tuple[str, dict[str, Any], str | None] | None:
+    """(table, row, stream id) from a DominationService ``<table>.created`` event."""
+    try:
+        envelope = json.loads(text)
+    except ValueError:
+        return None
+    table = envelope.get("entity_type")
+    payload = envelope.get("payload") or {}
+    record = payload.get("record")
+    if table not in HEMS_STREAM_TABLES or not isinstance(record, dict):
+        return None
+    if "changes" in payload and "data" not in record:
+        # Compact events: a create's changes are the whole data document.
+        record = {**record, "data": payload["changes"]}
+    return table, record, envelope.get("stream_id")
+
+
 @router.get("/missions/stream")
 async def mission_stream(
-    request: Request,
     current: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(db_session_dependency),
+    db: AsyncSession = Depends(async_db_session_dependency),
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
 ):
+    """Flight-ops SSE: a snapshot of recent rows, then live events from the realtime hub.
+
+    Mission, readiness and weather writes are published by DominationService;
+    the stream holds no database connection after the snapshot. On reconnect
+    with ``Last-Event-ID`` the missed events are replayed instead.
+    """
     from fastapi.responses import StreamingResponse
 
-    async def event_generator():
-        svc = _svc(db)
-        last_event_ids: dict[str, str] = {}
-        while True:
-            if await request.is_disconnected():
-                break
-
-            tables = [
-                "hems_mission_events",
-                "aircraft_readiness_events",
-                "hems_weather_briefs",
-            ]
-            for table in tables:
-                rows = svc.repo(table).list(
-                    tenant_id=current.tenant_id, limit=10, offset=0
+    _check(current)
+    tenant_id = str(current.tenant_id)
+    hub = get_realtime_hub()
+    # Subscribe before reading the snapshot so no write falls in between.
+    sub = await hub.subscribe(
+        tenant_id,
+        [f"tenant.{tenant_id}.{table}.created" for table in HEMS_STREAM_TABLES],
+        transport="sse",
+        after_id=last_event_id,
+    )
+    snapshot: list[tuple[str, dict[str, Any]]] = []
+    try:
+        if not last_event_id:
+            for table in HEMS_STREAM_TABLES:
+                rows = await AsyncDominationRepository(db, table=table).list(
+                    tenant_id=current.tenant_id, limit=HEMS_STREAM_SNAPSHOT_ROWS
                 )
-                for row in sorted(
-                    rows, key=lambda r: r.get("created_at", ""), reverse=True
-                )[:5]:
-                    row_id = str(row.get("id", ""))
-                    if last_event_ids.get(table) != row_id:
-                        last_event_ids[table] = row_id
-                        event_type = (row.get("data") or {}).get(
-                            "event_type", table.replace("_", "-")
-                        )
-                        yield f"event: {event_type}\ndata: {json.dumps(row)}\n\n"
-
-            await asyncio.sleep(5)
+                snapshot.extend((table, row) for row in reversed(rows))
+    except BaseException:
+        await hub.unsubscribe(sub)
+        raise
+    finally:
+        await db.close()
+    seen = {str(row.get("id")) for _, row in snapshot}
+
+    async def event_generator():
+        try:
+            for table, row in snapshot:
+                yield _hems_sse(table, row)
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        sub.get(), timeout=HEMS_STREAM_KEEPALIVE_SECONDS
+                    )
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    break
+                parsed = _row_from_envelope(event[1])
+                if parsed is None:
+                    continue
+                table, row, stream_id = parsed
+                if seen and str(row.get("id")) in seen:
+                    continue
+                yield _hems_sse(table, row, stream_id)
+        finally:
+            await hub.unsubscribe(sub)
 
     return StreamingResponse(
         event_generator(),
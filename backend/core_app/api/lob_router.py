@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from core_app.api.dependencies import db_session_dependency, get_current_user
 from core_app.integrations.lob_service import LobNotConfigured, _get_lob_config
+from core_app.observability.metrics import external_call
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
@@ -51,21 +52,22 @@ async def send_html_statement_letter(
         )
 
     try:
-        resp = _requests.post(
-            "https://api.lob.com/v1/letters",
-            auth=(cfg.api_key, ""),
-            json={
-                "description": f"FusionEMS Statement - Case {case_id}",
-                "to": to_addr,
-                "from": from_addr,
-                "file": html_content,
-                "color": False,
-                "double_sided": False,
-                "mail_type": "usps_first_class",
-            },
-            timeout=30,
-        )
-        resp.raise_for_status()
+        with external_call("lob", "letters"):
+            resp = _requests.post(
+                "https://api.lob.com/v1/letters",
+                auth=(cfg.api_key, ""),
+                json={
+                    "description": f"FusionEMS Statement - Case {case_id}",
+                    "to": to_addr,
+                    "from": from_addr,
+                    "file": html_content,
+                    "color": False,
+                    "double_sided": False,
+                    "mail_type": "usps_first_class",
+                },
+                timeout=30,
+            )
+            resp.raise_for_status()
         result = resp.json()
     except Exception as exc:
         raise HTTPException(status_code=502, detail=f"lob_error: {exc}")
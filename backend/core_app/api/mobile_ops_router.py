@@ -12,6 +12,7 @@ from core_app.api.dependencies import (
     get_current_user,
     require_role,
 )
+from core_app.repositories.domination_repository import Aggregate, QueryFilter
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
@@ -404,12 +405,14 @@ async def scheduling_heatmap(
 ):
     require_role(current, ["founder", "admin", "agency_admin"])
     svc = DominationService(db, get_event_publisher())
-    shifts = svc.repo("shifts").list(tenant_id=current.tenant_id, limit=10000)
+    groups = svc.repo("shifts").aggregate(
+        tenant_id=current.tenant_id, group_by=["data.shift_date"], metrics=[Aggregate("count")]
+    )
     heatmap: dict[str, int] = {}
-    for s in shifts:
-        day = s.get("data", {}).get("shift_date", "")[:10]
-        heatmap[day] = heatmap.get(day, 0) + 1
-    return {"heatmap": heatmap, "total_shifts": len(shifts)}
+    for g in groups:
+        day = (g["shift_date"] or "")[:10]
+        heatmap[day] = heatmap.get(day, 0) + g["count"]
+    return {"heatmap": heatmap, "total_shifts": sum(heatmap.values())}
 
 
 @router.get("/crew/availability")
@@ -419,9 +422,11 @@ async def crew_availability(
 ):
     require_role(current, ["founder", "admin", "agency_admin"])
     svc = DominationService(db, get_event_publisher())
-    shifts = svc.repo("shifts").list(tenant_id=current.tenant_id, limit=10000)
-    active = [s for s in shifts if s.get("data", {}).get("status") == "active"]
-    return {"active_shifts": len(active), "total_shifts": len(shifts)}
+    repo = svc.repo("shifts")
+    active = repo.count(
+        tenant_id=current.tenant_id, filters=[QueryFilter("data.status", "eq", "active")]
+    )
+    return {"active_shifts": active, "total_shifts": repo.count(tenant_id=current.tenant_id)}
 
 
 @router.get("/staffing/shortage-predictor")
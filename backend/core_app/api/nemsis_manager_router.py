@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import hashlib
+import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 
 from core_app.api.dependencies import (
@@ -15,6 +16,8 @@ from core_app.compliance.nemsis_xml_generator import (
     build_nemsis_document,
     validate_nemsis_xml,
 )
+from core_app.documents.s3_storage import default_exports_bucket, presign_get
+from core_app.repositories.domination_repository import QueryFilter
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
@@ -1305,12 +1308,16 @@ async def duplicate_detection(
     db: Session = Depends(db_session_dependency),
 ):
     pcr_number = payload.get("pcr_number")
-    validations = (
-        _svc(db).repo("nemsis_validation_results").list(tenant_id=current.tenant_id)
+    matches = (
+        _svc(db)
+        .repo("nemsis_validation_results")
+        .query(
+            tenant_id=current.tenant_id,
+            filters=[QueryFilter("data.pcr_number", "eq", pcr_number)],
+            fields=["id"],
+        )
+        .items
     )
-    matches = [
-        v for v in validations if v.get("data", {}).get("pcr_number") == pcr_number
-    ]
     return {
         "pcr_number": pcr_number,
         "duplicate_found": len(matches) > 1,
@@ -1748,14 +1755,20 @@ async def create_export_batch(
     ),
     db: Session = Depends(db_session_dependency),
 ):
+    # Picked up by the NEMSIS export worker (core_app/workers/nemsis_export_worker.py).
+    incident_ids = payload.get("incident_ids", [])
+    chart_ids = payload.get("chart_ids", [])
     return await _svc(db).create(
         table="nemsis_export_batches",
         tenant_id=current.tenant_id,
         actor_user_id=current.user_id,
         data={
-            "incident_ids": payload.get("incident_ids", []),
+            "incident_ids": incident_ids,
+            "chart_ids": chart_ids,
             "state_code": payload.get("state_code"),
-            "batch_size": len(payload.get("incident_ids", [])),
+            "agency_info": payload.get("agency_info", {}),
+            "skip_invalid": bool(payload.get("skip_invalid", False)),
+            "batch_size": len(incident_ids) + len(chart_ids),
             "status": "queued",
             "created_by": str(current.user_id),
         },
@@ -1771,6 +1784,32 @@ async def list_export_batches(
     return _svc(db).repo("nemsis_export_batches").list(tenant_id=current.tenant_id)
 
 
+@router.get("/export/batches/{batch_id}/downloads")
+async def export_batch_downloads(
+    batch_id: uuid.UUID,
+    current: CurrentUser = Depends(
+        require_role("founder", "agency_admin", "billing", "compliance")
+    ),
+    db: Session = Depends(db_session_dependency),
+):
+    batch = _svc(db).repo("nemsis_export_batches").get(
+        tenant_id=current.tenant_id, record_id=batch_id
+    )
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Export batch not found")
+    data = batch.get("data", {})
+    if data.get("status") != "completed":
+        raise HTTPException(status_code=409, detail=f"Export batch is {data.get('status')}")
+    bucket = default_exports_bucket()
+    return {
+        "documents": {
+            state: {**doc, "download_url": presign_get(bucket=bucket, key=doc["s3_key"])}
+            for state, doc in data.get("documents", {}).items()
+        },
+        "results_url": presign_get(bucket=bucket, key=data["results_s3_key"]),
+    }
+
+
 # ── Dataset backup versioning ─────────────────────────────────────────────────
 
 
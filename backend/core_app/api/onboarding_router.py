@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import logging
 from datetime import UTC, datetime, timedelta
@@ -16,12 +17,8 @@ from core_app.pricing.catalog import PLANS, calculate_quote
 from core_app.roi.engine import compute_roi, hash_outputs
 from core_app.services.event_publisher import get_event_publisher
 
-try:
-    import stripe as stripe_lib
-
-    STRIPE_AVAILABLE = True
-except ImportError:
-    STRIPE_AVAILABLE = False
+# Probe without importing: stripe-python is imported on first checkout.
+STRIPE_AVAILABLE = importlib.util.find_spec("stripe") is not None
 
 logger = logging.getLogger(__name__)
 
@@ -447,6 +444,8 @@ async def checkout_start(
                 detail=f"Plan {plan_code!r} requires a custom quote — contact sales.",
             )
 
+        import stripe as stripe_lib
+
         stripe_lib.api_key = settings.stripe_secret_key
         stage = settings.environment or "prod"
 
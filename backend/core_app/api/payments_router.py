@@ -195,7 +195,7 @@ async def send_link_sms(
         raise HTTPException(status_code=503, detail="telnyx_not_configured")
 
     try:
-        resp = send_sms(
+        resp = await send_sms(
             api_key=api_key,
             from_number=from_number,
             to_number=body.to_phone_e164,
@@ -2,99 +2,92 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import time
 from collections.abc import AsyncIterator
 from datetime import UTC, datetime
 from typing import Any
 
-import redis.asyncio as redis_async
-from fastapi import APIRouter, Depends, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, Header, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from jose import JWTError, jwt
 
 from core_app.api.dependencies import get_current_user
 from core_app.core.config import get_settings
+from core_app.realtime.hub import get_realtime_hub
 from core_app.schemas.auth import CurrentUser
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/realtime", tags=["realtime"])
 
+SSE_HEARTBEAT_SECONDS = 15.0
+WS_HEARTBEAT_SECONDS = 20.0
+
 
 def _sse(data: dict[str, Any]) -> str:
     return f"data: {json.dumps(data)}\n\n"
 
 
-async def _presence_ping(r, tenant_id: str, kind: str, key: str) -> None:
-    # Presence keys with TTL allow CAD/MDT/Crewlink dashboards to show online status.
-    presence_key = f"tenant.{tenant_id}.presence.{kind}.{key}"
-    await r.set(presence_key, "1", ex=45)
+def _heartbeat() -> dict[str, Any]:
+    return {"eventType": "heartbeat", "ts": datetime.now(UTC).isoformat()}
+
+
+def _safe_patterns(tenant_id: str, patterns: list[Any]) -> list[str]:
+    prefix = f"tenant.{tenant_id}."
+    return [p for p in patterns if isinstance(p, str) and p.startswith(prefix)]
 
 
 @router.get("/sse")
 async def realtime_sse(
-    request: Request,
     current: CurrentUser = Depends(get_current_user),
     patterns: list[str] = Query(default=[]),
+    last_event_id_header: str | None = Header(default=None, alias="Last-Event-ID"),
+    last_event_id: str | None = Query(default=None),
 ) -> StreamingResponse:
-    """Tenant-scoped Server-Sent Events stream with Redis pub/sub fanout.
+    """Tenant-scoped Server-Sent Events stream fed by the process-wide realtime hub.
 
-    - Default subscription: psubscribe `tenant.<tenant_id>.*`
+    - Default subscription: `tenant.<tenant_id>.*`
     - Optional patterns can be provided (must be subset of tenant.<id>.*)
+    - Events carry an SSE `id:`; on reconnect the browser's `Last-Event-ID`
+      (or `?last_event_id=`) replays what was missed. A `resync_required`
+      event means the gap could not be filled and boards must be refetched.
     """
-    settings = get_settings()
-    r = redis_async.from_url(settings.redis_url, decode_responses=True)
     tenant_id = str(current.tenant_id)
-
-    safe_patterns: list[str] = []
-    if patterns:
-        for p in patterns:
-            if not p.startswith(f"tenant.{tenant_id}."):
-                continue
-            safe_patterns.append(p)
-    if not safe_patterns:
-        safe_patterns = [f"tenant.{tenant_id}.*"]
-
-    pubsub = r.pubsub()
-    await pubsub.psubscribe(*safe_patterns)
+    hub = get_realtime_hub()
+    sub = await hub.subscribe(
+        tenant_id,
+        _safe_patterns(tenant_id, patterns),
+        transport="sse",
+        presence=("user", str(current.user_id)),
+        after_id=last_event_id_header or last_event_id,
+    )
 
     async def event_stream() -> AsyncIterator[str]:
-        yield _sse(
-            {
-                "eventType": "connected",
-                "tenantId": tenant_id,
-                "ts": datetime.now(UTC).isoformat(),
-            }
-        )
-        last_heartbeat = 0.0
-
+        # Starlette cancels this generator when the client disconnects.
         try:
+            yield _sse(
+                {
+                    "eventType": "connected",
+                    "tenantId": tenant_id,
+                    "ts": datetime.now(UTC).isoformat(),
+                }
+            )
+            last_heartbeat = time.monotonic()
             while True:
-                if await request.is_disconnected():
+                wait = SSE_HEARTBEAT_SECONDS - (time.monotonic() - last_heartbeat)
+                try:
+                    event = await asyncio.wait_for(sub.get(), timeout=max(wait, 0))
+                except TimeoutError:
+                    last_heartbeat = time.monotonic()
+                    yield _sse(_heartbeat())
+                    continue
+                if event is None:
                     break
-
-                # heartbeat every 15s
-                now = time.time()
-                if now - last_heartbeat > 15:
-                    last_heartbeat = now
-                    await _presence_ping(r, tenant_id, "user", str(current.user_id))
-                    yield _sse(
-                        {"eventType": "heartbeat", "ts": datetime.now(UTC).isoformat()}
-                    )
-
-                message = await pubsub.get_message(
-                    ignore_subscribe_messages=True, timeout=1.0
-                )
-                if message and message.get("type") in ("pmessage", "message"):
-                    raw = message.get("data")
-                    try:
-                        payload = json.loads(raw) if isinstance(raw, str) else raw
-                    except Exception as e:
-                        payload = {"eventType": "raw", "data": raw}
-                    yield _sse(payload)
-
-                await asyncio.sleep(0.01)
+                event_id, text = event
+                yield f"id: {event_id}\ndata: {text}\n\n" if event_id else f"data: {text}\n\n"
         finally:
-            await pubsub.close()
-            await r.close()
+            await hub.unsubscribe(sub)
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
 
@@ -104,6 +97,7 @@ async def realtime_ws(websocket: WebSocket) -> None:
     """Primary realtime channel (tenant-scoped) via WebSocket.
 
     Auth: `token` query parameter (JWT).
+    Resume: `cursor` query parameter, the last `stream_id` the client saw.
     Client may send: {"type":"subscribe","patterns":[...]}.
     """
     settings = get_settings()
@@ -125,62 +119,50 @@ async def realtime_ws(websocket: WebSocket) -> None:
         return
 
     await websocket.accept()
-    r = redis_async.from_url(settings.redis_url, decode_responses=True)
-    pubsub = r.pubsub()
-
     tenant_id_str = str(tenant_id)
-    patterns = [f"tenant.{tenant_id_str}.*"]
-    await pubsub.psubscribe(*patterns)
-    await _presence_ping(r, tenant_id_str, "user", str(user_id))
+    hub = get_realtime_hub()
+    sub = await hub.subscribe(
+        tenant_id_str,
+        transport="ws",
+        presence=("user", str(user_id)),
+        after_id=websocket.query_params.get("cursor"),
+    )
 
     async def sender() -> None:
-        last_ping = 0.0
         while True:
-            now = time.time()
-            if now - last_ping > 20:
-                last_ping = now
-                await _presence_ping(r, tenant_id_str, "user", str(user_id))
-                await websocket.send_text(
-                    json.dumps(
-                        {"eventType": "heartbeat", "ts": datetime.now(UTC).isoformat()}
-                    )
-                )
-
-            msg = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if msg and msg.get("type") == "pmessage":
-                raw = msg.get("data")
-                await websocket.send_text(
-                    raw if isinstance(raw, str) else json.dumps(raw)
-                )
-            await asyncio.sleep(0.01)
+            try:
+                event = await asyncio.wait_for(sub.get(), timeout=WS_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                await websocket.send_text(json.dumps(_heartbeat()))
+                continue
+            if event is None:
+                # Closed by the hub (slow consumer under the disconnect policy).
+                await websocket.close(code=1013)
+                return
+            await websocket.send_text(event[1])
 
     async def receiver() -> None:
         while True:
             data = await websocket.receive_text()
             try:
                 obj = json.loads(data)
-            except Exception as e:
+            except ValueError:
                 continue
-            if obj.get("type") == "subscribe":
-                req_patterns = obj.get("patterns") or []
-                safe = []
-                for p in req_patterns:
-                    if isinstance(p, str) and p.startswith(f"tenant.{tenant_id_str}."):
-                        safe.append(p)
+            if isinstance(obj, dict) and obj.get("type") == "subscribe":
+                safe = _safe_patterns(tenant_id_str, obj.get("patterns") or [])
                 if safe:
-                    await pubsub.punsubscribe()
-                    await pubsub.psubscribe(*safe)
+                    hub.set_patterns(sub, safe)
 
     send_task = asyncio.create_task(sender())
     recv_task = asyncio.create_task(receiver())
     try:
-        await asyncio.gather(send_task, recv_task)
-    except (WebSocketDisconnect, asyncio.CancelledError) as e:
-        import logging
-
-        logging.error(f"Error: {e}")
+        await asyncio.wait({send_task, recv_task}, return_when=asyncio.FIRST_COMPLETED)
+        for task in (send_task, recv_task):
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                exc = task.exception()
+                if not isinstance(exc, WebSocketDisconnect):
+                    logger.error("realtime_ws_failed error=%s", exc)
     finally:
         send_task.cancel()
         recv_task.cancel()
-        await pubsub.close()
-        await r.close()
+        await hub.unsubscribe(sub)
@@ -13,6 +13,7 @@ from core_app.api.dependencies import (
     get_current_user,
     require_role,
 )
+from core_app.repositories.domination_repository import Aggregate, QueryFilter
 from core_app.roi.engine import compute_roi
 from core_app.schemas.auth import CurrentUser
 from core_app.services.domination_service import DominationService
@@ -489,19 +490,16 @@ async def conversion_kpis(
 ):
     require_role(current, ["founder", "admin"])
     svc = DominationService(db, get_event_publisher())
-    events = svc.repo("conversion_events").list(
-        tenant_id=current.tenant_id, limit=50000
-    )
-    proposals = svc.repo("proposals").list(tenant_id=current.tenant_id, limit=10000)
-    subs = svc.repo("tenant_subscriptions").list(
-        tenant_id=current.tenant_id, limit=10000
+    events = svc.repo("conversion_events").count(tenant_id=current.tenant_id)
+    proposals = svc.repo("proposals").count(tenant_id=current.tenant_id)
+    active_subs = svc.repo("tenant_subscriptions").count(
+        tenant_id=current.tenant_id, filters=[QueryFilter("data.status", "eq", "active")]
     )
-    active_subs = [s for s in subs if s.get("data", {}).get("status") == "active"]
-    conversion_rate = round(len(active_subs) / max(len(proposals), 1) * 100, 2)
+    conversion_rate = round(active_subs / max(proposals, 1) * 100, 2)
     return {
-        "total_events": len(events),
-        "total_proposals": len(proposals),
-        "active_subscriptions": len(active_subs),
+        "total_events": events,
+        "total_proposals": proposals,
+        "active_subscriptions": active_subs,
         "proposal_to_paid_conversion_pct": conversion_rate,
         "as_of": datetime.now(UTC).isoformat(),
     }
@@ -514,16 +512,16 @@ async def subscription_lifecycle(
 ):
     require_role(current, ["founder", "admin"])
     svc = DominationService(db, get_event_publisher())
-    subs = svc.repo("tenant_subscriptions").list(
-        tenant_id=current.tenant_id, limit=10000
+    groups = svc.repo("tenant_subscriptions").aggregate(
+        tenant_id=current.tenant_id, group_by=["data.status"], metrics=[Aggregate("count")]
     )
     statuses: dict[str, int] = {}
-    for s in subs:
-        status = s.get("data", {}).get("status", "unknown")
-        statuses[status] = statuses.get(status, 0) + 1
+    for g in groups:
+        status = g["status"] or "unknown"
+        statuses[status] = statuses.get(status, 0) + g["count"]
     return {
         "lifecycle": statuses,
-        "total": len(subs),
+        "total": sum(statuses.values()),
         "as_of": datetime.now(UTC).isoformat(),
     }
 
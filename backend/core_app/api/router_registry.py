@@ -0,0 +1,250 @@
+"""Router registry and lazy mounting.
+
+``ROUTERS`` lists every API router in mount order.  With the default
+``ROUTER_LOADING=eager`` they are all imported and included at startup.  With
+``lazy`` a router is imported and included on the first request whose path
+could match one of its routes, so a worker boots without paying for routers
+(and their SDKs) it never serves.  Candidate routers are found through
+``router_manifest.json`` -- each router's route paths cut at the first
+``{`` -- which ``scripts/import_profile.py --write-manifest`` regenerates
+and ``tests/test_router_registry.py`` keeps honest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import json
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import anyio
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = Path(__file__).with_name("router_manifest.json")
+
+# Paths that need every router mounted (the OpenAPI schema covers all of them).
+_LOAD_ALL_PATHS = frozenset({"/openapi.json", "/docs", "/redoc"})
+
+
+@dataclass(frozen=True, slots=True)
+class RouterSpec:
+    module: str
+    prefix: str = ""
+
+    def load(self) -> APIRouter:
+        return importlib.import_module(self.module).router
+
+
+ROUTERS: tuple[RouterSpec, ...] = (
+    RouterSpec("core_app.api.accreditation_router", "/api/v1"),
+    RouterSpec("core_app.api.audit_router", "/api/v1"),
+    RouterSpec("core_app.api.auth_router", "/api/v1"),
+    RouterSpec("core_app.api.fhir_router", "/api/v1"),
+    RouterSpec("core_app.api.health_router", "/api/v1"),
+    RouterSpec("core_app.api.incident_router", "/api/v1"),
+    RouterSpec("core_app.api.microsoft_auth_router", "/api/v1"),
+    RouterSpec("core_app.api.nemsis_router", "/api/v1"),
+    RouterSpec("core_app.api.neris_router", "/api/v1"),
+    RouterSpec("core_app.api.patient_router", "/api/v1"),
+    RouterSpec("core_app.api.payments_router", "/api/v1"),
+    RouterSpec("core_app.api.realtime_router", "/api/v1"),
+    RouterSpec("core_app.api.roi_router", "/api/v1"),
+    RouterSpec("core_app.api.vital_router", "/api/v1"),
+    RouterSpec("core_app.api.ai_router"),
+    RouterSpec("core_app.api.ar_router"),
+    RouterSpec("core_app.api.auth_rep_router"),
+    RouterSpec("core_app.api.billing_command_router"),
+    RouterSpec("core_app.api.billing_router"),
+    RouterSpec("core_app.api.cad_calls_router"),
+    RouterSpec("core_app.api.cad_units_router"),
+    RouterSpec("core_app.api.cases_router"),
+    RouterSpec("core_app.api.claim_packet_router"),
+    RouterSpec("core_app.api.cms_gate_router"),
+    RouterSpec("core_app.api.compliance_pack_index_router"),
+    RouterSpec("core_app.api.crewlink_router"),
+    RouterSpec("core_app.api.doc_kit_router"),
+    RouterSpec("core_app.api.documents_router"),
+    RouterSpec("core_app.billing.edi_router"),
+    RouterSpec("core_app.api.epcr_capture_router"),
+    RouterSpec("core_app.api.epcr_customization_router"),
+    RouterSpec("core_app.api.epcr_router"),
+    RouterSpec("core_app.api.events_router"),
+    RouterSpec("core_app.api.export_status_router"),
+    RouterSpec("core_app.api.exports_router"),
+    RouterSpec("core_app.api.fax_router"),
+    RouterSpec("core_app.api.fax_webhook_router"),
+    RouterSpec("core_app.api.fire_epcr_router"),
+    RouterSpec("core_app.api.fire_ops_router"),
+    RouterSpec("core_app.api.fire_statements_router"),
+    RouterSpec("core_app.api.fleet_intelligence_router"),
+    RouterSpec("core_app.api.fleet_router"),
+    RouterSpec("core_app.api.founder_agents_router"),
+    RouterSpec("core_app.api.founder_copilot_router"),
+    RouterSpec("core_app.api.founder_documents_router"),
+    RouterSpec("core_app.api.founder_graph_router"),
+    RouterSpec("core_app.api.founder_router"),
+    RouterSpec("core_app.api.hems_router"),
+    RouterSpec("core_app.api.icd10_router"),
+    RouterSpec("core_app.api.imports_router"),
+    RouterSpec("core_app.api.kitlink_compliance_router"),
+    RouterSpec("core_app.api.kitlink_router"),
+    RouterSpec("core_app.api.lob_router"),
+    RouterSpec("core_app.api.lob_webhook_router"),
+    RouterSpec("core_app.api.mdt_router"),
+    RouterSpec("core_app.api.metrics_router"),
+    RouterSpec("core_app.api.mobile_ops_router"),
+    RouterSpec("core_app.api.nemsis_compliance_studio_router"),
+    RouterSpec("core_app.api.nemsis_manager_router"),
+    RouterSpec("core_app.api.nemsis_pack_router"),
+    RouterSpec("core_app.api.nemsis_submissions_router"),
+    RouterSpec("core_app.api.neris_copilot_router"),
+    RouterSpec("core_app.api.neris_incident_router"),
+    RouterSpec("core_app.api.neris_tenant_router"),
+    RouterSpec("core_app.api.neris_pack_router"),
+    RouterSpec("core_app.api.onboarding_router"),
+    RouterSpec("core_app.api.pricebook_router"),
+    RouterSpec("core_app.api.pricing_router"),
+    RouterSpec("core_app.api.public_pricing_router"),
+    RouterSpec("core_app.api.roi_funnel_router"),
+    RouterSpec("core_app.api.scheduling_router"),
+    RouterSpec("core_app.api.signatures_router"),
+    RouterSpec("core_app.api.sms_webhook_router"),
+    RouterSpec("core_app.api.statements_router"),
+    RouterSpec("core_app.api.stripe_webhook_router"),
+    RouterSpec("core_app.api.support_router"),
+    RouterSpec("core_app.api.system_health_router"),
+    RouterSpec("core_app.api.systems_router"),
+    RouterSpec("core_app.api.template_router"),
+    RouterSpec("core_app.api.tracking_router"),
+    RouterSpec("core_app.api.transportlink_router"),
+    RouterSpec("core_app.api.trip_router"),
+    RouterSpec("core_app.api.visibility_router"),
+    RouterSpec("core_app.api.voice_advanced_router"),
+    RouterSpec("core_app.api.voice_webhook_router"),
+    RouterSpec("core_app.api.weather_router"),
+    RouterSpec("core_app.api.sync_router"),
+)
+
+
+def include_routers(app: FastAPI, specs: Iterable[RouterSpec] = ROUTERS) -> None:
+    for spec in specs:
+        app.include_router(spec.load(), prefix=spec.prefix)
+
+
+def _stems(paths: Iterable[str]) -> list[str]:
+    """Literal path prefixes, minus any already covered by a shorter one."""
+    stems = sorted({path.split("{", 1)[0] for path in paths})
+    out: list[str] = []
+    for stem in stems:
+        if not out or not stem.startswith(out[-1]):
+            out.append(stem)
+    return out
+
+
+def build_manifest(specs: Iterable[RouterSpec] = ROUTERS) -> dict[str, list[str]]:
+    manifest = {}
+    for spec in specs:
+        probe = APIRouter()
+        probe.include_router(spec.load(), prefix=spec.prefix)
+        manifest[spec.module] = _stems(route.path for route in probe.routes)
+    return manifest
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict[str, list[str]]:
+    return json.loads(path.read_text())
+
+
+def write_manifest(path: Path = MANIFEST_PATH) -> None:
+    path.write_text(json.dumps(build_manifest(), indent=2) + "\n")
+
+
+class LazyRouterLoader:
+    """Mounts routers on demand while keeping the eager route order.
+
+    Routes registered on the app before the loader was created (docs)
+    stay first and routes added afterwards (``/health``...) stay last, with
+    loaded routers in ``specs`` order between them, so overlapping paths
+    resolve exactly as they do with eager loading.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        specs: Sequence[RouterSpec] = ROUTERS,
+        manifest: dict[str, list[str]] | None = None,
+    ) -> None:
+        self.app = app
+        self.specs = tuple(specs)
+        manifest = load_manifest() if manifest is None else manifest
+        self._stems = {spec: tuple(manifest.get(spec.module, ())) for spec in self.specs}
+        self._pending = list(self.specs)
+        self._mounted: dict[RouterSpec, list[BaseRoute]] = {}
+        self._head = list(app.router.routes)
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> tuple[RouterSpec, ...]:
+        return tuple(self._pending)
+
+    def _candidates(self, path: str) -> list[RouterSpec]:
+        if path in _LOAD_ALL_PATHS:
+            return list(self._pending)
+        return [
+            spec
+            for spec in self._pending
+            if any(path.startswith(stem) for stem in self._stems[spec])
+        ]
+
+    async def ensure(self, path: str) -> None:
+        if not self._pending or not self._candidates(path):
+            return
+        async with self._lock:
+            wanted = self._candidates(path)
+            if not wanted:
+                return
+            # Imports are blocking; keep the event loop serving other requests.
+            routers = [await anyio.to_thread.run_sync(spec.load) for spec in wanted]
+            for spec, router in zip(wanted, routers, strict=True):
+                self._mount(spec, router)
+            self._reorder()
+            logger.info(
+                "lazy_routers_mounted path=%s modules=%s",
+                path,
+                ",".join(spec.module for spec in wanted),
+            )
+
+    def load_all(self) -> None:
+        for spec in list(self._pending):
+            self._mount(spec, spec.load())
+        self._reorder()
+
+    def _mount(self, spec: RouterSpec, router: APIRouter) -> None:
+        before = len(self.app.router.routes)
+        self.app.include_router(router, prefix=spec.prefix)
+        self._mounted[spec] = self.app.router.routes[before:]
+        self._pending.remove(spec)
+
+    def _reorder(self) -> None:
+        mounted = [route for spec in self.specs for route in self._mounted.get(spec, ())]
+        known = {id(route) for route in (*self._head, *mounted)}
+        tail = [route for route in self.app.router.routes if id(route) not in known]
+        self.app.router.routes[:] = [*self._head, *mounted, *tail]
+        self.app.openapi_schema = None
+
+
+class LazyRouterMiddleware:
+    def __init__(self, app: ASGIApp, *, loader: LazyRouterLoader) -> None:
+        self.app = app
+        self.loader = loader
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket"):
+            await self.loader.ensure(scope["path"])
+        await self.app(scope, receive, send)
@@ -13,6 +13,7 @@ from sqlalchemy.orm import Session
 from core_app.api.dependencies import db_session_dependency
 from core_app.core.config import get_settings
 from core_app.telnyx.client import TelnyxApiError, send_sms
+from core_app.telnyx.did_directory import get_did_directory
 from core_app.telnyx.signature import verify_telnyx_webhook
 # from core_app.services.ai_narrative_service import AiNarrativeService # TODO: distinct service
 from core_app.services.ai_assistant_service import AIAssistantService # Use existing service
@@ -51,6 +52,12 @@ def _insert_event(
 
 
 def _resolve_tenant_by_did(db: Session, to_number: str) -> str | None:
+    return get_did_directory().lookup(
+        "billing_sms", to_number, lambda: _query_tenant_by_did(db, to_number)
+    )
+
+
+def _query_tenant_by_did(db: Session, to_number: str) -> str | None:
     row = db.execute(
         text(
             "SELECT tenant_id FROM tenant_phone_numbers "
@@ -129,7 +136,7 @@ def _log_sms(
     db.commit()
 
 
-def _send_reply(
+async def _send_reply(
     *,
     api_key: str,
     from_number: str,
@@ -140,7 +147,7 @@ def _send_reply(
     db: Session,
 ) -> None:
     try:
-        resp = send_sms(
+        resp = await send_sms(
             api_key=api_key,
             from_number=from_number,
             to_number=to_number,
@@ -218,7 +225,7 @@ async def telnyx_sms_webhook(
         if body_text.upper() in STOP_KEYWORDS:
             _upsert_opt_out(db, tenant_id, from_number, "SMS_INBOUND")
             # Auto-ACK opt-out
-            _send_reply(
+            await _send_reply(
                 api_key=settings.telnyx_api_key,
                 from_number=to_number,
                 to_number=from_number,
@@ -242,7 +249,7 @@ async def telnyx_sms_webhook(
             )
             
             if reply:
-                _send_reply(
+                await _send_reply(
                     api_key=settings.telnyx_api_key,
                     from_number=to_number,
                     to_number=from_number,
@@ -300,7 +307,7 @@ async def telnyx_sms_webhook(
             logger.info(
                 "telnyx_sms_opt_out phone=%s tenant_id=%s", from_number, tenant_id
             )
-            _send_reply(
+            await _send_reply(
                 api_key=api_key,
                 from_number=to_number,
                 to_number=from_number,
@@ -318,7 +325,7 @@ async def telnyx_sms_webhook(
             )
             agency_name = tenant_info["name"]
             billing_phone = tenant_info["billing_phone"] or "our billing office"
-            _send_reply(
+            await _send_reply(
                 api_key=api_key,
                 from_number=to_number,
                 to_number=from_number,
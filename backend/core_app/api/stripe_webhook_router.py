@@ -4,7 +4,6 @@ import logging
 import uuid
 from datetime import UTC, datetime
 
-import stripe
 from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from sqlalchemy.orm import Session
 
@@ -68,6 +67,8 @@ async def stripe_webhook(
         webhook_secret=webhook_secret,
     )
 
+    import stripe
+
     try:
         event = verify_webhook_signature(
             cfg=cfg,
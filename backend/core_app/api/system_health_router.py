@@ -14,17 +14,18 @@ from core_app.api.dependencies import (
     require_role,
 )
 from core_app.core.config import get_settings
+from core_app.repositories.domination_repository import QueryFilter
 from core_app.schemas.auth import CurrentUser
 from core_app.services.aws_health import (
+    db_connections_summary,
     get_cost_mtd,
-    get_cw_metric_avg,
-    get_db_connections,
     get_rds_backup_status,
     get_secret_metadata,
     get_ssl_expiration,
 )
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import get_event_publisher
+from core_app.services.health_metrics import get_health_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -72,13 +73,6 @@ def _metric_status(value: float | None, threshold: float) -> str:
     return "alert" if value >= threshold else "normal"
 
 
-def _ecs_dimensions(cluster: str, service: str) -> list[dict]:
-    return [
-        {"Name": "ClusterName", "Value": cluster},
-        {"Name": "ServiceName", "Value": service},
-    ]
-
-
 def _integration_report(name: str, checks: list[tuple[str, object]]) -> dict[str, object]:
     missing_keys = [key for key, value in checks if not value]
     configured_count = len(checks) - len(missing_keys)
@@ -99,11 +93,13 @@ async def health_dashboard(
 ):
     require_role(current, ["founder", "admin"])
     svc = DominationService(db, get_event_publisher())
-    alerts = svc.repo("system_alerts").list(tenant_id=current.tenant_id, limit=1000)
-    active_alerts = [a for a in alerts if a.get("data", {}).get("status") == "active"]
-    critical = [
-        a for a in active_alerts if a.get("data", {}).get("severity") == "critical"
-    ]
+    repo = svc.repo("system_alerts")
+    active = QueryFilter("data.status", "eq", "active")
+    active_alerts = repo.count(tenant_id=current.tenant_id, filters=[active])
+    critical = repo.count(
+        tenant_id=current.tenant_id,
+        filters=[active, QueryFilter("data.severity", "eq", "critical")],
+    )
     services_monitored = [
         "ecs",
         "rds",
@@ -114,8 +110,8 @@ async def health_dashboard(
         "cognito",
     ]
     return {
-        "total_active_alerts": len(active_alerts),
-        "critical_alerts": len(critical),
+        "total_active_alerts": active_alerts,
+        "critical_alerts": critical,
         "services_monitored": services_monitored,
         "overall_status": (
             "degraded" if critical else ("warning" if active_alerts else "healthy")
@@ -130,47 +126,11 @@ async def service_health(
     db: Session = Depends(db_session_dependency),
 ):
     require_role(current, ["founder", "admin"])
-    s = get_settings()
-
-    ecs_cpu = (
-        get_cw_metric_avg(
-            "AWS/ECS",
-            "CPUUtilization",
-            _ecs_dimensions(s.ecs_cluster_name, s.ecs_backend_service),
-        )
-        if s.ecs_cluster_name
-        else None
-    )
-
-    rds_conns = (
-        get_cw_metric_avg(
-            "AWS/RDS",
-            "DatabaseConnections",
-            [{"Name": "DBInstanceIdentifier", "Value": s.rds_instance_id}],
-        )
-        if s.rds_instance_id
-        else None
-    )
-
-    redis_latency = (
-        get_cw_metric_avg(
-            "AWS/ElastiCache",
-            "EngineCPUUtilization",
-            [{"Name": "ReplicationGroupId", "Value": s.redis_cluster_id}],
-        )
-        if s.redis_cluster_id
-        else None
-    )
-
-    cf_error = get_cw_metric_avg(
-        "AWS/CloudFront",
-        "5xxErrorRate",
-        [
-            {"Name": "DistributionId", "Value": "GLOBAL"},
-            {"Name": "Region", "Value": "Global"},
-        ],
-        minutes=15,
-    )
+    metrics = get_health_metrics()
+    ecs_cpu = await metrics.get("ecs_cpu")
+    rds_conns = await metrics.get("rds_connections")
+    redis_latency = await metrics.get("redis_engine_cpu")
+    cf_error = await metrics.get("cloudfront_5xx")
 
     def _svc_status(val: float | None, threshold: float) -> str:
         if val is None:
@@ -260,14 +220,7 @@ async def cpu_metrics(
     current: CurrentUser = Depends(get_current_user),
 ):
     require_role(current, ["founder", "admin"])
-    s = get_settings()
-    value = None
-    if s.ecs_cluster_name:
-        value = get_cw_metric_avg(
-            "AWS/ECS",
-            "CPUUtilization",
-            _ecs_dimensions(s.ecs_cluster_name, s.ecs_backend_service),
-        )
+    value = await get_health_metrics().get("ecs_cpu")
     threshold = 80
     return {
         "metric": "cpu_utilization_pct",
@@ -283,14 +236,7 @@ async def memory_metrics(
     current: CurrentUser = Depends(get_current_user),
 ):
     require_role(current, ["founder", "admin"])
-    s = get_settings()
-    value = None
-    if s.ecs_cluster_name:
-        value = get_cw_metric_avg(
-            "AWS/ECS",
-            "MemoryUtilization",
-            _ecs_dimensions(s.ecs_cluster_name, s.ecs_backend_service),
-        )
+    value = await get_health_metrics().get("ecs_memory")
     threshold = 85
     return {
         "metric": "memory_utilization_pct",
@@ -306,17 +252,9 @@ async def api_latency(
     current: CurrentUser = Depends(get_current_user),
 ):
     require_role(current, ["founder", "admin"])
-    s = get_settings()
-    value = None
-    if s.ecs_cluster_name:
-        value = get_cw_metric_avg(
-            "AWS/ApplicationELB",
-            "TargetResponseTime",
-            [{"Name": "LoadBalancer", "Value": s.ecs_cluster_name}],
-            minutes=10,
-        )
-        if value is not None:
-            value = round(value * 1000, 2)
+    value = await get_health_metrics().get("alb_latency")
+    if value is not None:
+        value = round(value * 1000, 2)
     threshold = 500
     return {
         "metric": "api_latency_ms_p99",
@@ -334,15 +272,15 @@ async def error_rate(
 ):
     require_role(current, ["founder", "admin"])
     svc = DominationService(db, get_event_publisher())
-    alerts = svc.repo("system_alerts").list(tenant_id=current.tenant_id, limit=10000)
-    errors = [
-        a for a in alerts if a.get("data", {}).get("severity") in ("error", "critical")
-    ]
+    errors = svc.repo("system_alerts").count(
+        tenant_id=current.tenant_id,
+        filters=[QueryFilter("data.severity", "in", ["error", "critical"])],
+    )
     return {
         "metric": "error_count_1h",
-        "value": len(errors),
+        "value": errors,
         "threshold": 10,
-        "status": "normal" if len(errors) < 10 else "alert",
+        "status": "normal" if errors < 10 else "alert",
         "as_of": _now_iso(),
     }
 
@@ -375,14 +313,16 @@ async def list_alerts(
 ):
     require_role(current, ["founder", "admin"])
     svc = DominationService(db, get_event_publisher())
-    all_alerts = svc.repo("system_alerts").list(tenant_id=current.tenant_id, limit=1000)
-    filtered = all_alerts
+    filters: list[QueryFilter] = []
     if severity:
-        filtered = [
-            a for a in filtered if a.get("data", {}).get("severity") == severity
-        ]
+        filters.append(QueryFilter("data.severity", "eq", severity))
     if status:
-        filtered = [a for a in filtered if a.get("data", {}).get("status") == status]
+        filters.append(QueryFilter("data.status", "eq", status))
+    filtered = (
+        svc.repo("system_alerts")
+        .query(tenant_id=current.tenant_id, filters=filters, limit=1000)
+        .items
+    )
     return {"alerts": filtered, "total": len(filtered)}
 
 
@@ -462,9 +402,10 @@ async def uptime_sla(
 ):
     require_role(current, ["founder", "admin"])
     svc = DominationService(db, get_event_publisher())
-    alerts = svc.repo("system_alerts").list(tenant_id=current.tenant_id, limit=10000)
-    critical = [a for a in alerts if a.get("data", {}).get("severity") == "critical"]
-    downtime_incidents = len(critical)
+    downtime_incidents = svc.repo("system_alerts").count(
+        tenant_id=current.tenant_id,
+        filters=[QueryFilter("data.severity", "eq", "critical")],
+    )
     estimated_uptime_pct = max(99.9 - (downtime_incidents * 0.1), 0)
     return {
         "estimated_uptime_pct": round(estimated_uptime_pct, 3),
@@ -740,21 +681,12 @@ async def cache_hit_ratio(
     current: CurrentUser = Depends(get_current_user),
 ):
     require_role(current, ["founder", "admin"])
-    s = get_settings()
+    metrics = get_health_metrics()
     value = None
-    if s.redis_cluster_id:
-        hits = get_cw_metric_avg(
-            "AWS/ElastiCache",
-            "CacheHits",
-            [{"Name": "ReplicationGroupId", "Value": s.redis_cluster_id}],
-        )
-        misses = get_cw_metric_avg(
-            "AWS/ElastiCache",
-            "CacheMisses",
-            [{"Name": "ReplicationGroupId", "Value": s.redis_cluster_id}],
-        )
-        if hits is not None and misses is not None and (hits + misses) > 0:
-            value = round(hits / (hits + misses), 4)
+    hits = await metrics.get("redis_hits")
+    misses = await metrics.get("redis_misses")
+    if hits is not None and misses is not None and (hits + misses) > 0:
+        value = round(hits / (hits + misses), 4)
     return {
         "metric": "redis_cache_hit_ratio",
         "value": value if value is not None else 0,
@@ -776,15 +708,9 @@ async def network_latency(
     s = get_settings()
     region = s.aws_region or "us-east-1"
     latency_ms = None
-    if s.ecs_cluster_name:
-        val = get_cw_metric_avg(
-            "AWS/ApplicationELB",
-            "TargetResponseTime",
-            [{"Name": "LoadBalancer", "Value": s.ecs_cluster_name}],
-            minutes=10,
-        )
-        if val is not None:
-            latency_ms = round(val * 1000, 2)
+    val = await get_health_metrics().get("alb_latency")
+    if val is not None:
+        latency_ms = round(val * 1000, 2)
     return {
         "regions": [
             {
@@ -806,15 +732,7 @@ async def db_connections(
     current: CurrentUser = Depends(get_current_user),
 ):
     require_role(current, ["founder", "admin"])
-    s = get_settings()
-    if s.rds_instance_id:
-        rds = get_db_connections(s.rds_instance_id)
-    else:
-        rds = {
-            "active_connections": 0,
-            "max_connections": 500,
-            "pool_utilization_pct": 0,
-        }
+    rds = db_connections_summary(await get_health_metrics().get("rds_connections"))
     return {"rds": rds, "as_of": _now_iso()}
 
 
@@ -935,22 +853,9 @@ async def resource_forecast(
     current: CurrentUser = Depends(get_current_user),
 ):
     require_role(current, ["founder", "admin"])
-    s = get_settings()
-    cpu_avg = None
-    mem_avg = None
-    if s.ecs_cluster_name:
-        cpu_avg = get_cw_metric_avg(
-            "AWS/ECS",
-            "CPUUtilization",
-            _ecs_dimensions(s.ecs_cluster_name, s.ecs_backend_service),
-            minutes=1440,
-        )
-        mem_avg = get_cw_metric_avg(
-            "AWS/ECS",
-            "MemoryUtilization",
-            _ecs_dimensions(s.ecs_cluster_name, s.ecs_backend_service),
-            minutes=1440,
-        )
+    metrics = get_health_metrics()
+    cpu_avg = await metrics.get("ecs_cpu_1d")
+    mem_avg = await metrics.get("ecs_memory_1d")
     forecast_cpu = round((cpu_avg or 0) * 1.1, 1)
     forecast_mem = round((mem_avg or 0) * 1.1, 1)
     recommendation = "no_scaling_needed"
@@ -976,14 +881,12 @@ async def resilience_score(
 ):
     require_role(current, ["founder", "admin"])
     svc = DominationService(db, get_event_publisher())
-    alerts = svc.repo("system_alerts").list(tenant_id=current.tenant_id, limit=10000)
-    critical = len(
-        [
-            a
-            for a in alerts
-            if a.get("data", {}).get("severity") == "critical"
-            and a.get("data", {}).get("status") == "active"
-        ]
+    critical = svc.repo("system_alerts").count(
+        tenant_id=current.tenant_id,
+        filters=[
+            QueryFilter("data.severity", "eq", "critical"),
+            QueryFilter("data.status", "eq", "active"),
+        ],
     )
     score = max(0, 100 - (critical * 10))
     return {
@@ -74,7 +74,7 @@ async def send_payment_link_for_call(
     from core_app.telnyx.client import TelnyxApiError, send_sms
 
     try:
-        resp = send_sms(
+        resp = await send_sms(
             api_key=api_key,
             from_number=from_number,
             to_number=phone_e164,
@@ -22,6 +22,7 @@ from core_app.telnyx.client import (
     call_playback_start,
     call_transfer,
 )
+from core_app.telnyx.did_directory import get_did_directory
 from core_app.telnyx.signature import verify_telnyx_webhook
 
 logger = logging.getLogger(__name__)
@@ -53,6 +54,12 @@ def _utcnow() -> str:
 
 
 def _resolve_tenant_by_did(db: Session, to_number: str) -> dict[str, Any] | None:
+    return get_did_directory().lookup(
+        "billing_voice", to_number, lambda: _query_tenant_by_did(db, to_number)
+    )
+
+
+def _query_tenant_by_did(db: Session, to_number: str) -> dict[str, Any] | None:
     row = db.execute(
         text(
             "SELECT tenant_id, forward_to_phone_e164 "
@@ -217,9 +224,9 @@ def _get_tenant_forward(db: Session, tenant_id: str) -> str | None:
 # ── IVR state actions ─────────────────────────────────────────────────────────
 
 
-def _play_menu(api_key: str, call_control_id: str, cid_log: str) -> None:
+async def _play_menu(api_key: str, call_control_id: str, cid_log: str) -> None:
     logger.info("ivr_menu call_control_id=%s", cid_log)
-    call_gather_using_audio(
+    await call_gather_using_audio(
         api_key=api_key,
         call_control_id=call_control_id,
         audio_url=_audio("menu.wav"),
@@ -230,8 +237,8 @@ def _play_menu(api_key: str, call_control_id: str, cid_log: str) -> None:
     )
 
 
-def _play_collect_statement(api_key: str, call_control_id: str) -> None:
-    call_gather_using_audio(
+async def _play_collect_statement(api_key: str, call_control_id: str) -> None:
+    await call_gather_using_audio(
         api_key=api_key,
         call_control_id=call_control_id,
         audio_url=_audio("enter_statement_id.wav"),
@@ -243,8 +250,8 @@ def _play_collect_statement(api_key: str, call_control_id: str) -> None:
     )
 
 
-def _play_collect_phone(api_key: str, call_control_id: str) -> None:
-    call_gather_using_audio(
+async def _play_collect_phone(api_key: str, call_control_id: str) -> None:
+    await call_gather_using_audio(
         api_key=api_key,
         call_control_id=call_control_id,
         audio_url=_audio("enter_phone.wav"),
@@ -255,7 +262,7 @@ def _play_collect_phone(api_key: str, call_control_id: str) -> None:
     )
 
 
-def _do_transfer(
+async def _do_transfer(
     api_key: str,
     call_control_id: str,
     forward_to: str | None,
@@ -265,7 +272,7 @@ def _do_transfer(
         logger.info(
             "ivr_transfer call_control_id=%s to=%s", call_control_id, forward_to
         )
-        call_transfer(
+        await call_transfer(
             api_key=api_key,
             call_control_id=call_control_id,
             to=forward_to,
@@ -273,12 +280,12 @@ def _do_transfer(
             client_state=STATE_TRANSFER,
         )
     else:
-        call_playback_start(
+        await call_playback_start(
             api_key=api_key,
             call_control_id=call_control_id,
             audio_url=_audio("transferring.wav"),
         )
-        call_hangup(api_key=api_key, call_control_id=call_control_id)
+        await call_hangup(api_key=api_key, call_control_id=call_control_id)
 
 
 def _normalize_e164_us(digits: str) -> str:
@@ -386,16 +393,16 @@ async def _dispatch_voice_event(
 ) -> None:
 
     if event_type == "call.initiated":
-        call_answer(api_key=api_key, call_control_id=call_control_id)
+        await call_answer(api_key=api_key, call_control_id=call_control_id)
         return
 
     if event_type == "call.answered":
         if not tenant_id:
             logger.warning("ivr_no_tenant_for_did to=%s", to_number)
-            call_hangup(api_key=api_key, call_control_id=call_control_id)
+            await call_hangup(api_key=api_key, call_control_id=call_control_id)
             return
         _get_or_create_call(db, call_control_id, tenant_id, from_number, to_number)
-        _play_menu(api_key, call_control_id, call_control_id)
+        await _play_menu(api_key, call_control_id, call_control_id)
         return
 
     if event_type in ("call.gather.ended", "call.dtmf.received"):
@@ -453,41 +460,41 @@ async def _handle_gather(
 
     if status == "no_input" or not digits:
         _update_call(db, call_control_id, state=STATE_TRANSFER)
-        _do_transfer(api_key, call_control_id, forward_to, from_number)
+        await _do_transfer(api_key, call_control_id, forward_to, from_number)
         return
 
     current_state = call_record.get("state", STATE_MENU)
 
     if current_state == STATE_MENU:
         if digits == "9":
-            _play_menu(api_key, call_control_id, call_control_id)
+            await _play_menu(api_key, call_control_id, call_control_id)
         elif digits == "1":
             _update_call(db, call_control_id, state=STATE_COLLECT_STMT)
-            _play_collect_statement(api_key, call_control_id)
+            await _play_collect_statement(api_key, call_control_id)
         else:
             _update_call(db, call_control_id, state=STATE_TRANSFER)
-            _do_transfer(api_key, call_control_id, forward_to, from_number)
+            await _do_transfer(api_key, call_control_id, forward_to, from_number)
         return
 
     if current_state == STATE_COLLECT_STMT:
         attempts: int = call_record.get("attempts", 0)
         if not digits or len(digits) < 6:
             _update_call(db, call_control_id, state=STATE_TRANSFER)
-            _do_transfer(api_key, call_control_id, forward_to, from_number)
+            await _do_transfer(api_key, call_control_id, forward_to, from_number)
             return
         valid = _validate_statement(db, tenant_id or "", digits) if tenant_id else False
         if not valid:
             if attempts < MAX_STMT_RETRIES:
                 _update_call(db, call_control_id, attempts=attempts + 1)
-                call_playback_start(
+                await call_playback_start(
                     api_key=api_key,
                     call_control_id=call_control_id,
                     audio_url=_audio("invalid.wav"),
                 )
-                _play_collect_statement(api_key, call_control_id)
+                await _play_collect_statement(api_key, call_control_id)
             else:
                 _update_call(db, call_control_id, state=STATE_TRANSFER)
-                _do_transfer(api_key, call_control_id, forward_to, from_number)
+                await _do_transfer(api_key, call_control_id, forward_to, from_number)
         else:
             _update_call(
                 db,
@@ -496,17 +503,17 @@ async def _handle_gather(
                 statement_id=digits,
                 attempts=0,
             )
-            _play_collect_phone(api_key, call_control_id)
+            await _play_collect_phone(api_key, call_control_id)
         return
 
     if current_state == STATE_COLLECT_PHONE:
         if len(digits) != 10:
-            call_playback_start(
+            await call_playback_start(
                 api_key=api_key,
                 call_control_id=call_control_id,
                 audio_url=_audio("invalid.wav"),
             )
-            _play_collect_phone(api_key, call_control_id)
+            await _play_collect_phone(api_key, call_control_id)
             return
 
         phone_e164 = _normalize_e164_us(digits)
@@ -514,7 +521,7 @@ async def _handle_gather(
         if _check_opt_out(db, tenant_id or "", phone_e164):
             logger.info("ivr_opted_out phone=%s tenant_id=%s", phone_e164, tenant_id)
             _update_call(db, call_control_id, state=STATE_TRANSFER)
-            _do_transfer(api_key, call_control_id, forward_to, from_number)
+            await _do_transfer(api_key, call_control_id, forward_to, from_number)
             return
 
         statement_id: str = call_record.get("statement_id", "")
@@ -531,7 +538,7 @@ async def _handle_gather(
 
         _update_call(db, call_control_id, state=STATE_DONE, sms_phone=phone_e164)
 
-        call_gather_using_audio(
+        await call_gather_using_audio(
             api_key=api_key,
             call_control_id=call_control_id,
             audio_url=_audio("sent_sms.wav"),
@@ -544,12 +551,12 @@ async def _handle_gather(
 
     if call_state == "POST_SMS":
         if digits == "1":
-            _do_transfer(api_key, call_control_id, forward_to, from_number)
+            await _do_transfer(api_key, call_control_id, forward_to, from_number)
         else:
-            call_playback_start(
+            await call_playback_start(
                 api_key=api_key,
                 call_control_id=call_control_id,
                 audio_url=_audio("goodbye.wav"),
             )
-            call_hangup(api_key=api_key, call_control_id=call_control_id)
+            await call_hangup(api_key=api_key, call_control_id=call_control_id)
         return
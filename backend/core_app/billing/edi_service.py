@@ -116,41 +116,42 @@ class EDIService:
         sha256 = hashlib.sha256(bundle.encode("utf-8")).hexdigest()
         content_b64 = base64.b64encode(bundle.encode("utf-8")).decode("ascii")
 
-        batch_record = await self.svc.create(
-            table="edi_artifacts",
-            tenant_id=self.tenant_id,
-            actor_user_id=None,
-            data={
-                "entity_type": "submission_batch",
-                "claim_ids": claim_ids,
-                "file_type": "837P_BATCH",
-                "content_b64": content_b64,
-                "sha256": sha256,
-                "status": "generated",
-                "submitter_id": submitter_config.get("submitter_id", ""),
-                "batch_date": _utcnow(),
-                "claim_count": len(claim_ids),
-                "validated": validated,
-                "validation_errors": all_validation_errors,
-            },
-            correlation_id=None,
-        )
-        batch_id = str(batch_record["id"])
+        async with self.svc.batch_events():
+            batch_record = await self.svc.create(
+                table="edi_artifacts",
+                tenant_id=self.tenant_id,
+                actor_user_id=None,
+                data={
+                    "entity_type": "submission_batch",
+                    "claim_ids": claim_ids,
+                    "file_type": "837P_BATCH",
+                    "content_b64": content_b64,
+                    "sha256": sha256,
+                    "status": "generated",
+                    "submitter_id": submitter_config.get("submitter_id", ""),
+                    "batch_date": _utcnow(),
+                    "claim_count": len(claim_ids),
+                    "validated": validated,
+                    "validation_errors": all_validation_errors,
+                },
+                correlation_id=None,
+            )
+            batch_id = str(batch_record["id"])
 
-        await self.svc.create(
-            table="edi_artifacts",
-            tenant_id=self.tenant_id,
-            actor_user_id=None,
-            data={
-                "entity_type": "edi_file",
-                "batch_id": batch_id,
-                "file_type": "837P",
-                "content_b64": content_b64,
-                "sha256": sha256,
-                "status": "generated",
-            },
-            correlation_id=None,
-        )
+            await self.svc.create(
+                table="edi_artifacts",
+                tenant_id=self.tenant_id,
+                actor_user_id=None,
+                data={
+                    "entity_type": "edi_file",
+                    "batch_id": batch_id,
+                    "file_type": "837P",
+                    "content_b64": content_b64,
+                    "sha256": sha256,
+                    "status": "generated",
+                },
+                correlation_id=None,
+            )
 
         return {
             "batch_id": batch_id,
@@ -1,16 +1,10 @@
 from __future__ import annotations
 
+import functools
 import io
 from datetime import UTC, datetime
 from typing import Any
 
-try:
-    from weasyprint import CSS, HTML  # noqa: F401
-
-    WEASYPRINT_AVAILABLE = True
-except ImportError:
-    WEASYPRINT_AVAILABLE = False
-
 try:
     from reportlab.lib import colors  # noqa: F401
     from reportlab.lib.pagesizes import letter  # noqa: F401
@@ -49,6 +43,16 @@ BRAND_WHITE = colors.white if RL_AVAILABLE else None
 BRAND_STRIPE_A = colors.HexColor("#f8fafc") if RL_AVAILABLE else None
 
 
+@functools.cache
+def _weasyprint_html() -> Any | None:
+    """WeasyPrint's ``HTML`` class, imported on first PDF render (it loads pango via cffi)."""
+    try:
+        from weasyprint import HTML
+    except (ImportError, OSError):
+        return None
+    return HTML
+
+
 def _now_str() -> str:
     return datetime.now(UTC).strftime("%B %d, %Y %H:%M UTC")
 
@@ -214,10 +218,11 @@ class ClaimPacketGenerator:
         attachments: list[dict],
         include_audit: bool = True,
     ) -> bytes:
-        if not WEASYPRINT_AVAILABLE and not RL_AVAILABLE:
+        HTML = _weasyprint_html()
+        if HTML is None and not RL_AVAILABLE:
             return _FALLBACK_PDF
 
-        if WEASYPRINT_AVAILABLE:
+        if HTML is not None:
             html = self._build_weasyprint_html(claim_data, patient_data, attachments, include_audit)
             try:
                 return HTML(string=html).write_pdf()
@@ -549,10 +554,11 @@ class ClaimPacketGenerator:
         return buf.getvalue()
 
     def generate_epcr_summary_page(self, chart_data: dict) -> bytes:
-        if not WEASYPRINT_AVAILABLE and not RL_AVAILABLE:
+        HTML = _weasyprint_html()
+        if HTML is None and not RL_AVAILABLE:
             return _FALLBACK_PDF
 
-        if WEASYPRINT_AVAILABLE:
+        if HTML is not None:
             incident_time = chart_data.get("incident_time") or "N/A"
             dispatch_time = chart_data.get("dispatch_time") or "N/A"
             on_scene_time = chart_data.get("on_scene_time") or "N/A"
@@ -0,0 +1,46 @@
+"""Consecutive-failure circuit breaker for outbound dependencies (Redis, Telnyx)."""
+
+from __future__ import annotations
+
+import time
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: open for ``reset_seconds``, then one probe.
+
+    A probe that never reports back (cancelled request) is replaced by a new
+    one after another ``reset_seconds``.
+    """
+
+    def __init__(self, *, failure_threshold: int = 5, reset_seconds: float = 10.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probe_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self._opened_at < self.reset_seconds:
+            return False
+        if self._probe_at is not None and now - self._probe_at < self.reset_seconds:
+            return False
+        self._probe_at = now
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probe_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probe_at = None
+        if self._opened_at is not None or self._failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
@@ -19,6 +19,17 @@ class Settings(BaseSettings):
         return bool(v)
 
     database_url: str = Field(default="")
+
+    # API connection pooling (workers read DB_WORKER_* from env, see core_app/db/pool.py)
+    db_pool_size: int = Field(default=10)
+    db_max_overflow: int = Field(default=10)
+    db_pool_timeout_seconds: float = Field(default=30.0)
+    db_pool_recycle_seconds: int = Field(default=1800)
+    db_pool_pre_ping: bool = Field(default=True)
+    db_statement_timeout_ms: int = Field(default=30000)
+    db_pgbouncer: bool = Field(
+        default=False, description="PgBouncer transaction-pooling compatibility mode"
+    )
     api_base_url: str = Field(default="https://api.fusionemsquantum.com")
 
     system_tenant_id: str = Field(
@@ -90,11 +101,27 @@ class Settings(BaseSettings):
         default="", description="Secrets Manager ARN/name for Stripe webhook secret"
     )
 
+    # System-health CloudWatch snapshot (core_app/services/health_metrics.py)
+    health_metrics_provider: str = Field(default="cloudwatch", description="cloudwatch or local")
+    health_metrics_refresh_seconds: float = Field(default=60.0)
+    health_metrics_ttl_seconds: float = Field(
+        default=180.0, description="Older snapshots read as unavailable"
+    )
+    health_metrics_idle_seconds: float = Field(
+        default=600.0, description="Stop refreshing after this long without a dashboard read"
+    )
+
     # Telnyx webhook verification + IVR
     telnyx_public_key: str = Field(
         default="", description="Base64-encoded Ed25519 public key from Telnyx portal"
     )
     telnyx_webhook_tolerance_seconds: int = Field(default=300)
+    telnyx_timeout_seconds: float = Field(default=10.0)
+    telnyx_max_connections: int = Field(default=20)
+    telnyx_retries: int = Field(default=2, description="Retries for idempotent Telnyx calls")
+    telnyx_breaker_failures: int = Field(default=5)
+    telnyx_breaker_reset_seconds: float = Field(default=30.0)
+    telnyx_did_cache_ttl_seconds: float = Field(default=300.0)
     ivr_audio_base_url: str = Field(
         default="", description="S3 or CDN base URL for pre-generated IVR WAV prompts"
     )
@@ -107,10 +134,46 @@ class Settings(BaseSettings):
     cognito_user_pool_id: str = Field(default="")
     cognito_app_client_id: str = Field(default="")
     cognito_issuer: str = Field(default="")
+    cognito_jwks_refresh_seconds: float = Field(default=3600.0)
+
+    # Resolved-user / tenant-status cache (core_app/services/auth_cache.py)
+    auth_cache_ttl_seconds: float = Field(default=30.0)
+    auth_cache_max_entries: int = Field(default=10000)
+    auth_cache_redis: bool = Field(default=False, description="Back the auth cache with REDIS_URL")
+    auth_cache_redis_ttl_seconds: int = Field(default=300)
+
+    # Startup (core_app/api/router_registry.py)
+    router_loading: str = Field(
+        default="eager", description="eager, or lazy: mount routers on first matching request"
+    )
+
+    # Rate limiter (core_app/middleware/rate_limiter.py)
+    rate_limit_redis_timeout_seconds: float = Field(default=0.25)
+    rate_limit_lease_fraction: float = Field(
+        default=0.05, description="Share of a limit leased per Redis round trip"
+    )
+    rate_limit_lease_ttl_seconds: float = Field(default=1.0)
+    rate_limit_breaker_failures: int = Field(default=5)
+    rate_limit_breaker_reset_seconds: float = Field(default=10.0)
+
+    # Realtime fan-out hub (core_app/realtime/hub.py)
+    realtime_queue_maxsize: int = Field(default=256, description="Per-connection outbound queue bound")
+    realtime_overflow_policy: str = Field(default="drop_oldest", description="drop_oldest or disconnect")
+    realtime_presence_interval_seconds: float = Field(default=15.0)
+    realtime_replay_limit: int = Field(default=1000, description="Max events replayed on resume")
+    event_publisher_backend: str = Field(default="streams", description="streams (replayable) or pubsub")
+    event_stream_maxlen: int = Field(default=10000, description="Approximate per-tenant stream length")
+    event_payload_mode: str = Field(default="full", description="full record or compact (ids + changes)")
 
     # OPA (optional policy engine)
     opa_url: str = Field(default="", description="OPA HTTP endpoint, e.g. http://opa:8181")
     opa_policy_path: str = Field(default="v1/data/fusionems/allow")
+    opa_mode: str = Field(default="http", description="http (OPA server) or local (in-process Rego)")
+    opa_policy_dir: str = Field(default="", description="Rego directory for OPA_MODE=local; defaults to opa/policies")
+    opa_timeout_seconds: float = Field(default=5.0)
+    opa_max_connections: int = Field(default=20)
+    opa_decision_cache_ttl_seconds: float = Field(default=30.0)
+    opa_decision_cache_max_entries: int = Field(default=10000)
 
     # SQS queues (Lambda workers)
     lob_events_queue_url: str = Field(default="")
@@ -138,6 +201,26 @@ class Settings(BaseSettings):
     otel_exporter_otlp_endpoint: str = Field(default="")
     metrics_enabled: bool = Field(default=True)
 
+    # NEMSIS XSD schema registry (core_app/nemsis/xsd_validator.py)
+    nemsis_schema_warmup: bool = Field(default=True, description="Compile EMS/DEM XSDs at startup")
+    nemsis_schema_warmup_states: str = Field(
+        default="WI", description="Comma-separated state packs compiled alongside the national XSDs"
+    )
+
+    # NEMSIS batch export worker (core_app/workers/nemsis_export_worker.py)
+    nemsis_export_processes: int = Field(default=2, description="PCR render/validate processes")
+    nemsis_export_page_size: int = Field(default=500, description="Charts loaded per page")
+    nemsis_export_part_size_mb: int = Field(default=8, description="S3 multipart part size")
+    nemsis_export_poll_seconds: float = Field(default=30.0)
+
+    # ePCR NEMSIS validation-result cache (core_app/epcr/validation_cache.py)
+    validation_cache_ttl_seconds: float = Field(default=300.0)
+    validation_cache_max_entries: int = Field(default=5000)
+    validation_cache_redis: bool = Field(
+        default=False, description="Share cached validation results through REDIS_URL"
+    )
+    validation_cache_redis_ttl_seconds: int = Field(default=86400)
+
     @model_validator(mode="after")
     def _validate_production_secrets(self) -> "Settings":
         env = self.environment.lower()
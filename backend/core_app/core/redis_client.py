@@ -0,0 +1,20 @@
+"""Connection options shared by every Redis client the app builds from ``REDIS_URL``.
+
+The deployed endpoint is ``rediss://`` and clients connect without verifying
+its certificate (``ssl_cert_reqs=None``), as the event publisher always has.
+redis-py rejects that option on a plain ``redis://`` connection, so it is only
+added for TLS URLs.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def redis_kwargs(url: str, **overrides: Any) -> dict[str, Any]:
+    """``from_url`` keyword arguments for ``url`` (sync or asyncio client)."""
+    kwargs: dict[str, Any] = {"decode_responses": True}
+    if url.startswith("rediss://"):
+        kwargs["ssl_cert_reqs"] = None
+    kwargs.update(overrides)
+    return kwargs
@@ -0,0 +1,197 @@
+"""Shared connection-pool construction for the API and the Lambda workers.
+
+Every engine in the process is built here so pool sizing, pre-ping, recycle,
+statement timeouts and PgBouncer compatibility are configured in one place,
+and so the pool gauges exported on ``/metrics`` cover all of them.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+from prometheus_client import Histogram
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import Connection, create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from core_app.observability.metrics import instrument_engine, register_process_collector
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+_ENGINES: dict[str, Engine] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class PoolConfig:
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pre_ping: bool = True
+    statement_timeout_ms: int = 30000
+    pgbouncer: bool = False
+
+
+def pool_config(settings: Any) -> PoolConfig:
+    """Pool config for the API process, from ``DB_*`` Settings fields."""
+    return PoolConfig(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pre_ping=settings.db_pool_pre_ping,
+        statement_timeout_ms=settings.db_statement_timeout_ms,
+        pgbouncer=settings.db_pgbouncer,
+    )
+
+
+def worker_pool_config(environ: Mapping[str, str] = os.environ) -> PoolConfig:
+    """Worker pool config read straight from the environment.
+
+    Lambda workers do not load the full API ``Settings`` (its production
+    validator requires secrets the workers are never given), so the shared
+    ``DB_*`` variables are read here directly.  Workers run one message at a
+    time, so the pool is small and batch jobs get a longer statement timeout
+    (``DB_WORKER_STATEMENT_TIMEOUT_MS``).
+    """
+    truthy = ("1", "true", "yes", "on")
+    return PoolConfig(
+        pool_size=int(environ.get("DB_WORKER_POOL_SIZE", "2")),
+        max_overflow=0,
+        pool_timeout=float(environ.get("DB_POOL_TIMEOUT_SECONDS", "30")),
+        pool_recycle=int(environ.get("DB_POOL_RECYCLE_SECONDS", "1800")),
+        pre_ping=environ.get("DB_POOL_PRE_PING", "true").strip().lower() in truthy,
+        statement_timeout_ms=int(environ.get("DB_WORKER_STATEMENT_TIMEOUT_MS", "300000")),
+        pgbouncer=environ.get("DB_PGBOUNCER", "").strip().lower() in truthy,
+    )
+
+
+def build_psycopg_url(database_url: str) -> str:
+    if database_url.startswith("postgresql+psycopg://"):
+        return database_url
+    if database_url.startswith("postgresql://"):
+        return database_url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return database_url
+
+
+class _CheckoutTimer:
+    """Pool mixin recording how long callers wait in ``_do_get``."""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(pool=self.metrics_name).observe(
+                time.perf_counter() - start
+            )
+
+
+def _timed_pool_class(base: type[Pool], name: str) -> type[Pool]:
+    # A class attribute (rather than an instance one) survives pool.recreate().
+    return type(f"Timed{base.__name__}", (_CheckoutTimer, base), {"metrics_name": name})
+
+
+def _engine_kwargs(config: PoolConfig, base_pool: type[Pool], name: str) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {}
+    if config.pgbouncer:
+        # Transaction pooling hands each transaction to an arbitrary server
+        # connection: server-side prepared statements and startup options are
+        # not preserved, so disable the former and set the timeout per txn.
+        connect_args["prepare_threshold"] = None
+    elif config.statement_timeout_ms > 0:
+        connect_args["options"] = f"-c statement_timeout={config.statement_timeout_ms}"
+    return {
+        "poolclass": _timed_pool_class(base_pool, name),
+        "pool_size": config.pool_size,
+        "max_overflow": config.max_overflow,
+        "pool_timeout": config.pool_timeout,
+        "pool_recycle": config.pool_recycle,
+        "pool_pre_ping": config.pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def _install_local_timeout(engine: Engine, config: PoolConfig) -> None:
+    if not config.pgbouncer or config.statement_timeout_ms <= 0:
+        return
+    stmt = f"SET LOCAL statement_timeout = {int(config.statement_timeout_ms)}"
+
+    @event.listens_for(engine, "begin")
+    def _set_statement_timeout(conn: Connection) -> None:
+        conn.exec_driver_sql(stmt)
+
+
+def build_engine(database_url: str, config: PoolConfig, *, name: str) -> Engine:
+    engine = create_engine(
+        build_psycopg_url(database_url),
+        future=True,
+        **_engine_kwargs(config, QueuePool, name),
+    )
+    _install_local_timeout(engine, config)
+    instrument_engine(engine)
+    _ENGINES[name] = engine
+    return engine
+
+
+def build_async_engine(database_url: str, config: PoolConfig, *, name: str) -> AsyncEngine:
+    engine = create_async_engine(
+        build_psycopg_url(database_url),
+        future=True,
+        **_engine_kwargs(config, AsyncAdaptedQueuePool, name),
+    )
+    _install_local_timeout(engine.sync_engine, config)
+    instrument_engine(engine.sync_engine)
+    _ENGINES[name] = engine.sync_engine
+    return engine
+
+
+@lru_cache(maxsize=1)
+def worker_engine() -> Engine | None:
+    """Process-wide engine for Lambda workers, reused across invocations."""
+    database_url = os.environ.get("DATABASE_URL", "")
+    if not database_url:
+        return None
+    return build_engine(database_url, worker_pool_config(), name="worker")
+
+
+class _PoolCollector:
+    """Exports in-use/overflow/size gauges for every engine built here."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["pool"])
+        in_use = GaugeMetricFamily(
+            "db_pool_checked_out", "Connections currently checked out", labels=["pool"]
+        )
+        idle = GaugeMetricFamily(
+            "db_pool_checked_in", "Idle connections held by the pool", labels=["pool"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Connections open beyond pool_size", labels=["pool"]
+        )
+        for name, engine in list(_ENGINES.items()):
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            size.add_metric([name], pool.size())
+            in_use.add_metric([name], pool.checkedout())
+            idle.add_metric([name], pool.checkedin())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        yield from (size, in_use, idle, overflow)
+
+
+register_process_collector(_PoolCollector())
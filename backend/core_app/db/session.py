@@ -1,27 +1,22 @@
 from collections.abc import AsyncGenerator, Generator
 from contextlib import contextmanager
+from uuid import UUID
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Connection, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction, sessionmaker
 
 from core_app.core.config import get_settings
+from core_app.db.pool import build_async_engine, build_engine, pool_config
 
 settings = get_settings()
 
+_api_pool = pool_config(settings)
 
-def _build_psycopg_url(database_url: str) -> str:
-    if database_url.startswith("postgresql+psycopg://"):
-        return database_url
-    if database_url.startswith("postgresql://"):
-        return database_url.replace("postgresql://", "postgresql+psycopg://", 1)
-    return database_url
-
-
-engine = create_engine(_build_psycopg_url(settings.database_url), future=True)
+engine = build_engine(settings.database_url, _api_pool, name="api")
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
 
-async_engine = create_async_engine(_build_psycopg_url(settings.database_url), future=True)
+async_engine = build_async_engine(settings.database_url, _api_pool, name="api_async")
 AsyncSessionLocal = async_sessionmaker(
     bind=async_engine, expire_on_commit=False, autoflush=False, class_=AsyncSession
 )
@@ -47,3 +42,36 @@ def get_db_session_ctx() -> Generator[Session, None, None]:
 async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+_RLS_TENANT_KEY = "rls_tenant_id"
+_SET_TENANT_SQL = text("SELECT set_config('app.tenant_id', :tid, true)")
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_tenant_rls(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    # set_config(..., true) is transaction-local, so re-apply it at the start
+    # of every transaction the session opens rather than once per request.
+    tenant_id = session.info.get(_RLS_TENANT_KEY)
+    if tenant_id is not None:
+        connection.execute(_SET_TENANT_SQL, {"tid": tenant_id})
+
+
+def bind_tenant(db: Session, tenant_id: UUID | str) -> None:
+    """Scope *db* to *tenant_id* for Postgres RLS.
+
+    ``set_config`` is transaction-local, so it runs as its own statement (one
+    extra round trip) when each transaction the session opens begins, not once
+    per request; a transaction that is already open is updated immediately.
+    """
+    db.info[_RLS_TENANT_KEY] = str(tenant_id)
+    if db.in_transaction():
+        db.execute(_SET_TENANT_SQL, {"tid": str(tenant_id)})
+
+
+async def bind_tenant_async(db: AsyncSession, tenant_id: UUID | str) -> None:
+    db.info[_RLS_TENANT_KEY] = str(tenant_id)
+    if db.in_transaction():
+        await db.execute(_SET_TENANT_SQL, {"tid": str(tenant_id)})
@@ -34,3 +34,84 @@ def default_exports_bucket() -> str:
 
 def default_docs_bucket() -> str:
     return get_settings().s3_bucket_docs
+
+
+class S3MultipartWriter:
+    """Write-only file object that streams to S3 through a multipart upload.
+
+    At most one part (``part_size`` bytes, 5 MiB minimum) is buffered, so
+    arbitrarily large objects are written in bounded memory.  ``close``
+    completes the upload; ``abort`` (or an exception inside ``with``) discards
+    it.
+    """
+
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
+    def __init__(
+        self,
+        *,
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        part_size: int = 8 * 1024 * 1024,
+        client=None,
+    ) -> None:
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(part_size, self.MIN_PART_SIZE)
+        self.bytes_written = 0
+        self._s3 = client or boto3.client("s3")
+        self._buffer = bytearray()
+        self._parts: list[dict] = []
+        self._upload_id = self._s3.create_multipart_upload(
+            Bucket=bucket, Key=key, ContentType=content_type
+        )["UploadId"]
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self.bytes_written += len(data)
+        if len(self._buffer) >= self.part_size:
+            self._upload_part()
+        return len(data)
+
+    def _upload_part(self) -> None:
+        number = len(self._parts) + 1
+        resp = self._s3.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=bytes(self._buffer),
+        )
+        self._parts.append({"ETag": resp["ETag"], "PartNumber": number})
+        self._buffer.clear()
+
+    def close(self) -> S3ObjectRef:
+        if not self.closed:
+            if self._buffer or not self._parts:
+                self._upload_part()
+            self._s3.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+            self.closed = True
+        return S3ObjectRef(bucket=self.bucket, key=self.key)
+
+    def abort(self) -> None:
+        if not self.closed:
+            self._s3.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+            )
+            self.closed = True
+
+    def __enter__(self) -> S3MultipartWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
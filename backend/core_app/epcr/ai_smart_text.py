@@ -379,7 +379,13 @@ class SmartTextEngine:
         return "\n".join(parts)
 
     def _cache_key(self, chart: dict[str, Any], prompt_type: str) -> str:
-        exclude = {"updated_at", "sync_status", "completeness_score", "completeness_issues"}
+        exclude = {
+            "updated_at",
+            "sync_status",
+            "completeness_score",
+            "completeness_issues",
+            "completeness_state",
+        }
         filtered = {k: v for k, v in chart.items() if k not in exclude}
         serialized = json.dumps(filtered, sort_keys=True, default=str)
         return hashlib.sha256(f"{serialized}:{prompt_type}".encode()).hexdigest()
@@ -267,6 +267,7 @@ class Chart:
     provenance: list[ProvenanceRecord] = field(default_factory=list)
     completeness_score: float = 0.0
     completeness_issues: list[str] = field(default_factory=list)
+    completeness_state: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
         return dataclasses.asdict(self)
@@ -341,4 +342,5 @@ class Chart:
         c.attachments = d.get("attachments", [])
         c.completeness_score = d.get("completeness_score", 0.0)
         c.completeness_issues = d.get("completeness_issues", [])
+        c.completeness_state = d.get("completeness_state", {})
         return c
@@ -1,5 +1,24 @@
+"""NEMSIS completeness scoring for ePCR charts.
+
+``ELEMENT_FIELD_MAP`` and ``MODE_EXTRA`` are compiled once per chart mode
+into ``CompiledRules``.  Field paths are pre-split into keys and list indexes,
+and each rule is indexed under the top-level chart field it reads.  A full
+score evaluates every rule.  ``rescore`` re-evaluates only the rules that
+read the fields a PATCH replaced, and takes every other rule's outcome from
+the ``completeness_state`` stored by the previous score.  That state records
+the record version it was written with; any other write to the chart (an
+appended vital, a device sync) bumps the version, and the next ``rescore`` is
+a full score.
+"""
+
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import re
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
 from typing import Any
 
 ELEMENT_FIELD_MAP: dict[str, dict[str, str]] = {
@@ -91,54 +110,141 @@ MODE_EXTRA: dict[str, list[str]] = {
 }
 
 
-class CompletenessEngine:
-    def score_chart(self, chart: dict[str, Any], mode: str = "bls") -> dict[str, Any]:
-        missing = []
-        present = []
+# Changes whenever the rule tables do, so stored states from older rules are rescored in full.
+RULES_VERSION = hashlib.sha256(
+    json.dumps([ELEMENT_FIELD_MAP, MODE_EXTRA], sort_keys=True).encode()
+).hexdigest()[:12]
+
+_INDEXED_STEP = re.compile(r"^(\w+)\[(\d+)\]$")
+
+
+def compile_path(path: str) -> tuple[str | int, ...]:
+    """``"assessments[0].chief_complaint"`` -> ``("assessments", 0, "chief_complaint")``."""
+    steps: list[str | int] = []
+    for part in path.split("."):
+        m = _INDEXED_STEP.match(part)
+        if m:
+            steps.extend((m.group(1), int(m.group(2))))
+        else:
+            steps.append(part)
+    return tuple(steps)
+
+
+@dataclass(frozen=True, slots=True)
+class CompletenessRule:
+    element_id: str
+    field_path: str
+    label: str
+    section: str
+    severity: str
+    steps: tuple[str | int, ...]
+    any_value: bool = False  # present when truthy, without the non-blank text check
 
-        for elem_id, meta in ELEMENT_FIELD_MAP.items():
-            val = self._get_nested(chart, meta["path"])
-            if val and str(val).strip():
-                present.append(elem_id)
+    def present(self, chart: Mapping[str, Any]) -> bool:
+        current: Any = chart
+        for step in self.steps:
+            if isinstance(step, int):
+                if not isinstance(current, list) or step >= len(current):
+                    return False
+                current = current[step]
+            elif isinstance(current, dict):
+                current = current.get(step)
             else:
-                missing.append(
-                    {
-                        "element_id": elem_id,
-                        "field_path": meta["path"],
-                        "label": meta["label"],
-                        "section": meta["section"],
-                        "severity": meta["severity"],
-                    }
-                )
-
-        vitals = chart.get("vitals", [])
-        if not vitals:
-            missing.append(
-                {
-                    "element_id": "eVitals",
-                    "field_path": "vitals",
-                    "label": "At least one Vital Set",
-                    "section": "Vitals",
-                    "severity": "error",
-                }
+                return False
+        if self.any_value:
+            return bool(current)
+        return bool(current) and bool(str(current).strip())
+
+    def missing_entry(self) -> dict[str, Any]:
+        return {
+            "element_id": self.element_id,
+            "field_path": self.field_path,
+            "label": self.label,
+            "section": self.section,
+            "severity": self.severity,
+        }
+
+
+class CompiledRules:
+    """The rules scored for one chart mode, indexed by the top-level field each reads."""
+
+    def __init__(self, mode: str) -> None:
+        rules = [
+            CompletenessRule(
+                element_id=elem_id,
+                field_path=meta["path"],
+                label=meta["label"],
+                section=meta["section"],
+                severity=meta["severity"],
+                steps=compile_path(meta["path"]),
             )
-        else:
-            present.append("eVitals")
-
-        for extra_path in MODE_EXTRA.get(mode, []):
-            val = self._get_nested(chart, extra_path)
-            if not val or not str(val).strip():
-                missing.append(
-                    {
-                        "element_id": extra_path,
-                        "field_path": extra_path,
-                        "label": extra_path,
-                        "section": mode.upper(),
-                        "severity": "warning",
-                    }
-                )
-
-        total = len(ELEMENT_FIELD_MAP) + 1 + len(MODE_EXTRA.get(mode, []))
+            for elem_id, meta in ELEMENT_FIELD_MAP.items()
+        ]
+        rules.append(
+            CompletenessRule(
+                element_id="eVitals",
+                field_path="vitals",
+                label="At least one Vital Set",
+                section="Vitals",
+                severity="error",
+                steps=("vitals",),
+                any_value=True,
+            )
+        )
+        rules.extend(
+            CompletenessRule(
+                element_id=path,
+                field_path=path,
+                label=path,
+                section=mode.upper(),
+                severity="warning",
+                steps=compile_path(path),
+            )
+            for path in MODE_EXTRA.get(mode, [])
+        )
+        self.mode = mode
+        self.rules = tuple(rules)
+        dependents: dict[str, list[int]] = {}
+        for i, rule in enumerate(self.rules):
+            dependents.setdefault(str(rule.steps[0]), []).append(i)
+        self.dependents = {field: tuple(idx) for field, idx in dependents.items()}
+
+    def score(self, chart: Mapping[str, Any]) -> dict[str, Any]:
+        return self._result([rule.present(chart) for rule in self.rules])
+
+    def rescore(
+        self, chart: Mapping[str, Any], changed_fields: Iterable[str], record_version: int
+    ) -> dict[str, Any]:
+        changed_fields = set(changed_fields)
+        state = chart.get("completeness_state") or {}
+        if (
+            "completeness_state" in changed_fields  # never trust a state sent in the patch
+            or not self.current(state, record_version)
+        ):
+            return self.score(chart)
+        was_missing = set(state.get("missing") or ())
+        dirty = {i for field in changed_fields for i in self.dependents.get(field, ())}
+        return self._result(
+            [
+                rule.present(chart) if i in dirty else rule.element_id not in was_missing
+                for i, rule in enumerate(self.rules)
+            ]
+        )
+
+    def current(self, state: Mapping[str, Any], record_version: int) -> bool:
+        """True when ``state`` was written by these rules at ``record_version``."""
+        return (
+            state.get("rules") == RULES_VERSION
+            and state.get("mode") == self.mode
+            and state.get("record_version") == record_version
+        )
+
+    def _result(self, present_flags: list[bool]) -> dict[str, Any]:
+        present = [r.element_id for r, ok in zip(self.rules, present_flags, strict=True) if ok]
+        missing = [
+            r.missing_entry() for r, ok in zip(self.rules, present_flags, strict=True) if not ok
+        ]
+        total = len(self.rules)
         errors_only = [m for m in missing if m["severity"] == "error"]
         pct = round((len(present) / total) * 100, 1) if total else 100.0
         return {
@@ -150,6 +256,57 @@ class CompletenessEngine:
             "warning_count": len(missing) - len(errors_only),
         }
 
+
+@functools.cache
+def compiled_rules(mode: str) -> CompiledRules:
+    return CompiledRules(mode)
+
+
+def completeness_fields(result: Mapping[str, Any], mode: str, record_version: int) -> dict[str, Any]:
+    """Chart fields that persist a score in the write producing ``record_version``.
+
+    ``rescore`` resumes from ``completeness_state`` only while the record is
+    still at that version.
+    """
+    return {
+        "completeness_score": result["score"],
+        "completeness_issues": [m["label"] for m in result["missing"]],
+        "completeness_state": {
+            "rules": RULES_VERSION,
+            "mode": mode,
+            "missing": [m["element_id"] for m in result["missing"]],
+            "record_version": record_version,
+        },
+    }
+
+
+class CompletenessEngine:
+    def score_chart(self, chart: dict[str, Any], mode: str = "bls") -> dict[str, Any]:
+        return compiled_rules(mode).score(chart)
+
+    def rescore(
+        self,
+        chart: dict[str, Any],
+        changed_fields: Iterable[str],
+        mode: str = "bls",
+        *,
+        record_version: int,
+    ) -> dict[str, Any]:
+        """Score ``chart`` after a PATCH that replaced the top-level ``changed_fields``.
+
+        ``record_version`` is the version of the record the PATCH was applied
+        to.  Only rules reading the patched fields are re-evaluated; the rest
+        come from the chart's stored ``completeness_state``.  Without a state
+        written by the current rules and mode at that version, or when the patch
+        itself carries one, this is a full ``score_chart``.
+        """
+        return compiled_rules(mode).rescore(chart, changed_fields, record_version)
+
+    def is_stale(self, chart: Mapping[str, Any], record_version: int, mode: str = "bls") -> bool:
+        """True when the chart's stored score predates the current rules, mode or record."""
+        state = chart.get("completeness_state") or {}
+        return not compiled_rules(mode).current(state, record_version)
+
     def score_for_submission(self, chart: dict[str, Any], state_code: str = "WI") -> dict[str, Any]:
         result = self.score_chart(chart, mode=chart.get("chart_mode", "bls"))
         blocking = [m["label"] for m in result["missing"] if m["severity"] == "error"]
@@ -159,22 +316,3 @@ class CompletenessEngine:
             "score": result["score"],
             "pct": result["pct"],
         }
-
-    def _get_nested(self, chart: dict[str, Any], path: str) -> Any:
-        import re
-
-        current: Any = chart
-        parts = re.split(r"\.", path)
-        for part in parts:
-            if current is None:
-                return None
-            m = re.match(r"^(\w+)\[(\d+)\]$", part)
-            if m:
-                key, idx = m.group(1), int(m.group(2))
-                lst = current.get(key, []) if isinstance(current, dict) else None
-                if not isinstance(lst, list) or idx >= len(lst):
-                    return None
-                current = lst[idx]
-            else:
-                current = current.get(part) if isinstance(current, dict) else None
-        return current
@@ -21,8 +21,8 @@ hex string regardless of insertion order or timestamp formatting, provided the
 caller excludes volatile fields before passing the payload.
 
 Hash payload contract for epcr_charts (exclude these fields):
-  updated_at, completeness_score, completeness_issues, sync_status,
-  _event_log, attachments (S3 keys are volatile)
+  updated_at, completeness_score, completeness_issues, completeness_state,
+  sync_status, _event_log, attachments (S3 keys are volatile)
 
 Include:
   chart_id, tenant_id, chart_mode, schema_version (default "3.5"),
@@ -44,6 +44,7 @@ _VOLATILE_TOP_LEVEL = frozenset(
         "updated_at",
         "completeness_score",
         "completeness_issues",
+        "completeness_state",
         "sync_status",
         "_event_log",
         "attachments",
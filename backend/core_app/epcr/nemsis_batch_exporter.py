@@ -0,0 +1,290 @@
+"""Streaming multi-PCR NEMSIS export for ``nemsis_export_batches``.
+
+A batch names ePCR charts by ``chart_ids`` (record ids) and/or
+``incident_ids`` (matched on ``dispatch.cad_incident_id``).  Charts are loaded
+``page_size`` at a time.  Each page is rendered and validated in a process
+pool (``render_pcr``), and every PatientCareReport is then appended, in batch
+order, to one EMSDataSet document per state.  The documents are written
+incrementally with ``lxml.etree.xmlfile`` straight into S3 multipart uploads,
+and per-PCR results stream into ``results.jsonl`` beside them.  Memory stays
+bounded by one page of charts plus one buffered upload part per open object,
+however many PCRs the batch holds.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import multiprocessing
+import re
+import uuid
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from lxml import etree
+
+from core_app.epcr.nemsis_exporter import NEMSIS_NS, NEMSIS_VERSION, NEMSISExporter
+from core_app.nemsis.validator import NEMSISValidator
+from core_app.repositories.domination_repository import QueryFilter
+
+logger = logging.getLogger(__name__)
+
+XSI_NS = "http://www.w3.org/2001/XMLSchema-instance"
+EXPORT_S3_PREFIX = "nemsis/exports"
+MAX_SAMPLE_ERRORS = 100
+_STATE_RE = re.compile(r"[A-Z]{2}")
+
+
+class ExportWriter(Protocol):
+    def write(self, data: bytes) -> int: ...
+
+    def __enter__(self) -> Any: ...
+
+    def __exit__(self, exc_type, exc, tb) -> Any: ...
+
+
+OpenWriter = Callable[[str, str], ExportWriter]
+
+
+@dataclass(frozen=True, slots=True)
+class PcrResult:
+    chart_id: str
+    state_code: str
+    valid: bool
+    errors: tuple[str, ...] = ()
+    xml: bytes = b""  # serialized PatientCareReport; empty when rendering failed
+
+
+def _ns(tag: str) -> str:
+    return f"{{{NEMSIS_NS}}}{tag}"
+
+
+def render_pcr(job: tuple[str, dict[str, Any], str]) -> PcrResult:
+    """Render and validate one chart (runs in the export process pool)."""
+    chart_id, chart, state_code = job
+    try:
+        doc = NEMSISExporter().export_chart(
+            {**chart, "chart_id": chart_id}, agency_info={"state": state_code}
+        )
+    except Exception as exc:  # one malformed chart must not sink the batch
+        return PcrResult(chart_id, state_code, False, (f"Export failed: {exc}",))
+    result = NEMSISValidator().validate_xml_bytes(doc, state_code=state_code)
+    errors = tuple(i.plain_message for i in result.issues if i.severity == "error")
+    pcr = etree.fromstring(doc).find(f"{_ns('EMSDataSet')}/{_ns('PatientCareReport')}")
+    return PcrResult(chart_id, state_code, not errors, errors, etree.tostring(pcr))
+
+
+class _StateDocument:
+    """One EMSDataSet being streamed; PCRs are appended inside its Header."""
+
+    def __init__(
+        self, stack: contextlib.ExitStack, writer: ExportWriter, state_code: str, agency: Mapping
+    ) -> None:
+        stack.enter_context(writer)  # closed (or aborted) after the XML is flushed
+        xf = stack.enter_context(etree.xmlfile(writer, encoding="utf-8"))
+        xf.write_declaration()
+        stack.enter_context(
+            xf.element(
+                _ns("EMSDataSet"),
+                nsmap={None: NEMSIS_NS, "xsi": XSI_NS},
+                attrib={
+                    f"{{{XSI_NS}}}schemaLocation": f"{NEMSIS_NS} EMSDataSet.xsd",
+                    "nemsisVersion": NEMSIS_VERSION,
+                },
+            )
+        )
+        stack.enter_context(xf.element(_ns("Header")))
+        xf.write(_demographic_group(agency, state_code))
+        self._xf = xf
+        self.pcr_count = 0
+
+    def append(self, pcr_xml: bytes) -> None:
+        self._xf.write(etree.fromstring(pcr_xml))
+        self.pcr_count += 1
+
+
+def _demographic_group(agency: Mapping, state_code: str) -> etree._Element:
+    group = etree.Element(_ns("DemographicGroup"), nsmap={None: NEMSIS_NS})
+    agency_el = etree.SubElement(group, _ns("dAgency.AgencyGroup"))
+    for tag, value in (
+        ("dAgency.01", agency.get("state_id", "WI-EMS-000")),
+        ("dAgency.02", agency.get("number", "WI-0001")),
+        ("dAgency.03", agency.get("name", "FusionEMS Agency")),
+        ("dAgency.04", state_code),
+    ):
+        etree.SubElement(agency_el, _ns(tag)).text = str(value)
+    return group
+
+
+@dataclass
+class BatchSummary:
+    pcr_total: int = 0
+    pcr_valid: int = 0
+    pcr_invalid: int = 0
+    pcr_skipped: int = 0
+    missing_ids: list[str] = field(default_factory=list)
+    documents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    results_key: str = ""
+    invalid_sample: list[dict[str, Any]] = field(default_factory=list)
+
+    def to_patch(self) -> dict[str, Any]:
+        return {
+            "pcr_total": self.pcr_total,
+            "pcr_valid": self.pcr_valid,
+            "pcr_invalid": self.pcr_invalid,
+            "pcr_skipped": self.pcr_skipped,
+            "missing_ids": self.missing_ids,
+            "documents": self.documents,
+            "results_s3_key": self.results_key,
+            "invalid_sample": self.invalid_sample,
+        }
+
+
+class NEMSISBatchExporter:
+    def __init__(
+        self,
+        charts_repo,
+        *,
+        open_writer: OpenWriter,
+        processes: int = 0,
+        page_size: int = 500,
+    ) -> None:
+        self._charts = charts_repo
+        self._open_writer = open_writer
+        self._processes = processes
+        self._page_size = page_size
+
+    def run(self, *, tenant_id: uuid.UUID, batch_id: str, batch: Mapping[str, Any]) -> BatchSummary:
+        """Export every chart named by ``batch`` (a batch record's ``data``)."""
+        prefix = f"{EXPORT_S3_PREFIX}/{tenant_id}/{batch_id}"
+        default_state = _state_code(batch.get("state_code"), "WI")
+        agency = batch.get("agency_info") or {}
+        skip_invalid = bool(batch.get("skip_invalid"))
+        summary = BatchSummary(results_key=f"{prefix}/results.jsonl")
+        documents: dict[str, _StateDocument] = {}
+
+        with contextlib.ExitStack() as stack:
+            pool = stack.enter_context(self._executor())
+            results = stack.enter_context(
+                self._open_writer(summary.results_key, "application/x-ndjson")
+            )
+            for page in self._pages(tenant_id, batch, summary):
+                jobs = [
+                    (chart_id, chart, _state_code(chart.get("state_code"), default_state))
+                    for chart_id, chart in page
+                ]
+                for res in pool.map(render_pcr, jobs, chunksize=max(1, len(jobs) // 32)):
+                    self._record(res, summary, results)
+                    if not res.xml or (skip_invalid and not res.valid):
+                        summary.pcr_skipped += 1
+                        continue
+                    doc = documents.get(res.state_code)
+                    if doc is None:
+                        key = f"{prefix}/EMSDataSet_{res.state_code}.xml"
+                        writer = self._open_writer(key, "application/xml")
+                        doc = documents[res.state_code] = _StateDocument(
+                            stack, writer, res.state_code, agency
+                        )
+                        summary.documents[res.state_code] = {"s3_key": key, "pcr_count": 0}
+                    doc.append(res.xml)
+                    summary.documents[res.state_code]["pcr_count"] = doc.pcr_count
+
+        logger.info(
+            "nemsis_batch_export_done batch_id=%s pcrs=%d invalid=%d states=%s",
+            batch_id,
+            summary.pcr_total,
+            summary.pcr_invalid,
+            ",".join(sorted(summary.documents)),
+        )
+        return summary
+
+    def _executor(self) -> contextlib.AbstractContextManager[Executor | _InlineExecutor]:
+        if self._processes <= 0:
+            return contextlib.nullcontext(_InlineExecutor())
+        # spawn: the worker process runs an event loop and threads, which fork would copy.
+        return ProcessPoolExecutor(
+            max_workers=self._processes, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    @staticmethod
+    def _record(res: PcrResult, summary: BatchSummary, results: ExportWriter) -> None:
+        summary.pcr_total += 1
+        if res.valid:
+            summary.pcr_valid += 1
+        else:
+            summary.pcr_invalid += 1
+            if len(summary.invalid_sample) < MAX_SAMPLE_ERRORS:
+                summary.invalid_sample.append({"chart_id": res.chart_id, "errors": list(res.errors)})
+        line = {
+            "chart_id": res.chart_id,
+            "state_code": res.state_code,
+            "valid": res.valid,
+            "errors": list(res.errors),
+        }
+        results.write(json.dumps(line).encode() + b"\n")
+
+    def _pages(
+        self, tenant_id: uuid.UUID, batch: Mapping[str, Any], summary: BatchSummary
+    ) -> Iterator[list[tuple[str, dict[str, Any]]]]:
+        """(record id, chart data) pages in batch order; unknown ids go to ``missing_ids``."""
+        for ids in _chunks(batch.get("chart_ids") or [], self._page_size):
+            found = {
+                str(rec["id"]): rec.get("data", {})
+                for rec in self._query(tenant_id, QueryFilter("id", "in", _uuids(ids)), len(ids))
+            }
+            summary.missing_ids.extend(i for i in ids if str(i) not in found)
+            yield [(str(i), found[str(i)]) for i in ids if str(i) in found]
+
+        for ids in _chunks(batch.get("incident_ids") or [], self._page_size):
+            by_incident: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+            flt = QueryFilter("data.dispatch.cad_incident_id", "in", [str(i) for i in ids])
+            for rec in self._query(tenant_id, flt, len(ids)):
+                data = rec.get("data") or {}
+                incident = str((data.get("dispatch") or {}).get("cad_incident_id"))
+                by_incident.setdefault(incident, []).append((str(rec["id"]), data))
+            summary.missing_ids.extend(str(i) for i in ids if str(i) not in by_incident)
+            yield [chart for i in ids for chart in by_incident.get(str(i), [])]
+
+    def _query(self, tenant_id: uuid.UUID, flt: QueryFilter, expected: int) -> Iterator[dict]:
+        cursor = None
+        while True:
+            page = self._charts.query(
+                tenant_id=tenant_id,
+                filters=[flt],
+                order_by="id",
+                limit=max(expected, 1),
+                cursor=cursor,
+            )
+            yield from page.items
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+
+class _InlineExecutor:
+    """``Executor.map`` in the calling thread (``processes=0``)."""
+
+    def map(self, fn, iterable: Iterable, chunksize: int = 1) -> Iterator:
+        return map(fn, iterable)
+
+
+def _state_code(value: Any, default: str) -> str:
+    code = str(value or "").strip().upper()
+    return code if _STATE_RE.fullmatch(code) else default
+
+
+def _chunks(items: Sequence, size: int) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _uuids(ids: Iterable) -> list[uuid.UUID]:
+    out = []
+    for i in ids:
+        with contextlib.suppress(ValueError, TypeError):
+            out.append(uuid.UUID(str(i)))
+    return out
+
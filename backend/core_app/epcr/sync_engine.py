@@ -101,6 +101,7 @@ class SyncEngine:
             "_event_log",
             "completeness_score",
             "completeness_issues",
+            "completeness_state",
         }
         clean = {k: v for k, v in chart.items() if k not in exclude}
         serialized = json.dumps(clean, sort_keys=True, default=str)
@@ -0,0 +1,220 @@
+"""NEMSIS export + validation results cached by chart content hash.
+
+``export_nemsis`` and ``submit_chart`` export a chart and run it through
+``NEMSISValidator`` on every call, usually for a chart that has not changed
+since the crew last validated it.  Results are keyed on the JCS content hash
+of the chart (``build_chart_hash_payload``), the state code and the pack
+generation.  They are stored in a bounded in-process LRU and, when
+``VALIDATION_CACHE_REDIS`` is enabled, in Redis so workers share them.
+
+``PackManager`` bumps the pack generation when a pack is activated or
+archived.  This orphans every entry for that state (for a national pack,
+every state) without a key scan.  Without Redis the generation is per
+process, and other processes converge within ``VALIDATION_CACHE_TTL_SECONDS``.
+Every key also carries a fingerprint of the exporter and validator sources,
+so a deploy that changes either never reads results the old code produced.
+A cached result is still current for its key, so ``validated_at`` is stamped
+when the result is served rather than when it was first computed.
+
+``validate_chart`` blocks (lxml, and Redis when enabled); async callers run
+it with ``anyio.to_thread.run_sync``.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Callable, Mapping
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from core_app.core.config import get_settings
+from core_app.core.redis_client import redis_kwargs
+from core_app.epcr import nemsis_exporter
+from core_app.epcr.jcs_hash import build_chart_hash_payload, jcs_sha256
+from core_app.nemsis import validator
+from core_app.nemsis.validator import NEMSISValidator, ValidationIssue, ValidationResult
+from core_app.services.auth_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "validation_cache"
+NATIONAL = "*"  # generation scope bumped by national packs
+
+
+def _code_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for module in (nemsis_exporter, validator):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+_CODE_FINGERPRINT = _code_fingerprint()
+
+
+def chart_content_hash(chart: Mapping[str, Any], **context: Any) -> str | None:
+    """JCS SHA-256 of the chart's clinical content plus ``context``.
+
+    Volatile fields (``updated_at``, ``chart_status``, attachments, ...) are
+    excluded, so the exporter must not read them.  Returns None when the chart
+    holds values JCS cannot represent; such charts are simply not cached.
+    """
+    try:
+        return jcs_sha256({"chart": build_chart_hash_payload(dict(chart)), **context})
+    except (TypeError, ValueError):
+        return None
+
+
+class ValidationCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 300,
+        max_entries: int = 5000,
+        redis_client: Any | None = None,
+        redis_ttl_seconds: int = 86400,
+    ) -> None:
+        self._local: TTLCache[str] = TTLCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._redis = redis_client
+        self._redis_ttl = redis_ttl_seconds
+
+    def get_or_compute(
+        self,
+        kind: str,
+        content_hash: str | None,
+        state_code: str,
+        compute: Callable[[], dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Return the cached JSON-able result for the key, computing it on a miss."""
+        key = self._key(kind, content_hash, state_code)
+        if key is None:
+            return compute()
+        raw = self._local.get(key)
+        if raw is None and self._redis is not None:
+            raw = self._redis_get(key)
+            if raw is not None:
+                self._local.set(key, raw)
+        if raw is not None:
+            return json.loads(raw)
+
+        value = compute()
+        raw = json.dumps(value)
+        self._local.set(key, raw)
+        if self._redis is not None:
+            self._redis_set(key, raw)
+        return value
+
+    def generation(self, state_code: str) -> str | None:
+        """Current pack generation for a state; None when Redis cannot be read."""
+        state = state_code.upper()
+        if self._redis is None:
+            with self._lock:
+                return f"{self._generations.get(NATIONAL, 0)}.{self._generations.get(state, 0)}"
+        try:
+            national, local = self._redis.mget(
+                f"{_REDIS_PREFIX}:gen:{NATIONAL}", f"{_REDIS_PREFIX}:gen:{state}"
+            )
+        except Exception as exc:
+            logger.warning("validation_cache_redis_gen_failed state=%s error=%s", state, exc)
+            return None
+        return f"{national or 0}.{local or 0}"
+
+    def invalidate(self, state_code: str | None = None) -> None:
+        """Orphan results for ``state_code``; None (a national pack) orphans every state."""
+        scope = (state_code or NATIONAL).upper()
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+        if self._redis is not None:
+            try:
+                self._redis.incr(f"{_REDIS_PREFIX}:gen:{scope}")
+            except Exception as exc:
+                logger.warning("validation_cache_redis_incr_failed scope=%s error=%s", scope, exc)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def _key(self, kind: str, content_hash: str | None, state_code: str) -> str | None:
+        if content_hash is None:
+            return None
+        generation = self.generation(state_code)
+        if generation is None:
+            return None  # a Redis outage must not serve results from before an invalidation
+        state = state_code.upper()
+        return f"{_REDIS_PREFIX}:{kind}:{_CODE_FINGERPRINT}:{generation}:{state}:{content_hash}"
+
+    # -- redis (best effort: a Redis outage degrades to recomputing) --------
+
+    def _redis_get(self, key: str) -> str | None:
+        try:
+            return self._redis.get(key)
+        except Exception as exc:
+            logger.warning("validation_cache_redis_get_failed error=%s", exc)
+            return None
+
+    def _redis_set(self, key: str, value: str) -> None:
+        try:
+            self._redis.set(key, value, ex=self._redis_ttl)
+        except Exception as exc:
+            logger.warning("validation_cache_redis_set_failed error=%s", exc)
+
+
+def validate_chart(
+    chart: Mapping[str, Any],
+    *,
+    state_code: str = "WI",
+    agency_info: Mapping[str, Any] | None = None,
+    cache: ValidationCache | None = None,
+) -> tuple[bytes, ValidationResult]:
+    """Export ``chart`` to NEMSIS XML and validate it, reusing a cached result."""
+    agency = dict(agency_info or {})
+
+    def compute() -> dict[str, Any]:
+        xml_bytes = nemsis_exporter.NEMSISExporter().export_chart(dict(chart), agency_info=agency)
+        result = NEMSISValidator().validate_xml_bytes(xml_bytes, state_code=state_code)
+        return {**result.to_dict(), "xml_b64": base64.b64encode(xml_bytes).decode()}
+
+    cache = cache or get_validation_cache()
+    payload = cache.get_or_compute(
+        "nemsis", chart_content_hash(chart, agency=agency), state_code, compute
+    )
+    xml_bytes = base64.b64decode(payload["xml_b64"])
+    return xml_bytes, ValidationResult(
+        valid=payload["valid"],
+        issues=[ValidationIssue(**issue) for issue in payload["issues"]],
+        stage_results=payload["stage_results"],
+        xml_bytes=xml_bytes,
+        validated_at=datetime.now(UTC).isoformat(),
+    )
+
+
+_validation_cache: ValidationCache | None = None
+
+
+def get_validation_cache() -> ValidationCache:
+    global _validation_cache
+    if _validation_cache is None:
+        settings = get_settings()
+        redis_client = None
+        if settings.validation_cache_redis and settings.redis_url:
+            try:
+                import redis as redis_lib
+
+                redis_client = redis_lib.from_url(
+                    settings.redis_url,
+                    **redis_kwargs(settings.redis_url, socket_connect_timeout=2, socket_timeout=2),
+                )
+            except Exception as exc:
+                logger.warning("validation_cache_redis_init_failed error=%s", exc)
+        _validation_cache = ValidationCache(
+            ttl_seconds=settings.validation_cache_ttl_seconds,
+            max_entries=settings.validation_cache_max_entries,
+            redis_client=redis_client,
+            redis_ttl_seconds=settings.validation_cache_redis_ttl_seconds,
+        )
+    return _validation_cache
@@ -3,6 +3,7 @@ from __future__ import annotations
 import contextlib
 import json
 import re
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
 from sqlalchemy import text
@@ -10,6 +11,130 @@ from sqlalchemy.orm import Session
 
 from core_app.repositories.domination_repository import DominationRepository
 
+# Candidate-generation expressions. These must stay byte-identical to the
+# indexes created in alembic/versions/20261016_0027_billing_case_match_indexes.py
+# or the planner will fall back to sequential scans.
+_NAME_EXPR = (
+    "lower(coalesce(data->>'patient_last_name', '') || ' ' || "
+    "coalesce(data->>'patient_first_name', ''))"
+)
+_DOB_EXPR = "(data->>'patient_dob')"
+_MEMBER_ID_EXPR = "lower(data->>'member_id')"
+_CLAIM_NUMBER_EXPR = "(data->>'claim_id')"
+
+_CANDIDATE_LIMIT = 200
+_NAME_SIMILARITY_THRESHOLD = 0.25
+
+_NAME_RE = re.compile(r"(?:Patient|Name)\s*[:\-]\s*(.+)", re.IGNORECASE)
+_DOB_RE = re.compile(r"\b(\d{1,2}/\d{1,2}/\d{4}|\d{4}-\d{2}-\d{2})\b")
+_US_DATE_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+_MEMBER_ID_RES = [
+    re.compile(p, re.IGNORECASE)
+    for p in (r"Member\s*ID\s*[:\-]\s*(\S+)", r"Policy\s*[:\-]\s*(\S+)", r"ID#\s*(\S+)")
+]
+_CLAIM_NUMBER_RE = re.compile(r"\b(\d{6,12})\b")
+
+
+@dataclass(frozen=True, slots=True)
+class FaxFeatures:
+    """Blocking keys extracted from a fax's OCR text, normalized for matching."""
+
+    names: tuple[str, ...]
+    dobs: tuple[str, ...]
+    member_ids: frozenset[str]
+    claim_numbers: tuple[str, ...]
+
+
+def extract_fax_features(ocr_text: str) -> FaxFeatures:
+    names: list[str] = []
+    for line in ocr_text.splitlines():
+        m = _NAME_RE.match(line)
+        if m:
+            names.append(m.group(1).strip().lower())
+
+    dobs: list[str] = []
+    for raw in _DOB_RE.findall(ocr_text):
+        dobs.append(raw.replace("/", "-"))
+        us = _US_DATE_RE.match(raw)
+        if us:
+            month, day, year = us.groups()
+            dobs.append(f"{year}-{int(month):02d}-{int(day):02d}")
+
+    member_ids = {mid.lower() for pat in _MEMBER_ID_RES for mid in pat.findall(ocr_text)}
+    return FaxFeatures(
+        names=tuple(dict.fromkeys(names)),
+        dobs=tuple(dict.fromkeys(dobs)),
+        member_ids=frozenset(member_ids),
+        claim_numbers=tuple(dict.fromkeys(_CLAIM_NUMBER_RE.findall(ocr_text))),
+    )
+
+
+def score_candidates(
+    candidates: list[dict], features: FaxFeatures, *, fax_date: str = ""
+) -> list[dict]:
+    """Score a candidate set against one fax; returns matches with score >= 40, best first."""
+    fax_dt: datetime | None = None
+    if fax_date:
+        with contextlib.suppress(Exception):
+            fax_dt = datetime.fromisoformat(fax_date.replace("Z", "+00:00"))
+
+    seen_ids: set[str] = set()
+    results: list[dict] = []
+    for case in candidates:
+        claim_id = str(case.get("id", ""))
+        if claim_id in seen_ids:
+            continue
+        seen_ids.add(claim_id)
+
+        cdata = case.get("data") or {}
+        if isinstance(cdata, str):
+            try:
+                cdata = json.loads(cdata)
+            except Exception:
+                cdata = {}
+
+        score = 0
+        match_fields: list[str] = []
+        full_name = (
+            (cdata.get("patient_last_name", "") + " " + cdata.get("patient_first_name", ""))
+            .strip()
+            .lower()
+        )
+        if full_name and any(pn in full_name or full_name in pn for pn in features.names):
+            score += 40
+            match_fields.append("patient_name")
+
+        case_dob = cdata.get("patient_dob", "")
+        if case_dob and any(d in case_dob or case_dob in d for d in features.dobs):
+            score += 30
+            match_fields.append("dob")
+
+        case_member_id = cdata.get("member_id", "")
+        if case_member_id and case_member_id.lower() in features.member_ids:
+            score += 20
+            match_fields.append("member_id")
+
+        if fax_dt is not None and cdata.get("dos"):
+            with contextlib.suppress(Exception):
+                dos_dt = datetime.fromisoformat(cdata["dos"].replace("Z", "+00:00"))
+                if abs((fax_dt - dos_dt).days) <= 30:
+                    score += 10
+                    match_fields.append("date_proximity")
+
+        if score >= 40:
+            results.append(
+                {
+                    "claim_id": claim_id,
+                    "claim_data": cdata,
+                    "score": score,
+                    "confidence": round(score / 100, 2),
+                    "match_fields": match_fields,
+                }
+            )
+
+    results.sort(key=lambda x: x["score"], reverse=True)
+    return results
+
 
 class ClaimMatcher:
     def __init__(self, db: Session, tenant_id: str) -> None:
@@ -73,22 +198,6 @@ class ClaimMatcher:
             return None
 
     def match_claim_probabilistic(self, ocr_text: str, fax_date: str = "") -> list[dict]:
-        patient_names: list[str] = []
-        for line in ocr_text.splitlines():
-            m = re.match(r"(?:Patient|Name)\s*[:\-]\s*(.+)", line, re.IGNORECASE)
-            if m:
-                patient_names.append(m.group(1).strip())
-
-        dob_patterns: list[str] = re.findall(
-            r"\b(\d{1,2}/\d{1,2}/\d{4}|\d{4}-\d{2}-\d{2})\b", ocr_text
-        )
-
-        member_ids: list[str] = []
-        for pat in [r"Member\s*ID\s*[:\-]\s*(\S+)", r"Policy\s*[:\-]\s*(\S+)", r"ID#\s*(\S+)"]:
-            member_ids.extend(re.findall(pat, ocr_text, re.IGNORECASE))
-
-        claim_numbers: list[str] = re.findall(r"\b(\d{6,12})\b", ocr_text)
-
         import uuid
 
         try:
@@ -96,161 +205,57 @@ class ClaimMatcher:
         except Exception:
             return []
 
-        pg_trgm_available = self._check_pg_trgm()
-
-        cases: list[dict] = []
-        for patient_name in patient_names[:3]:
-            if pg_trgm_available:
-                try:
-                    rows = (
-                        self.db.execute(
-                            text(
-                                "SELECT id, data, tenant_id, version, created_at "
-                                "FROM billing_cases "
-                                "WHERE tenant_id = :tid AND deleted_at IS NULL "
-                                "AND similarity(data->>'patient_last_name' || ' ' || data->>'patient_first_name', :name) > 0.25 "
-                                "ORDER BY similarity(data->>'patient_last_name' || ' ' || data->>'patient_first_name', :name) DESC "
-                                "LIMIT 20"
-                            ),
-                            {"tid": str(tenant_uuid), "name": patient_name},
-                        )
-                        .mappings()
-                        .all()
-                    )
-                    cases.extend([dict(r) for r in rows])
-                except Exception:
-                    rows = (
-                        self.db.execute(
-                            text(
-                                "SELECT id, data, tenant_id, version, created_at "
-                                "FROM billing_cases "
-                                "WHERE tenant_id = :tid AND deleted_at IS NULL "
-                                "AND (data->>'patient_last_name' ILIKE :name OR data->>'patient_first_name' ILIKE :name) "
-                                "LIMIT 20"
-                            ),
-                            {"tid": str(tenant_uuid), "name": f"%{patient_name}%"},
-                        )
-                        .mappings()
-                        .all()
-                    )
-                    cases.extend([dict(r) for r in rows])
-            else:
-                for name_fragment in patient_name.split()[:2]:
-                    try:
-                        rows = (
-                            self.db.execute(
-                                text(
-                                    "SELECT id, data, tenant_id, version, created_at "
-                                    "FROM billing_cases "
-                                    "WHERE tenant_id = :tid AND deleted_at IS NULL "
-                                    "AND (data->>'patient_last_name' ILIKE :frag OR data->>'patient_first_name' ILIKE :frag) "
-                                    "LIMIT 20"
-                                ),
-                                {"tid": str(tenant_uuid), "frag": f"%{name_fragment}%"},
-                            )
-                            .mappings()
-                            .all()
-                        )
-                        cases.extend([dict(r) for r in rows])
-                    except Exception:
-                        pass
-
-        if claim_numbers:
-            for cn in claim_numbers[:3]:
-                try:
-                    rows = (
-                        self.db.execute(
-                            text(
-                                "SELECT id, data, tenant_id, version, created_at "
-                                "FROM billing_cases "
-                                "WHERE tenant_id = :tid AND deleted_at IS NULL "
-                                "AND data->>'claim_id' ILIKE :cn "
-                                "LIMIT 5"
-                            ),
-                            {"tid": str(tenant_uuid), "cn": f"%{cn}%"},
-                        )
-                        .mappings()
-                        .all()
-                    )
-                    cases.extend([dict(r) for r in rows])
-                except Exception:
-                    pass
-
-        seen_ids: set[str] = set()
-        unique_cases: list[dict] = []
-        for c in cases:
-            cid = str(c.get("id", ""))
-            if cid not in seen_ids:
-                seen_ids.add(cid)
-                unique_cases.append(c)
-
-        results: list[dict] = []
-        for case in unique_cases:
-            score = 0
-            match_fields: list[str] = []
-            cdata = case.get("data") or {}
-            if isinstance(cdata, str):
-                try:
-                    cdata = json.loads(cdata)
-                except Exception:
-                    cdata = {}
-
-            case_full_name = (
-                (cdata.get("patient_last_name", "") + " " + cdata.get("patient_first_name", ""))
-                .strip()
-                .lower()
+        features = extract_fax_features(ocr_text)
+        candidates = self._candidate_cases(tenant_uuid, features)
+        return score_candidates(candidates, features, fax_date=fax_date)
+
+    def _candidate_cases(self, tenant_uuid, features: FaxFeatures) -> list[dict]:
+        """Fetch every blocking-key candidate for one fax in a single indexed query."""
+        clauses: list[str] = []
+        params: dict = {"tid": str(tenant_uuid), "limit": _CANDIDATE_LIMIT}
+        for i, name in enumerate(features.names[:3]):
+            clauses.append(f"{_NAME_EXPR} % :name{i}")
+            params[f"name{i}"] = name
+        if features.dobs:
+            clauses.append(f"{_DOB_EXPR} = ANY(CAST(:dobs AS text[]))")
+            params["dobs"] = list(features.dobs)
+        if features.member_ids:
+            clauses.append(f"{_MEMBER_ID_EXPR} = ANY(CAST(:member_ids AS text[]))")
+            params["member_ids"] = sorted(features.member_ids)
+        for i, cn in enumerate(features.claim_numbers[:3]):
+            clauses.append(f"{_CLAIM_NUMBER_EXPR} ILIKE :cn{i}")
+            params[f"cn{i}"] = f"%{cn}%"
+        if not clauses:
+            return []
+
+        order = "created_at DESC"
+        if features.names:
+            order = (
+                "GREATEST("
+                + ", ".join(f"similarity({_NAME_EXPR}, :name{i})" for i in range(len(features.names[:3])))
+                + ") DESC"
             )
-            for pn in patient_names:
-                if case_full_name and pn.lower() in case_full_name or case_full_name in pn.lower():
-                    score += 40
-                    match_fields.append("patient_name")
-                    break
-
-            case_dob = cdata.get("patient_dob", "")
-            for dob in dob_patterns:
-                dob_norm = dob.replace("/", "-")
-                if case_dob and (dob_norm in case_dob or case_dob in dob_norm):
-                    score += 30
-                    match_fields.append("dob")
-                    break
-
-            case_member_id = cdata.get("member_id", "")
-            for mid in member_ids:
-                if case_member_id and mid.lower() == case_member_id.lower():
-                    score += 20
-                    match_fields.append("member_id")
-                    break
-
-            if fax_date and cdata.get("dos"):
-                try:
-                    fax_dt = datetime.fromisoformat(fax_date.replace("Z", "+00:00"))
-                    dos_dt = datetime.fromisoformat(cdata["dos"].replace("Z", "+00:00"))
-                    if abs((fax_dt - dos_dt).days) <= 30:
-                        score += 10
-                        match_fields.append("date_proximity")
-                except Exception:
-                    pass
-
-            if score >= 40:
-                results.append(
-                    {
-                        "claim_id": str(case.get("id", "")),
-                        "claim_data": cdata,
-                        "score": score,
-                        "confidence": round(score / 100, 2),
-                        "match_fields": match_fields,
-                    }
-                )
-
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results
-
-    def _check_pg_trgm(self) -> bool:
-        try:
-            self.db.execute(text("SELECT similarity('test', 'test')"))
-            return True
-        except Exception:
-            return False
+            # ``%`` uses the session threshold; keep the historical 0.25 cut-off.
+            self.db.execute(
+                text("SELECT set_config('pg_trgm.similarity_threshold', :t, true)"),
+                {"t": str(_NAME_SIMILARITY_THRESHOLD)},
+            )
+        rows = (
+            self.db.execute(
+                text(
+                    "SELECT id, data, tenant_id, version, created_at "
+                    "FROM billing_cases "
+                    "WHERE tenant_id = :tid AND deleted_at IS NULL "
+                    f"AND ({' OR '.join(clauses)}) "
+                    f"ORDER BY {order} "
+                    "LIMIT :limit"
+                ),
+                params,
+            )
+            .mappings()
+            .all()
+        )
+        return [dict(r) for r in rows]
 
     def attach_to_claim(
         self,
@@ -258,9 +263,10 @@ class ClaimMatcher:
         claim_id: str,
         attachment_type: str,
         actor: str = "auto",
+        commit: bool = True,
     ) -> dict:
         now = datetime.now(UTC).isoformat()
-        with contextlib.suppress(Exception):
+        with contextlib.suppress(Exception), self.db.begin_nested():
             self.db.execute(
                 text(
                     "INSERT INTO claim_documents "
@@ -288,7 +294,7 @@ class ClaimMatcher:
             {"claim_id": claim_id, "now": now, "fax_id": fax_id},
         )
 
-        with contextlib.suppress(Exception):
+        with contextlib.suppress(Exception), self.db.begin_nested():
             self.db.execute(
                 text(
                     "INSERT INTO document_audit_events "
@@ -304,7 +310,8 @@ class ClaimMatcher:
                 },
             )
 
-        self.db.commit()
+        if commit:
+            self.db.commit()
         return {
             "fax_id": fax_id,
             "claim_id": claim_id,
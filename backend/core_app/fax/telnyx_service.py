@@ -5,6 +5,8 @@ from typing import Any
 
 import requests
 
+from core_app.telnyx import client as telnyx_client
+
 
 class TelnyxNotConfigured(RuntimeError):
     pass
@@ -39,8 +41,10 @@ def send_sms(*, cfg: TelnyxConfig, from_number: str, to_number: str, text: str)
     return r.json()
 
 
-def download_media(*, cfg: TelnyxConfig, media_url: str) -> bytes:
-    r = requests.get(media_url, headers=_headers(cfg), timeout=60)
-    if r.status_code >= 300:
-        raise TelnyxNotConfigured(f"telnyx_download_media_failed:{r.status_code}:{r.text[:200]}")
-    return r.content
+async def download_media(*, cfg: TelnyxConfig, media_url: str) -> bytes:
+    # Shares the pooled, retrying client used by the webhooks.
+    _headers(cfg)
+    try:
+        return await telnyx_client.download_media(api_key=cfg.api_key, media_url=media_url)
+    except telnyx_client.TelnyxApiError as exc:
+        raise TelnyxNotConfigured(f"telnyx_download_media_failed:{exc}") from exc
@@ -6,6 +6,7 @@ from typing import Any
 
 from sqlalchemy.orm import Session
 
+from core_app.repositories.domination_repository import QueryFilter
 from core_app.services.domination_service import DominationService
 from core_app.services.event_publisher import EventPublisher
 
@@ -31,13 +32,20 @@ class ReadinessEngine:
     def compute_unit_readiness(self, unit_id: uuid.UUID) -> dict[str, Any]:
         uid = str(unit_id)
         now = datetime.now(UTC)
+        by_unit = [QueryFilter("data.unit_id", "eq", uid)]
 
-        alerts = self.svc.repo("fleet_alerts").list(tenant_id=self.tenant_id, limit=200)
+        def _unit_records(table: str, limit: int) -> list[dict[str, Any]]:
+            return (
+                self.svc.repo(table)
+                .query(tenant_id=self.tenant_id, filters=by_unit, limit=limit)
+                .items
+            )
+
+        alerts = _unit_records("fleet_alerts", 200)
         active_alerts = [
             a
             for a in alerts
-            if (a.get("data") or {}).get("unit_id") == uid
-            and not (a.get("data") or {}).get("acknowledged")
+            if not (a.get("data") or {}).get("acknowledged")
             and not (a.get("data") or {}).get("resolved")
         ]
         critical_alerts = [
@@ -46,12 +54,7 @@ class ReadinessEngine:
         alert_penalty = min(len(critical_alerts) * 25 + len(active_alerts) * 10, 100)
         alert_score = max(0, 100 - alert_penalty)
 
-        maintenance_list = self.svc.repo("maintenance_work_orders").list(
-            tenant_id=self.tenant_id, limit=100
-        )
-        unit_maintenance = [
-            m for m in maintenance_list if (m.get("data") or {}).get("unit_id") == uid
-        ]
+        unit_maintenance = _unit_records("maintenance_work_orders", 100)
         open_critical = [
             m
             for m in unit_maintenance
@@ -70,8 +73,7 @@ class ReadinessEngine:
         elif open_routine:
             maintenance_score = max(0, 100 - len(open_routine) * 15)
 
-        mdt_sessions = self.svc.repo("mdt_sessions").list(tenant_id=self.tenant_id, limit=100)
-        unit_sessions = [s for s in mdt_sessions if (s.get("data") or {}).get("unit_id") == uid]
+        unit_sessions = _unit_records("mdt_sessions", 100)
         mdt_online = False
         if unit_sessions:
             latest = sorted(unit_sessions, key=lambda x: x.get("updated_at", ""), reverse=True)[0]
@@ -85,8 +87,7 @@ class ReadinessEngine:
                     pass
         mdt_score = 100 if mdt_online else 0
 
-        obd_readings = self.svc.repo("obd_readings").list(tenant_id=self.tenant_id, limit=50)
-        unit_obd = [r for r in obd_readings if (r.get("data") or {}).get("unit_id") == uid]
+        unit_obd = _unit_records("obd_readings", 50)
         if unit_obd:
             latest_obd = sorted(unit_obd, key=lambda x: x.get("created_at", ""), reverse=True)[0]
             obd_data = (latest_obd.get("data") or {}).get("payload", {})
@@ -96,12 +97,8 @@ class ReadinessEngine:
             obd_score = 50
 
         creds = self.svc.repo("credentials").list(tenant_id=self.tenant_id, limit=500)
-        unit_crews = self.svc.repo("crew_assignments").list(tenant_id=self.tenant_id, limit=100)
-        unit_crew_ids = [
-            (ca.get("data") or {}).get("crew_member_id")
-            for ca in unit_crews
-            if (ca.get("data") or {}).get("unit_id") == uid
-        ]
+        unit_crews = _unit_records("crew_assignments", 100)
+        unit_crew_ids = [(ca.get("data") or {}).get("crew_member_id") for ca in unit_crews]
         if unit_crew_ids:
             expired_creds = [
                 c
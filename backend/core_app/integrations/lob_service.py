@@ -13,6 +13,8 @@ from typing import Any, Optional
 
 import httpx
 
+from core_app.observability.metrics import external_call
+
 logger = logging.getLogger(__name__)
 
 LOB_API_BASE = "https://api.lob.com/v1"
@@ -93,11 +95,12 @@ class LobService:
 
         headers = {"Idempotency-Key": idempotency_key or str(uuid.uuid4())}
 
-        async with httpx.AsyncClient(auth=(self._key(), "")) as client:
-            resp = await client.post(f"{LOB_API_BASE}/letters", json=payload, headers=headers, timeout=30)
-            if resp.status_code >= 400:
-                raise LobApiError(resp.status_code, resp.text)
-            result = resp.json()
+        with external_call("lob", "letters"):
+            async with httpx.AsyncClient(auth=(self._key(), "")) as client:
+                resp = await client.post(f"{LOB_API_BASE}/letters", json=payload, headers=headers, timeout=30)
+                if resp.status_code >= 400:
+                    raise LobApiError(resp.status_code, resp.text)
+                result = resp.json()
 
         logger.info(
             "lob_letter_sent id=%s to_zip=%s template=%s",
@@ -127,25 +130,28 @@ class LobService:
             "size": "4x6",
         }
 
-        async with httpx.AsyncClient(auth=(self._key(), "")) as client:
-            resp = await client.post(f"{LOB_API_BASE}/postcards", json=payload, timeout=30)
-            if resp.status_code >= 400:
-                raise LobApiError(resp.status_code, resp.text)
-            return resp.json()
+        with external_call("lob", "postcards"):
+            async with httpx.AsyncClient(auth=(self._key(), "")) as client:
+                resp = await client.post(f"{LOB_API_BASE}/postcards", json=payload, timeout=30)
+                if resp.status_code >= 400:
+                    raise LobApiError(resp.status_code, resp.text)
+                return resp.json()
 
     async def create_address(self, address: dict) -> dict:
-        async with httpx.AsyncClient(auth=(self._key(), "")) as client:
-            resp = await client.post(f"{LOB_API_BASE}/addresses", json=address, timeout=30)
-            if resp.status_code >= 400:
-                raise LobApiError(resp.status_code, resp.text)
-            return resp.json()
+        with external_call("lob", "addresses"):
+            async with httpx.AsyncClient(auth=(self._key(), "")) as client:
+                resp = await client.post(f"{LOB_API_BASE}/addresses", json=address, timeout=30)
+                if resp.status_code >= 400:
+                    raise LobApiError(resp.status_code, resp.text)
+                return resp.json()
 
     async def verify_address(self, address: dict) -> dict:
-        async with httpx.AsyncClient(auth=(self._key(), "")) as client:
-            resp = await client.post(f"{LOB_API_BASE}/us_verifications", json=address, timeout=30)
-            if resp.status_code >= 400:
-                raise LobApiError(resp.status_code, resp.text)
-            return resp.json()
+        with external_call("lob", "us_verifications"):
+            async with httpx.AsyncClient(auth=(self._key(), "")) as client:
+                resp = await client.post(f"{LOB_API_BASE}/us_verifications", json=address, timeout=30)
+                if resp.status_code >= 400:
+                    raise LobApiError(resp.status_code, resp.text)
+                return resp.json()
 
     @staticmethod
     def verify_webhook(payload: bytes, signature: str, secret: str) -> bool:
@@ -205,11 +211,12 @@ async def send_statement_letter(
 
     headers = {"Idempotency-Key": idempotency_key}
 
-    async with httpx.AsyncClient(auth=(api_key, "")) as client:
-        resp = await client.post(f"{LOB_API_BASE}/letters", json=payload, headers=headers, timeout=60)
-        if resp.status_code >= 400:
-            raise LobApiError(resp.status_code, resp.text)
-        return resp.json()
+    with external_call("lob", "letters"):
+        async with httpx.AsyncClient(auth=(api_key, "")) as client:
+            resp = await client.post(f"{LOB_API_BASE}/letters", json=payload, headers=headers, timeout=60)
+            if resp.status_code >= 400:
+                raise LobApiError(resp.status_code, resp.text)
+            return resp.json()
 
 
 def verify_lob_webhook_signature(
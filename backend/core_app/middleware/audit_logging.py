@@ -1,17 +1,17 @@
 import uuid
+from typing import Any
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+CORRELATION_HEADER = "x-correlation-id"
 
 
-class AuditLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request.state.correlation_id = request.headers.get("x-correlation-id") or str(uuid.uuid4())
-        request.state.audit_context = {
-            "actor_user_id": None,
-            "tenant_id": None,
-            "correlation_id": request.state.correlation_id,
-        }
-        response = await call_next(request)
-        response.headers["x-correlation-id"] = request.state.correlation_id
-        return response
+def correlation_context(correlation_id: str | None) -> tuple[str, dict[str, Any]]:
+    """Correlation id for the request and the audit context seeded from it.
+
+    ``get_current_user`` fills in ``tenant_id`` / ``actor_user_id`` later.
+    """
+    correlation_id = correlation_id or str(uuid.uuid4())
+    return correlation_id, {
+        "actor_user_id": None,
+        "tenant_id": None,
+        "correlation_id": correlation_id,
+    }
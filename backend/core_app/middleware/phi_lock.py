@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-from fastapi import Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
 
 PHI_PROTECTED_PREFIXES = [
     "/api/v1/patients",
@@ -28,39 +26,32 @@ PUBLIC_PREFIXES = [
 ]
 
 
-class PHILockMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-
-        for pub in PUBLIC_PREFIXES:
-            if path.startswith(pub):
-                return await call_next(request)
-
-        is_phi = any(path.startswith(p) for p in PHI_PROTECTED_PREFIXES)
-        if not is_phi:
-            return await call_next(request)
-
-        tenant_status = getattr(request.state, "tenant_status", None)
-        legal_status = getattr(request.state, "tenant_legal_status", None)
-
-        if tenant_status in (None, "provisioning", "restricted", "failed"):
-            return JSONResponse(
-                status_code=403,
-                content={
-                    "error": "phi_locked",
-                    "message": "PHI access is locked. Complete legal signing and payment to unlock patient data.",
-                    "next_step": "complete_onboarding",
-                },
-            )
-
-        if legal_status not in (None, "signed", "active"):
-            return JSONResponse(
-                status_code=403,
-                content={
-                    "error": "phi_locked",
-                    "message": "BAA must be signed before accessing patient data.",
-                    "next_step": "sign_baa",
-                },
-            )
-
-        return await call_next(request)
+def is_phi_path(path: str) -> bool:
+    if any(path.startswith(pub) for pub in PUBLIC_PREFIXES):
+        return False
+    return any(path.startswith(p) for p in PHI_PROTECTED_PREFIXES)
+
+
+def phi_lock_response(tenant_status: str | None, legal_status: str | None) -> JSONResponse | None:
+    """403 for a PHI request from a tenant that has not unlocked PHI, else None."""
+    if tenant_status in (None, "provisioning", "restricted", "failed"):
+        return JSONResponse(
+            status_code=403,
+            content={
+                "error": "phi_locked",
+                "message": "PHI access is locked. Complete legal signing and payment to unlock patient data.",
+                "next_step": "complete_onboarding",
+            },
+        )
+
+    if legal_status not in (None, "signed", "active"):
+        return JSONResponse(
+            status_code=403,
+            content={
+                "error": "phi_locked",
+                "message": "BAA must be signed before accessing patient data.",
+                "next_step": "sign_baa",
+            },
+        )
+
+    return None
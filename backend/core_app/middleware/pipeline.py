@@ -0,0 +1,128 @@
+"""Fused pure-ASGI request pipeline.
+
+Replaces the four ``BaseHTTPMiddleware`` layers (rate limit, tenant context,
+PHI lock, correlation id) with one ASGI callable.  Stages run in the order
+the old stack did, and response headers are added in a single
+``http.response.start`` hook, so no per-layer task or body re-streaming is
+involved and SSE / file responses pass straight through.
+
+The tenant record (status, legal status, billing tier) is resolved *before*
+routing from the verified bearer token (see ``token_tenant_id``) and exposed
+as ``request.state.tenant``; the rate limiter picks the tier from it and the
+PHI lock its status.  The old PHI layer read state that was only filled after
+the response, so it locked every PHI route regardless of tenant status.
+
+Every request, rejected ones included, is recorded in the
+``http_request_duration_seconds`` / ``http_requests_in_flight`` metrics
+(``core_app.observability.metrics``).
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core_app.middleware.audit_logging import CORRELATION_HEADER, correlation_context
+from core_app.middleware.phi_lock import is_phi_path, phi_lock_response
+from core_app.middleware.rate_limiter import DEFAULT_EXCLUDED_PATHS, check_rate_limit
+from core_app.middleware.tenant_context import (
+    bearer_token,
+    resolve_tenant_status,
+    token_tenant_id,
+)
+from core_app.observability.metrics import HTTP_REQUESTS_IN_FLIGHT, observe_request
+
+
+class RequestPipelineMiddleware:
+    def __init__(
+        self, app: ASGIApp, *, rate_limit_excluded_paths: Iterable[str] | None = None
+    ) -> None:
+        self.app = app
+        self.rate_limit_excluded_paths = tuple(rate_limit_excluded_paths or DEFAULT_EXCLUDED_PATHS)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_observed(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self._handle(scope, receive, send_observed)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            observe_request(scope, status, time.perf_counter() - started)
+
+    async def _handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Shared with request.state for everything downstream.
+        state = scope.setdefault("state", {})
+        path: str = scope["path"]
+        headers = Headers(scope=scope)
+        extra_headers: dict[str, str] = {}
+
+        # 1. Tenant record (cached) for authenticated requests.
+        rate_limited = not path.startswith(self.rate_limit_excluded_paths)
+        phi = is_phi_path(path)
+        tenant_id = tenant = None
+        if rate_limited or phi:
+            token = bearer_token(
+                headers.get("authorization"),
+                QueryParams(scope.get("query_string", b"")).get("token"),
+            )
+            tenant_id = await token_tenant_id(token)
+            tenant = await resolve_tenant_status(tenant_id) if tenant_id else None
+        state["tenant"] = tenant
+
+        # 2. Rate limit, per tenant by tier or per IP when anonymous.
+        if rate_limited:
+            client = scope.get("client")
+            decision = await check_rate_limit(
+                tenant_id=tenant_id,
+                tier=tenant.billing_tier if tenant else None,
+                client_ip=client[0] if client else None,
+            )
+            if not decision.allowed:
+                await decision.response()(scope, receive, send)
+                return
+            extra_headers.update(decision.headers())
+
+        # 3. Tenant context; get_current_user sets tenant_id once authenticated.
+        state["tenant_id"] = None
+        state["tenant_status"] = tenant.status if tenant else None
+        state["tenant_legal_status"] = tenant.legal_status if tenant else None
+
+        # 4. Correlation id / audit context.
+        correlation_id, audit_context = correlation_context(headers.get(CORRELATION_HEADER))
+        state["correlation_id"] = correlation_id
+        state["audit_context"] = audit_context
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                out = MutableHeaders(scope=message)
+                out[CORRELATION_HEADER] = correlation_id
+                authed_tenant = state.get("tenant_id")
+                if authed_tenant is not None:
+                    out["x-tenant-id"] = str(authed_tenant)
+                for key, value in extra_headers.items():
+                    out[key] = value
+            await send(message)
+
+        # 5. PHI lock.
+        if phi:
+            locked = phi_lock_response(state["tenant_status"], state["tenant_legal_status"])
+            if locked is not None:
+                await locked(scope, receive, send_with_headers)
+                return
+
+        await self.app(scope, receive, send_with_headers)
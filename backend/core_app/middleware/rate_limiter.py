@@ -2,11 +2,21 @@ from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
 
-from fastapi import Request, Response
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from prometheus_client import Counter
+
+from core_app.core.circuit_breaker import CircuitBreaker
+from core_app.core.config import get_settings
+from core_app.core.redis_client import redis_kwargs
+from core_app.services.auth_cache import TTLCache
+
+try:
+    import redis.asyncio as redis_async
+except Exception:
+    redis_async = None
 
 logger = logging.getLogger(__name__)
 
@@ -24,129 +34,236 @@ RATE_LIMITS: dict[str, dict[str, int]] = {
 IP_RATE_LIMIT = 200
 WINDOW_SECONDS = 60
 
-_redis_client = None
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions_total",
+    "Rate-limit checks by where they were decided",
+    ["source", "result"],
+)
 
+# GCRA over one key holding the theoretical arrival time (ms).  Grants up to
+# ARGV[3] tokens at once so callers can lease a batch; returns
+# {granted, remaining, retry_after_ms}.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now then tat = now end
+local available = math.floor((now + burst - tat) / interval)
+if available < 0 then available = 0 end
+local granted = math.min(want, available)
+if granted > 0 then
+  tat = tat + granted * interval
+  redis.call('SET', KEYS[1], tat, 'PX', math.ceil(tat - now) + 1000)
+  return {granted, available - granted, 0}
+end
+return {0, 0, math.ceil(tat + interval - burst - now)}
+"""
 
-def _get_redis():
-    global _redis_client
-    if _redis_client is None:
-        try:
-            import redis as redis_lib
 
-            from core_app.core.config import get_settings
+def _gcra(tat: float, now: float, interval: float, burst: float, want: int) -> tuple[int, int, float]:
+    """In-process twin of ``GCRA_SCRIPT``: (granted, remaining, new_tat)."""
+    tat = max(tat, now)
+    available = max(0, int((now + burst - tat) // interval))
+    granted = min(want, available)
+    return granted, available - granted, tat + granted * interval
+
+
+class RateLimiter:
+    """Async GCRA limiter: Redis holds the shared state, the process leases.
+
+    Each Redis round trip leases ``lease_fraction`` of the limit into a
+    per-process bucket that absorbs the following checks for up to
+    ``lease_ttl_seconds``; denials are likewise remembered until the retry
+    time.  With ``redis_client=None`` every request is allowed (no
+    REDIS_URL).  While the breaker is open, limits are enforced per process
+    instead of failing open or waiting on socket timeouts.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any | None,
+        *,
+        lease_fraction: float = 0.05,
+        lease_ttl_seconds: float = 1.0,
+        breaker: CircuitBreaker | None = None,
+        max_keys: int = 10000,
+    ) -> None:
+        self._redis = redis_client
+        self._script = redis_client.register_script(GCRA_SCRIPT) if redis_client else None
+        self.lease_fraction = lease_fraction
+        self.breaker = breaker or CircuitBreaker()
+        # key -> [tokens, remaining reported by Redis]
+        self._leases: TTLCache[list[int]] = TTLCache(
+            ttl_seconds=lease_ttl_seconds, max_entries=max_keys
+        )
+        # key -> monotonic time until which the key is denied
+        self._denied: TTLCache[float] = TTLCache(
+            ttl_seconds=WINDOW_SECONDS, max_entries=max_keys
+        )
+        # key -> tat (seconds) for the breaker-open fallback
+        self._fallback: TTLCache[float] = TTLCache(
+            ttl_seconds=WINDOW_SECONDS, max_entries=max_keys
+        )
+
+    async def hit(self, key: str, limit: int, window: int) -> tuple[bool, int]:
+        """Consume one request from ``key``; returns (allowed, remaining)."""
+        if self._script is None:
+            return True, limit
+
+        lease = self._leases.get(key)
+        if lease is not None and lease[0] > 0:
+            lease[0] -= 1
+            RATE_LIMIT_DECISIONS.labels("local", "allowed").inc()
+            return True, lease[1] + lease[0]
+        denied_until = self._denied.get(key)
+        if denied_until is not None and denied_until > time.monotonic():
+            RATE_LIMIT_DECISIONS.labels("local", "denied").inc()
+            return False, 0
 
-            settings = get_settings()
-            _redis_client = redis_lib.from_url(
-                settings.redis_url,
-                decode_responses=True,
-                socket_connect_timeout=2,
-                socket_timeout=2,
-                ssl_cert_reqs=None,
+        if not self.breaker.allow():
+            return self._fallback_hit(key, limit, window)
+
+        interval_ms = window * 1000 / limit
+        want = max(1, int(limit * self.lease_fraction))
+        try:
+            granted, remaining, retry_ms = await self._script(
+                keys=[key], args=[interval_ms, window * 1000, want]
             )
-        except Exception as e:
-            logger.warning("Redis rate limiter init failed: %s", e)
-            return None
-    return _redis_client
-
-
-def _redis_sliding_window(key: str, limit: int, window: int) -> tuple[bool, int]:
-    """Sliding window counter using Redis. Returns (allowed, remaining)."""
-    r = _get_redis()
-    if r is None:
-        return True, limit
-
-    now = time.time()
-    window_start = now - window
-
-    try:
-        pipe = r.pipeline()
-        pipe.zremrangebyscore(key, "-inf", window_start)
-        pipe.zadd(key, {str(now): now})
-        pipe.zcard(key)
-        pipe.expire(key, window + 5)
-        results = pipe.execute()
-        count = int(results[2])
-        remaining = max(0, limit - count)
-        return count <= limit, remaining
-    except Exception as e:
-        logger.warning("Redis rate limit check failed: %s — allowing request", e)
-        return True, limit
-
-
-class TenantRateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, excluded_paths: list[str] | None = None) -> None:
-        super().__init__(app)
-        self.excluded_paths = set(
-            excluded_paths
-            or [
-                "/health",
-                "/api/v1/health",
-                "/healthz",
-                "/api/v1/webhooks",
-                "/api/v1/public",
-                "/track",
-            ]
+        except Exception as exc:
+            self.breaker.record_failure()
+            if self.breaker.is_open:
+                logger.warning("rate_limit_redis_unavailable key=%s error=%s", key, exc)
+            return self._fallback_hit(key, limit, window)
+        self.breaker.record_success()
+
+        if int(granted) == 0:
+            self._denied.set(key, time.monotonic() + int(retry_ms) / 1000)
+            RATE_LIMIT_DECISIONS.labels("redis", "denied").inc()
+            return False, 0
+        self._leases.set(key, [int(granted) - 1, int(remaining)])
+        RATE_LIMIT_DECISIONS.labels("redis", "allowed").inc()
+        return True, int(remaining) + int(granted) - 1
+
+    def _fallback_hit(self, key: str, limit: int, window: int) -> tuple[bool, int]:
+        now = time.monotonic()
+        granted, remaining, tat = _gcra(
+            self._fallback.get(key) or now, now, window / limit, window, 1
         )
+        self._fallback.set(key, tat)
+        result = "allowed" if granted else "denied"
+        RATE_LIMIT_DECISIONS.labels("fallback", result).inc()
+        return bool(granted), remaining
+
+    async def aclose(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        path = request.url.path
-
-        if any(path.startswith(ep) for ep in self.excluded_paths):
-            return await call_next(request)
-
-        tenant_id = getattr(request.state, "tenant_id", None)
-
-        if not tenant_id:
-            # Rate limit unauthenticated requests by IP
-            ip = (request.client.host if request.client else "unknown") or "unknown"
-            key = f"rate:ip:{ip}:minute"
-            allowed, remaining = _redis_sliding_window(key, IP_RATE_LIMIT, WINDOW_SECONDS)
-            if not allowed:
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": "rate_limit_exceeded",
-                        "message": "Too many requests from this IP.",
-                    },
-                    headers={
-                        "X-RateLimit-Limit": str(IP_RATE_LIMIT),
-                        "X-RateLimit-Remaining": "0",
-                        "Retry-After": "60",
-                    },
+_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        settings = get_settings()
+        client = None
+        if settings.redis_url and redis_async is not None:
+            try:
+                client = redis_async.from_url(
+                    settings.redis_url,
+                    **redis_kwargs(
+                        settings.redis_url,
+                        socket_connect_timeout=settings.rate_limit_redis_timeout_seconds,
+                        socket_timeout=settings.rate_limit_redis_timeout_seconds,
+                    ),
                 )
-            response = await call_next(request)
-            response.headers["X-RateLimit-Limit"] = str(IP_RATE_LIMIT)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            return response
-
-        tenant = getattr(request.state, "tenant", None)
-        tier = "starter"
-        if tenant and hasattr(tenant, "billing_tier"):
-            tier = tenant.billing_tier or "starter"
-
-        limit = RATE_LIMITS["api_calls_per_minute"].get(tier, 60)
-        key = f"rate:api:{tenant_id}:minute"
-        allowed, remaining = _redis_sliding_window(key, limit, WINDOW_SECONDS)
-
-        if not allowed:
-            logger.warning("Rate limit exceeded for tenant %s (tier=%s)", tenant_id, tier)
-            return JSONResponse(
-                status_code=429,
-                content={
-                    "error": "rate_limit_exceeded",
-                    "message": f"API rate limit exceeded. Limit: {limit} requests/minute.",
-                    "upgrade_url": "/billing/upgrade",
-                },
-                headers={
-                    "X-RateLimit-Limit": str(limit),
-                    "X-RateLimit-Remaining": "0",
-                    "Retry-After": "60",
-                },
-            )
+            except Exception as exc:
+                logger.warning("Redis rate limiter init failed: %s", exc)
+        _limiter = RateLimiter(
+            client,
+            lease_fraction=settings.rate_limit_lease_fraction,
+            lease_ttl_seconds=settings.rate_limit_lease_ttl_seconds,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.rate_limit_breaker_failures,
+                reset_seconds=settings.rate_limit_breaker_reset_seconds,
+            ),
+        )
+    return _limiter
+
+
+async def close_rate_limiter() -> None:
+    global _limiter
+    if _limiter is not None:
+        await _limiter.aclose()
+        _limiter = None
+
+
+DEFAULT_EXCLUDED_PATHS: tuple[str, ...] = (
+    "/health",
+    "/api/v1/health",
+    "/healthz",
+    "/api/v1/webhooks",
+    "/api/v1/public",
+    "/track",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    message: str
+    upgrade_url: str | None = None
+
+    def headers(self) -> dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+        }
+
+    def response(self) -> JSONResponse:
+        content = {"error": "rate_limit_exceeded", "message": self.message}
+        if self.upgrade_url:
+            content["upgrade_url"] = self.upgrade_url
+        return JSONResponse(
+            status_code=429,
+            content=content,
+            headers={
+                "X-RateLimit-Limit": str(self.limit),
+                "X-RateLimit-Remaining": "0",
+                "Retry-After": "60",
+            },
+        )
+
+
+async def check_rate_limit(
+    *, tenant_id: object | None, tier: str | None, client_ip: str | None
+) -> RateLimitDecision:
+    """Per-tenant limit by billing tier, or a per-IP limit when no tenant is known."""
+    if not tenant_id:
+        ip = client_ip or "unknown"
+        allowed, remaining = await get_rate_limiter().hit(
+            f"rate:ip:{ip}:minute", IP_RATE_LIMIT, WINDOW_SECONDS
+        )
+        return RateLimitDecision(
+            allowed, IP_RATE_LIMIT, remaining, "Too many requests from this IP."
+        )
 
-        response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        return response
+    tier = tier or "starter"
+    limit = RATE_LIMITS["api_calls_per_minute"].get(tier, 60)
+    allowed, remaining = await get_rate_limiter().hit(
+        f"rate:api:{tenant_id}:minute", limit, WINDOW_SECONDS
+    )
+    if not allowed:
+        logger.warning("Rate limit exceeded for tenant %s (tier=%s)", tenant_id, tier)
+    return RateLimitDecision(
+        allowed,
+        limit,
+        remaining,
+        f"API rate limit exceeded. Limit: {limit} requests/minute.",
+        upgrade_url="/billing/upgrade",
+    )
@@ -1,41 +1,92 @@
-from fastapi import Request
+import uuid
+
+import anyio
+from jose import JWTError, jwt
 from sqlalchemy import text
-from starlette.middleware.base import BaseHTTPMiddleware
-
-
-class TenantContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request.state.tenant_id = None
-        request.state.tenant_status = None
-        request.state.tenant_legal_status = None
-
-        response = await call_next(request)
-
-        tenant_id = getattr(request.state, "tenant_id", None)
-        if tenant_id is not None:
-            response.headers["x-tenant-id"] = str(tenant_id)
-
-            if request.state.tenant_status is None:
-                try:
-                    from core_app.db.session import get_db_session
-
-                    db = next(get_db_session())
-                    row = (
-                        db.execute(
-                            text(
-                                "SELECT data->>'status' AS status, data->>'legal_status' AS legal_status "
-                                "FROM tenants WHERE tenant_id = :tid AND deleted_at IS NULL LIMIT 1"
-                            ),
-                            {"tid": str(tenant_id)},
-                        )
-                        .mappings()
-                        .first()
-                    )
-                    if row:
-                        request.state.tenant_status = row["status"]
-                        request.state.tenant_legal_status = row["legal_status"]
-                    db.close()
-                except Exception:
-                    pass
-
-        return response
+
+from core_app.core.config import get_settings
+from core_app.services.auth_cache import TenantStatus, TTLCache, get_auth_cache
+from core_app.services.cognito_jwt import CognitoAuthError, verify_cognito_jwt
+
+
+def _tenant_status(tenant_id) -> TenantStatus | None:
+    cache = get_auth_cache()
+    status = cache.get_tenant_status(tenant_id)
+    if status is not None:
+        return status
+    try:
+        from core_app.db.session import get_db_session_ctx
+
+        with get_db_session_ctx() as db:
+            row = (
+                db.execute(
+                    text(
+                        "SELECT data->>'status' AS status, data->>'legal_status' AS legal_status, "
+                        "data->>'billing_tier' AS billing_tier FROM tenants WHERE tenant_id = :tid AND deleted_at IS NULL LIMIT 1"
+                    ),
+                    {"tid": str(tenant_id)},
+                )
+                .mappings()
+                .first()
+            )
+    except Exception:
+        return None
+    if row is None:
+        return None
+    status = TenantStatus(
+        status=row["status"], legal_status=row["legal_status"], billing_tier=row["billing_tier"]
+    )
+    cache.set_tenant_status(tenant_id, status)
+    return status
+
+
+def bearer_token(authorization: str | None, query_token: str | None) -> str | None:
+    """The request's bearer token, from the header or the ``token`` query param."""
+    if authorization:
+        scheme, _, param = authorization.partition(" ")
+        if scheme.lower() == "bearer" and param:
+            return param.strip()
+    return query_token or None
+
+
+def _verified_tenant_id(token: str) -> uuid.UUID | None:
+    settings = get_settings()
+    try:
+        if settings.auth_mode.lower() == "cognito":
+            raw = verify_cognito_jwt(token).tenant_id
+        else:
+            claims = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+            raw = claims.get("tenant_id")
+        return uuid.UUID(str(raw)) if raw else None
+    except (CognitoAuthError, JWTError, ValueError):
+        return None
+
+
+# token -> (tenant_id | None,); the tuple lets invalid tokens be cached too.
+_token_tenants: TTLCache[tuple[uuid.UUID | None]] = TTLCache(ttl_seconds=60, max_entries=10000)
+
+
+async def token_tenant_id(token: str | None) -> uuid.UUID | None:
+    """Tenant of a *verified* bearer token, cached per token.
+
+    Used before routing (rate-limit bucket, PHI lock); ``get_current_user``
+    still authenticates the request.  A forged claim must not be able to
+    spend another tenant's quota, hence the signature check.
+    """
+    if not token:
+        return None
+    cached = _token_tenants.get(token)
+    if cached is None:
+        # A JWKS refetch on key rotation is blocking I/O.
+        cached = (await anyio.to_thread.run_sync(_verified_tenant_id, token),)
+        _token_tenants.set(token, cached)
+    return cached[0]
+
+
+async def resolve_tenant_status(tenant_id: uuid.UUID) -> TenantStatus | None:
+    status = get_auth_cache().peek_tenant_status(tenant_id)
+    if status is not None:
+        return status
+    # Local miss: the Redis GET and the DB fallback are both blocking, so
+    # keep them off the event loop.
+    return await anyio.to_thread.run_sync(_tenant_status, tenant_id)
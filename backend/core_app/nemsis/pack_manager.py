@@ -7,6 +7,8 @@ from typing import Any
 
 from core_app.core.config import get_settings
 from core_app.documents.s3_storage import put_bytes
+from core_app.epcr.validation_cache import get_validation_cache
+from core_app.nemsis.xsd_validator import get_schema_registry
 from core_app.services.domination_service import DominationService
 
 REQUIRED_ROLES_BY_PACK_TYPE: dict[str, list[str]] = {
@@ -18,6 +20,9 @@ REQUIRED_ROLES_BY_PACK_TYPE: dict[str, list[str]] = {
     "bundle": ["national_xsd", "national_schematron", "wi_state_dataset", "wi_schematron"],
 }
 
+# Pack types whose XSDs apply to every state's compiled schemas.
+NATIONAL_PACK_TYPES = frozenset({"national_xsd", "bundle"})
+
 CONTENT_TYPE_MAP: dict[str, str] = {
     "xsd": "application/xml",
     "sch": "application/xml",
@@ -156,7 +161,7 @@ class PackManager:
                     correlation_id=correlation_id,
                 )
 
-        return await self._svc.update(
+        activated = await self._svc.update(
             table="nemsis_resource_packs",
             tenant_id=self._tenant_id,
             actor_user_id=self._actor_user_id,
@@ -169,6 +174,8 @@ class PackManager:
             },
             correlation_id=correlation_id,
         )
+        self._invalidate_caches(pack_data)
+        return activated
 
     async def stage_pack(self, pack_id: str, correlation_id: str | None = None) -> dict[str, Any]:
         pack = self.get_pack(pack_id)
@@ -188,7 +195,7 @@ class PackManager:
         pack = self.get_pack(pack_id)
         if pack is None:
             raise ValueError(f"Pack {pack_id} not found")
-        return await self._svc.update(
+        archived = await self._svc.update(
             table="nemsis_resource_packs",
             tenant_id=self._tenant_id,
             actor_user_id=self._actor_user_id,
@@ -197,6 +204,17 @@ class PackManager:
             patch={"status": "archived"},
             correlation_id=correlation_id,
         )
+        self._invalidate_caches(pack.get("data", {}))
+        return archived
+
+    def _invalidate_caches(self, pack_data: dict[str, Any]) -> None:
+        national = pack_data.get("pack_type") in NATIONAL_PACK_TYPES
+        state_code = None if national else pack_data.get("state_code") or ""
+        get_schema_registry().invalidate(
+            nemsis_version=pack_data.get("nemsis_version") or None,
+            state_code=state_code,
+        )
+        get_validation_cache().invalidate(state_code)
 
     def get_active_pack(self, state_code: str, pack_type: str) -> dict[str, Any] | None:
         packs = self.list_packs()
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import contextlib
 import re
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field
@@ -48,25 +47,33 @@ def _ui_info(element_id: str) -> tuple[str, str]:
     return entry.get("section", "Unknown"), entry.get("label", element_id)
 
 
-def _find_text(root: ET.Element, local_name: str) -> str | None:
-    for elem in root.iter():
-        tag = elem.tag
-        if "}" in tag:
-            tag = tag.split("}", 1)[1]
-        if tag == local_name:
-            return (elem.text or "").strip() or None
-    return None
+class ElementIndex:
+    """Local name → elements in document order, built in one pass over the tree.
 
+    Every rule lookup is a dict hit, so validating a multi-PCR EMSDataSet is
+    linear in the document size rather than in rules × elements.
+    """
 
-def _find_all(root: ET.Element, local_name: str) -> list[ET.Element]:
-    result = []
-    for elem in root.iter():
-        tag = elem.tag
-        if "}" in tag:
-            tag = tag.split("}", 1)[1]
-        if tag == local_name:
-            result.append(elem)
-    return result
+    __slots__ = ("_elements",)
+
+    def __init__(self, root: Any) -> None:
+        elements: dict[str, list[Any]] = {}
+        for elem in root.iter():
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue  # lxml comments and processing instructions
+            elements.setdefault(tag.rpartition("}")[2], []).append(elem)
+        self._elements = elements
+
+    def all(self, local_name: str) -> list[Any]:
+        return self._elements.get(local_name, [])
+
+    def text(self, local_name: str) -> str | None:
+        """Stripped text of the first element named ``local_name``; None when absent or empty."""
+        found = self._elements.get(local_name)
+        if not found:
+            return None
+        return (found[0].text or "").strip() or None
 
 
 @dataclass
@@ -140,46 +147,298 @@ def _make_issue(
     )
 
 
+@dataclass(frozen=True, slots=True)
+class Rule:
+    """One NEMSIS check evaluated against an ``ElementIndex``.
+
+    ``kind`` is ``required`` (non-empty text), ``section`` (element present),
+    ``allowed`` (value in ``allowed``), ``pattern`` (value matches ``pattern``)
+    or ``equals`` (value equals ``expected``, case-insensitively); the last
+    three only apply when the element has a value.  Messages are
+    ``str.format`` templates over ``value``.
+    """
+
+    rule_id: str
+    element_id: str
+    kind: str
+    plain_message: str
+    technical_message: str
+    rule_source: str
+    fix_hint: str
+    severity: str = "error"
+    allowed: frozenset[str] = frozenset()
+    pattern: re.Pattern[str] | None = None
+    expected: str = ""
+
+    def evaluate(self, stage: str, index: ElementIndex) -> ValidationIssue | None:
+        value: str | None = None
+        if self.kind == "section":
+            if index.all(self.element_id):
+                return None
+        else:
+            value = index.text(self.element_id)
+            if self.kind == "required":
+                if value is not None:
+                    return None
+            elif value is None or self._accepts(value):
+                return None
+        return _make_issue(
+            self.severity,
+            stage,
+            self.rule_id,
+            self.element_id,
+            self.plain_message.format(value=value),
+            self.technical_message.format(value=value),
+            self.rule_source,
+            self.fix_hint,
+        )
+
+    def _accepts(self, value: str) -> bool:
+        if self.kind == "allowed":
+            return value in self.allowed
+        if self.kind == "pattern":
+            return self.pattern is not None and self.pattern.match(value) is not None
+        return value.upper() == self.expected
+
+
+def _required(element_id: str, rule_id: str, plain: str, technical: str, source: str, hint: str) -> Rule:
+    return Rule(rule_id, element_id, "required", plain, technical, source, hint)
+
+
+def _timestamp(element_id: str) -> Rule:
+    _, label = _ui_info(element_id)
+    return Rule(
+        "WI-STATE-003",
+        element_id,
+        "pattern",
+        f"{label} has an invalid date/time format: '{{value}}'.",
+        f"{element_id} value={{value!r}} does not match ISO 8601 pattern.",
+        "Wisconsin",
+        "Use ISO 8601 format: YYYY-MM-DDTHH:MM:SSZ or with offset (e.g. 2024-01-15T14:30:00-06:00).",
+        pattern=_ISO8601_RE,
+    )
+
+
+NATIONAL_SCHEMATRON_RULES: tuple[Rule, ...] = (
+    _required(
+        "eRecord.01",
+        "NEMSIS-001",
+        "PCR Report Number (eRecord.01) is missing or empty.",
+        "eRecord.01 element not found or has no text content.",
+        "National NEMSIS",
+        "Add a unique PCR report number to eRecord.01.",
+    ),
+    _required(
+        "eIncident.01",
+        "NEMSIS-002",
+        "Incident Number (eIncident.01) is missing or empty.",
+        "eIncident.01 element not found.",
+        "National NEMSIS",
+        "Populate eIncident.01 with the incident number.",
+    ),
+    _required(
+        "eTimes.01",
+        "NEMSIS-003",
+        "PSAP Call Time (eTimes.01) is required but missing.",
+        "eTimes.01 element not found.",
+        "National NEMSIS",
+        "Set eTimes.01 to the PSAP call date/time in ISO 8601 format.",
+    ),
+    _required(
+        "eTimes.03",
+        "NEMSIS-004",
+        "Unit Notified Time (eTimes.03) is required but missing.",
+        "eTimes.03 element not found.",
+        "National NEMSIS",
+        "Set eTimes.03 to the unit notified date/time.",
+    ),
+    _required(
+        "eNarrative.01",
+        "NEMSIS-008",
+        "Narrative (eNarrative.01) is required but missing.",
+        "eNarrative.01 element not found.",
+        "National NEMSIS",
+        "Add a patient care narrative to eNarrative.01.",
+    ),
+    _required(
+        "eDisposition.27",
+        "NEMSIS-009",
+        "Final Patient Acuity (eDisposition.27) is required but missing.",
+        "eDisposition.27 element not found.",
+        "National NEMSIS",
+        "Set eDisposition.27 to the final patient acuity code.",
+    ),
+    Rule(
+        "NEMSIS-005",
+        "ePatient",
+        "section",
+        "The ePatient section is missing from this PCR.",
+        "No ePatient element found in document.",
+        "National NEMSIS",
+        "Include the ePatient section with at least the required demographic fields.",
+    ),
+    Rule(
+        "NEMSIS-007",
+        "eVitals",
+        "section",
+        "At least one set of vital signs (eVitals) is required.",
+        "No eVitals element found in document.",
+        "National NEMSIS",
+        "Add at least one VitalGroup/eVitals section with vital sign measurements.",
+    ),
+)
+
+WI_SCHEMATRON_RULES: tuple[Rule, ...] = (
+    _required(
+        "eTimes.06",
+        "WI-001",
+        "Wisconsin requires Arrived Scene Time (eTimes.06).",
+        "eTimes.06 not found.",
+        "Wisconsin",
+        "Set eTimes.06 to the unit arrived on scene date/time.",
+    ),
+    _required(
+        "eTimes.07",
+        "WI-002",
+        "Wisconsin requires Patient Contact Time (eTimes.07).",
+        "eTimes.07 not found.",
+        "Wisconsin",
+        "Set eTimes.07 to the patient contact date/time.",
+    ),
+    _required(
+        "eResponse.13",
+        "WI-003",
+        "Wisconsin requires Unit Call Sign (eResponse.13).",
+        "eResponse.13 not found.",
+        "Wisconsin",
+        "Populate eResponse.13 with the unit's call sign.",
+    ),
+    _required(
+        "eSituation.11",
+        "WI-004",
+        "Wisconsin requires Primary Impression (eSituation.11).",
+        "eSituation.11 not found.",
+        "Wisconsin",
+        "Select a provider primary impression code for eSituation.11.",
+    ),
+    _required(
+        "eResponse.23",
+        "WI-005",
+        "Wisconsin requires Transport Mode (eResponse.23).",
+        "eResponse.23 not found.",
+        "Wisconsin",
+        "Set eResponse.23 to the appropriate transport mode code.",
+    ),
+    Rule(
+        "WI-006",
+        "dAgency.04",
+        "equals",
+        "Agency State (dAgency.04) is '{value}', expected 'WI' for Wisconsin submissions.",
+        "dAgency.04 value={value!r}; expected 'WI'.",
+        "Wisconsin",
+        "Set dAgency.04 to 'WI' for Wisconsin EMS agency submissions.",
+        severity="warning",
+        expected="WI",
+    ),
+)
+
+WI_STATE_RULES: tuple[Rule, ...] = (
+    Rule(
+        "WI-STATE-001",
+        "ePatient.13",
+        "allowed",
+        "Patient Gender code '{value}' is not a valid NEMSIS code.",
+        f"ePatient.13 value={{value!r}}; valid codes: {sorted(VALID_GENDER_CODES)}",
+        "Wisconsin",
+        "Use a valid NEMSIS gender code: 9906001 (Male), 9906003 (Female), 9906009 (Unknown).",
+        allowed=frozenset(VALID_GENDER_CODES),
+    ),
+    Rule(
+        "WI-STATE-002",
+        "eDisposition.27",
+        "allowed",
+        "Final Patient Acuity code '{value}' is not a valid NEMSIS code.",
+        f"eDisposition.27 value={{value!r}}; valid codes: {sorted(VALID_ACUITY_CODES)}",
+        "Wisconsin",
+        "Use a valid NEMSIS final acuity code from the eDisposition.27 value set.",
+        allowed=frozenset(VALID_ACUITY_CODES),
+    ),
+    *(_timestamp(ts) for ts in ("eTimes.01", "eTimes.03", "eTimes.06", "eTimes.07", "eTimes.11")),
+)
+
+# (stage, rules, state the stage applies to; None for every state)
+STAGES: tuple[tuple[str, tuple[Rule, ...], str | None], ...] = (
+    ("national_schematron", NATIONAL_SCHEMATRON_RULES, None),
+    ("wi_schematron", WI_SCHEMATRON_RULES, "WI"),
+    ("wi_state", WI_STATE_RULES, "WI"),
+)
+
+
+def _parse(xml_bytes: bytes) -> tuple[Any | None, list[ValidationIssue]]:
+    """Parse once for every stage; syntax errors become XSD-001 issues."""
+    if _LXML_AVAILABLE:
+        # Entities are not expanded: element text is echoed into issue messages.
+        parser = lxml_etree.XMLParser(resolve_entities=False, no_network=True)
+        try:
+            return lxml_etree.fromstring(xml_bytes, parser), []
+        except lxml_etree.XMLSyntaxError as exc:
+            return None, [
+                _make_issue(
+                    severity="error",
+                    stage="xsd",
+                    rule_id="XSD-001",
+                    element_id="structure",
+                    plain_message=f"XML syntax error at line {err.line}: {err.message}",
+                    technical_message=str(err),
+                    rule_source="Structure",
+                    fix_hint="Fix XML syntax near the indicated line.",
+                )
+                for err in exc.error_log
+            ]
+    try:
+        return ET.fromstring(xml_bytes), []
+    except ET.ParseError as exc:
+        return None, [
+            _make_issue(
+                severity="error",
+                stage="xsd",
+                rule_id="XSD-001",
+                element_id="structure",
+                plain_message=f"XML parse error: {exc}",
+                technical_message=str(exc),
+                rule_source="Structure",
+                fix_hint="Fix XML syntax error in the document.",
+            )
+        ]
+
+
 class NEMSISValidator:
     def validate_xml_bytes(self, xml_bytes: bytes, state_code: str = "WI") -> ValidationResult:
         all_issues: list[ValidationIssue] = []
         stage_results: dict[str, Any] = {}
-        root: ET.Element | None = None
 
-        xsd_issues = self._stage_xsd(xml_bytes)
+        root, xsd_issues = _parse(xml_bytes)
+        if root is not None:
+            xsd_issues.extend(self._stage_xsd(xml_bytes))
         all_issues.extend(xsd_issues)
         stage_results["xsd"] = {
             "passed": not any(i.severity == "error" for i in xsd_issues),
             "issue_count": len(xsd_issues),
         }
 
-        with contextlib.suppress(ET.ParseError):
-            root = ET.fromstring(xml_bytes)
-
         if root is not None:
-            nat_issues = self._stage_national_schematron(root)
-            all_issues.extend(nat_issues)
-            stage_results["national_schematron"] = {
-                "passed": not any(i.severity == "error" for i in nat_issues),
-                "issue_count": len(nat_issues),
-            }
-
-            if state_code.upper() == "WI":
-                wi_issues = self._stage_wi_schematron(root)
-                all_issues.extend(wi_issues)
-                stage_results["wi_schematron"] = {
-                    "passed": not any(i.severity == "error" for i in wi_issues),
-                    "issue_count": len(wi_issues),
-                }
-
-                wi_state_issues = self._stage_wi_state(root)
-                all_issues.extend(wi_state_issues)
-                stage_results["wi_state"] = {
-                    "passed": not any(i.severity == "error" for i in wi_state_issues),
-                    "issue_count": len(wi_state_issues),
+            index = ElementIndex(root)
+            for stage, rules, state in STAGES:
+                if state is not None and state_code.upper() != state:
+                    continue
+                issues = [issue for rule in rules if (issue := rule.evaluate(stage, index))]
+                all_issues.extend(issues)
+                stage_results[stage] = {
+                    "passed": not any(i.severity == "error" for i in issues),
+                    "issue_count": len(issues),
                 }
         else:
-            for stage in ("national_schematron", "wi_schematron", "wi_state"):
+            for stage, _, _ in STAGES:
                 stage_results[stage] = {"passed": False, "issue_count": 0, "skipped": True}
 
         valid = not any(i.severity == "error" for i in all_issues)
@@ -192,288 +451,18 @@ class NEMSISValidator:
         )
 
     def _stage_xsd(self, xml_bytes: bytes) -> list[ValidationIssue]:
-        issues: list[ValidationIssue] = []
-
-        if _LXML_AVAILABLE:
-            try:
-                lxml_etree.fromstring(xml_bytes)
-            except lxml_etree.XMLSyntaxError as exc:
-                for err in exc.error_log:
-                    issues.append(
-                        _make_issue(
-                            severity="error",
-                            stage="xsd",
-                            rule_id="XSD-001",
-                            element_id="structure",
-                            plain_message=f"XML syntax error at line {err.line}: {err.message}",
-                            technical_message=str(err),
-                            rule_source="Structure",
-                            fix_hint="Fix XML syntax near the indicated line.",
-                        )
-                    )
-                return issues
-        else:
-            try:
-                ET.fromstring(xml_bytes)
-            except ET.ParseError as exc:
-                issues.append(
-                    _make_issue(
-                        severity="error",
-                        stage="xsd",
-                        rule_id="XSD-001",
-                        element_id="structure",
-                        plain_message=f"XML parse error: {exc}",
-                        technical_message=str(exc),
-                        rule_source="Structure",
-                        fix_hint="Fix XML syntax error in the document.",
-                    )
-                )
-                return issues
-
         preview = xml_bytes[:500].decode(errors="ignore")
-        if "EMSDataSet" not in preview and "DEMDataSet" not in preview:
-            issues.append(
-                _make_issue(
-                    severity="warning",
-                    stage="xsd",
-                    rule_id="XSD-002",
-                    element_id="structure",
-                    plain_message="Root element does not appear to be a NEMSIS EMSDataSet or DEMDataSet.",
-                    technical_message="Neither 'EMSDataSet' nor 'DEMDataSet' found in first 500 bytes.",
-                    rule_source="Structure",
-                    fix_hint="Ensure the root element is <EMSDataSet> or <DEMDataSet> with the correct NEMSIS namespace.",
-                )
+        if "EMSDataSet" in preview or "DEMDataSet" in preview:
+            return []
+        return [
+            _make_issue(
+                severity="warning",
+                stage="xsd",
+                rule_id="XSD-002",
+                element_id="structure",
+                plain_message="Root element does not appear to be a NEMSIS EMSDataSet or DEMDataSet.",
+                technical_message="Neither 'EMSDataSet' nor 'DEMDataSet' found in first 500 bytes.",
+                rule_source="Structure",
+                fix_hint="Ensure the root element is <EMSDataSet> or <DEMDataSet> with the correct NEMSIS namespace.",
             )
-
-        return issues
-
-    def _stage_national_schematron(self, root: ET.Element) -> list[ValidationIssue]:
-        issues: list[ValidationIssue] = []
-
-        checks = [
-            (
-                "eRecord.01",
-                "NEMSIS-001",
-                "PCR Report Number (eRecord.01) is missing or empty.",
-                "eRecord.01 element not found or has no text content.",
-                "National NEMSIS",
-                "Add a unique PCR report number to eRecord.01.",
-            ),
-            (
-                "eIncident.01",
-                "NEMSIS-002",
-                "Incident Number (eIncident.01) is missing or empty.",
-                "eIncident.01 element not found.",
-                "National NEMSIS",
-                "Populate eIncident.01 with the incident number.",
-            ),
-            (
-                "eTimes.01",
-                "NEMSIS-003",
-                "PSAP Call Time (eTimes.01) is required but missing.",
-                "eTimes.01 element not found.",
-                "National NEMSIS",
-                "Set eTimes.01 to the PSAP call date/time in ISO 8601 format.",
-            ),
-            (
-                "eTimes.03",
-                "NEMSIS-004",
-                "Unit Notified Time (eTimes.03) is required but missing.",
-                "eTimes.03 element not found.",
-                "National NEMSIS",
-                "Set eTimes.03 to the unit notified date/time.",
-            ),
-            (
-                "eNarrative.01",
-                "NEMSIS-008",
-                "Narrative (eNarrative.01) is required but missing.",
-                "eNarrative.01 element not found.",
-                "National NEMSIS",
-                "Add a patient care narrative to eNarrative.01.",
-            ),
-            (
-                "eDisposition.27",
-                "NEMSIS-009",
-                "Final Patient Acuity (eDisposition.27) is required but missing.",
-                "eDisposition.27 element not found.",
-                "National NEMSIS",
-                "Set eDisposition.27 to the final patient acuity code.",
-            ),
         ]
-
-        for element_id, rule_id, plain_msg, tech_msg, source, hint in checks:
-            element_id.split(".")[-1] if "." in element_id else element_id
-            parent_local = element_id.split(".")[0] if "." in element_id else element_id
-            val = _find_text(root, parent_local + "." + (element_id.split(".")[-1]))
-            if val is None:
-                issues.append(
-                    _make_issue(
-                        "error",
-                        "national_schematron",
-                        rule_id,
-                        element_id,
-                        plain_msg,
-                        tech_msg,
-                        source,
-                        hint,
-                    )
-                )
-
-        epatient_elems = _find_all(root, "ePatient")
-        if not epatient_elems:
-            issues.append(
-                _make_issue(
-                    severity="error",
-                    stage="national_schematron",
-                    rule_id="NEMSIS-005",
-                    element_id="ePatient",
-                    plain_message="The ePatient section is missing from this PCR.",
-                    technical_message="No ePatient element found in document.",
-                    rule_source="National NEMSIS",
-                    fix_hint="Include the ePatient section with at least the required demographic fields.",
-                )
-            )
-
-        vital_groups = _find_all(root, "eVitals")
-        if not vital_groups:
-            issues.append(
-                _make_issue(
-                    severity="error",
-                    stage="national_schematron",
-                    rule_id="NEMSIS-007",
-                    element_id="eVitals",
-                    plain_message="At least one set of vital signs (eVitals) is required.",
-                    technical_message="No eVitals element found in document.",
-                    rule_source="National NEMSIS",
-                    fix_hint="Add at least one VitalGroup/eVitals section with vital sign measurements.",
-                )
-            )
-
-        return issues
-
-    def _stage_wi_schematron(self, root: ET.Element) -> list[ValidationIssue]:
-        issues: list[ValidationIssue] = []
-
-        wi_checks = [
-            (
-                "eTimes.06",
-                "WI-001",
-                "Wisconsin requires Arrived Scene Time (eTimes.06).",
-                "eTimes.06 not found.",
-                "Set eTimes.06 to the unit arrived on scene date/time.",
-            ),
-            (
-                "eTimes.07",
-                "WI-002",
-                "Wisconsin requires Patient Contact Time (eTimes.07).",
-                "eTimes.07 not found.",
-                "Set eTimes.07 to the patient contact date/time.",
-            ),
-            (
-                "eResponse.13",
-                "WI-003",
-                "Wisconsin requires Unit Call Sign (eResponse.13).",
-                "eResponse.13 not found.",
-                "Populate eResponse.13 with the unit's call sign.",
-            ),
-            (
-                "eSituation.11",
-                "WI-004",
-                "Wisconsin requires Primary Impression (eSituation.11).",
-                "eSituation.11 not found.",
-                "Select a provider primary impression code for eSituation.11.",
-            ),
-            (
-                "eResponse.23",
-                "WI-005",
-                "Wisconsin requires Transport Mode (eResponse.23).",
-                "eResponse.23 not found.",
-                "Set eResponse.23 to the appropriate transport mode code.",
-            ),
-        ]
-
-        for element_id, rule_id, plain_msg, tech_msg, hint in wi_checks:
-            val = _find_text(root, element_id)
-            if val is None:
-                issues.append(
-                    _make_issue(
-                        "error",
-                        "wi_schematron",
-                        rule_id,
-                        element_id,
-                        plain_msg,
-                        tech_msg,
-                        "Wisconsin",
-                        hint,
-                    )
-                )
-
-        agency_state = _find_text(root, "dAgency.04")
-        if agency_state is not None and agency_state.upper() != "WI":
-            issues.append(
-                _make_issue(
-                    severity="warning",
-                    stage="wi_schematron",
-                    rule_id="WI-006",
-                    element_id="dAgency.04",
-                    plain_message=f"Agency State (dAgency.04) is '{agency_state}', expected 'WI' for Wisconsin submissions.",
-                    technical_message=f"dAgency.04 value={agency_state!r}; expected 'WI'.",
-                    rule_source="Wisconsin",
-                    fix_hint="Set dAgency.04 to 'WI' for Wisconsin EMS agency submissions.",
-                )
-            )
-
-        return issues
-
-    def _stage_wi_state(self, root: ET.Element) -> list[ValidationIssue]:
-        issues: list[ValidationIssue] = []
-
-        gender_val = _find_text(root, "ePatient.13")
-        if gender_val is not None and gender_val not in VALID_GENDER_CODES:
-            issues.append(
-                _make_issue(
-                    severity="error",
-                    stage="wi_state",
-                    rule_id="WI-STATE-001",
-                    element_id="ePatient.13",
-                    plain_message=f"Patient Gender code '{gender_val}' is not a valid NEMSIS code.",
-                    technical_message=f"ePatient.13 value={gender_val!r}; valid codes: {sorted(VALID_GENDER_CODES)}",
-                    rule_source="Wisconsin",
-                    fix_hint="Use a valid NEMSIS gender code: 9906001 (Male), 9906003 (Female), 9906009 (Unknown).",
-                )
-            )
-
-        acuity_val = _find_text(root, "eDisposition.27")
-        if acuity_val is not None and acuity_val not in VALID_ACUITY_CODES:
-            issues.append(
-                _make_issue(
-                    severity="error",
-                    stage="wi_state",
-                    rule_id="WI-STATE-002",
-                    element_id="eDisposition.27",
-                    plain_message=f"Final Patient Acuity code '{acuity_val}' is not a valid NEMSIS code.",
-                    technical_message=f"eDisposition.27 value={acuity_val!r}; valid codes: {sorted(VALID_ACUITY_CODES)}",
-                    rule_source="Wisconsin",
-                    fix_hint="Use a valid NEMSIS final acuity code from the eDisposition.27 value set.",
-                )
-            )
-
-        timestamp_fields = ["eTimes.01", "eTimes.03", "eTimes.06", "eTimes.07", "eTimes.11"]
-        for ts_field in timestamp_fields:
-            val = _find_text(root, ts_field)
-            if val is not None and not _ISO8601_RE.match(val):
-                section, label = _ui_info(ts_field)
-                issues.append(
-                    _make_issue(
-                        severity="error",
-                        stage="wi_state",
-                        rule_id="WI-STATE-003",
-                        element_id=ts_field,
-                        plain_message=f"{label} has an invalid date/time format: '{val}'.",
-                        technical_message=f"{ts_field} value={val!r} does not match ISO 8601 pattern.",
-                        rule_source="Wisconsin",
-                        fix_hint="Use ISO 8601 format: YYYY-MM-DDTHH:MM:SSZ or with offset (e.g. 2024-01-15T14:30:00-06:00).",
-                    )
-                )
-
-        return issues
@@ -1,12 +1,33 @@
+"""NEMSIS XSD validation backed by a process-wide compiled-schema registry.
+
+Compiling the NEMSIS EMS/DEM schemas (with all their includes) costs far more
+than validating one PCR, so each schema is located and compiled once per
+``(dataset type, NEMSIS version, state pack)`` and reused by every validator
+in the process.  ``warm_schema_cache`` compiles them ahead of the first
+request, and ``SchemaRegistry.invalidate`` drops them when a resource pack is
+activated; an XSD whose file changed on disk is recompiled on next use.
+
+lxml keeps a compiled schema's ``error_log`` on the schema object, so the
+validate-and-read-errors step holds a per-schema lock.
+"""
+
 from __future__ import annotations
 
-import os
-from pathlib import Path
-from typing import Optional
+import logging
+import re
+import threading
+from collections.abc import Iterable
 from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
 
 XSD_BASE = Path(__file__).resolve().parent.parent.parent / "compliance" / "nemsis" / "v3.5.1"
 
+DEFAULT_NEMSIS_VERSION = "3.5.1"
+DATASET_TYPES = ("EMS", "DEM")
+_VERSION_DIR = re.compile(r"v\d+(\.\d+)*")
+
 
 @dataclass
 class XSDValidationResult:
@@ -24,28 +45,165 @@ class XSDValidationResult:
         }
 
 
-class NEMSISXSDValidator:
-    def __init__(self, xsd_dir: Optional[str] = None):
-        self._xsd_dir = Path(xsd_dir) if xsd_dir else XSD_BASE
-        self._ems_schema = None
-        self._dem_schema = None
+@dataclass(frozen=True, slots=True)
+class SchemaKey:
+    dataset_type: str
+    nemsis_version: str = DEFAULT_NEMSIS_VERSION
+    state_code: str = ""
+
 
-    def _load_schema(self, schema_path: Path):
+class CompiledSchema:
+    """One compiled XSD (or the reason there is none) plus its validation lock."""
+
+    def __init__(self, path: Path | None, schema=None, mtime_ns: int = 0, warning: str = "") -> None:
+        self.path = path
+        self.schema = schema
+        self.mtime_ns = mtime_ns
+        self.warning = warning
+        self._lock = threading.Lock()
+
+    def stale(self) -> bool:
+        if self.path is None:
+            return False
         try:
-            from lxml import etree
+            return self.path.stat().st_mtime_ns != self.mtime_ns
+        except OSError:
+            return True
+
+    def validate(self, doc) -> list[str]:
+        """Schema errors for ``doc`` (empty when valid)."""
+        with self._lock:
+            if self.schema.validate(doc):
+                return []
+            return [f"Line {error.line}: {error.message}" for error in self.schema.error_log]
 
-            with open(schema_path, "rb") as f:
-                schema_doc = etree.parse(f)
-            return etree.XMLSchema(schema_doc)
-        except ImportError:
-            return None
-        except Exception:
-            return None
 
-    def _find_xsd(self, pattern: str) -> Optional[Path]:
-        for p in self._xsd_dir.rglob(pattern):
-            return p
+def _version_dir(xsd_dir: Path, nemsis_version: str) -> Path | None:
+    """The directory holding ``nemsis_version``'s XSDs.
+
+    ``xsd_dir`` may contain ``v<version>/`` subdirectories, or be one itself
+    (like ``XSD_BASE``) with other versions as siblings.  An unversioned
+    directory only serves the default version.
+    """
+    name = f"v{nemsis_version}"
+    versioned = _VERSION_DIR.fullmatch(xsd_dir.name) is not None
+    candidates = [xsd_dir / name, xsd_dir.parent / name] if versioned else [xsd_dir / name]
+    for candidate in candidates:
+        if candidate.is_dir():
+            return candidate
+    if nemsis_version == DEFAULT_NEMSIS_VERSION and not versioned:
+        return xsd_dir
+    return None
+
+
+def _find_xsd(xsd_dir: Path, key: SchemaKey) -> Path | None:
+    version_dir = _version_dir(xsd_dir, key.nemsis_version)
+    if version_dir is None:
         return None
+    # A state pack's own XSDs (``<version>/<STATE>/``) win over the national ones.
+    dirs = [version_dir / key.state_code.upper(), version_dir] if key.state_code else [version_dir]
+    for directory in dirs:
+        if not directory.is_dir():
+            continue
+        for pattern in (f"*{key.dataset_type}*DataSet*.xsd", "*.xsd"):
+            for path in sorted(directory.rglob(pattern)):
+                return path
+    return None
+
+
+def _compile(xsd_dir: Path, key: SchemaKey) -> CompiledSchema:
+    from lxml import etree
+
+    path = _find_xsd(xsd_dir, key)
+    if path is None:
+        return CompiledSchema(
+            None,
+            warning=(
+                f"No XSD file found for {key.dataset_type} dataset in {xsd_dir}"
+                if key.nemsis_version == DEFAULT_NEMSIS_VERSION
+                else f"No NEMSIS {key.nemsis_version} XSD file found for "
+                f"{key.dataset_type} dataset in {xsd_dir}"
+            ),
+        )
+    mtime_ns = path.stat().st_mtime_ns
+    try:
+        # Parse by path so relative xs:include/xs:import locations resolve.
+        schema = etree.XMLSchema(etree.parse(str(path)))
+    except (etree.XMLSyntaxError, etree.XMLSchemaParseError, OSError) as exc:
+        logger.warning("nemsis_xsd_compile_failed path=%s error=%s", path, exc)
+        return CompiledSchema(path, mtime_ns=mtime_ns, warning=f"Could not load XSD schema from {path}")
+    return CompiledSchema(path, schema, mtime_ns)
+
+
+class SchemaRegistry:
+    """Compiled schemas shared by every validator in the process (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[SchemaKey, Path], CompiledSchema] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: SchemaKey, xsd_dir: Path = XSD_BASE) -> CompiledSchema:
+        entry = self._entries.get((key, xsd_dir))
+        if entry is not None and not entry.stale():
+            return entry
+        with self._lock:
+            entry = self._entries.get((key, xsd_dir))
+            if entry is None or entry.stale():
+                entry = _compile(xsd_dir, key)
+                self._entries[(key, xsd_dir)] = entry
+            return entry
+
+    def invalidate(self, *, nemsis_version: str | None = None, state_code: str | None = None) -> int:
+        """Drop compiled schemas matching the version/state (all when both are None)."""
+        with self._lock:
+            stale = [
+                k
+                for k in self._entries
+                if (nemsis_version is None or k[0].nemsis_version == nemsis_version)
+                and (state_code is None or k[0].state_code == state_code.upper())
+            ]
+            for k in stale:
+                del self._entries[k]
+        return len(stale)
+
+    def warm(self, keys: Iterable[SchemaKey], xsd_dir: Path = XSD_BASE) -> None:
+        for key in keys:
+            self.get(key, xsd_dir)
+
+
+_registry = SchemaRegistry()
+
+
+def get_schema_registry() -> SchemaRegistry:
+    return _registry
+
+
+def warm_schema_cache(state_codes: Iterable[str] = ("",)) -> None:
+    """Compile the EMS/DEM schemas ahead of the first validation."""
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return
+    _registry.warm(
+        SchemaKey(dataset_type, DEFAULT_NEMSIS_VERSION, state.upper())
+        for state in state_codes
+        for dataset_type in DATASET_TYPES
+    )
+
+
+class NEMSISXSDValidator:
+    def __init__(
+        self,
+        xsd_dir: str | None = None,
+        *,
+        nemsis_version: str = DEFAULT_NEMSIS_VERSION,
+        state_code: str = "",
+        registry: SchemaRegistry | None = None,
+    ):
+        self._xsd_dir = Path(xsd_dir) if xsd_dir else XSD_BASE
+        self._nemsis_version = nemsis_version
+        self._state_code = state_code.upper()
+        self._registry = registry or _registry
 
     def validate_ems_dataset(self, xml_content: str | bytes) -> XSDValidationResult:
         return self._validate(xml_content, "EMS")
@@ -54,7 +212,7 @@ class NEMSISXSDValidator:
         return self._validate(xml_content, "DEM")
 
     def _validate(self, xml_content: str | bytes, dataset_type: str) -> XSDValidationResult:
-        result = XSDValidationResult(valid=True)
+        result = XSDValidationResult(valid=True, xsd_version=self._nemsis_version)
 
         if isinstance(xml_content, str):
             xml_content = xml_content.encode("utf-8")
@@ -72,21 +230,16 @@ class NEMSISXSDValidator:
             result.errors.append(f"XML parse error: {e}")
             return result
 
-        xsd_file = self._find_xsd(f"*{dataset_type}*DataSet*.xsd")
-        if not xsd_file:
-            xsd_file = self._find_xsd("*.xsd")
-
-        if xsd_file:
-            schema = self._load_schema(xsd_file)
-            if schema:
-                if not schema.validate(doc):
-                    result.valid = False
-                    for error in schema.error_log:
-                        result.errors.append(f"Line {error.line}: {error.message}")
-            else:
-                result.warnings.append(f"Could not load XSD schema from {xsd_file}")
+        compiled = self._registry.get(
+            SchemaKey(dataset_type, self._nemsis_version, self._state_code), self._xsd_dir
+        )
+        if compiled.schema is not None:
+            errors = compiled.validate(doc)
+            if errors:
+                result.valid = False
+                result.errors.extend(errors)
         else:
-            result.warnings.append(f"No XSD file found for {dataset_type} dataset in {self._xsd_dir}")
+            result.warnings.append(compiled.warning)
 
         root_tag = etree.QName(doc.tag).localname if doc.tag else ""
         if dataset_type == "EMS" and "EMS" not in root_tag.upper():
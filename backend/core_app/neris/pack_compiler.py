@@ -60,72 +60,73 @@ class NERISPackCompiler:
         entity_rules = self._build_entity_rules(raw_files, value_sets)
         incident_rules = self._build_incident_rules(raw_files, value_sets)
 
-        for vs_code, vs_data in value_sets.items():
-            vs_def = await self.svc.create(
-                table="neris_value_set_definitions",
-                tenant_id=self.tenant_id,
-                actor_user_id=self.actor_user_id,
-                data={
-                    "pack_id": str(pack_id),
-                    "code": vs_code,
-                    "name": vs_data.get("name", vs_code),
-                    "version": vs_data.get("version", ""),
-                    "source_path": vs_data.get("source_path", ""),
-                },
-                correlation_id=correlation_id,
-            )
-            for item in vs_data.get("items", []):
-                await self.svc.create(
-                    table="neris_value_set_items",
+        async with self.svc.batch_events():
+            for vs_code, vs_data in value_sets.items():
+                vs_def = await self.svc.create(
+                    table="neris_value_set_definitions",
                     tenant_id=self.tenant_id,
                     actor_user_id=self.actor_user_id,
                     data={
-                        "definition_id": str(vs_def["id"]),
                         "pack_id": str(pack_id),
-                        "value_code": item.get("code", ""),
-                        "display": item.get("display", ""),
-                        "deprecated": item.get("deprecated", False),
-                        "metadata_json": item.get("metadata", {}),
+                        "code": vs_code,
+                        "name": vs_data.get("name", vs_code),
+                        "version": vs_data.get("version", ""),
+                        "source_path": vs_data.get("source_path", ""),
                     },
                     correlation_id=correlation_id,
                 )
+                for item in vs_data.get("items", []):
+                    await self.svc.create(
+                        table="neris_value_set_items",
+                        tenant_id=self.tenant_id,
+                        actor_user_id=self.actor_user_id,
+                        data={
+                            "definition_id": str(vs_def["id"]),
+                            "pack_id": str(pack_id),
+                            "value_code": item.get("code", ""),
+                            "display": item.get("display", ""),
+                            "deprecated": item.get("deprecated", False),
+                            "metadata_json": item.get("metadata", {}),
+                        },
+                        correlation_id=correlation_id,
+                    )
 
-        for entity_type, rules in [("ENTITY", entity_rules), ("INCIDENT", incident_rules)]:
-            rules_bytes = json.dumps(rules, indent=2).encode()
-            s3_key = f"{PACK_S3_PREFIX}/{pack_id}/compiled/rules_{entity_type.lower()}.json"
-            if bucket:
-                put_bytes(
-                    bucket=bucket, key=s3_key, content=rules_bytes, content_type="application/json"
+            for entity_type, rules in [("ENTITY", entity_rules), ("INCIDENT", incident_rules)]:
+                rules_bytes = json.dumps(rules, indent=2).encode()
+                s3_key = f"{PACK_S3_PREFIX}/{pack_id}/compiled/rules_{entity_type.lower()}.json"
+                if bucket:
+                    put_bytes(
+                        bucket=bucket, key=s3_key, content=rules_bytes, content_type="application/json"
+                    )
+
+                await self.svc.create(
+                    table="neris_compiled_rules",
+                    tenant_id=self.tenant_id,
+                    actor_user_id=self.actor_user_id,
+                    data={
+                        "pack_id": str(pack_id),
+                        "entity_type": entity_type,
+                        "rules_json": rules,
+                        "schema_version": (pack.get("data") or {}).get("source_ref", ""),
+                        "compiled_at": datetime.now(UTC).isoformat(),
+                        "s3_key": s3_key,
+                    },
+                    correlation_id=correlation_id,
                 )
 
-            await self.svc.create(
-                table="neris_compiled_rules",
+            pdata = dict(pack.get("data") or {})
+            pdata["status"] = "staged"
+            pdata["compiled"] = True
+            pdata["compiled_at"] = datetime.now(UTC).isoformat()
+            await self.svc.update(
+                table="neris_packs",
                 tenant_id=self.tenant_id,
+                record_id=pack_id,
                 actor_user_id=self.actor_user_id,
-                data={
-                    "pack_id": str(pack_id),
-                    "entity_type": entity_type,
-                    "rules_json": rules,
-                    "schema_version": (pack.get("data") or {}).get("source_ref", ""),
-                    "compiled_at": datetime.now(UTC).isoformat(),
-                    "s3_key": s3_key,
-                },
+                patch=pdata,
+                expected_version=pack.get("version", 1),
                 correlation_id=correlation_id,
             )
-
-        pdata = dict(pack.get("data") or {})
-        pdata["status"] = "staged"
-        pdata["compiled"] = True
-        pdata["compiled_at"] = datetime.now(UTC).isoformat()
-        await self.svc.update(
-            table="neris_packs",
-            tenant_id=self.tenant_id,
-            record_id=pack_id,
-            actor_user_id=self.actor_user_id,
-            patch=pdata,
-            expected_version=pack.get("version", 1),
-            correlation_id=correlation_id,
-        )
         return {
             "pack_id": str(pack_id),
             "entity_rules_fields": len(entity_rules.get("sections", [])),
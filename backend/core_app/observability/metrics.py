@@ -0,0 +1,369 @@
+"""Prometheus instrumentation of the API's hot paths.
+
+* ``http_request_duration_seconds{method,route,status}`` and
+  ``http_requests_in_flight``, recorded by ``RequestPipelineMiddleware``.  The
+  route label is the matched path template (``/api/v1/cases/{case_id}``), so
+  ids in URLs never create new series.
+* ``db_query_duration_seconds{table,operation}`` from cursor events on every
+  engine built by ``core_app.db.pool``.  ``operation`` is the repository method
+  the statement ran under (``@instrument_repository``), else the SQL verb.
+* ``redis_command_duration_seconds{command}`` for every ``redis.asyncio`` client.
+* ``external_call_duration_seconds{service,operation,outcome}``: Telnyx, Lob,
+  Stripe and OpenAI through ``external_call``; S3, Textract and every other AWS
+  API through botocore events on the default boto3 session.
+* ``worker_job_duration_seconds{worker,outcome}`` and
+  ``worker_queue_lag_seconds{worker}`` (SQS ``SentTimestamp`` to pickup).
+
+Under gunicorn, ``PROMETHEUS_MULTIPROC_DIR`` is set (see ``gunicorn.conf.py``),
+so the metrics above are kept in per-process files and ``/metrics`` aggregates
+every worker.  Callback collectors (DB pool and realtime gauges) cannot be
+shared that way, so they are reported for the serving process only, with a
+``pid`` label.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import re
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from prometheus_client import REGISTRY, CollectorRegistry, Gauge, Histogram, generate_latest
+from prometheus_client.metrics_core import Metric
+from prometheus_client.multiprocess import MultiProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+UNMATCHED_ROUTE = "<unmatched>"
+_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+_REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, 5.0)
+_JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=_REQUEST_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served", multiprocess_mode="livesum"
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement latency by table and repository method",
+    ["table", "operation"],
+    buckets=_QUERY_BUCKETS,
+)
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command / pipeline round-trip latency",
+    ["command"],
+    buckets=_QUERY_BUCKETS,
+)
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds",
+    "Latency of calls to third-party APIs",
+    ["service", "operation", "outcome"],
+    buckets=_REQUEST_BUCKETS,
+)
+WORKER_JOB_DURATION = Histogram(
+    "worker_job_duration_seconds",
+    "Background / queue job duration",
+    ["worker", "outcome"],
+    buckets=_JOB_BUCKETS,
+)
+WORKER_QUEUE_LAG = Histogram(
+    "worker_queue_lag_seconds",
+    "Time a job waited in its queue before a worker picked it up",
+    ["worker"],
+    buckets=_JOB_BUCKETS,
+)
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+
+
+def route_template(scope: dict[str, Any]) -> str:
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or UNMATCHED_ROUTE
+
+
+def observe_request(scope: dict[str, Any], status: int, seconds: float) -> None:
+    method = scope.get("method", "")
+    HTTP_REQUEST_DURATION.labels(
+        method=method if method in _METHODS else "OTHER",
+        route=route_template(scope),
+        status=str(status),
+    ).observe(seconds)
+
+
+# ── SQL ───────────────────────────────────────────────────────────────────────
+
+_repository_method: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "repository_method", default=None
+)
+
+_SQL_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+\"?([\w.]+)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=2048)
+def statement_labels(statement: str) -> tuple[str, str]:
+    """(first table referenced, SQL verb) for a statement."""
+    words = statement.split(None, 1)
+    verb = words[0].lower() if words else "unknown"
+    match = _SQL_TABLE.search(statement)
+    return (match.group(1).lower() if match else "-"), verb
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _query_started(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _query_finished(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is None:
+            return
+        table, verb = statement_labels(statement)
+        DB_QUERY_DURATION.labels(
+            table=table, operation=_repository_method.get() or verb
+        ).observe(time.perf_counter() - started)
+
+
+def instrument_repository(cls: type[T]) -> type[T]:
+    """Label SQL run inside each public method as ``<Class>.<method>``."""
+    for name, fn in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(fn):
+            setattr(cls, name, _labelled(fn, f"{cls.__name__}.{name}"))
+    return cls
+
+
+def _labelled(fn: Callable, label: str) -> Callable:
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            token = _repository_method.set(label)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _repository_method.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _repository_method.set(label)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _repository_method.reset(token)
+
+    return wrapper
+
+
+# ── Redis ─────────────────────────────────────────────────────────────────────
+
+
+def instrument_redis() -> None:
+    """Time every ``redis.asyncio`` command and pipeline (idempotent)."""
+    try:
+        from redis.asyncio.client import Pipeline, Redis
+    except ImportError:
+        return
+    if getattr(Redis.execute_command, "_metrics_wrapped", False):
+        return
+
+    execute_command = Redis.execute_command
+    execute_pipeline = Pipeline.execute
+
+    @functools.wraps(execute_command)
+    async def timed_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await execute_command(self, *args, **options)
+        finally:
+            command = str(args[0]).upper() if args else "UNKNOWN"
+            REDIS_COMMAND_DURATION.labels(command=command).observe(time.perf_counter() - started)
+
+    @functools.wraps(execute_pipeline)
+    async def timed_pipeline(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await execute_pipeline(self, *args, **kwargs)
+        finally:
+            REDIS_COMMAND_DURATION.labels(command="PIPELINE").observe(time.perf_counter() - started)
+
+    timed_command._metrics_wrapped = True
+    Redis.execute_command = timed_command
+    Pipeline.execute = timed_pipeline
+
+
+# ── External calls ────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def external_call(service: str, operation: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_CALL_DURATION.labels(
+            service=service, operation=operation, outcome=outcome
+        ).observe(time.perf_counter() - started)
+
+
+def _aws_call_started(model, context, **kwargs) -> None:
+    context["_metrics"] = (model.service_model.service_name, model.name, time.perf_counter())
+
+
+def _aws_call_finished(context, outcome: str) -> None:
+    labels = context.pop("_metrics", None)
+    if labels is None:
+        return
+    service, operation, started = labels
+    EXTERNAL_CALL_DURATION.labels(
+        service=service, operation=operation, outcome=outcome
+    ).observe(time.perf_counter() - started)
+
+
+def _aws_call_returned(http_response, context, **kwargs) -> None:
+    _aws_call_finished(context, "ok" if http_response.status_code < 400 else "error")
+
+
+def _aws_call_raised(context, **kwargs) -> None:
+    _aws_call_finished(context, "error")
+
+
+def instrument_boto3() -> None:
+    """Time every AWS API call made by clients of the default boto3 session.
+
+    botocore copies the session's handlers into each client when it is built,
+    so this must run before the first ``boto3.client()`` / ``boto3.resource()``.
+    """
+    import boto3
+
+    session = boto3._get_default_session()
+    if getattr(session, "_metrics_instrumented", False):
+        return
+    session.events.register("before-call", _aws_call_started)
+    session.events.register("after-call", _aws_call_returned)
+    session.events.register("after-call-error", _aws_call_raised)
+    session._metrics_instrumented = True
+
+
+# ── Workers ───────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def worker_job(worker: str, *, enqueued_at: float | None = None) -> Iterator[None]:
+    """Time one job; ``enqueued_at`` (epoch seconds) also records its queue lag."""
+    if enqueued_at is not None:
+        WORKER_QUEUE_LAG.labels(worker=worker).observe(max(0.0, time.time() - enqueued_at))
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        WORKER_JOB_DURATION.labels(worker=worker, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+
+def sqs_enqueued_at(record: dict[str, Any]) -> float | None:
+    sent = (record.get("attributes") or {}).get("SentTimestamp")
+    try:
+        return int(sent) / 1000 if sent is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def sqs_job(worker: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Instrument a Lambda SQS handler: batch duration and the oldest record's lag.
+
+    Lambda containers are not scraped, so the same figures are logged as a
+    ``worker_job`` line for CloudWatch Logs Insights.
+    """
+
+    def decorate(handler: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(handler)
+        def wrapper(event: Any, context: Any) -> T:
+            records = event.get("Records") if isinstance(event, dict) else None
+            sent = [t for t in map(sqs_enqueued_at, records or []) if t is not None]
+            enqueued_at = min(sent) if sent else None
+            started = time.perf_counter()
+            try:
+                with worker_job(worker, enqueued_at=enqueued_at):
+                    return handler(event, context)
+            finally:
+                logger.info(
+                    "worker_job worker=%s records=%d duration_ms=%d lag_ms=%s",
+                    worker,
+                    len(records or []),
+                    (time.perf_counter() - started) * 1000,
+                    int((time.time() - enqueued_at) * 1000) if enqueued_at else "-",
+                )
+
+        return wrapper
+
+    return decorate
+
+
+# ── Exposition ────────────────────────────────────────────────────────────────
+
+_process_collectors: list[Any] = []
+
+
+def register_process_collector(collector: Any) -> None:
+    """Register a callback collector whose values only exist in this process."""
+    REGISTRY.register(collector)
+    _process_collectors.append(collector)
+
+
+class _PidLabelled:
+    def __init__(self, collectors: Iterable[Any]) -> None:
+        self.collectors = list(collectors)
+
+    def collect(self) -> Iterator[Metric]:
+        pid = str(os.getpid())
+        for collector in self.collectors:
+            for metric in collector.collect():
+                labelled = Metric(metric.name, metric.documentation, metric.type, metric.unit)
+                for s in metric.samples:
+                    labelled.add_sample(
+                        s.name, {**s.labels, "pid": pid}, s.value, s.timestamp, s.exemplar
+                    )
+                yield labelled
+
+
+def exposition() -> bytes:
+    """``/metrics`` payload; aggregates all workers in multiprocess mode."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    registry.register(_PidLabelled(_process_collectors))
+    return generate_latest(registry)
+
+
+def configure_metrics() -> None:
+    """Process-wide client instrumentation; call once at startup."""
+    instrument_redis()
+    instrument_boto3()
@@ -4,7 +4,7 @@ import logging
 from dataclasses import dataclass
 from typing import Any
 
-import stripe
+from core_app.observability.metrics import external_call
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +19,19 @@ class StripeConfig:
     webhook_secret: str | None = None
 
 
-def _configure(cfg: StripeConfig) -> None:
+def _stripe() -> Any:
+    # stripe-python takes ~1s to import; defer it to the first Stripe call.
+    import stripe
+
+    return stripe
+
+
+def _configure(cfg: StripeConfig) -> Any:
     if not cfg.secret_key:
         raise StripeNotConfigured("stripe_secret_key_missing")
+    stripe = _stripe()
     stripe.api_key = cfg.secret_key
+    return stripe
 
 
 def create_connect_checkout_session(
@@ -42,7 +51,7 @@ def create_connect_checkout_session(
     Create a Stripe Checkout Session on the agency's connected account.
     FusionEMS never touches the funds; payment goes directly to the agency.
     """
-    _configure(cfg)
+    stripe = _configure(cfg)
 
     metadata: dict[str, str] = {
         "statement_id": statement_id,
@@ -53,27 +62,28 @@ def create_connect_checkout_session(
     if lob_letter_id:
         metadata["lob_letter_id"] = lob_letter_id
 
-    session = stripe.checkout.Session.create(
-        mode="payment",
-        line_items=[
-            {
-                "price_data": {
-                    "currency": currency,
-                    "product_data": {
-                        "name": "Medical Transport — Balance Due",
-                        "description": f"Statement {statement_id}",
+    with external_call("stripe", "checkout.session.create"):
+        session = stripe.checkout.Session.create(
+            mode="payment",
+            line_items=[
+                {
+                    "price_data": {
+                        "currency": currency,
+                        "product_data": {
+                            "name": "Medical Transport — Balance Due",
+                            "description": f"Statement {statement_id}",
+                        },
+                        "unit_amount": amount_cents,
                     },
-                    "unit_amount": amount_cents,
-                },
-                "quantity": 1,
-            }
-        ],
-        success_url=success_url,
-        cancel_url=cancel_url,
-        metadata=metadata,
-        payment_intent_data={"metadata": metadata},
-        stripe_account=connected_account_id,
-    )
+                    "quantity": 1,
+                }
+            ],
+            success_url=success_url,
+            cancel_url=cancel_url,
+            metadata=metadata,
+            payment_intent_data={"metadata": metadata},
+            stripe_account=connected_account_id,
+        )
 
     logger.info(
         "stripe_checkout_created statement_id=%s session_id=%s account=%s",
@@ -101,7 +111,7 @@ def verify_webhook_signature(
     """
     if not cfg.webhook_secret:
         raise StripeNotConfigured("stripe_webhook_secret_missing")
-    event = stripe.Webhook.construct_event(payload, sig_header, cfg.webhook_secret)
+    event = _stripe().Webhook.construct_event(payload, sig_header, cfg.webhook_secret)
     return dict(event)
 
 
@@ -111,11 +121,12 @@ def retrieve_checkout_session(
     session_id: str,
     connected_account_id: str,
 ) -> dict[str, Any]:
-    _configure(cfg)
-    session = stripe.checkout.Session.retrieve(
-        session_id,
-        stripe_account=connected_account_id,
-    )
+    stripe = _configure(cfg)
+    with external_call("stripe", "checkout.session.retrieve"):
+        session = stripe.checkout.Session.retrieve(
+            session_id,
+            stripe_account=connected_account_id,
+        )
     return dict(session)
 
 
@@ -129,21 +140,22 @@ def create_patient_checkout_session(
     currency: str = "usd",
 ) -> dict[str, Any]:
     """Create a direct Stripe Checkout Session for patient bill payment."""
-    _configure(cfg)
-    session = stripe.checkout.Session.create(
-        mode="payment",
-        line_items=[
-            {
-                "price_data": {
-                    "currency": currency,
-                    "unit_amount": amount_cents,
-                    "product_data": {"name": "EMS Billing Payment"},
-                },
-                "quantity": 1,
-            }
-        ],
-        success_url=success_url,
-        cancel_url=cancel_url,
-        metadata=metadata or {},
-    )
+    stripe = _configure(cfg)
+    with external_call("stripe", "checkout.session.create"):
+        session = stripe.checkout.Session.create(
+            mode="payment",
+            line_items=[
+                {
+                    "price_data": {
+                        "currency": currency,
+                        "unit_amount": amount_cents,
+                        "product_data": {"name": "EMS Billing Payment"},
+                    },
+                    "quantity": 1,
+                }
+            ],
+            success_url=success_url,
+            cancel_url=cancel_url,
+            metadata=metadata or {},
+        )
     return dict(session)
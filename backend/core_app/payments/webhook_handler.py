@@ -7,8 +7,6 @@ import os
 import time
 from typing import Any, Optional
 
-import stripe
-
 logger = logging.getLogger(__name__)
 
 
@@ -31,6 +29,8 @@ class StripeWebhookHandler:
         if not secret:
             raise ValueError("Stripe webhook secret not configured")
 
+        import stripe
+
         event = stripe.Webhook.construct_event(payload, sig_header, secret)
         event_id = event["id"]
         event_type = event["type"]
@@ -0,0 +1,415 @@
+"""Per-process fan-out of Redis pub/sub events to SSE and WebSocket clients.
+
+One Redis connection and one ``psubscribe`` per tenant (``tenant.<id>.*``)
+serve every connected browser, MDT and CrewLink device in the process.  The
+reader task blocks on the socket (no polling) and copies each message into
+the bounded queue of every matching ``Subscription``; a slow consumer either
+loses its oldest queued events (``drop_oldest``) or is disconnected
+(``disconnect``) instead of stalling the others.
+
+A client reconnecting with a ``stream_id`` cursor is first replayed the
+entries it missed from the tenant's Redis stream (``core_app.realtime.streams``).
+
+Presence keys are refcounted here and refreshed for all live connections in
+one pipelined round trip per ``REALTIME_PRESENCE_INTERVAL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import fnmatch
+import json
+import logging
+from collections import Counter as Tally
+from collections import deque
+from collections.abc import Iterator
+from typing import Any
+
+from prometheus_client import Counter
+from prometheus_client.core import GaugeMetricFamily
+
+from core_app.core.config import get_settings
+from core_app.core.redis_client import redis_kwargs
+from core_app.observability.metrics import register_process_collector
+from core_app.realtime.streams import is_stream_id, parse_stream_id, replay
+
+try:
+    import redis.asyncio as redis_async
+except Exception:
+    redis_async = None
+
+logger = logging.getLogger(__name__)
+
+DROP_OLDEST = "drop_oldest"
+DISCONNECT = "disconnect"
+
+PRESENCE_TTL_SECONDS = 45
+
+# Sent ahead of a replay that cannot be complete (trimmed stream, Redis error).
+RESYNC_EVENT = json.dumps({"eventType": "resync_required"})
+
+REALTIME_DROPPED = Counter(
+    "realtime_dropped_messages_total",
+    "Realtime events discarded because a client queue was full",
+    ["transport", "policy"],
+)
+
+
+def tenant_pattern(tenant_id: str) -> str:
+    return f"tenant.{tenant_id}.*"
+
+
+def presence_key(tenant_id: str, kind: str, key: str) -> str:
+    # Presence keys with TTL allow CAD/MDT/Crewlink dashboards to show online status.
+    return f"tenant.{tenant_id}.presence.{kind}.{key}"
+
+
+Event = tuple[str | None, str]
+
+
+def _normalize(raw: Any) -> Event:
+    """(stream id, serialized event text), parsed once per message rather than per client."""
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8", errors="replace")
+    if isinstance(raw, str):
+        try:
+            obj = json.loads(raw)
+        except ValueError:
+            pass
+        else:
+            stream_id = obj.get("stream_id") if isinstance(obj, dict) else None
+            return (stream_id if isinstance(stream_id, str) else None), raw
+    return None, json.dumps({"eventType": "raw", "data": raw}, default=str)
+
+
+class Subscription:
+    """One client connection: its patterns and bounded outbound queue.
+
+    ``get()`` yields ``(event_id, text)`` pairs, replayed events first, and
+    returns ``None`` once the hub has closed the subscription.
+    """
+
+    def __init__(
+        self,
+        tenant_id: str,
+        patterns: list[str],
+        *,
+        transport: str,
+        maxsize: int,
+        policy: str,
+        presence: str | None = None,
+    ) -> None:
+        self.tenant_id = tenant_id
+        self.patterns = patterns
+        self.transport = transport
+        self.policy = policy
+        self.presence = presence
+        self.dropped = 0
+        self.closed = False
+        self._queue: asyncio.Queue[Event | None] = asyncio.Queue(maxsize=maxsize)
+        self._backlog: deque[Event] = deque()
+        self._replayed_to: tuple[int, int] | None = None
+
+    def matches(self, channel: str) -> bool:
+        return any(fnmatch.fnmatchcase(channel, p) for p in self.patterns)
+
+    def offer(self, event: Event) -> None:
+        if self.closed:
+            return
+        try:
+            self._queue.put_nowait(event)
+            return
+        except asyncio.QueueFull:
+            pass
+        self.dropped += 1
+        REALTIME_DROPPED.labels(transport=self.transport, policy=self.policy).inc()
+        if self.policy == DISCONNECT:
+            self.close()
+            return
+        self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+    def prime(self, events: list[Event], replayed_to: str | None) -> None:
+        """Queue replayed events ahead of live ones and skip live duplicates."""
+        self._backlog.extend(events)
+        if replayed_to is not None:
+            self._replayed_to = parse_stream_id(replayed_to)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        # Make room for the sentinel so a blocked get() wakes up.
+        while self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> Event | None:
+        if self._backlog and not self.closed:
+            return self._backlog.popleft()
+        while True:
+            if self.closed and self._queue.empty():
+                return None
+            event = await self._queue.get()
+            if event is None or self._replayed_to is None or event[0] is None:
+                return event
+            if parse_stream_id(event[0]) > self._replayed_to:
+                # Past the replayed range: every later event is new.
+                self._replayed_to = None
+                return event
+
+    def qsize(self) -> int:
+        return self._queue.qsize() + len(self._backlog)
+
+
+class RealtimeHub:
+    def __init__(
+        self,
+        redis_client: Any,
+        *,
+        queue_maxsize: int = 256,
+        overflow_policy: str = DROP_OLDEST,
+        presence_interval: float = 15.0,
+        reconnect_delay: float = 1.0,
+        replay_limit: int = 1000,
+    ) -> None:
+        self._redis = redis_client
+        self.queue_maxsize = queue_maxsize
+        self.overflow_policy = overflow_policy
+        self.presence_interval = presence_interval
+        self.reconnect_delay = reconnect_delay
+        self.replay_limit = replay_limit
+        self._subs: dict[str, set[Subscription]] = {}
+        self._presence: Tally[str] = Tally()
+        self._pubsub: Any | None = None
+        self._reader: asyncio.Task | None = None
+        self._presence_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    # -- subscriptions -------------------------------------------------------
+
+    async def subscribe(
+        self,
+        tenant_id: str,
+        patterns: list[str] | None = None,
+        *,
+        transport: str,
+        presence: tuple[str, str] | None = None,
+        after_id: str | None = None,
+    ) -> Subscription:
+        """Register a client; with ``after_id``, replay what it missed first.
+
+        The live subscription is in place before the stream is read, so no
+        event falls between the replay and the live feed.
+        """
+        sub = Subscription(
+            tenant_id,
+            patterns or [tenant_pattern(tenant_id)],
+            transport=transport,
+            maxsize=self.queue_maxsize,
+            policy=self.overflow_policy,
+            presence=presence_key(tenant_id, *presence) if presence else None,
+        )
+        async with self._lock:
+            first = tenant_id not in self._subs
+            self._subs.setdefault(tenant_id, set()).add(sub)
+            if first:
+                await self._psubscribe(tenant_pattern(tenant_id))
+        if sub.presence is not None:
+            self._presence[sub.presence] += 1
+            if self._presence[sub.presence] == 1:
+                await self._refresh_presence([sub.presence])
+            self._ensure_presence_task()
+        if is_stream_id(after_id):
+            await self._replay(sub, after_id)
+        return sub
+
+    async def _replay(self, sub: Subscription, after_id: str) -> None:
+        try:
+            result = await replay(
+                self._redis, sub.tenant_id, after_id, sub.patterns, limit=self.replay_limit
+            )
+        except Exception as exc:
+            logger.warning("realtime_replay_failed tenant=%s error=%s", sub.tenant_id, exc)
+            sub.prime([(None, RESYNC_EVENT)], None)
+            return
+        events: list[Event] = [(eid, text) for eid, text in result.events]
+        if result.gap:
+            events.insert(0, (None, RESYNC_EVENT))
+        sub.prime(events, result.events[-1][0] if result.events else None)
+
+    def set_patterns(self, sub: Subscription, patterns: list[str]) -> None:
+        # Patterns are filtered in-process; the Redis side stays tenant-wide.
+        sub.patterns = patterns or [tenant_pattern(sub.tenant_id)]
+
+    async def unsubscribe(self, sub: Subscription) -> None:
+        sub.close()
+        if sub.presence is not None:
+            self._presence[sub.presence] -= 1
+            if self._presence[sub.presence] <= 0:
+                del self._presence[sub.presence]
+        async with self._lock:
+            subs = self._subs.get(sub.tenant_id)
+            if subs is None:
+                return
+            subs.discard(sub)
+            if not subs:
+                del self._subs[sub.tenant_id]
+                if self._pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        await self._pubsub.punsubscribe(tenant_pattern(sub.tenant_id))
+
+    async def _psubscribe(self, pattern: str) -> None:
+        if self._pubsub is None:
+            self._pubsub = self._redis.pubsub()
+        await self._pubsub.psubscribe(pattern)
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_loop())
+
+    # -- dispatch ------------------------------------------------------------
+
+    def dispatch(self, channel: str, raw: Any) -> None:
+        tenant_id = channel.split(".", 2)[1] if channel.startswith("tenant.") else ""
+        subs = self._subs.get(tenant_id)
+        if not subs:
+            return
+        event = _normalize(raw)
+        for sub in list(subs):
+            if sub.matches(channel):
+                sub.offer(event)
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=None
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("realtime_hub_read_failed error=%s", exc)
+                await asyncio.sleep(self.reconnect_delay)
+                await self._resubscribe()
+                continue
+            if message and message.get("type") in ("pmessage", "message"):
+                channel = message.get("channel")
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                self.dispatch(str(channel), message.get("data"))
+
+    async def _resubscribe(self) -> None:
+        async with self._lock:
+            old, self._pubsub = self._pubsub, self._redis.pubsub()
+            if old is not None:
+                with contextlib.suppress(Exception):
+                    await old.close()
+            patterns = [tenant_pattern(t) for t in self._subs]
+            if patterns:
+                with contextlib.suppress(Exception):
+                    await self._pubsub.psubscribe(*patterns)
+
+    # -- presence ------------------------------------------------------------
+
+    def _ensure_presence_task(self) -> None:
+        if self._presence_task is None or self._presence_task.done():
+            self._presence_task = asyncio.create_task(self._presence_loop())
+
+    async def _refresh_presence(self, keys: list[str]) -> None:
+        if not keys:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.set(key, "1", ex=PRESENCE_TTL_SECONDS)
+                await pipe.execute()
+        except Exception as exc:
+            logger.warning("realtime_presence_refresh_failed keys=%d error=%s", len(keys), exc)
+
+    async def _presence_loop(self) -> None:
+        while self._presence:
+            await asyncio.sleep(self.presence_interval)
+            await self._refresh_presence(list(self._presence))
+
+    # -- lifecycle / metrics -------------------------------------------------
+
+    async def close(self) -> None:
+        for task in (self._reader, self._presence_task):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._reader = self._presence_task = None
+        for subs in list(self._subs.values()):
+            for sub in subs:
+                sub.close()
+        self._subs.clear()
+        self._presence.clear()
+        if self._pubsub is not None:
+            with contextlib.suppress(Exception):
+                await self._pubsub.close()
+            self._pubsub = None
+        with contextlib.suppress(Exception):
+            await self._redis.close()
+
+    def subscriptions(self) -> Iterator[Subscription]:
+        for subs in list(self._subs.values()):
+            yield from list(subs)
+
+
+_hub: RealtimeHub | None = None
+
+
+def get_realtime_hub() -> RealtimeHub:
+    global _hub
+    if _hub is None:
+        settings = get_settings()
+        if not settings.redis_url or redis_async is None:
+            raise RuntimeError("Realtime requires REDIS_URL.")
+        _hub = RealtimeHub(
+            redis_async.from_url(settings.redis_url, **redis_kwargs(settings.redis_url)),
+            queue_maxsize=settings.realtime_queue_maxsize,
+            overflow_policy=settings.realtime_overflow_policy,
+            presence_interval=settings.realtime_presence_interval_seconds,
+            replay_limit=settings.realtime_replay_limit,
+        )
+    return _hub
+
+
+async def close_realtime_hub() -> None:
+    global _hub
+    if _hub is not None:
+        await _hub.close()
+        _hub = None
+
+
+class _HubCollector:
+    """Connection-count and queue-depth gauges for the process's hub."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        connections = GaugeMetricFamily(
+            "realtime_connections", "Open realtime client connections", labels=["transport"]
+        )
+        queued = GaugeMetricFamily(
+            "realtime_queued_messages", "Events waiting in client queues", labels=["transport"]
+        )
+        max_depth = GaugeMetricFamily(
+            "realtime_queue_depth_max", "Deepest client queue", labels=["transport"]
+        )
+        counts: Tally[str] = Tally()
+        totals: Tally[str] = Tally()
+        deepest: dict[str, int] = {}
+        if _hub is not None:
+            for sub in _hub.subscriptions():
+                depth = sub.qsize()
+                counts[sub.transport] += 1
+                totals[sub.transport] += depth
+                deepest[sub.transport] = max(deepest.get(sub.transport, 0), depth)
+        for transport in ("sse", "ws"):
+            connections.add_metric([transport], counts[transport])
+            queued.add_metric([transport], totals[transport])
+            max_depth.add_metric([transport], deepest.get(transport, 0))
+        yield from (connections, queued, max_depth)
+
+
+register_process_collector(_HubCollector())
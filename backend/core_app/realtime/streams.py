@@ -0,0 +1,77 @@
+"""Per-tenant Redis Streams that back realtime replay.
+
+``RedisStreamEventPublisher`` appends every event to ``stream:tenant.<id>``
+(approximately trimmed to ``EVENT_STREAM_MAXLEN``) and publishes it on the
+usual ``tenant.<id>.<event>`` channel in the same round trip, with the entry
+id spliced into the envelope as ``stream_id``.  Live clients keep receiving
+pub/sub fan-out; a reconnecting client passes its last ``stream_id`` and is
+replayed the entries it missed with ``XRANGE``.  Because the stream is an
+ordinary Redis stream, server-side consumers can attach consumer groups
+(``XGROUP CREATE`` / ``XREADGROUP``) to it directly.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from dataclasses import dataclass
+from typing import Any
+
+_STREAM_ID_RE = re.compile(r"^\d+-\d+$")
+
+# XADD + PUBLISH atomically; the entry id is prepended to the JSON object so
+# subscribers see the same cursor a replay would return.
+PUBLISH_SCRIPT = """
+local id = redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], '*', 'topic', ARGV[2], 'data', ARGV[3])
+redis.call('PUBLISH', ARGV[2], '{"stream_id":"' .. id .. '",' .. string.sub(ARGV[3], 2))
+return id
+"""
+
+
+def stream_key(tenant_id: str) -> str:
+    return f"stream:tenant.{tenant_id}"
+
+
+def is_stream_id(value: str | None) -> bool:
+    return bool(value) and bool(_STREAM_ID_RE.match(value))
+
+
+def parse_stream_id(value: str) -> tuple[int, int]:
+    ms, _, seq = value.partition("-")
+    return int(ms), int(seq)
+
+
+def with_stream_id(stream_id: str, data: str) -> str:
+    """The pub/sub form of a stream entry (see ``PUBLISH_SCRIPT``)."""
+    return '{"stream_id":"' + stream_id + '",' + data[1:]
+
+
+@dataclass(frozen=True, slots=True)
+class Replay:
+    events: list[tuple[str, str]]
+    # True when the cursor predates the oldest retained entry (trimmed) or more
+    # than ``limit`` entries were missed: the client must refetch its boards.
+    gap: bool
+
+
+async def replay(
+    redis: Any,
+    tenant_id: str,
+    after_id: str,
+    patterns: list[str],
+    *,
+    limit: int = 1000,
+) -> Replay:
+    """Entries newer than ``after_id`` whose topic matches ``patterns``."""
+    key = stream_key(tenant_id)
+    entries = await redis.xrange(key, min=f"({after_id}", max="+", count=limit)
+    gap = len(entries) >= limit
+    if entries and not gap:
+        head = await redis.xrange(key, min="-", max="+", count=1)
+        gap = bool(head) and parse_stream_id(head[0][0]) > parse_stream_id(after_id)
+    events = [
+        (entry_id, with_stream_id(entry_id, fields["data"]))
+        for entry_id, fields in entries
+        if any(fnmatch.fnmatchcase(fields.get("topic", ""), p) for p in patterns)
+    ]
+    return Replay(events=events, gap=gap)
@@ -4,8 +4,10 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from core_app.models.audit_log import AuditLog
+from core_app.observability.metrics import instrument_repository
 
 
+@instrument_repository
 class AuditRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
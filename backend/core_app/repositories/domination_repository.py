@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import base64
 import json
 import re
 import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Any
 
-from sqlalchemy import text
+from sqlalchemy import TextClause, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from core_app.observability.metrics import instrument_repository
+
 # Whitelist of tenant-scoped tables created by domination migration.
 TENANT_TABLES: set[str] = {
     "devices",
@@ -357,21 +365,332 @@ _TABLE_TYPED_COLUMNS: dict[str, frozenset[str]] = {
 }
 
 
-class DominationRepository:
-    def __init__(self, db: Session, *, table: str) -> None:
+# Hot JSONB paths served by B-tree indexes, keyed by table then top-level key.
+# "expression" paths are indexed as ``(tenant_id, (data->>'key'))``, partial on
+# ``deleted_at IS NULL``, which is exactly the predicate the repository emits.
+# Run ``scripts/generate_jsonb_index_migration.py`` after editing this registry.
+_TABLE_INDEXED_PATHS: dict[str, dict[str, str]] = {
+    "export_jobs": {"status": "expression"},
+    "fax_jobs": {"status": "expression"},
+    "document_matches": {"fax_id": "expression"},
+    "system_alerts": {"status": "expression", "severity": "expression"},
+    "fleet_alerts": {"unit_id": "expression"},
+    "maintenance_work_orders": {"unit_id": "expression"},
+    "mdt_sessions": {"unit_id": "expression"},
+    "obd_readings": {"unit_id": "expression"},
+    "crew_assignments": {"unit_id": "expression"},
+    "aircraft_readiness_events": {"aircraft_id": "expression"},
+    "nemsis_validation_results": {"pcr_number": "expression", "chart_id": "expression"},
+    "ar_accounts": {"status": "expression"},
+    "tenant_subscriptions": {"status": "expression"},
+}
+
+_INDEXED_PATH_MODES: frozenset[str] = frozenset({"expression"})
+
+
+def indexed_path_index_name(table: str, path: str) -> str:
+    name = f"ix_{table}_data_{path}"
+    if len(name) > 63:
+        raise ValueError(f"Index name too long for {table}.{path}: {name!r}")
+    return name
+
+
+def indexed_path_ddl(table: str, path: str, mode: str) -> tuple[list[str], list[str]]:
+    """Return ``(upgrade, downgrade)`` SQL statements for one registry entry.
+
+    Index statements use ``CONCURRENTLY`` and must run outside a transaction.
+    """
+    if mode not in _INDEXED_PATH_MODES:
+        raise ValueError(f"Unsupported indexed path mode: {mode!r}")
+    if table not in TENANT_TABLES or not _DominationStatements._SAFE_FIELD_RE.match(path):
+        raise ValueError(f"Invalid indexed path: {table}.{path}")
+    index = indexed_path_index_name(table, path)
+    upgrade = [
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} "
+        f"ON {table} (tenant_id, (data->>'{path}')) WHERE deleted_at IS NULL"
+    ]
+    downgrade = [f"DROP INDEX CONCURRENTLY IF EXISTS {index}"]
+    return upgrade, downgrade
+
+
+# Columns present on every tenant JSON table (see ``_create_tenant_json_table``).
+_BASE_COLUMNS: frozenset[str] = frozenset({"id", "tenant_id", "version", "created_at", "updated_at"})
+
+# Base columns usable as keyset ordering keys, with the cast applied to cursor values.
+_ORDER_COLUMN_CASTS: dict[str, str] = {
+    "created_at": "timestamptz",
+    "updated_at": "timestamptz",
+    "version": "integer",
+}
+
+_COMPARISON_OPS: dict[str, str] = {
+    "eq": "=",
+    "ne": "<>",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+}
+_FILTER_OPS: frozenset[str] = frozenset({*_COMPARISON_OPS, "in", "not_in", "exists", "missing"})
+
+_MAX_QUERY_LIMIT = 10000
+
+_AGGREGATE_FUNCS: frozenset[str] = frozenset(
+    {"count", "sum", "avg", "min", "max", "percentile", "distinct"}
+)
+_AGGREGATE_CASTS: frozenset[str] = frozenset({"numeric", "timestamptz"})
+# JSONB text must match before it is cast, so one malformed value becomes NULL
+# (skipped by the aggregate) instead of failing the whole statement.
+_CAST_GUARDS: dict[str, str] = {
+    "numeric": r"^\s*[-+]?([0-9]+(\.[0-9]*)?|\.[0-9]+)([eE][-+]?[0-9]+)?\s*$",
+    "timestamptz": (
+        r"^[0-9]{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])"
+        r"([T ]([01][0-9]|2[0-3]):[0-5][0-9](:[0-5][0-9](\.[0-9]+)?)?)?"
+        r"\s*(Z|[-+]([01][0-9]|2[0-3])(:?[0-5][0-9])?)?$"
+    ),
+}
+_BUCKET_UNITS: frozenset[str] = frozenset(
+    {"minute", "hour", "day", "week", "month", "quarter", "year"}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class QueryFilter:
+    """A single predicate for :meth:`DominationRepository.query`.
+
+    ``field`` is either a base/typed column name (``"created_at"``, ``"status"``)
+    or a JSONB path prefixed with ``data.`` (``"data.status"``,
+    ``"data.payer.name"``).  ``op`` is one of ``eq``, ``ne``, ``gt``, ``gte``,
+    ``lt``, ``lte``, ``in``, ``not_in``, ``exists`` or ``missing``.
+    """
+
+    field: str
+    op: str = "eq"
+    value: Any = None
+
+
+@dataclass(slots=True)
+class QueryPage:
+    items: list[dict[str, Any]]
+    next_cursor: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class Aggregate:
+    """A single output metric for :meth:`DominationRepository.aggregate`.
+
+    ``func`` is ``count``, ``sum``, ``avg``, ``min``, ``max``, ``percentile``
+    (discrete, ``percentile`` in ``[0, 1]``) or ``distinct`` (sorted array of
+    distinct non-null values).  ``sum``/``avg``/``percentile`` cast JSONB text
+    to numeric; ``min``/``max`` compare as text unless ``cast`` is ``numeric``
+    or ``timestamptz``.  When ``since`` is set the aggregated value is the
+    elapsed milliseconds from the ``since`` timestamp to the ``field``
+    timestamp.  ``filters`` become a ``FILTER (WHERE ...)`` clause.
+    """
+
+    name: str
+    func: str = "count"
+    field: str | None = None
+    since: str | None = None
+    percentile: float | None = None
+    cast: str | None = None
+    filters: Sequence[QueryFilter] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class DateBucket:
+    """Group key truncating a timestamp column or JSONB ISO string to ``unit``."""
+
+    field: str
+    unit: str = "day"
+    name: str = "bucket"
+
+
+def _plain_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def _json_text_value(value: Any) -> Any:
+    """Coerce a Python value to the text form ``data->>'key'`` yields for it."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _encode_cursor(order_value: Any, record_id: Any) -> str:
+    if isinstance(order_value, (datetime, date)):
+        order_value = order_value.isoformat()
+    raw = json_dumps([order_value, str(record_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[Any, str]:
+    try:
+        order_value, record_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        uuid.UUID(str(record_id))
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    return order_value, str(record_id)
+
+
+def _set_path(target: dict[str, Any], path: Sequence[str], value: Any) -> None:
+    for segment in path[:-1]:
+        nxt = target.get(segment)
+        if not isinstance(nxt, dict):
+            nxt = {}
+            target[segment] = nxt
+        target = nxt
+    target[path[-1]] = value
+
+
+@dataclass(slots=True)
+class _QueryPlan:
+    sql: TextClause
+    params: dict[str, Any]
+    limit: int
+    projected: bool
+    json_fields: list[list[str]]
+
+
+class _DominationStatements:
+    """SQL construction shared by the sync and async Domination repositories."""
+
+    _SAFE_FIELD_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]{0,63}$")
+
+    def __init__(self, *, table: str) -> None:
         if table not in TENANT_TABLES:
             raise ValueError(f"Unsupported table: {table}")
-        self.db = db
         self.table = table
         self._typed_cols = _TABLE_TYPED_COLUMNS.get(table, frozenset())
 
-    def create(
+    def _json_path(self, field: str) -> list[str] | None:
+        """Return the JSONB path segments for a ``data.``-prefixed field, else None."""
+        if not field.startswith("data."):
+            return None
+        segments = field[len("data.") :].split(".")
+        for segment in segments:
+            if not self._SAFE_FIELD_RE.match(segment):
+                raise ValueError(f"Invalid field name: {field!r}")
+        return segments
+
+    def _column(self, field: str) -> str:
+        if field in _BASE_COLUMNS or field in self._typed_cols:
+            return field
+        raise ValueError(f"Unknown column {field!r} for table {self.table!r}")
+
+    def _json_text_expr(self, path: Sequence[str]) -> str:
+        # Validated segments are inlined as literals so predicates match the
+        # expression indexes declared in ``_TABLE_INDEXED_PATHS``.
+        if len(path) == 1:
+            return f"(data->>'{path[0]}')"
+        return f"(data#>>'{{{','.join(path)}}}')"
+
+    @staticmethod
+    def _json_value_expr(path: Sequence[str]) -> str:
+        if len(path) == 1:
+            return f"(data->'{path[0]}')"
+        return f"(data#>'{{{','.join(path)}}}')"
+
+    def _text_expr(self, field: str) -> str:
+        path = self._json_path(field)
+        return self._column(field) if path is None else self._json_text_expr(path)
+
+    def _typed_expr(self, field: str, cast: str) -> str:
+        path = self._json_path(field)
+        if path is None:
+            return self._column(field)
+        return self._guarded_cast(self._json_text_expr(path), cast)
+
+    @staticmethod
+    def _guarded_cast(text_expr: str, cast: str) -> str:
+        # A malformed JSONB value reads as NULL instead of failing the whole statement.
+        return f"(CASE WHEN {text_expr} ~ '{_CAST_GUARDS[cast]}' THEN CAST({text_expr} AS {cast}) END)"
+
+    def _filter_clause(self, flt: QueryFilter, key: str, params: dict[str, Any]) -> str:
+        if flt.op not in _FILTER_OPS:
+            raise ValueError(f"Unsupported filter op: {flt.op!r}")
+        path = self._json_path(flt.field)
+
+        if flt.value is None and flt.op in ("eq", "ne"):
+            # ``= NULL`` matches nothing; a missing key and JSON null both read as NULL.
+            expr = self._text_expr(flt.field)
+            return f"{expr} IS NULL" if flt.op == "eq" else f"{expr} IS NOT NULL"
+
+        if path is None:
+            expr = self._column(flt.field)
+            if flt.op == "exists":
+                return f"{expr} IS NOT NULL"
+            if flt.op == "missing":
+                return f"{expr} IS NULL"
+            if flt.op in ("in", "not_in"):
+                params[key] = list(flt.value)
+                neg = "NOT " if flt.op == "not_in" else ""
+                return f"{neg}({expr} = ANY(:{key}))"
+            params[key] = flt.value
+            return f"{expr} {_COMPARISON_OPS[flt.op]} :{key}"
+
+        if flt.op in ("exists", "missing"):
+            if len(path) == 1:
+                clause = f"(data ? '{path[0]}')"
+            else:
+                clause = f"({self._json_value_expr(path)} IS NOT NULL)"
+            return clause if flt.op == "exists" else f"NOT {clause}"
+
+        expr = self._json_text_expr(path)
+        if flt.op in ("in", "not_in"):
+            params[key] = [_json_text_value(v) for v in flt.value]
+            neg = "NOT " if flt.op == "not_in" else ""
+            return f"{neg}({expr} = ANY(CAST(:{key} AS text[])))"
+        if (
+            flt.op in ("gt", "gte", "lt", "lte")
+            and isinstance(flt.value, (int, float))
+            and not isinstance(flt.value, bool)
+        ):
+            params[key] = flt.value
+            return f"{self._guarded_cast(expr, 'numeric')} {_COMPARISON_OPS[flt.op]} :{key}"
+        params[key] = _json_text_value(flt.value)
+        return f"{expr} {_COMPARISON_OPS[flt.op]} :{key}"
+
+    def _where(
+        self, tenant_id: uuid.UUID, filters: Sequence[QueryFilter], params: dict[str, Any]
+    ) -> list[str]:
+        params["tenant_id"] = str(tenant_id)
+        clauses = ["tenant_id = :tenant_id", "deleted_at IS NULL"]
+        clauses.extend(self._filter_clause(f, f"_f{i}", params) for i, f in enumerate(filters))
+        return clauses
+
+    def _metric_expr(self, metric: Aggregate) -> str:
+        if metric.func not in _AGGREGATE_FUNCS:
+            raise ValueError(f"Unsupported aggregate func: {metric.func!r}")
+        if metric.cast is not None and metric.cast not in _AGGREGATE_CASTS:
+            raise ValueError(f"Unsupported aggregate cast: {metric.cast!r}")
+        if metric.field is None:
+            if metric.func != "count" or metric.since is not None:
+                raise ValueError(f"Aggregate {metric.name!r} requires a field")
+            return ""
+        if metric.since is not None:
+            return (
+                f"(EXTRACT(EPOCH FROM ({self._typed_expr(metric.field, 'timestamptz')} - "
+                f"{self._typed_expr(metric.since, 'timestamptz')})) * 1000)"
+            )
+        if metric.func in ("sum", "avg", "percentile"):
+            return self._typed_expr(metric.field, metric.cast or "numeric")
+        if metric.cast is not None:
+            return self._typed_expr(metric.field, metric.cast)
+        return self._text_expr(metric.field)
+
+    def _create_stmt(
         self,
-        *,
         tenant_id: uuid.UUID,
         data: dict[str, Any],
-        typed_columns: dict[str, Any] | None = None,
-    ) -> dict[str, Any]:
+        typed_columns: dict[str, Any] | None,
+    ) -> tuple[TextClause, dict[str, Any]]:
         cols = ["tenant_id", "data"]
         vals = [":tenant_id", "CAST(:data AS jsonb)"]
         params: dict[str, Any] = {"tenant_id": str(tenant_id), "data": json_dumps(data)}
@@ -388,65 +707,146 @@ class DominationRepository:
         sql = text(
             f"INSERT INTO {self.table} ({', '.join(cols)}) VALUES ({', '.join(vals)}) RETURNING *"
         )
-        row = self.db.execute(sql, params).mappings().one()
-        return dict(row)
+        return sql, params
 
-    def get(self, *, tenant_id: uuid.UUID, record_id: uuid.UUID) -> dict[str, Any] | None:
+    def _get_stmt(
+        self, tenant_id: uuid.UUID, record_id: uuid.UUID
+    ) -> tuple[TextClause, dict[str, Any]]:
         sql = text(
             f"SELECT * FROM {self.table} "
             f"WHERE tenant_id = :tenant_id AND id = :id AND deleted_at IS NULL"
         )
-        row = (
-            self.db.execute(sql, {"tenant_id": str(tenant_id), "id": str(record_id)})
-            .mappings()
-            .first()
-        )
-        return dict(row) if row else None
+        return sql, {"tenant_id": str(tenant_id), "id": str(record_id)}
 
-    def list(
-        self, *, tenant_id: uuid.UUID, limit: int = 50, offset: int = 0
-    ) -> list[dict[str, Any]]:
+    def _list_stmt(
+        self, tenant_id: uuid.UUID, limit: int, offset: int
+    ) -> tuple[TextClause, dict[str, Any]]:
         sql = text(
             f"SELECT * FROM {self.table} "
             f"WHERE tenant_id = :tenant_id AND deleted_at IS NULL "
             f"ORDER BY created_at DESC "
             f"LIMIT :limit OFFSET :offset"
         )
-        rows = (
-            self.db.execute(sql, {"tenant_id": str(tenant_id), "limit": limit, "offset": offset})
-            .mappings()
-            .all()
+        return sql, {"tenant_id": str(tenant_id), "limit": limit, "offset": offset}
+
+    def _query_plan(
+        self,
+        tenant_id: uuid.UUID,
+        filters: Sequence[QueryFilter],
+        fields: Sequence[str] | None,
+        order_by: str,
+        descending: bool,
+        limit: int,
+        cursor: str | None,
+    ) -> _QueryPlan:
+        if limit < 1 or limit > _MAX_QUERY_LIMIT:
+            raise ValueError(f"limit must be between 1 and {_MAX_QUERY_LIMIT}")
+
+        params: dict[str, Any] = {"limit": limit + 1}
+        clauses = self._where(tenant_id, filters, params)
+
+        order_path = self._json_path(order_by)
+        if order_path is not None:
+            order_expr = f"COALESCE({self._json_text_expr(order_path)}, '')"
+            cursor_cast = "text"
+        elif order_by == "id" or order_by in _ORDER_COLUMN_CASTS:
+            order_expr = order_by
+            cursor_cast = _ORDER_COLUMN_CASTS.get(order_by, "uuid")
+        else:
+            raise ValueError(f"Unsupported order_by: {order_by!r}")
+        direction = "DESC" if descending else "ASC"
+        cmp = "<" if descending else ">"
+
+        if cursor is not None:
+            cursor_value, cursor_id = _decode_cursor(cursor)
+            params["_cursor_id"] = cursor_id
+            if order_by == "id":
+                clauses.append(f"id {cmp} CAST(:_cursor_id AS uuid)")
+            else:
+                params["_cursor_value"] = cursor_value
+                clauses.append(
+                    f"({order_expr}, id) {cmp} "
+                    f"(CAST(:_cursor_value AS {cursor_cast}), CAST(:_cursor_id AS uuid))"
+                )
+
+        select_cols: list[str]
+        json_fields: list[list[str]] = []
+        if fields is None:
+            select_cols = ["*"]
+        else:
+            select_cols = ["id"]
+            for i, field in enumerate(fields):
+                path = self._json_path(field)
+                if path is None:
+                    col = self._column(field)
+                    if col != "id":
+                        select_cols.append(col)
+                else:
+                    select_cols.append(f"{self._json_value_expr(path)} AS _p{i}")
+                    json_fields.append(path)
+        select_cols.append(f"{order_expr} AS _order_key")
+
+        order_clause = "id" if order_by == "id" else f"{order_expr} {direction}, id"
+        sql = text(
+            f"SELECT {', '.join(select_cols)} FROM {self.table} "
+            f"WHERE {' AND '.join(clauses)} "
+            f"ORDER BY {order_clause} {direction} "
+            f"LIMIT :limit"
+        )
+        return _QueryPlan(
+            sql=sql,
+            params=params,
+            limit=limit,
+            projected=fields is not None,
+            json_fields=json_fields,
         )
-        return [dict(r) for r in rows]
 
-    _SAFE_FIELD_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]{0,63}$")
+    @staticmethod
+    def _query_page(plan: _QueryPlan, rows: Sequence[Any]) -> QueryPage:
+        records = [dict(r) for r in rows]
+        next_cursor = None
+        if len(records) > plan.limit:
+            records = records[: plan.limit]
+            last = records[-1]
+            next_cursor = _encode_cursor(last["_order_key"], last["id"])
 
-    def list_raw_by_field(
-        self, field: str, value: str, *, tenant_id: uuid.UUID | None = None, limit: int = 50
-    ) -> list[dict[str, Any]]:
+        items: list[dict[str, Any]] = []
+        for row in records:
+            row.pop("_order_key", None)
+            if plan.projected and plan.json_fields:
+                data: dict[str, Any] = {}
+                for i, path in enumerate(plan.json_fields):
+                    value = row.pop(f"_p{i}", None)
+                    if value is not None:
+                        _set_path(data, path, value)
+                row["data"] = data
+            items.append(row)
+        return QueryPage(items=items, next_cursor=next_cursor)
+
+    def _list_raw_by_field_stmt(
+        self, field: str, value: str, tenant_id: uuid.UUID | None, limit: int
+    ) -> tuple[TextClause, dict[str, Any]]:
         if not self._SAFE_FIELD_RE.match(field):
             raise ValueError(f"Invalid field name: {field!r}")
         tenant_clause = "AND tenant_id = :tenant_id " if tenant_id else ""
         sql = text(
             f"SELECT * FROM {self.table} "
-            f"WHERE data->>:field = :value AND deleted_at IS NULL "
+            f"WHERE {self._json_text_expr([field])} = :value AND deleted_at IS NULL "
             f"{tenant_clause}"
             f"ORDER BY created_at DESC LIMIT :limit"
         )
-        params: dict[str, Any] = {"field": field, "value": value, "limit": limit}
+        params: dict[str, Any] = {"value": value, "limit": limit}
         if tenant_id:
             params["tenant_id"] = str(tenant_id)
-        rows = self.db.execute(sql, params).mappings().all()
-        return [dict(r) for r in rows]
+        return sql, params
 
-    def update(
+    def _update_stmt(
         self,
-        *,
         tenant_id: uuid.UUID,
         record_id: uuid.UUID,
         expected_version: int,
         patch: dict[str, Any],
-    ) -> dict[str, Any] | None:
+    ) -> tuple[TextClause, dict[str, Any]]:
         typed_sets: list[str] = []
         params: dict[str, Any] = {
             "tenant_id": str(tenant_id),
@@ -481,31 +881,19 @@ class DominationRepository:
             f"AND deleted_at IS NULL AND version = :expected_version "
             f"RETURNING *"
         )
-        row = self.db.execute(sql, params).mappings().first()
-        return dict(row) if row else None
+        return sql, params
 
-    def count(self, *, tenant_id: uuid.UUID) -> int:
-        sql = text(
-            f"SELECT COUNT(*) FROM {self.table} "
-            f"WHERE tenant_id = :tenant_id AND deleted_at IS NULL"
-        )
-        result = self.db.execute(sql, {"tenant_id": str(tenant_id)}).scalar_one()
-        return int(result)
+    def _count_stmt(
+        self, tenant_id: uuid.UUID, filters: Sequence[QueryFilter]
+    ) -> tuple[TextClause, dict[str, Any]]:
+        params: dict[str, Any] = {}
+        clauses = self._where(tenant_id, filters, params)
+        sql = text(f"SELECT COUNT(*) FROM {self.table} WHERE {' AND '.join(clauses)}")
+        return sql, params
 
-    def aggregate_json_field(
-        self,
-        *,
-        tenant_id: uuid.UUID,
-        group_field: str,
-        sum_field: str | None = None,
-    ) -> list[dict[str, Any]]:
-        """Return per-group counts (and optional integer sums) from a JSONB field.
-
-        Aggregation is pushed down to Postgres, avoiding large in-memory fetches.
-        Both *group_field* and *sum_field* are validated against ``_SAFE_FIELD_RE``
-        and are passed as SQLAlchemy named bind parameters (e.g. ``:group_field``),
-        not interpolated as SQL identifiers, so they are safe against injection.
-        """
+    def _aggregate_json_field_stmt(
+        self, tenant_id: uuid.UUID, group_field: str, sum_field: str | None
+    ) -> tuple[TextClause, dict[str, Any]]:
         if not self._SAFE_FIELD_RE.match(group_field):
             raise ValueError(f"Invalid field name: {group_field!r}")
         if sum_field is not None and not self._SAFE_FIELD_RE.match(sum_field):
@@ -526,16 +914,309 @@ class DominationRepository:
             f"WHERE tenant_id = :tenant_id AND deleted_at IS NULL "
             f"GROUP BY data->>:group_field"
         )
-        rows = self.db.execute(sql, params).mappings().all()
-        return [dict(r) for r in rows]
+        return sql, params
 
-    def soft_delete(self, *, tenant_id: uuid.UUID, record_id: uuid.UUID) -> bool:
+    def _aggregate_stmt(
+        self,
+        tenant_id: uuid.UUID,
+        metrics: Sequence[Aggregate],
+        group_by: Sequence[str | DateBucket],
+        filters: Sequence[QueryFilter],
+    ) -> tuple[TextClause, dict[str, Any], list[str]]:
+        if not metrics:
+            raise ValueError("At least one aggregate metric is required")
+        params: dict[str, Any] = {}
+        clauses = self._where(tenant_id, filters, params)
+
+        select_cols: list[str] = []
+        out_names: list[str] = []
+        for i, key in enumerate(group_by):
+            if isinstance(key, DateBucket):
+                if key.unit not in _BUCKET_UNITS:
+                    raise ValueError(f"Unsupported bucket unit: {key.unit!r}")
+                expr = f"date_trunc('{key.unit}', {self._typed_expr(key.field, 'timestamptz')})"
+                out_names.append(key.name)
+            else:
+                expr = self._text_expr(key)
+                out_names.append(key[len("data.") :] if key.startswith("data.") else key)
+            select_cols.append(f"{expr} AS _g{i}")
+
+        for i, metric in enumerate(metrics):
+            expr = self._metric_expr(metric)
+            conds = [
+                self._filter_clause(f, f"_m{i}_{j}", params)
+                for j, f in enumerate(metric.filters)
+            ]
+            if metric.func == "count":
+                agg = f"COUNT({expr or '*'})"
+            elif metric.func == "percentile":
+                if metric.percentile is None or not 0 <= metric.percentile <= 1:
+                    raise ValueError(f"Aggregate {metric.name!r} needs a percentile in [0, 1]")
+                agg = f"percentile_disc({float(metric.percentile)!r}) WITHIN GROUP (ORDER BY {expr})"
+            elif metric.func == "distinct":
+                conds.append(f"{expr} IS NOT NULL")
+                agg = f"array_agg(DISTINCT {expr} ORDER BY {expr})"
+            else:
+                agg = f"{metric.func.upper()}({expr})"
+            if conds:
+                agg += f" FILTER (WHERE {' AND '.join(conds)})"
+            select_cols.append(f"{agg} AS _m{i}")
+
+        group_clause = ""
+        if group_by:
+            ordinals = ", ".join(str(i + 1) for i in range(len(group_by)))
+            group_clause = f"GROUP BY {ordinals} ORDER BY {ordinals}"
+        sql = text(
+            f"SELECT {', '.join(select_cols)} FROM {self.table} "
+            f"WHERE {' AND '.join(clauses)} {group_clause}"
+        )
+        return sql, params, out_names
+
+    @staticmethod
+    def _aggregate_rows(
+        metrics: Sequence[Aggregate], out_names: Sequence[str], rows: Sequence[Any]
+    ) -> list[dict[str, Any]]:
+        results: list[dict[str, Any]] = []
+        for row in rows:
+            out = {name: row[f"_g{i}"] for i, name in enumerate(out_names)}
+            for i, metric in enumerate(metrics):
+                value = row[f"_m{i}"]
+                if metric.func == "distinct":
+                    value = list(value or [])
+                out[metric.name] = _plain_value(value)
+            results.append(out)
+        return results
+
+    def _soft_delete_stmt(
+        self, tenant_id: uuid.UUID, record_id: uuid.UUID
+    ) -> tuple[TextClause, dict[str, Any]]:
         sql = text(
             f"UPDATE {self.table} "
             f"SET deleted_at = now(), updated_at = now() "
             f"WHERE tenant_id = :tenant_id AND id = :id AND deleted_at IS NULL"
         )
-        res = self.db.execute(sql, {"tenant_id": str(tenant_id), "id": str(record_id)})
+        return sql, {"tenant_id": str(tenant_id), "id": str(record_id)}
+
+
+@instrument_repository
+class DominationRepository(_DominationStatements):
+    def __init__(self, db: Session, *, table: str) -> None:
+        super().__init__(table=table)
+        self.db = db
+
+    def create(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        data: dict[str, Any],
+        typed_columns: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        sql, params = self._create_stmt(tenant_id, data, typed_columns)
+        row = self.db.execute(sql, params).mappings().one()
+        return dict(row)
+
+    def get(self, *, tenant_id: uuid.UUID, record_id: uuid.UUID) -> dict[str, Any] | None:
+        sql, params = self._get_stmt(tenant_id, record_id)
+        row = self.db.execute(sql, params).mappings().first()
+        return dict(row) if row else None
+
+    def list(
+        self, *, tenant_id: uuid.UUID, limit: int = 50, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        sql, params = self._list_stmt(tenant_id, limit, offset)
+        rows = self.db.execute(sql, params).mappings().all()
+        return [dict(r) for r in rows]
+
+    def query(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        filters: Sequence[QueryFilter] = (),
+        fields: Sequence[str] | None = None,
+        order_by: str = "created_at",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> QueryPage:
+        """Filtered, projected, keyset-paginated listing pushed down to Postgres.
+
+        ``fields`` restricts the returned columns; ``data.``-prefixed entries are
+        reassembled into a partial ``data`` dict so callers keep reading
+        ``record["data"][...]``.  ``order_by`` accepts ``id``, ``created_at``,
+        ``updated_at``, ``version`` or a ``data.`` path; ``id`` is always the
+        tie-breaker.  Pass the returned ``next_cursor`` back as ``cursor`` to
+        fetch the following page.
+        """
+        plan = self._query_plan(tenant_id, filters, fields, order_by, descending, limit, cursor)
+        rows = self.db.execute(plan.sql, plan.params).mappings().all()
+        return self._query_page(plan, rows)
+
+    def list_raw_by_field(
+        self, field: str, value: str, *, tenant_id: uuid.UUID | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        sql, params = self._list_raw_by_field_stmt(field, value, tenant_id, limit)
+        rows = self.db.execute(sql, params).mappings().all()
+        return [dict(r) for r in rows]
+
+    def update(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        record_id: uuid.UUID,
+        expected_version: int,
+        patch: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        sql, params = self._update_stmt(tenant_id, record_id, expected_version, patch)
+        row = self.db.execute(sql, params).mappings().first()
+        return dict(row) if row else None
+
+    def count(self, *, tenant_id: uuid.UUID, filters: Sequence[QueryFilter] = ()) -> int:
+        sql, params = self._count_stmt(tenant_id, filters)
+        result = self.db.execute(sql, params).scalar_one()
+        return int(result)
+
+    def aggregate_json_field(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        group_field: str,
+        sum_field: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return per-group counts (and optional integer sums) from a JSONB field.
+
+        Aggregation is pushed down to Postgres, avoiding large in-memory fetches.
+        Both *group_field* and *sum_field* are validated against ``_SAFE_FIELD_RE``
+        and are passed as SQLAlchemy named bind parameters (e.g. ``:group_field``),
+        not interpolated as SQL identifiers, so they are safe against injection.
+        """
+        sql, params = self._aggregate_json_field_stmt(tenant_id, group_field, sum_field)
+        rows = self.db.execute(sql, params).mappings().all()
+        return [dict(r) for r in rows]
+
+    def aggregate(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        metrics: Sequence[Aggregate],
+        group_by: Sequence[str | DateBucket] = (),
+        filters: Sequence[QueryFilter] = (),
+    ) -> list[dict[str, Any]]:
+        """Compute grouped rollups in a single SQL round trip.
+
+        Group keys are returned under the field name without its ``data.``
+        prefix (or the bucket's ``name``); metrics under their ``name``.
+        Without ``group_by`` exactly one row is returned.
+        """
+        sql, params, out_names = self._aggregate_stmt(tenant_id, metrics, group_by, filters)
+        rows = self.db.execute(sql, params).mappings().all()
+        return self._aggregate_rows(metrics, out_names, rows)
+
+    def soft_delete(self, *, tenant_id: uuid.UUID, record_id: uuid.UUID) -> bool:
+        sql, params = self._soft_delete_stmt(tenant_id, record_id)
+        res = self.db.execute(sql, params)
+        return res.rowcount > 0
+
+
+@instrument_repository
+class AsyncDominationRepository(_DominationStatements):
+    """AsyncSession twin of :class:`DominationRepository` with the same SQL."""
+
+    def __init__(self, db: AsyncSession, *, table: str) -> None:
+        super().__init__(table=table)
+        self.db = db
+
+    async def create(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        data: dict[str, Any],
+        typed_columns: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        sql, params = self._create_stmt(tenant_id, data, typed_columns)
+        row = (await self.db.execute(sql, params)).mappings().one()
+        return dict(row)
+
+    async def get(
+        self, *, tenant_id: uuid.UUID, record_id: uuid.UUID
+    ) -> dict[str, Any] | None:
+        sql, params = self._get_stmt(tenant_id, record_id)
+        row = (await self.db.execute(sql, params)).mappings().first()
+        return dict(row) if row else None
+
+    async def list(
+        self, *, tenant_id: uuid.UUID, limit: int = 50, offset: int = 0
+    ) -> list[dict[str, Any]]:
+        sql, params = self._list_stmt(tenant_id, limit, offset)
+        rows = (await self.db.execute(sql, params)).mappings().all()
+        return [dict(r) for r in rows]
+
+    async def query(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        filters: Sequence[QueryFilter] = (),
+        fields: Sequence[str] | None = None,
+        order_by: str = "created_at",
+        descending: bool = True,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> QueryPage:
+        plan = self._query_plan(tenant_id, filters, fields, order_by, descending, limit, cursor)
+        rows = (await self.db.execute(plan.sql, plan.params)).mappings().all()
+        return self._query_page(plan, rows)
+
+    async def list_raw_by_field(
+        self, field: str, value: str, *, tenant_id: uuid.UUID | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        sql, params = self._list_raw_by_field_stmt(field, value, tenant_id, limit)
+        rows = (await self.db.execute(sql, params)).mappings().all()
+        return [dict(r) for r in rows]
+
+    async def update(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        record_id: uuid.UUID,
+        expected_version: int,
+        patch: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        sql, params = self._update_stmt(tenant_id, record_id, expected_version, patch)
+        row = (await self.db.execute(sql, params)).mappings().first()
+        return dict(row) if row else None
+
+    async def count(
+        self, *, tenant_id: uuid.UUID, filters: Sequence[QueryFilter] = ()
+    ) -> int:
+        sql, params = self._count_stmt(tenant_id, filters)
+        result = (await self.db.execute(sql, params)).scalar_one()
+        return int(result)
+
+    async def aggregate_json_field(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        group_field: str,
+        sum_field: str | None = None,
+    ) -> list[dict[str, Any]]:
+        sql, params = self._aggregate_json_field_stmt(tenant_id, group_field, sum_field)
+        rows = (await self.db.execute(sql, params)).mappings().all()
+        return [dict(r) for r in rows]
+
+    async def aggregate(
+        self,
+        *,
+        tenant_id: uuid.UUID,
+        metrics: Sequence[Aggregate],
+        group_by: Sequence[str | DateBucket] = (),
+        filters: Sequence[QueryFilter] = (),
+    ) -> list[dict[str, Any]]:
+        sql, params, out_names = self._aggregate_stmt(tenant_id, metrics, group_by, filters)
+        rows = (await self.db.execute(sql, params)).mappings().all()
+        return self._aggregate_rows(metrics, out_names, rows)
+
+    async def soft_delete(self, *, tenant_id: uuid.UUID, record_id: uuid.UUID) -> bool:
+        sql, params = self._soft_delete_stmt(tenant_id, record_id)
+        res = await self.db.execute(sql, params)
         return res.rowcount > 0
 
 
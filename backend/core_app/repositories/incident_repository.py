@@ -5,8 +5,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from core_app.core.errors import AppError, ErrorCodes
 from core_app.models.incident import Incident
+from core_app.observability.metrics import instrument_repository
 
 
+@instrument_repository
 class IncidentRepository:
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
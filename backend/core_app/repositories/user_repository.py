@@ -4,8 +4,10 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from core_app.models.user import User
+from core_app.observability.metrics import instrument_repository
 
 
+@instrument_repository
 class UserRepository:
     def __init__(self, db: Session) -> None:
         self.db = db
@@ -0,0 +1,252 @@
+"""Short-TTL cache for resolved ``CurrentUser`` and tenant status.
+
+Authenticated requests otherwise pay a user-row lookup in ``get_current_user``
+and a tenant-record lookup in ``RequestPipelineMiddleware``.  Entries live in a
+bounded in-process LRU (``AUTH_CACHE_TTL_SECONDS``) and, when
+``AUTH_CACHE_REDIS`` is enabled, in Redis with a longer TTL so workers share
+warm entries.  Mutations call ``invalidate_user`` / ``invalidate_tenant``;
+other processes converge within the in-process TTL.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+from core_app.core.config import get_settings
+from core_app.core.redis_client import redis_kwargs
+from core_app.schemas.auth import CurrentUser
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+_REDIS_PREFIX = "auth_cache"
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe bounded LRU whose entries expire after ``ttl_seconds``."""
+
+    def __init__(self, *, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._data: OrderedDict[Any, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Any], bool]) -> None:
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass(frozen=True, slots=True)
+class TenantStatus:
+    status: str | None
+    legal_status: str | None
+    billing_tier: str | None = None
+
+
+class AuthCache:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = 30,
+        max_entries: int = 10000,
+        redis_client: Any | None = None,
+        redis_ttl_seconds: int = 300,
+    ) -> None:
+        self._users: TTLCache[CurrentUser] = TTLCache(
+            ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+        self._tenants: TTLCache[TenantStatus] = TTLCache(
+            ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+        self._redis = redis_client
+        self._redis_ttl = redis_ttl_seconds
+
+    # -- users ---------------------------------------------------------------
+
+    @staticmethod
+    def _user_key(tenant_id: uuid.UUID, *, user_id: uuid.UUID | None, email: str | None) -> str:
+        ident = f"id:{user_id}" if user_id is not None else f"email:{(email or '').lower()}"
+        return f"{tenant_id}:{ident}"
+
+    def get_user(
+        self, tenant_id: uuid.UUID, *, user_id: uuid.UUID | None = None, email: str | None = None
+    ) -> CurrentUser | None:
+        key = self._user_key(tenant_id, user_id=user_id, email=email)
+        user = self._users.get(key)
+        if user is None and self._redis is not None:
+            raw = self._redis_get(f"{_REDIS_PREFIX}:user:{key}")
+            if raw is not None:
+                user = CurrentUser.model_validate_json(raw)
+                self._users.set(key, user)
+        return user
+
+    def set_user(
+        self,
+        user: CurrentUser,
+        *,
+        user_id: uuid.UUID | None = None,
+        email: str | None = None,
+    ) -> None:
+        key = self._user_key(user.tenant_id, user_id=user_id, email=email)
+        self._users.set(key, user)
+        if self._redis is not None:
+            self._redis_set(f"{_REDIS_PREFIX}:user:{key}", user.model_dump_json())
+
+    def invalidate_user(
+        self, tenant_id: uuid.UUID, *, user_id: uuid.UUID | None = None, email: str | None = None
+    ) -> None:
+        """Drop a user's entries; with neither identifier, drop every user of the tenant."""
+        keys = []
+        if user_id is not None:
+            keys.append(self._user_key(tenant_id, user_id=user_id, email=None))
+        if email:
+            keys.append(self._user_key(tenant_id, user_id=None, email=email))
+        if keys:
+            for key in keys:
+                self._users.pop(key)
+            self._redis_delete(*[f"{_REDIS_PREFIX}:user:{k}" for k in keys])
+            return
+        prefix = f"{tenant_id}:"
+        self._users.pop_where(lambda k: k.startswith(prefix))
+        self._redis_delete_matching(f"{_REDIS_PREFIX}:user:{prefix}*")
+
+    # -- tenants -------------------------------------------------------------
+
+    def get_tenant_status(self, tenant_id: uuid.UUID) -> TenantStatus | None:
+        key = str(tenant_id)
+        status = self._tenants.get(key)
+        if status is None and self._redis is not None:
+            raw = self._redis_get(f"{_REDIS_PREFIX}:tenant:{key}")
+            if raw is not None:
+                status = TenantStatus(**json.loads(raw))
+                self._tenants.set(key, status)
+        return status
+
+    def peek_tenant_status(self, tenant_id: uuid.UUID) -> TenantStatus | None:
+        """In-process lookup only; never blocks on Redis, so safe on the event loop."""
+        return self._tenants.get(str(tenant_id))
+
+    def set_tenant_status(self, tenant_id: uuid.UUID, status: TenantStatus) -> None:
+        key = str(tenant_id)
+        self._tenants.set(key, status)
+        if self._redis is not None:
+            self._redis_set(
+                f"{_REDIS_PREFIX}:tenant:{key}",
+                json.dumps(
+                    {
+                        "status": status.status,
+                        "legal_status": status.legal_status,
+                        "billing_tier": status.billing_tier,
+                    }
+                ),
+            )
+
+    def invalidate_tenant(self, tenant_id: uuid.UUID) -> None:
+        """Drop the tenant's status and every cached user belonging to it."""
+        self._tenants.pop(str(tenant_id))
+        self._redis_delete(f"{_REDIS_PREFIX}:tenant:{tenant_id}")
+        self.invalidate_user(tenant_id)
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._tenants.clear()
+
+    # -- redis (best effort: a Redis outage degrades to in-process only) ----
+
+    def _redis_get(self, key: str) -> str | None:
+        try:
+            return self._redis.get(key)
+        except Exception as exc:
+            logger.warning("auth_cache_redis_get_failed key=%s error=%s", key, exc)
+            return None
+
+    def _redis_set(self, key: str, value: str) -> None:
+        try:
+            self._redis.set(key, value, ex=self._redis_ttl)
+        except Exception as exc:
+            logger.warning("auth_cache_redis_set_failed key=%s error=%s", key, exc)
+
+    def _redis_delete(self, *keys: str) -> None:
+        if self._redis is None or not keys:
+            return
+        try:
+            self._redis.delete(*keys)
+        except Exception as exc:
+            logger.warning("auth_cache_redis_delete_failed error=%s", exc)
+
+    def _redis_delete_matching(self, pattern: str) -> None:
+        if self._redis is None:
+            return
+        try:
+            keys = list(self._redis.scan_iter(match=pattern, count=500))
+            if keys:
+                self._redis.delete(*keys)
+        except Exception as exc:
+            logger.warning("auth_cache_redis_scan_failed pattern=%s error=%s", pattern, exc)
+
+
+_auth_cache: AuthCache | None = None
+
+
+def get_auth_cache() -> AuthCache:
+    global _auth_cache
+    if _auth_cache is None:
+        settings = get_settings()
+        redis_client = None
+        if settings.auth_cache_redis and settings.redis_url:
+            try:
+                import redis as redis_lib
+
+                redis_client = redis_lib.from_url(
+                    settings.redis_url,
+                    **redis_kwargs(settings.redis_url, socket_connect_timeout=2, socket_timeout=2),
+                )
+            except Exception as exc:
+                logger.warning("auth_cache_redis_init_failed error=%s", exc)
+        _auth_cache = AuthCache(
+            ttl_seconds=settings.auth_cache_ttl_seconds,
+            max_entries=settings.auth_cache_max_entries,
+            redis_client=redis_client,
+            redis_ttl_seconds=settings.auth_cache_redis_ttl_seconds,
+        )
+    return _auth_cache
@@ -157,11 +157,16 @@ def get_secret_metadata(secret_id: str) -> dict[str, Any] | None:
 
 
 def get_db_connections(db_instance_id: str) -> dict[str, Any]:
-    val = get_cw_metric_avg(
-        "AWS/RDS",
-        "DatabaseConnections",
-        [{"Name": "DBInstanceIdentifier", "Value": db_instance_id}],
+    return db_connections_summary(
+        get_cw_metric_avg(
+            "AWS/RDS",
+            "DatabaseConnections",
+            [{"Name": "DBInstanceIdentifier", "Value": db_instance_id}],
+        )
     )
+
+
+def db_connections_summary(val: float | None) -> dict[str, Any]:
     return {
         "active_connections": val if val is not None else 0,
         "max_connections": 500,
@@ -1,14 +1,22 @@
+import asyncio
+import contextlib
+import logging
+import random
+import threading
 import time
 from dataclasses import dataclass
-from functools import lru_cache
 from typing import Any
 
+import httpx
 import requests
-from jose import jwt
-from jose.exceptions import JWTError
+from jose import jwk, jwt
+from jose.backends.base import Key
+from jose.exceptions import JOSEError, JWTError
 
 from core_app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class CognitoClaims:
@@ -23,15 +31,121 @@ class CognitoAuthError(Exception):
     pass
 
 
-@lru_cache(maxsize=1)
-def _jwks() -> dict[str, Any]:
-    settings = get_settings()
-    if not settings.cognito_region or not settings.cognito_user_pool_id:
-        raise CognitoAuthError("Cognito not configured (COGNITO_REGION/COGNITO_USER_POOL_ID).")
-    url = f"https://cognito-idp.{settings.cognito_region}.amazonaws.com/{settings.cognito_user_pool_id}/.well-known/jwks.json"
-    resp = requests.get(url, timeout=10)
-    resp.raise_for_status()
-    return resp.json()
+class JWKSManager:
+    """Cognito signing keys, parsed once and looked up by ``kid``.
+
+    Keys are prefetched at startup and refreshed in the background with
+    jitter, so verification is a pure-CPU signature check.  A token signed
+    with an unknown ``kid`` (key rotation) triggers one synchronous refetch,
+    rate-limited by ``min_refetch_seconds``.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        refresh_seconds: float = 3600,
+        jitter: float = 0.1,
+        min_refetch_seconds: float = 30,
+        timeout: float = 10,
+    ) -> None:
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self.jitter = jitter
+        self.min_refetch_seconds = min_refetch_seconds
+        self.timeout = timeout
+        self._keys: dict[str, Key] = {}
+        self._last_fetch = float("-inf")
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _install(self, jwks: dict[str, Any]) -> None:
+        keys: dict[str, Key] = {}
+        for entry in jwks.get("keys", []):
+            kid = entry.get("kid")
+            if not kid:
+                continue
+            try:
+                keys[kid] = jwk.construct(entry, entry.get("alg", "RS256"))
+            except JOSEError as exc:
+                logger.warning("cognito_jwks_key_unparseable kid=%s error=%s", kid, exc)
+        if not keys:
+            raise CognitoAuthError("Cognito JWKS contained no usable keys.")
+        # Swap the whole mapping so readers never see a half-built key set.
+        self._keys = keys
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._last_fetch = time.monotonic()
+            try:
+                resp = requests.get(self.url, timeout=self.timeout)
+                resp.raise_for_status()
+                jwks = resp.json()
+            except requests.RequestException as exc:
+                raise CognitoAuthError(f"Unable to fetch Cognito JWKS: {exc}") from exc
+            self._install(jwks)
+
+    async def refresh_async(self) -> None:
+        self._last_fetch = time.monotonic()
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout) as client:
+                resp = await client.get(self.url)
+                resp.raise_for_status()
+                jwks = resp.json()
+        except httpx.HTTPError as exc:
+            raise CognitoAuthError(f"Unable to fetch Cognito JWKS: {exc}") from exc
+        self._install(jwks)
+
+    def key_for(self, kid: str | None) -> Key:
+        if not kid:
+            raise CognitoAuthError("Token header has no kid.")
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_fetch >= self.min_refetch_seconds:
+            self.refresh()
+            key = self._keys.get(kid)
+        if key is None:
+            raise CognitoAuthError(f"Unknown signing key kid={kid!r}.")
+        return key
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            delay = self.refresh_seconds * (1 + random.uniform(-self.jitter, self.jitter))
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh_async()
+            except CognitoAuthError as exc:
+                logger.warning("cognito_jwks_refresh_failed error=%s", exc)
+
+    async def start(self) -> None:
+        """Prefetch the key set and schedule background refreshes."""
+        try:
+            await self.refresh_async()
+        except CognitoAuthError as exc:
+            # Startup must not fail on a JWKS blip; key_for() refetches lazily.
+            logger.warning("cognito_jwks_prefetch_failed error=%s", exc)
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+_jwks_manager: JWKSManager | None = None
+
+
+def get_jwks_manager() -> JWKSManager:
+    global _jwks_manager
+    if _jwks_manager is None:
+        settings = get_settings()
+        if not settings.cognito_region or not settings.cognito_user_pool_id:
+            raise CognitoAuthError("Cognito not configured (COGNITO_REGION/COGNITO_USER_POOL_ID).")
+        url = f"https://cognito-idp.{settings.cognito_region}.amazonaws.com/{settings.cognito_user_pool_id}/.well-known/jwks.json"
+        _jwks_manager = JWKSManager(url, refresh_seconds=settings.cognito_jwks_refresh_seconds)
+    return _jwks_manager
 
 
 def _issuer() -> str:
@@ -49,9 +163,10 @@ def verify_cognito_jwt(token: str) -> CognitoClaims:
         raise CognitoAuthError("Cognito app client id not configured (COGNITO_APP_CLIENT_ID).")
 
     try:
+        key = get_jwks_manager().key_for(jwt.get_unverified_header(token).get("kid"))
         claims = jwt.decode(
             token,
-            _jwks(),
+            key,
             algorithms=["RS256"],
             audience=settings.cognito_app_client_id,
             issuer=_issuer(),
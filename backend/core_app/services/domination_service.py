@@ -2,15 +2,23 @@ from __future__ import annotations
 
 import base64
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from core_app.repositories.domination_repository import DominationRepository
-from core_app.services.audit_service import AuditService
-from core_app.services.event_publisher import EventPublisher
+from core_app.core.config import get_settings
+from core_app.repositories.domination_repository import (
+    AsyncDominationRepository,
+    DominationRepository,
+)
+from core_app.services.audit_service import AsyncAuditService, AuditService
+from core_app.services.auth_cache import get_auth_cache
+from core_app.services.event_publisher import EventPublisher, PendingEvent
 
 
 def _make_json_safe(obj: Any) -> Any:
@@ -31,15 +39,76 @@ def _make_json_safe(obj: Any) -> Any:
     return obj
 
 
-class DominationService:
+_SUMMARY_FIELDS = ("id", "tenant_id", "version", "created_at", "updated_at")
+
+
+class _EventEmitter:
+    """Post-commit event emission shared by the sync and async services.
+
+    Inside ``batch_events()`` events are buffered and published in one Redis
+    round trip when the block exits.  With ``compact_events`` (default from
+    ``EVENT_PAYLOAD_MODE=compact``) the payload carries the record's ids and
+    version plus the fields the mutation changed, reusing the serialization
+    already done for the audit log, instead of the whole record.
+    """
+
+    publisher: EventPublisher
+
+    def _init_events(self, publisher: EventPublisher, compact_events: bool | None) -> None:
+        self.publisher = publisher
+        if compact_events is None:
+            compact_events = get_settings().event_payload_mode.lower() == "compact"
+        self.compact_events = compact_events
+        self._pending_events: list[PendingEvent] | None = None
+
+    def _event_payload(self, rec: dict[str, Any], changes: dict[str, Any]) -> dict[str, Any]:
+        if self.compact_events:
+            summary = {k: _make_json_safe(rec[k]) for k in _SUMMARY_FIELDS if k in rec}
+            return {"record": summary, "changes": changes}
+        return _make_json_safe({"record": rec})
+
+    async def _emit(self, event: PendingEvent) -> None:
+        if self._pending_events is not None:
+            self._pending_events.append(event)
+            return
+        await self.publisher.publish(
+            event.event_name,
+            tenant_id=event.tenant_id,
+            entity_id=event.entity_id,
+            payload=event.payload,
+            entity_type=event.entity_type,
+            correlation_id=event.correlation_id,
+        )
+
+    @asynccontextmanager
+    async def batch_events(self) -> AsyncIterator[None]:
+        """Buffer events from committed mutations and flush them on exit.
+
+        Commit behaviour is unchanged; events already buffered belong to
+        committed rows, so they are flushed even if the block raises.
+        """
+        if self._pending_events is not None:
+            yield  # nested: the outermost block flushes
+            return
+        self._pending_events = []
+        try:
+            yield
+        finally:
+            events, self._pending_events = self._pending_events, None
+            await self.publisher.publish_many(events)
+
+
+class DominationService(_EventEmitter):
     def repo(self, table: str):
         if table not in self._repo_cache:
             self._repo_cache[table] = DominationRepository(self.db, table=table)
         return self._repo_cache[table]
 
-    def __init__(self, db: Session, publisher: EventPublisher) -> None:
+    def __init__(
+        self, db: Session, publisher: EventPublisher, *, compact_events: bool | None = None
+    ) -> None:
         self.db = db
-        self.publisher = publisher
+        self._init_events(publisher, compact_events)
         self.audit = AuditService(db)
         self._repo_cache: dict[str, DominationRepository] = {}
 
@@ -56,24 +125,27 @@ class DominationService:
     ) -> dict[str, Any]:
         repo = self.repo(table)
         rec = repo.create(tenant_id=tenant_id, data=data, typed_columns=typed_columns)
+        changes = _make_json_safe({"data": data})
         self.audit.log_mutation(
             tenant_id=tenant_id,
             action="create",
             entity_name=table,
             entity_id=uuid.UUID(str(rec["id"])),
             actor_user_id=actor_user_id,
-            field_changes=_make_json_safe({"data": data}),
+            field_changes=changes,
             correlation_id=correlation_id,
         )
         if commit:
             self.db.commit()
-            await self.publisher.publish(
-                f"{table}.created",
-                tenant_id=tenant_id,
-                entity_id=uuid.UUID(str(rec["id"])),
-                payload=_make_json_safe({"record": rec}),
-                entity_type=table,
-                correlation_id=correlation_id,
+            await self._emit(
+                PendingEvent(
+                    f"{table}.created",
+                    tenant_id=tenant_id,
+                    entity_id=uuid.UUID(str(rec["id"])),
+                    payload=self._event_payload(rec, changes["data"]),
+                    entity_type=table,
+                    correlation_id=correlation_id,
+                )
             )
         return rec
 
@@ -95,23 +167,126 @@ class DominationService:
         )
         if rec is None:
             return None
+        changes = _make_json_safe({"patch": patch, "expected_version": expected_version})
         self.audit.log_mutation(
             tenant_id=tenant_id,
             action="update",
             entity_name=table,
             entity_id=record_id,
             actor_user_id=actor_user_id,
-            field_changes=_make_json_safe({"patch": patch, "expected_version": expected_version}),
+            field_changes=changes,
             correlation_id=correlation_id,
         )
+        if table == "tenants":
+            get_auth_cache().invalidate_tenant(tenant_id)
         if commit:
             self.db.commit()
-            await self.publisher.publish(
-                f"{table}.updated",
-                tenant_id=tenant_id,
-                entity_id=record_id,
-                payload=_make_json_safe({"record": rec}),
-                entity_type=table,
-                correlation_id=correlation_id,
+            await self._emit(
+                PendingEvent(
+                    f"{table}.updated",
+                    tenant_id=tenant_id,
+                    entity_id=record_id,
+                    payload=self._event_payload(rec, changes["patch"]),
+                    entity_type=table,
+                    correlation_id=correlation_id,
+                )
+            )
+        return rec
+
+
+class AsyncDominationService(_EventEmitter):
+    """AsyncSession twin of :class:`DominationService` for non-blocking routers."""
+
+    def repo(self, table: str) -> AsyncDominationRepository:
+        if table not in self._repo_cache:
+            self._repo_cache[table] = AsyncDominationRepository(self.db, table=table)
+        return self._repo_cache[table]
+
+    def __init__(
+        self, db: AsyncSession, publisher: EventPublisher, *, compact_events: bool | None = None
+    ) -> None:
+        self.db = db
+        self._init_events(publisher, compact_events)
+        self.audit = AsyncAuditService(db)
+        self._repo_cache: dict[str, AsyncDominationRepository] = {}
+
+    async def create(
+        self,
+        *,
+        table: str,
+        tenant_id: uuid.UUID,
+        actor_user_id: uuid.UUID | None,
+        data: dict[str, Any],
+        correlation_id: str | None,
+        typed_columns: dict[str, Any] | None = None,
+        commit: bool = True,
+    ) -> dict[str, Any]:
+        repo = self.repo(table)
+        rec = await repo.create(tenant_id=tenant_id, data=data, typed_columns=typed_columns)
+        changes = _make_json_safe({"data": data})
+        await self.audit.log_mutation(
+            tenant_id=tenant_id,
+            action="create",
+            entity_name=table,
+            entity_id=uuid.UUID(str(rec["id"])),
+            actor_user_id=actor_user_id,
+            field_changes=changes,
+            correlation_id=correlation_id,
+        )
+        if commit:
+            await self.db.commit()
+            await self._emit(
+                PendingEvent(
+                    f"{table}.created",
+                    tenant_id=tenant_id,
+                    entity_id=uuid.UUID(str(rec["id"])),
+                    payload=self._event_payload(rec, changes["data"]),
+                    entity_type=table,
+                    correlation_id=correlation_id,
+                )
+            )
+        return rec
+
+    async def update(
+        self,
+        *,
+        table: str,
+        tenant_id: uuid.UUID,
+        actor_user_id: uuid.UUID | None,
+        record_id: uuid.UUID,
+        expected_version: int,
+        patch: dict[str, Any],
+        correlation_id: str | None,
+        commit: bool = True,
+    ) -> dict[str, Any] | None:
+        repo = self.repo(table)
+        rec = await repo.update(
+            tenant_id=tenant_id, record_id=record_id, expected_version=expected_version, patch=patch
+        )
+        if rec is None:
+            return None
+        changes = _make_json_safe({"patch": patch, "expected_version": expected_version})
+        await self.audit.log_mutation(
+            tenant_id=tenant_id,
+            action="update",
+            entity_name=table,
+            entity_id=record_id,
+            actor_user_id=actor_user_id,
+            field_changes=changes,
+            correlation_id=correlation_id,
+        )
+        if table == "tenants":
+            get_auth_cache().invalidate_tenant(tenant_id)
+        if commit:
+            await self.db.commit()
+            await self._emit(
+                PendingEvent(
+                    f"{table}.updated",
+                    tenant_id=tenant_id,
+                    entity_id=record_id,
+                    payload=self._event_payload(rec, changes["patch"]),
+                    entity_type=table,
+                    correlation_id=correlation_id,
+                )
             )
         return rec
@@ -4,10 +4,13 @@ import json
 import logging
 import uuid
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import Any
 
 from core_app.core.config import get_settings
+from core_app.core.redis_client import redis_kwargs
+from core_app.realtime.streams import PUBLISH_SCRIPT, stream_key
 
 try:
     import redis.asyncio as redis_async
@@ -17,7 +20,29 @@ except Exception:
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class PendingEvent:
+    event_name: str
+    tenant_id: uuid.UUID
+    entity_id: uuid.UUID
+    payload: dict[str, Any]
+    entity_type: str | None = None
+    correlation_id: str | None = None
+
+
 class EventPublisher(ABC):
+    async def publish_many(self, events: list[PendingEvent]) -> None:
+        """Publish a batch; backends override this to use a single round trip."""
+        for ev in events:
+            await self.publish(
+                ev.event_name,
+                ev.tenant_id,
+                ev.entity_id,
+                ev.payload,
+                entity_type=ev.entity_type,
+                correlation_id=ev.correlation_id,
+            )
+
     @abstractmethod
     async def publish(
         self,
@@ -110,13 +135,27 @@ class RedisEventPublisher(EventPublisher):
         if self._client is None:
             if redis_async is None:
                 raise RuntimeError("redis.asyncio not available")
-            self._client = redis_async.from_url(
-                self._redis_url,
-                decode_responses=True,
-                ssl_cert_reqs=None,
-            )
+            self._client = redis_async.from_url(self._redis_url, **redis_kwargs(self._redis_url))
         return self._client
 
+    async def _send(self, client, tenant_id: uuid.UUID, topic: str, data: str) -> None:
+        await client.publish(topic, data)
+
+    @staticmethod
+    def _envelope(ev: PendingEvent) -> tuple[str, str]:
+        topic = f"tenant.{ev.tenant_id}.{ev.event_name}"
+        envelope = {
+            "topic": topic,
+            "tenant_id": str(ev.tenant_id),
+            "entity_type": ev.entity_type or "unknown",
+            "entity_id": str(ev.entity_id),
+            "event_type": ev.event_name,
+            "payload": ev.payload,
+            "ts": datetime.now(UTC).isoformat(),
+            "correlation_id": ev.correlation_id,
+        }
+        return topic, json.dumps(envelope)
+
     async def publish(
         self,
         event_name: str,
@@ -127,20 +166,12 @@ class RedisEventPublisher(EventPublisher):
         entity_type: str | None = None,
         correlation_id: str | None = None,
     ) -> None:
+        ev = PendingEvent(event_name, tenant_id, entity_id, payload, entity_type, correlation_id)
         topic = f"tenant.{tenant_id}.{event_name}"
-        envelope = {
-            "topic": topic,
-            "tenant_id": str(tenant_id),
-            "entity_type": entity_type or "unknown",
-            "entity_id": str(entity_id),
-            "event_type": event_name,
-            "payload": payload,
-            "ts": datetime.now(UTC).isoformat(),
-            "correlation_id": correlation_id,
-        }
         try:
+            _, data = self._envelope(ev)
             client = await self._get_client()
-            await client.publish(topic, json.dumps(envelope))
+            await self._send(client, tenant_id, topic, data)
         except Exception as exc:
             logger.error(
                 "event_publisher.redis.publish failed",
@@ -155,6 +186,48 @@ class RedisEventPublisher(EventPublisher):
                 exc_info=exc,
             )
 
+    async def publish_many(self, events: list[PendingEvent]) -> None:
+        if not events:
+            return
+        try:
+            client = await self._get_client()
+            async with client.pipeline(transaction=False) as pipe:
+                for ev in events:
+                    topic, data = self._envelope(ev)
+                    await self._send(pipe, ev.tenant_id, topic, data)
+                await pipe.execute()
+        except Exception as exc:
+            logger.error(
+                "event_publisher.redis.publish_many failed",
+                extra={
+                    "event_count": len(events),
+                    "event_names": sorted({ev.event_name for ev in events}),
+                    "error": str(exc),
+                },
+                exc_info=exc,
+            )
+
+
+class RedisStreamEventPublisher(RedisEventPublisher):
+    """Appends each event to the tenant's Redis stream and publishes it.
+
+    The stream gives reconnecting realtime clients (and consumer groups) a
+    replayable history; see ``core_app.realtime.streams``.
+    """
+
+    def __init__(self, maxlen: int = 10000) -> None:
+        super().__init__()
+        self._maxlen = maxlen
+        self._script = None
+
+    async def _send(self, client, tenant_id: uuid.UUID, topic: str, data: str) -> None:
+        if self._script is None:
+            # Register on the connection itself; ``client`` may be a pipeline.
+            self._script = (await self._get_client()).register_script(PUBLISH_SCRIPT)
+        await self._script(
+            keys=[stream_key(str(tenant_id))], args=[self._maxlen, topic, data], client=client
+        )
+
 
 _publisher_instance: EventPublisher | None = None
 
@@ -164,7 +237,10 @@ def get_event_publisher(db_session=None) -> EventPublisher:
     if _publisher_instance is None:
         settings = get_settings()
         if getattr(settings, "redis_url", None) and redis_async is not None:
-            _publisher_instance = RedisEventPublisher()
+            if settings.event_publisher_backend.lower() == "streams":
+                _publisher_instance = RedisStreamEventPublisher(settings.event_stream_maxlen)
+            else:
+                _publisher_instance = RedisEventPublisher()
         else:
             logger.critical(
                 "event_publisher.fallback: Redis unavailable or not configured — "
@@ -0,0 +1,248 @@
+"""In-memory CloudWatch snapshot for the system-health dashboards.
+
+Every series the ``/api/v1/system-health`` endpoints read is declared once in
+``build_queries`` and fetched together in a single ``GetMetricData`` call
+(off the event loop).  The snapshot is refreshed every
+``HEALTH_METRICS_REFRESH_SECONDS`` by a background task that runs only while
+dashboards are being read, and it stops after
+``HEALTH_METRICS_IDLE_SECONDS`` without a reader.  Concurrent cache misses
+share one fetch.  A snapshot older than ``HEALTH_METRICS_TTL_SECONDS``, for
+example after CloudWatch errors, reads as unavailable.
+
+``HEALTH_METRICS_PROVIDER=local`` swaps CloudWatch for ``LocalMetricsProvider``
+(fixed values, no AWS calls), which is used for tests and local development.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Protocol
+
+import boto3
+
+from core_app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+Snapshot = dict[str, float | None]
+
+
+@dataclass(frozen=True, slots=True)
+class MetricQuery:
+    id: str
+    namespace: str
+    metric_name: str
+    dimensions: tuple[tuple[str, str], ...]
+    minutes: int = 5
+    stat: str = "Average"
+
+    def to_cloudwatch(self) -> dict:
+        return {
+            "Id": self.id,
+            "MetricStat": {
+                "Metric": {
+                    "Namespace": self.namespace,
+                    "MetricName": self.metric_name,
+                    "Dimensions": [{"Name": n, "Value": v} for n, v in self.dimensions],
+                },
+                "Period": self.minutes * 60,
+                "Stat": self.stat,
+            },
+            "ReturnData": True,
+        }
+
+
+def build_queries(settings: Settings) -> dict[str, MetricQuery]:
+    """Every series the dashboards read, for the resources that are configured."""
+    queries = [
+        MetricQuery(
+            "cloudfront_5xx",
+            "AWS/CloudFront",
+            "5xxErrorRate",
+            (("DistributionId", "GLOBAL"), ("Region", "Global")),
+            minutes=15,
+        )
+    ]
+    if settings.ecs_cluster_name:
+        ecs = (
+            ("ClusterName", settings.ecs_cluster_name),
+            ("ServiceName", settings.ecs_backend_service),
+        )
+        alb = (("LoadBalancer", settings.ecs_cluster_name),)
+        queries += [
+            MetricQuery("ecs_cpu", "AWS/ECS", "CPUUtilization", ecs),
+            MetricQuery("ecs_memory", "AWS/ECS", "MemoryUtilization", ecs),
+            MetricQuery("ecs_cpu_1d", "AWS/ECS", "CPUUtilization", ecs, minutes=1440),
+            MetricQuery("ecs_memory_1d", "AWS/ECS", "MemoryUtilization", ecs, minutes=1440),
+            MetricQuery("alb_latency", "AWS/ApplicationELB", "TargetResponseTime", alb, minutes=10),
+        ]
+    if settings.rds_instance_id:
+        rds = (("DBInstanceIdentifier", settings.rds_instance_id),)
+        queries.append(MetricQuery("rds_connections", "AWS/RDS", "DatabaseConnections", rds))
+    if settings.redis_cluster_id:
+        redis = (("ReplicationGroupId", settings.redis_cluster_id),)
+        queries += [
+            MetricQuery("redis_engine_cpu", "AWS/ElastiCache", "EngineCPUUtilization", redis),
+            MetricQuery("redis_hits", "AWS/ElastiCache", "CacheHits", redis),
+            MetricQuery("redis_misses", "AWS/ElastiCache", "CacheMisses", redis),
+        ]
+    return {q.id: q for q in queries}
+
+
+class MetricsProvider(Protocol):
+    async def fetch(self, queries: Iterable[MetricQuery]) -> Snapshot: ...
+
+
+class CloudWatchMetricsProvider:
+    """All queries in one ``GetMetricData`` request (paged by ``NextToken``)."""
+
+    def __init__(self, *, region: str = "us-east-1", client=None) -> None:
+        self._region = region
+        self._client = client
+
+    def _cw(self):
+        if self._client is None:
+            self._client = boto3.client("cloudwatch", region_name=self._region)
+        return self._client
+
+    async def fetch(self, queries: Iterable[MetricQuery]) -> Snapshot:
+        return await asyncio.to_thread(self._fetch, list(queries))
+
+    def _fetch(self, queries: list[MetricQuery]) -> Snapshot:
+        values: Snapshot = {q.id: None for q in queries}
+        if not queries:
+            return values
+        end = datetime.now(UTC)
+        # One request spans the widest window; each series only counts datapoints in its own.
+        cutoffs = {q.id: end - timedelta(minutes=q.minutes) for q in queries}
+        request = {
+            "MetricDataQueries": [q.to_cloudwatch() for q in queries],
+            "StartTime": end - timedelta(minutes=max(q.minutes for q in queries)),
+            "EndTime": end,
+            "ScanBy": "TimestampDescending",
+        }
+        while True:
+            resp = self._cw().get_metric_data(**request)
+            for result in resp.get("MetricDataResults", []):
+                series = result["Id"]
+                points = list(zip(result.get("Timestamps", []), result.get("Values", []), strict=True))
+                # Newest first: keep the first value seen for each series, if it is in its window.
+                if values.get(series) is None and points and points[0][0] >= cutoffs[series]:
+                    values[series] = round(points[0][1], 2)
+            token = resp.get("NextToken")
+            if not token:
+                return values
+            request["NextToken"] = token
+
+
+class LocalMetricsProvider:
+    """Fixed values keyed by query id; series without a value read as unavailable."""
+
+    def __init__(self, values: Mapping[str, float | None] | None = None) -> None:
+        self.values = dict(values or {})
+
+    async def fetch(self, queries: Iterable[MetricQuery]) -> Snapshot:
+        return {q.id: self.values.get(q.id) for q in queries}
+
+
+class HealthMetricsCollector:
+    def __init__(
+        self,
+        provider: MetricsProvider,
+        queries: Mapping[str, MetricQuery],
+        *,
+        refresh_seconds: float = 60.0,
+        ttl_seconds: float = 180.0,
+        idle_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.provider = provider
+        self.queries = dict(queries)
+        self.refresh_seconds = refresh_seconds
+        self.ttl_seconds = ttl_seconds
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._values: Snapshot = {}
+        self._fetched_at: float | None = None
+        self._attempts = 0
+        self._last_read = 0.0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _fresh(self) -> bool:
+        return self._fetched_at is not None and self._clock() - self._fetched_at <= self.ttl_seconds
+
+    async def get(self, metric_id: str) -> float | None:
+        """Latest value of a series from the snapshot; None when unconfigured or unavailable."""
+        if metric_id not in self.queries:
+            return None
+        self._last_read = self._clock()
+        self._ensure_task()
+        if not self._fresh():
+            await self.refresh()
+        return self._values.get(metric_id) if self._fresh() else None
+
+    async def refresh(self) -> None:
+        attempt = self._attempts
+        async with self._lock:
+            if self._attempts != attempt:
+                return  # another caller fetched while we waited
+            try:
+                values = await self.provider.fetch(self.queries.values())
+            except Exception as exc:
+                logger.warning("health_metrics_refresh_failed error=%s", exc)
+            else:
+                self._values = values
+                self._fetched_at = self._clock()
+            finally:
+                self._attempts += 1
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        while self._clock() - self._last_read < self.idle_seconds:
+            await asyncio.sleep(self.refresh_seconds)
+            await self.refresh()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+_collector: HealthMetricsCollector | None = None
+
+
+def get_health_metrics() -> HealthMetricsCollector:
+    global _collector
+    if _collector is None:
+        settings = get_settings()
+        if settings.health_metrics_provider.lower() == "local":
+            provider: MetricsProvider = LocalMetricsProvider()
+        else:
+            provider = CloudWatchMetricsProvider(region=settings.aws_region or "us-east-1")
+        _collector = HealthMetricsCollector(
+            provider,
+            build_queries(settings),
+            refresh_seconds=settings.health_metrics_refresh_seconds,
+            ttl_seconds=settings.health_metrics_ttl_seconds,
+            idle_seconds=settings.health_metrics_idle_seconds,
+        )
+    return _collector
+
+
+async def close_health_metrics() -> None:
+    global _collector
+    if _collector is not None:
+        await _collector.close()
+        _collector = None
@@ -1,29 +1,240 @@
+"""OPA policy checks for ``require_permission``.
+
+Decisions come either from an OPA server over a pooled async HTTP client
+(``OPA_MODE=http``) or from the ``opa/policies`` Rego evaluated in-process
+(``OPA_MODE=local``, needs the optional ``regorus`` package), and are cached
+for ``OPA_DECISION_CACHE_TTL_SECONDS`` keyed on (tenant, role, permission,
+method, path template).  Policies must therefore decide on those inputs only:
+the concrete path and user id are not part of the key.
+"""
+
 from __future__ import annotations
 
-from typing import Any
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Protocol
 
-import requests
+import httpx
+from prometheus_client import Counter, Histogram
 
 from core_app.core.config import get_settings
+from core_app.services.auth_cache import TTLCache
+
+try:
+    import regorus
+
+    REGORUS_AVAILABLE = True
+except ImportError:
+    REGORUS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLICY_DIR = Path(__file__).resolve().parents[3] / "opa" / "policies"
+
+OPA_DECISION_CACHE = Counter(
+    "opa_decision_cache_total",
+    "OPA decision cache lookups",
+    ["result"],
+)
+OPA_EVALUATION_SECONDS = Histogram(
+    "opa_evaluation_seconds",
+    "Time spent evaluating an OPA decision on a cache miss",
+    ["mode"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+DecisionKey = tuple[str, str, str, str, str]
 
 
 class OpaError(Exception):
     pass
 
 
-def opa_enabled() -> bool:
-    return bool(get_settings().opa_url)
+class PolicyEvaluator(Protocol):
+    mode: str
 
+    async def evaluate(self, input_doc: dict[str, Any]) -> bool: ...
 
-def check_policy(input_doc: dict[str, Any]) -> bool:
-    settings = get_settings()
-    if not settings.opa_url:
-        return True  # fallback to app RBAC if OPA not configured
-    url = settings.opa_url.rstrip("/") + "/" + settings.opa_policy_path.lstrip("/")
-    try:
-        resp = requests.post(url, json={"input": input_doc}, timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
+    async def aclose(self) -> None: ...
+
+
+class HttpPolicyEvaluator:
+    """Queries an OPA server, reusing keep-alive connections across requests."""
+
+    mode = "http"
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        timeout: float = 5.0,
+        max_connections: int = 20,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.url = url
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
+        )
+
+    async def evaluate(self, input_doc: dict[str, Any]) -> bool:
+        try:
+            resp = await self._client.post(self.url, json={"input": input_doc})
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            raise OpaError(str(exc)) from exc
         return bool(data.get("result", False))
-    except Exception as exc:
-        raise OpaError(str(exc)) from exc
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class LocalPolicyEvaluator:
+    """Evaluates Rego policies in-process with ``regorus``; no network hop.
+
+    ``rule`` is the OPA data path, e.g. ``data.fusionems.allow``.  The engine
+    is not thread-safe, so evaluations are serialized; each one is pure CPU
+    and takes microseconds.
+    """
+
+    mode = "local"
+
+    def __init__(self, policy_dir: Path, rule: str) -> None:
+        if not REGORUS_AVAILABLE:
+            raise OpaError("OPA_MODE=local requires the 'regorus' package.")
+        files = sorted(policy_dir.glob("*.rego"))
+        if not files:
+            raise OpaError(f"No .rego policies found in {policy_dir}.")
+        self.rule = rule
+        self._engine = regorus.Engine()
+        for path in files:
+            self._engine.add_policy_from_file(str(path))
+        self._lock = threading.Lock()
+
+    async def evaluate(self, input_doc: dict[str, Any]) -> bool:
+        try:
+            with self._lock:
+                self._engine.set_input_json(json.dumps(input_doc))
+                result = self._engine.eval_rule(self.rule)
+        except Exception as exc:
+            raise OpaError(str(exc)) from exc
+        return result is True
+
+    async def aclose(self) -> None:
+        return None
+
+
+def rule_from_policy_path(policy_path: str) -> str:
+    """``v1/data/fusionems/allow`` -> ``data.fusionems.allow``."""
+    parts = [p for p in policy_path.strip("/").split("/") if p]
+    if parts and parts[0] == "v1":
+        parts = parts[1:]
+    if not parts or parts[0] != "data":
+        parts.insert(0, "data")
+    return ".".join(parts)
+
+
+class OpaClient:
+    def __init__(
+        self,
+        evaluator: PolicyEvaluator,
+        *,
+        cache_ttl_seconds: float = 30,
+        cache_max_entries: int = 10000,
+    ) -> None:
+        self.evaluator = evaluator
+        self._cache: TTLCache[bool] | None = (
+            TTLCache(ttl_seconds=cache_ttl_seconds, max_entries=cache_max_entries)
+            if cache_ttl_seconds > 0
+            else None
+        )
+
+    async def is_allowed(self, key: DecisionKey, input_doc: dict[str, Any]) -> bool:
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                OPA_DECISION_CACHE.labels(result="hit").inc()
+                return cached
+            OPA_DECISION_CACHE.labels(result="miss").inc()
+        with OPA_EVALUATION_SECONDS.labels(mode=self.evaluator.mode).time():
+            allowed = await self.evaluator.evaluate(input_doc)
+        # Errors propagate uncached so the next request retries.
+        if self._cache is not None:
+            self._cache.set(key, allowed)
+        return allowed
+
+    def clear(self) -> None:
+        if self._cache is not None:
+            self._cache.clear()
+
+    async def aclose(self) -> None:
+        await self.evaluator.aclose()
+
+
+def opa_enabled() -> bool:
+    settings = get_settings()
+    return settings.opa_mode.lower() == "local" or bool(settings.opa_url)
+
+
+def build_input(
+    *,
+    tenant_id: str,
+    user_id: str,
+    role: str,
+    permission: str,
+    method: str,
+    path_template: str,
+) -> dict[str, Any]:
+    """Input document in the shape ``opa/policies/fusionems.rego`` reads."""
+    return {
+        "tenant_id": tenant_id,
+        "user_id": user_id,
+        "role": role,
+        "permission": permission,
+        "method": method,
+        "path": [seg for seg in path_template.split("/") if seg],
+        "path_template": path_template,
+        "user": {"sub": user_id, "tenant_id": tenant_id, "role": role},
+    }
+
+
+_opa_client: OpaClient | None = None
+
+
+def get_opa_client() -> OpaClient:
+    global _opa_client
+    if _opa_client is None:
+        settings = get_settings()
+        evaluator: PolicyEvaluator
+        if settings.opa_mode.lower() == "local":
+            policy_dir = Path(settings.opa_policy_dir) if settings.opa_policy_dir else DEFAULT_POLICY_DIR
+            evaluator = LocalPolicyEvaluator(policy_dir, rule_from_policy_path(settings.opa_policy_path))
+        else:
+            if not settings.opa_url:
+                raise OpaError("OPA not configured (OPA_URL).")
+            url = settings.opa_url.rstrip("/") + "/" + settings.opa_policy_path.lstrip("/")
+            evaluator = HttpPolicyEvaluator(
+                url,
+                timeout=settings.opa_timeout_seconds,
+                max_connections=settings.opa_max_connections,
+            )
+        _opa_client = OpaClient(
+            evaluator,
+            cache_ttl_seconds=settings.opa_decision_cache_ttl_seconds,
+            cache_max_entries=settings.opa_decision_cache_max_entries,
+        )
+    return _opa_client
+
+
+async def close_opa_client() -> None:
+    global _opa_client
+    if _opa_client is not None:
+        await _opa_client.aclose()
+        _opa_client = None
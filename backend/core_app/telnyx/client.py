@@ -1,14 +1,36 @@
+"""Async Telnyx v2 API client.
+
+One keep-alive ``httpx.AsyncClient`` per process (``get_telnyx_client``) so
+webhook handlers never block the event loop on Telnyx.  Call-control
+commands carry a ``command_id``, which Telnyx de-duplicates per call, so they
+are retried on timeouts, 429 and 5xx.  Messages are only retried when the
+connection was never established.  A circuit breaker fails calls fast while
+Telnyx is down.
+"""
+
 from __future__ import annotations
 
+import asyncio
+import base64
 import logging
+import uuid
 from typing import Any
 
-import requests
+import httpx
+
+from core_app.core.circuit_breaker import CircuitBreaker
+from core_app.core.config import get_settings
+from core_app.observability.metrics import external_call
 
 logger = logging.getLogger(__name__)
 
 TELNYX_API = "https://api.telnyx.com/v2"
 
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Raised before the request reached Telnyx: always safe to retry.
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
 
 class TelnyxNotConfigured(RuntimeError):
     pass
@@ -21,6 +43,10 @@ class TelnyxApiError(RuntimeError):
         self.body = body
 
 
+class TelnyxUnavailable(TelnyxApiError):
+    """Telnyx unreachable, or the circuit breaker is open."""
+
+
 def _headers(api_key: str) -> dict[str, str]:
     if not api_key:
         raise TelnyxNotConfigured("TELNYX_API_KEY is not configured")
@@ -30,7 +56,7 @@ def _headers(api_key: str) -> dict[str, str]:
     }
 
 
-def _raise_for(resp: requests.Response, context: str) -> None:
+def _raise_for(resp: httpx.Response, context: str) -> None:
     if resp.status_code >= 300:
         raise TelnyxApiError(
             f"{context} failed: HTTP {resp.status_code}",
@@ -39,21 +65,152 @@ def _raise_for(resp: requests.Response, context: str) -> None:
         )
 
 
+class TelnyxClient:
+    def __init__(
+        self,
+        *,
+        base_url: str = TELNYX_API,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        retries: int = 2,
+        backoff_seconds: float = 0.2,
+        breaker: CircuitBreaker | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self.breaker = breaker or CircuitBreaker()
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+            transport=transport,
+        )
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        api_key: str,
+        context: str,
+        json: dict[str, Any] | None = None,
+        idempotent: bool = False,
+        timeout: float | None = None,
+    ) -> httpx.Response:
+        headers = _headers(api_key)
+        if not self.breaker.allow():
+            raise TelnyxUnavailable(f"{context} skipped: Telnyx circuit open", status_code=503)
+        with external_call("telnyx", context):
+            return await self._send(
+                method, url, headers, context=context, json=json, idempotent=idempotent, timeout=timeout
+            )
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        *,
+        context: str,
+        json: dict[str, Any] | None,
+        idempotent: bool,
+        timeout: float | None,
+    ) -> httpx.Response:
+        extra = {} if timeout is None else {"timeout": timeout}
+        error: Exception | None = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self.backoff_seconds * 2 ** (attempt - 1))
+            try:
+                resp = await self._http.request(method, url, headers=headers, json=json, **extra)
+            except _NOT_SENT as exc:
+                error = exc
+                continue
+            except httpx.TransportError as exc:
+                error = exc
+                if idempotent:
+                    continue
+                break
+            if resp.status_code in RETRYABLE_STATUS:
+                if resp.status_code >= 500:
+                    error = TelnyxApiError(
+                        f"{context} failed: HTTP {resp.status_code}",
+                        status_code=resp.status_code,
+                        body=resp.text[:400],
+                    )
+                if idempotent and attempt < self.retries:
+                    continue
+            if resp.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            _raise_for(resp, context)
+            return resp
+
+        self.breaker.record_failure()
+        logger.warning("telnyx_request_failed context=%s error=%s", context, error)
+        raise TelnyxUnavailable(f"{context} failed: {error}", status_code=503) from error
+
+    async def call_action(
+        self, *, api_key: str, call_control_id: str, action: str, payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        resp = await self.request(
+            "POST",
+            f"/calls/{call_control_id}/actions/{action}",
+            api_key=api_key,
+            context=action,
+            json={**payload, "command_id": str(uuid.uuid4())},
+            idempotent=True,
+        )
+        return resp.json()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+_client: TelnyxClient | None = None
+
+
+def get_telnyx_client() -> TelnyxClient:
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = TelnyxClient(
+            timeout=settings.telnyx_timeout_seconds,
+            max_connections=settings.telnyx_max_connections,
+            retries=settings.telnyx_retries,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.telnyx_breaker_failures,
+                reset_seconds=settings.telnyx_breaker_reset_seconds,
+            ),
+        )
+    return _client
+
+
+async def close_telnyx_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _client_state(value: str) -> str:
+    return base64.b64encode(value.encode()).decode()
+
+
 # ── Call Control ──────────────────────────────────────────────────────────────
 
 
-def call_answer(*, api_key: str, call_control_id: str) -> dict[str, Any]:
-    r = requests.post(
-        f"{TELNYX_API}/calls/{call_control_id}/actions/answer",
-        headers=_headers(api_key),
-        json={},
-        timeout=10,
+async def call_answer(*, api_key: str, call_control_id: str) -> dict[str, Any]:
+    return await get_telnyx_client().call_action(
+        api_key=api_key, call_control_id=call_control_id, action="answer", payload={}
     )
-    _raise_for(r, "call_answer")
-    return r.json()
 
 
-def call_gather_using_audio(
+async def call_gather_using_audio(
     *,
     api_key: str,
     call_control_id: str,
@@ -75,20 +232,16 @@ def call_gather_using_audio(
     if terminating_digit:
         payload["terminating_digit"] = terminating_digit
     if client_state:
-        import base64
-
-        payload["client_state"] = base64.b64encode(client_state.encode()).decode()
-    r = requests.post(
-        f"{TELNYX_API}/calls/{call_control_id}/actions/gather_using_audio",
-        headers=_headers(api_key),
-        json=payload,
-        timeout=10,
+        payload["client_state"] = _client_state(client_state)
+    return await get_telnyx_client().call_action(
+        api_key=api_key,
+        call_control_id=call_control_id,
+        action="gather_using_audio",
+        payload=payload,
     )
-    _raise_for(r, "gather_using_audio")
-    return r.json()
 
 
-def call_playback_start(
+async def call_playback_start(
     *,
     api_key: str,
     call_control_id: str,
@@ -98,20 +251,16 @@ def call_playback_start(
 ) -> dict[str, Any]:
     payload: dict[str, Any] = {"audio_url": audio_url, "loop": loop}
     if client_state:
-        import base64
-
-        payload["client_state"] = base64.b64encode(client_state.encode()).decode()
-    r = requests.post(
-        f"{TELNYX_API}/calls/{call_control_id}/actions/playback_start",
-        headers=_headers(api_key),
-        json=payload,
-        timeout=10,
+        payload["client_state"] = _client_state(client_state)
+    return await get_telnyx_client().call_action(
+        api_key=api_key,
+        call_control_id=call_control_id,
+        action="playback_start",
+        payload=payload,
     )
-    _raise_for(r, "playback_start")
-    return r.json()
 
 
-def call_transfer(
+async def call_transfer(
     *,
     api_key: str,
     call_control_id: str,
@@ -123,34 +272,22 @@ def call_transfer(
     if from_:
         payload["from"] = from_
     if client_state:
-        import base64
-
-        payload["client_state"] = base64.b64encode(client_state.encode()).decode()
-    r = requests.post(
-        f"{TELNYX_API}/calls/{call_control_id}/actions/transfer",
-        headers=_headers(api_key),
-        json=payload,
-        timeout=10,
+        payload["client_state"] = _client_state(client_state)
+    return await get_telnyx_client().call_action(
+        api_key=api_key, call_control_id=call_control_id, action="transfer", payload=payload
     )
-    _raise_for(r, "call_transfer")
-    return r.json()
 
 
-def call_hangup(*, api_key: str, call_control_id: str) -> dict[str, Any]:
-    r = requests.post(
-        f"{TELNYX_API}/calls/{call_control_id}/actions/hangup",
-        headers=_headers(api_key),
-        json={},
-        timeout=10,
+async def call_hangup(*, api_key: str, call_control_id: str) -> dict[str, Any]:
+    return await get_telnyx_client().call_action(
+        api_key=api_key, call_control_id=call_control_id, action="hangup", payload={}
     )
-    _raise_for(r, "call_hangup")
-    return r.json()
 
 
 # ── Messaging ─────────────────────────────────────────────────────────────────
 
 
-def send_sms(
+async def send_sms(
     *,
     api_key: str,
     from_number: str,
@@ -165,29 +302,22 @@ def send_sms(
     }
     if messaging_profile_id:
         payload["messaging_profile_id"] = messaging_profile_id
-    r = requests.post(
-        f"{TELNYX_API}/messages",
-        headers=_headers(api_key),
-        json=payload,
-        timeout=20,
+    resp = await get_telnyx_client().request(
+        "POST", "/messages", api_key=api_key, context="send_sms", json=payload, timeout=20
     )
-    _raise_for(r, "send_sms")
-    return r.json()
+    return resp.json()
 
 
 # ── Media download ────────────────────────────────────────────────────────────
 
 
-def download_media(*, api_key: str, media_url: str) -> bytes:
-    r = requests.get(
+async def download_media(*, api_key: str, media_url: str) -> bytes:
+    resp = await get_telnyx_client().request(
+        "GET",
         media_url,
-        headers=_headers(api_key),
+        api_key=api_key,
+        context="download_media",
+        idempotent=True,
         timeout=60,
-        stream=True,
     )
-    _raise_for(r, "download_media")
-    chunks = []
-    for chunk in r.iter_content(chunk_size=65536):
-        if chunk:
-            chunks.append(chunk)
-    return b"".join(chunks)
+    return resp.content
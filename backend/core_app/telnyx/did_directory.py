@@ -0,0 +1,49 @@
+"""Cached DID -> tenant lookups for the Telnyx webhooks.
+
+Every voice, SMS and fax webhook hop resolves the dialled number to a tenant.
+``tenant_phone_numbers`` rarely changes (numbers are provisioned out of
+band), so results, misses included, are kept for
+``TELNYX_DID_CACHE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from core_app.core.config import get_settings
+from core_app.services.auth_cache import TTLCache
+
+V = TypeVar("V")
+
+
+class DidDirectory:
+    def __init__(self, *, ttl_seconds: float, max_entries: int = 10000) -> None:
+        # (purpose, phone) -> (value,); the tuple lets a miss be cached too.
+        self._cache: TTLCache[tuple[Any]] = TTLCache(
+            ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+
+    def lookup(self, purpose: str, phone: str, load: Callable[[], V]) -> V:
+        key = (purpose, phone)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = (load(),)
+            self._cache.set(key, cached)
+        return cached[0]
+
+    def invalidate(self, phone: str | None = None) -> None:
+        if phone is None:
+            self._cache.clear()
+        else:
+            self._cache.pop_where(lambda key: key[1] == phone)
+
+
+_directory: DidDirectory | None = None
+
+
+def get_did_directory() -> DidDirectory:
+    global _directory
+    if _directory is None:
+        _directory = DidDirectory(ttl_seconds=get_settings().telnyx_did_cache_ttl_seconds)
+    return _directory
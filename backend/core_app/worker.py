@@ -8,16 +8,23 @@ Handles:
 - Daily executive briefing
 - Credential expiry alerts
 - Export queue processing
+- NEMSIS batch exports (streaming multi-PCR EMSDataSet files)
+
+Set WORKER_METRICS_PORT to serve Prometheus metrics (job durations, DB,
+Redis and external-call latency) from this process.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import signal
 import uuid
 from datetime import UTC, datetime
 
+from core_app.observability.metrics import configure_metrics, external_call, worker_job
+
 logger = logging.getLogger(__name__)
 
 _BRIEFING_HOUR_UTC = 7
@@ -25,6 +32,11 @@ _BRIEFING_HOUR_UTC = 7
 
 async def run_worker() -> None:
     logger.info("FusionEMS Worker starting...")
+    configure_metrics()
+    if port := os.environ.get("WORKER_METRICS_PORT"):
+        from prometheus_client import start_http_server
+
+        start_http_server(int(port))
     loop = asyncio.get_running_loop()
     stop_event = asyncio.Event()
 
@@ -36,6 +48,7 @@ async def run_worker() -> None:
         loop.add_signal_handler(sig, _signal_handler)
 
     from core_app.workers.epcr_retention_worker import _epcr_retention_loop
+    from core_app.workers.nemsis_export_worker import _nemsis_export_loop
 
     tasks = [
         asyncio.create_task(_heartbeat_loop(stop_event)),
@@ -43,6 +56,7 @@ async def run_worker() -> None:
         asyncio.create_task(_executive_briefing_loop(stop_event)),
         asyncio.create_task(_dlq_processing_loop(stop_event)),
         asyncio.create_task(_epcr_retention_loop(stop_event)),
+        asyncio.create_task(_nemsis_export_loop(stop_event)),
     ]
 
     await stop_event.wait()
@@ -80,7 +94,8 @@ async def _executive_briefing_loop(stop: asyncio.Event) -> None:
         now_utc = datetime.now(UTC)
         if now_utc.hour == _BRIEFING_HOUR_UTC and now_utc.minute == 0:
             try:
-                await _generate_executive_briefing()
+                with worker_job("executive_briefing"):
+                    await _generate_executive_briefing()
             except Exception as e:
                 logger.error("Executive briefing error: %s", e)
             await asyncio.sleep(3600)
@@ -110,7 +125,7 @@ async def _dlq_processing_loop(stop: asyncio.Event) -> None:
             from core_app.services.event_publisher import get_event_publisher
             from core_app.services.webhook_dlq import process_dlq_batch
 
-            with get_db_session_ctx() as db:
+            with worker_job("webhook_dlq"), get_db_session_ctx() as db:
                 svc = DominationService(db, get_event_publisher())
                 from core_app.api.lob_webhook_router import handle_lob_event
                 from core_app.api.stripe_webhook_router import handle_stripe_event
@@ -149,26 +164,27 @@ async def _generate_executive_briefing() -> None:
                 import openai
 
                 client = openai.AsyncOpenAI(api_key=settings.openai_api_key)
-                resp = await client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": (
-                                "You are the FusionEMS platform intelligence. "
-                                "Generate a concise daily executive briefing for the EMS agency operator. "
-                                "Focus on revenue cycle health, operational readiness, compliance status, "
-                                "and any AI-detected anomalies. Be factual, brief, and action-oriented."
-                            ),
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Date: {datetime.now(UTC).strftime('%Y-%m-%d')}. Generate today's briefing.",
-                        },
-                    ],
-                    max_tokens=512,
-                    temperature=0.3,
-                )
+                with external_call("openai", "chat.completions"):
+                    resp = await client.chat.completions.create(
+                        model="gpt-4o-mini",
+                        messages=[
+                            {
+                                "role": "system",
+                                "content": (
+                                    "You are the FusionEMS platform intelligence. "
+                                    "Generate a concise daily executive briefing for the EMS agency operator. "
+                                    "Focus on revenue cycle health, operational readiness, compliance status, "
+                                    "and any AI-detected anomalies. Be factual, brief, and action-oriented."
+                                ),
+                            },
+                            {
+                                "role": "user",
+                                "content": f"Date: {datetime.now(UTC).strftime('%Y-%m-%d')}. Generate today's briefing.",
+                            },
+                        ],
+                        max_tokens=512,
+                        temperature=0.3,
+                    )
                 briefing["summary"] = resp.choices[0].message.content or briefing["summary"]
                 briefing["model"] = resp.model
             except Exception as ai_err:
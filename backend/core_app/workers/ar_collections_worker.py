@@ -2,20 +2,20 @@ from __future__ import annotations
 
 import json
 import logging
-import os
 import uuid
 from datetime import UTC, datetime
 from typing import Any
 
-logger = logging.getLogger(__name__)
+from core_app.observability.metrics import sqs_job
 
-DATABASE_URL = os.environ.get("DATABASE_URL", "")
+logger = logging.getLogger(__name__)
 
 try:
-    from sqlalchemy import create_engine
     from sqlalchemy.orm import sessionmaker
 
-    _engine = create_engine(DATABASE_URL) if DATABASE_URL else None
+    from core_app.db.pool import worker_engine
+
+    _engine = worker_engine()
     _Session = sessionmaker(bind=_engine) if _engine else None
 except Exception:
     _engine = None
@@ -25,6 +25,7 @@ DUNNING_DAYS = [0, 15, 30, 45, 60]
 PLACEMENT_THRESHOLD_DAYS = 90
 
 
+@sqs_job("ar_collections")
 def lambda_handler(event: dict, context: Any) -> dict:
     results = []
     for record in event.get("Records", []):
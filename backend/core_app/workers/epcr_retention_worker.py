@@ -37,6 +37,8 @@ import logging
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
+from core_app.observability.metrics import worker_job
+
 logger = logging.getLogger(__name__)
 
 RETENTION_YEARS = 10
@@ -175,7 +177,8 @@ async def _epcr_retention_loop(stop: asyncio.Event) -> None:
         try:
             from core_app.db.session import get_db_session_ctx
 
-            await run_retention_sweep(get_db_session_ctx)
+            with worker_job("epcr_retention"):
+                await run_retention_sweep(get_db_session_ctx)
         except Exception as exc:
             logger.error("Retention loop error: %s", exc)
         await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
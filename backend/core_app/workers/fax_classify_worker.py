@@ -11,6 +11,7 @@ from typing import Any
 import boto3
 
 from core_app.documents.classifier import classify_text
+from core_app.observability.metrics import sqs_job
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,7 @@ _TEXTRACT_POLL_INTERVAL_S = 5
 _TEXTRACT_MAX_POLLS = 60
 
 
+@sqs_job("fax_classify")
 def lambda_handler(event: dict[str, Any], context: Any) -> None:
     for record in event.get("Records", []):
         try:
@@ -7,27 +7,88 @@ import uuid
 from datetime import UTC, datetime
 from typing import Any
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
+from sqlalchemy.orm import Session, sessionmaker
+
+from core_app.db.pool import worker_engine
+from core_app.observability.metrics import sqs_job
 
 logger = logging.getLogger(__name__)
 
+_engine = worker_engine()
+_Session = sessionmaker(bind=_engine) if _engine else None
+
 
+@sqs_job("fax_match")
 def lambda_handler(event: dict, context: Any) -> None:
+    """Process an SQS batch; raise after the batch if any record failed.
+
+    The event source mapping does not enable ``ReportBatchItemFailures``, so
+    a returned failure list would be ignored and the messages deleted.
+    Raising redelivers the whole batch instead; faxes whose
+    ``fax_documents.status`` the first attempt already set to a match are
+    skipped on the retry (see ``_already_processed``).
+    """
+    failed: list[str] = []
+    batch: list[tuple[str, dict]] = []
     for record in event.get("Records", []):
+        message_id = record.get("messageId", "")
         try:
-            body = json.loads(record["body"])
-            process_fax_match(body)
+            batch.append((message_id, json.loads(record["body"])))
+        except Exception as exc:
+            logger.exception("fax_match_record_unparseable message_id=%s error=%s", message_id, exc)
+            failed.append(message_id)
+
+    processed = _already_processed(
+        [(m.get("fax_id", ""), str(m.get("tenant_id", ""))) for _, m in batch]
+    )
+    for message_id, message in batch:
+        try:
+            process_fax_match(message, processed=processed)
         except Exception as exc:
             logger.exception(
                 "fax_match_record_failed message_id=%s error=%s",
-                record.get("messageId", ""),
+                message_id,
                 exc,
             )
-            raise
+            failed.append(message_id)
+    if failed:
+        raise RuntimeError(f"fax_match failed for {len(failed)} record(s): {', '.join(failed)}")
+
+
+# fax_documents.status values written once a fax has been matched (or queued for review).
+_PROCESSED_STATUSES = ("auto_matched", "suggested", "attached")
+
+
+def _already_processed(keys: list[tuple[str, str]]) -> set[tuple[str, str]]:
+    """Return the ``(fax_id, tenant_id)`` pairs this worker already matched, in one query."""
+    keys = [(fid, tid) for fid, tid in keys if fid and tid]
+    if not keys or _Session is None:
+        return set()
+    try:
+        with _Session() as db:
+            rows = db.execute(
+                text(
+                    "SELECT fax_id, tenant_id::text AS tenant_id FROM fax_documents "
+                    "WHERE fax_id = ANY(CAST(:fids AS text[])) "
+                    "AND tenant_id = ANY(CAST(:tids AS uuid[])) "
+                    "AND status = ANY(CAST(:statuses AS text[]))"
+                ),
+                {
+                    "fids": sorted({fid for fid, _ in keys}),
+                    "tids": sorted({tid for _, tid in keys}),
+                    "statuses": list(_PROCESSED_STATUSES),
+                },
+            ).fetchall()
+    except Exception as exc:
+        logger.warning("fax_match_idempotency_check_failed count=%s error=%s", len(keys), exc)
+        return set()
+    return {(r.fax_id, r.tenant_id) for r in rows}
 
 
-def process_fax_match(message: dict) -> None:
+def process_fax_match(
+    message: dict, *, processed: set[tuple[str, str]] | None = None
+) -> dict | None:
     fax_id: str = message.get("fax_id", "")
     tenant_id: str | None = message.get("tenant_id")
     s3_key: str = message.get("s3_key", "")
@@ -44,47 +105,53 @@ def process_fax_match(message: dict) -> None:
             tenant_id,
             correlation_id,
         )
-        return
+        return None
 
-    database_url_idem = os.environ.get("DATABASE_URL", "")
-    if database_url_idem:
-        try:
-            _engine = create_engine(database_url_idem, pool_pre_ping=True)
-            _Session = sessionmaker(bind=_engine)
-            db = _Session()
-            try:
-                existing = db.execute(
-                    text(
-                        "SELECT data->>'match_status' as status FROM document_matches WHERE data->>'fax_id' = :fid AND tenant_id = :tid LIMIT 1"
-                    ),
-                    {"fid": fax_id, "tid": str(tenant_id)},
-                ).fetchone()
-                if existing and existing.status in ("matched", "suggested"):
-                    logger.info(
-                        "fax_match_skip_already_processed fax_id=%s status=%s correlation_id=%s",
-                        fax_id,
-                        existing.status,
-                        correlation_id,
-                    )
-                    return {"skipped": True, "reason": "already_processed", "fax_id": fax_id}
-            finally:
-                db.close()
-                _engine.dispose()
-        except Exception as _idem_exc:
-            logger.warning(
-                "fax_match_idempotency_check_failed fax_id=%s error=%s correlation_id=%s",
-                fax_id,
-                _idem_exc,
-                correlation_id,
-            )
+    if processed is None:
+        processed = _already_processed([(fax_id, str(tenant_id))])
+    if (fax_id, str(tenant_id)) in processed:
+        logger.info(
+            "fax_match_skip_already_processed fax_id=%s correlation_id=%s",
+            fax_id,
+            correlation_id,
+        )
+        return {"skipped": True, "reason": "already_processed", "fax_id": fax_id}
+
+    if _Session is None:
+        logger.error("fax_match_persist_skipped DATABASE_URL not set")
+        return None
 
-    database_url = os.environ.get("DATABASE_URL", "")
     bucket = os.environ.get("S3_BUCKET_DOCS", "")
 
+    # S3 download and QR decoding happen before a connection is checked out.
     qr_payload: dict | None = None
     if s3_key and bucket:
         qr_payload = _try_decode_qr_from_pdf(bucket=bucket, s3_key=s3_key)
 
+    with _Session() as db, db.begin():
+        _match_and_persist(
+            db,
+            fax_id=fax_id,
+            tenant_id=tenant_id,
+            qr_payload=qr_payload,
+            ocr_text=ocr_text,
+            fax_date=fax_date,
+            correlation_id=correlation_id,
+        )
+    return None
+
+
+def _match_and_persist(
+    db: Session,
+    *,
+    fax_id: str,
+    tenant_id: str,
+    qr_payload: dict | None,
+    ocr_text: str,
+    fax_date: str,
+    correlation_id: str,
+) -> None:
+    """Run matching and status persistence for one fax inside the caller's transaction."""
     if qr_payload:
         logger.info(
             "fax_match_qr_decoded fax_id=%s payload_claim_id=%s correlation_id=%s",
@@ -92,19 +159,14 @@ def process_fax_match(message: dict) -> None:
             qr_payload.get("claim_id"),
             correlation_id,
         )
-        match_result = _match_by_qr(
-            fax_id=fax_id,
-            tenant_id=tenant_id,
-            qr_payload=qr_payload,
-            database_url=database_url,
-        )
+        match_result = _match_by_qr(db, fax_id=fax_id, tenant_id=tenant_id, qr_payload=qr_payload)
         if match_result:
             _persist_status(
+                db,
                 fax_id=fax_id,
                 status="auto_matched",
                 matched_claim_id=match_result["claim_id"],
                 suggested_matches=None,
-                database_url=database_url,
             )
             logger.info(
                 "fax_match_auto_matched_qr fax_id=%s claim_id=%s correlation_id=%s",
@@ -116,28 +178,24 @@ def process_fax_match(message: dict) -> None:
 
     if ocr_text:
         matches = _match_probabilistic(
-            fax_id=fax_id,
-            tenant_id=tenant_id,
-            ocr_text=ocr_text,
-            fax_date=fax_date,
-            database_url=database_url,
+            db, fax_id=fax_id, tenant_id=tenant_id, ocr_text=ocr_text, fax_date=fax_date
         )
         if matches:
             best = matches[0]
             if best["score"] >= 80:
                 _attach_claim(
+                    db,
                     fax_id=fax_id,
                     tenant_id=tenant_id,
                     claim_id=best["claim_id"],
                     attachment_type="auto_probabilistic",
-                    database_url=database_url,
                 )
                 _persist_status(
+                    db,
                     fax_id=fax_id,
                     status="auto_matched",
                     matched_claim_id=best["claim_id"],
                     suggested_matches=None,
-                    database_url=database_url,
                 )
                 logger.info(
                     "fax_match_auto_matched_prob fax_id=%s claim_id=%s score=%s correlation_id=%s",
@@ -149,11 +207,11 @@ def process_fax_match(message: dict) -> None:
                 return
 
             _persist_status(
+                db,
                 fax_id=fax_id,
                 status="suggested",
                 matched_claim_id=None,
                 suggested_matches=matches[:5],
-                database_url=database_url,
             )
             logger.info(
                 "fax_match_suggested fax_id=%s top_score=%s correlation_id=%s",
@@ -164,11 +222,11 @@ def process_fax_match(message: dict) -> None:
             return
 
     _persist_status(
+        db,
         fax_id=fax_id,
         status="unmatched",
         matched_claim_id=None,
         suggested_matches=None,
-        database_url=database_url,
     )
     logger.info("fax_match_unmatched fax_id=%s correlation_id=%s", fax_id, correlation_id)
 
@@ -208,94 +266,65 @@ def _try_decode_qr_from_pdf(*, bucket: str, s3_key: str) -> dict | None:
 
 
 def _match_by_qr(
+    db: Session,
     *,
     fax_id: str,
     tenant_id: str,
     qr_payload: dict,
-    database_url: str,
 ) -> dict | None:
-    if not database_url:
-        return None
-    try:
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-
-        engine = create_engine(database_url, pool_pre_ping=True)
-        Session = sessionmaker(bind=engine)
-        db = Session()
-        try:
-            from core_app.fax.claim_matcher import ClaimMatcher
+    from core_app.fax.claim_matcher import ClaimMatcher
 
+    try:
+        with db.begin_nested():
             matcher = ClaimMatcher(db, tenant_id)
             result = matcher.match_claim_by_qr(qr_payload)
             if result:
                 claim_id = str(result.get("id", ""))
-                matcher.attach_to_claim(fax_id, claim_id, "qr_match", actor="auto_qr")
+                matcher.attach_to_claim(
+                    fax_id, claim_id, "qr_match", actor="auto_qr", commit=False
+                )
                 return {"claim_id": claim_id}
             return None
-        finally:
-            db.close()
-            engine.dispose()
     except Exception as exc:
         logger.error("fax_match_by_qr_failed fax_id=%s error=%s", fax_id, exc)
         return None
 
 
 def _match_probabilistic(
+    db: Session,
     *,
     fax_id: str,
     tenant_id: str,
     ocr_text: str,
     fax_date: str,
-    database_url: str,
 ) -> list[dict]:
-    if not database_url:
-        return []
-    try:
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-
-        engine = create_engine(database_url, pool_pre_ping=True)
-        Session = sessionmaker(bind=engine)
-        db = Session()
-        try:
-            from core_app.fax.claim_matcher import ClaimMatcher
+    from core_app.fax.claim_matcher import ClaimMatcher
 
+    try:
+        with db.begin_nested():
             matcher = ClaimMatcher(db, tenant_id)
             return matcher.match_claim_probabilistic(ocr_text, fax_date=fax_date)
-        finally:
-            db.close()
-            engine.dispose()
     except Exception as exc:
         logger.error("fax_match_probabilistic_failed fax_id=%s error=%s", fax_id, exc)
         return []
 
 
 def _attach_claim(
+    db: Session,
     *,
     fax_id: str,
     tenant_id: str,
     claim_id: str,
     attachment_type: str,
-    database_url: str,
 ) -> None:
-    if not database_url:
-        return
-    try:
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-
-        engine = create_engine(database_url, pool_pre_ping=True)
-        Session = sessionmaker(bind=engine)
-        db = Session()
-        try:
-            from core_app.fax.claim_matcher import ClaimMatcher
+    from core_app.fax.claim_matcher import ClaimMatcher
 
+    try:
+        with db.begin_nested():
             matcher = ClaimMatcher(db, tenant_id)
-            matcher.attach_to_claim(fax_id, claim_id, attachment_type, actor="auto_worker")
-        finally:
-            db.close()
-            engine.dispose()
+            matcher.attach_to_claim(
+                fax_id, claim_id, attachment_type, actor="auto_worker", commit=False
+            )
     except Exception as exc:
         logger.error(
             "fax_match_attach_failed fax_id=%s claim_id=%s error=%s", fax_id, claim_id, exc
@@ -303,36 +332,27 @@ def _attach_claim(
 
 
 def _persist_status(
+    db: Session,
     *,
     fax_id: str,
     status: str,
     matched_claim_id: str | None,
     suggested_matches: list[dict] | None,
-    database_url: str,
 ) -> None:
-    if not database_url:
-        logger.error("fax_match_persist_skipped DATABASE_URL not set")
-        return
-
-    now = datetime.now(UTC).isoformat()
-    suggested_json = json.dumps(suggested_matches or [], default=str)
-
-    try:
-        import psycopg
-
-        with psycopg.connect(database_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    UPDATE fax_documents
-                    SET status = %s,
-                        matched_claim_id = COALESCE(%s, matched_claim_id),
-                        suggested_matches = %s::jsonb,
-                        updated_at = %s
-                    WHERE fax_id = %s
-                    """,
-                    (status, matched_claim_id, suggested_json, now, fax_id),
-                )
-            conn.commit()
-    except Exception as exc:
-        logger.error("fax_match_persist_failed fax_id=%s error=%s", fax_id, exc)
+    db.execute(
+        text(
+            "UPDATE fax_documents "
+            "SET status = :status, "
+            "matched_claim_id = COALESCE(:matched_claim_id, matched_claim_id), "
+            "suggested_matches = CAST(:suggested AS jsonb), "
+            "updated_at = :now "
+            "WHERE fax_id = :fax_id"
+        ),
+        {
+            "status": status,
+            "matched_claim_id": matched_claim_id,
+            "suggested": json.dumps(suggested_matches or [], default=str),
+            "now": datetime.now(UTC).isoformat(),
+            "fax_id": fax_id,
+        },
+    )
@@ -8,6 +8,9 @@ from typing import Any
 
 import boto3
 
+from core_app.db.pool import worker_engine
+from core_app.observability.metrics import sqs_job
+
 WORKER_TYPE = os.environ.get("KITLINK_WORKER_TYPE", "kitlink_ocr")
 
 _s3 = boto3.client("s3")
@@ -15,7 +18,6 @@ _sqs = boto3.client("sqs")
 _ssm = boto3.client("ssm")
 
 BUCKET = os.environ.get("KITLINK_ARTIFACTS_BUCKET", "")
-DB_URL = os.environ.get("DATABASE_URL", "")
 
 QUEUE_URLS = {
     "kitlink_ocr": os.environ.get("KITLINK_OCR_QUEUE_URL", ""),
@@ -28,9 +30,12 @@ QUEUE_URLS = {
 
 
 def _db_conn():
-    import psycopg2
-
-    return psycopg2.connect(DB_URL)
+    # DBAPI connection checked out of the shared worker pool; close() returns
+    # it to the pool instead of tearing down the TCP/TLS session.
+    engine = worker_engine()
+    if engine is None:
+        raise RuntimeError("Database not configured — DATABASE_URL missing")
+    return engine.raw_connection()
 
 
 def _enqueue(queue_key: str, body: dict):
@@ -424,6 +429,7 @@ _HANDLERS = {
 }
 
 
+@sqs_job("kitlink")
 def lambda_handler(event: dict, context: Any) -> dict:
     handler = _HANDLERS.get(WORKER_TYPE)
     if not handler:
@@ -8,6 +8,8 @@ from typing import Any
 
 import boto3
 
+from core_app.observability.metrics import sqs_job
+
 logger = logging.getLogger(__name__)
 
 # ── Statement status machine ──────────────────────────────────────────────────
@@ -256,6 +258,7 @@ def _utcnow() -> str:
 # ── Lambda handler ────────────────────────────────────────────────────────────
 
 
+@sqs_job("lob")
 def lambda_handler(event: dict[str, Any], context: Any) -> None:
     for record in event.get("Records", []):
         try:
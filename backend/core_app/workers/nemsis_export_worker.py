@@ -0,0 +1,109 @@
+"""NEMSIS batch export worker.
+
+Runs in the main worker process (``core_app/worker.py``).  Every
+``NEMSIS_EXPORT_POLL_SECONDS`` it claims the oldest queued
+``nemsis_export_batches`` row and runs it through ``NEMSISBatchExporter`` in
+a thread.  The claim is a version-checked update, so several workers can poll
+safely.  PCR rendering and validation happen in ``NEMSIS_EXPORT_PROCESSES``
+worker processes.  The batch row ends ``completed``, with per-state document
+keys and PCR counts, or ``failed`` with the error.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import UTC, datetime
+from typing import Any
+
+from core_app.core.config import get_settings
+from core_app.documents.s3_storage import S3MultipartWriter, default_exports_bucket
+from core_app.epcr.nemsis_batch_exporter import NEMSISBatchExporter, OpenWriter
+from core_app.observability.metrics import worker_job
+
+logger = logging.getLogger(__name__)
+
+BATCH_TABLE = "nemsis_export_batches"
+
+
+def s3_writer(key: str, content_type: str) -> S3MultipartWriter:
+    settings = get_settings()
+    return S3MultipartWriter(
+        bucket=default_exports_bucket(),
+        key=key,
+        content_type=content_type,
+        part_size=settings.nemsis_export_part_size_mb * 1024 * 1024,
+    )
+
+
+async def export_next_batch(
+    svc, *, open_writer: OpenWriter = s3_writer, processes: int | None = None
+) -> dict[str, Any] | None:
+    """Claim and export the oldest queued batch; None when nothing is queued."""
+    settings = get_settings()
+    queued = svc.repo(BATCH_TABLE).list_raw_by_field("status", "queued", limit=20)
+    for batch in sorted(queued, key=lambda r: str(r.get("created_at"))):
+        tenant_id = uuid.UUID(str(batch["tenant_id"]))
+        batch_id = uuid.UUID(str(batch["id"]))
+        claimed = await svc.update(
+            table=BATCH_TABLE,
+            tenant_id=tenant_id,
+            actor_user_id=None,
+            record_id=batch_id,
+            expected_version=int(batch.get("version", 1)),
+            patch={"status": "running", "started_at": datetime.now(UTC).isoformat()},
+            correlation_id=None,
+        )
+        if claimed is None:
+            continue  # another worker claimed it first
+
+        exporter = NEMSISBatchExporter(
+            svc.repo("epcr_charts"),
+            open_writer=open_writer,
+            processes=settings.nemsis_export_processes if processes is None else processes,
+            page_size=settings.nemsis_export_page_size,
+        )
+        patch: dict[str, Any]
+        try:
+            with worker_job("nemsis_export"):
+                summary = await asyncio.to_thread(
+                    exporter.run,
+                    tenant_id=tenant_id,
+                    batch_id=str(batch_id),
+                    batch=claimed.get("data", {}),
+                )
+            patch = {"status": "completed", **summary.to_patch()}
+        except Exception as exc:
+            logger.exception("nemsis_batch_export_failed batch_id=%s", batch_id)
+            svc.db.rollback()
+            patch = {"status": "failed", "error": str(exc)[:500]}
+        patch["completed_at"] = datetime.now(UTC).isoformat()
+        return await svc.update(
+            table=BATCH_TABLE,
+            tenant_id=tenant_id,
+            actor_user_id=None,
+            record_id=batch_id,
+            expected_version=int(claimed.get("version", 1)),
+            patch=patch,
+            correlation_id=None,
+        )
+    return None
+
+
+async def _nemsis_export_loop(stop: asyncio.Event) -> None:
+    await asyncio.sleep(45)
+    poll_seconds = get_settings().nemsis_export_poll_seconds
+    while not stop.is_set():
+        try:
+            from core_app.db.session import get_db_session_ctx
+            from core_app.services.domination_service import DominationService
+            from core_app.services.event_publisher import get_event_publisher
+
+            with get_db_session_ctx() as db:
+                svc = DominationService(db, get_event_publisher())
+                while not stop.is_set() and await export_next_batch(svc) is not None:
+                    pass
+        except Exception as exc:
+            logger.error("NEMSIS export loop error: %s", exc)
+        await asyncio.sleep(poll_seconds)
@@ -11,19 +11,21 @@ import zipfile
 from typing import Any
 
 import boto3
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
 
+from core_app.db.pool import worker_engine
 from core_app.documents.s3_storage import put_bytes
+from core_app.observability.metrics import sqs_job
 
 logger = logging.getLogger(__name__)
 PACK_S3_PREFIX = "neris/packs"
 
-DATABASE_URL = os.environ.get("DATABASE_URL", "")
-_engine = create_engine(DATABASE_URL) if DATABASE_URL else None
+_engine = worker_engine()
 _Session = sessionmaker(bind=_engine) if _engine else None
 
 
+@sqs_job("neris_pack")
 def lambda_handler(event: dict, context: Any) -> dict:
     results = []
     for record in event.get("Records", []):
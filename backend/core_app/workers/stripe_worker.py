@@ -9,6 +9,8 @@ from typing import Any
 import boto3
 from boto3.dynamodb import conditions as ddb_conditions
 
+from core_app.observability.metrics import sqs_job
+
 logger = logging.getLogger(__name__)
 
 # ── Status machine ─────────────────────────────────────────────────────────────
@@ -238,6 +240,7 @@ def _utcnow() -> str:
 # ── Lambda handler ────────────────────────────────────────────────────────────
 
 
+@sqs_job("stripe")
 def lambda_handler(event: dict[str, Any], context: Any) -> None:
     for record in event.get("Records", []):
         try:
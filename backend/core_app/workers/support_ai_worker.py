@@ -8,6 +8,7 @@ from datetime import UTC, datetime
 from typing import Any
 
 from core_app.ai.service import AiService
+from core_app.observability.metrics import sqs_job
 from core_app.support.chat_service import ESCALATION_TRIGGERS
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,7 @@ SYSTEM_PROMPT = (
 )
 
 
+@sqs_job("support_ai")
 def lambda_handler(event: dict[str, Any], context: Any) -> None:
     for record in event.get("Records", []):
         try:
@@ -14,15 +14,17 @@ import os
 import uuid
 from typing import Any
 
-logger = logging.getLogger(__name__)
+from core_app.observability.metrics import sqs_job
 
-DATABASE_URL = os.environ.get("DATABASE_URL", "")
+logger = logging.getLogger(__name__)
 
 try:
-    from sqlalchemy import create_engine, text
+    from sqlalchemy import text
     from sqlalchemy.orm import sessionmaker
 
-    _engine = create_engine(DATABASE_URL) if DATABASE_URL else None
+    from core_app.db.pool import worker_engine
+
+    _engine = worker_engine()
     _Session = sessionmaker(bind=_engine) if _engine else None
 except Exception:
     _engine = None
@@ -260,6 +262,7 @@ def _handle_posting_apply_payments(body: dict, correlation_id: str) -> dict:
         db.close()
 
 
+@sqs_job("trip")
 def lambda_handler(event: dict, context: Any) -> dict:
     results = []
     for record in event.get("Records", []):
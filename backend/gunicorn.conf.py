@@ -1,4 +1,25 @@
+import os
+import shutil
+
 bind = "0.0.0.0:8000"
 workers = 2
 worker_class = "uvicorn.workers.UvicornWorker"
 timeout = 60
+
+# Prometheus multiprocess mode: every worker writes its metrics to files here
+# and /metrics aggregates them (core_app/observability/metrics.py).  Set in the
+# master, before any worker imports prometheus_client.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+
+def on_starting(server):
+    # Stale files from a previous run would be merged into the new totals.
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for probabilistic fax-to-claim matching.
+
+Seeds a synthetic tenant with ``--cases`` billing cases (default 100k) inside
+a transaction that is rolled back at the end, then times candidate retrieval
+and scoring per fax for the legacy per-name ``similarity()`` scan and for
+``ClaimMatcher``'s single indexed candidate query.  Requires ``DATABASE_URL``
+and migration 20261016_0027 applied.
+
+With ``--offline`` no database is used: only ``score_candidates`` is timed
+over synthetic candidate sets of ``--candidates`` rows.
+
+Usage (from ``backend/``):
+    python scripts/bench_claim_matcher.py [--cases 100000] [--faxes 200]
+    python scripts/bench_claim_matcher.py --offline [--candidates 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from core_app.db.pool import build_psycopg_url  # noqa: E402
+from core_app.fax.claim_matcher import (  # noqa: E402
+    ClaimMatcher,
+    extract_fax_features,
+    score_candidates,
+)
+
+FIRST = ["james", "mary", "john", "patricia", "robert", "jennifer", "michael", "linda",
+         "william", "elizabeth", "david", "barbara", "richard", "susan", "joseph", "jessica"]
+LAST = ["smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis",
+        "rodriguez", "martinez", "hernandez", "lopez", "gonzalez", "wilson", "anderson",
+        "thomas", "taylor", "moore", "jackson", "martin", "lee", "perez", "thompson", "white"]
+
+_SEED_SQL = """
+INSERT INTO billing_cases (tenant_id, data)
+SELECT CAST(:tid AS uuid), jsonb_build_object(
+    'patient_first_name', (CAST(:first AS text[]))[1 + (g % :nfirst)] || (g % 997),
+    'patient_last_name', (CAST(:last AS text[]))[1 + ((g / :nfirst) % :nlast)] || (g % 991),
+    'patient_dob', to_char(date '1940-01-01' + (g % 25000), 'YYYY-MM-DD'),
+    'member_id', 'M' || lpad(CAST(g AS text), 9, '0'),
+    'claim_id', lpad(CAST(g AS text), 10, '0'),
+    'dos', to_char(date '2026-01-01' + (g % 270), 'YYYY-MM-DD')
+)
+FROM generate_series(1, :n) AS g
+"""
+
+_LEGACY_SQL = (
+    "SELECT id, data, tenant_id, version, created_at FROM billing_cases "
+    "WHERE tenant_id = :tid AND deleted_at IS NULL "
+    "AND similarity(data->>'patient_last_name' || ' ' || data->>'patient_first_name', :name) > 0.25 "
+    "ORDER BY similarity(data->>'patient_last_name' || ' ' || data->>'patient_first_name', :name) DESC "
+    "LIMIT 20"
+)
+
+
+def _fax_text(rng: random.Random, case: dict) -> str:
+    return (
+        f"Patient: {case['patient_last_name']} {case['patient_first_name']}\n"
+        f"DOB: {case['patient_dob']}\n"
+        f"Member ID: {case['member_id']}\n"
+        f"Claim {case['claim_id'] if rng.random() < 0.5 else ''}\n"
+    )
+
+
+def _report(label: str, samples: list[float]) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(
+        f"{label:<28} n={len(samples):<5} median={statistics.median(samples) * 1000:8.2f}ms "
+        f"p95={p95 * 1000:8.2f}ms"
+    )
+
+
+def _offline(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    cases = [
+        {
+            "id": uuid.uuid4(),
+            "data": {
+                "patient_first_name": rng.choice(FIRST),
+                "patient_last_name": rng.choice(LAST),
+                "patient_dob": f"19{rng.randint(40, 99)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+                "member_id": f"M{rng.randint(0, 10**9):09d}",
+                "dos": "2026-03-01",
+            },
+        }
+        for _ in range(args.candidates)
+    ]
+    features = extract_fax_features(_fax_text(rng, {**cases[0]["data"], "claim_id": "0000000001"}))
+    samples = []
+    for _ in range(args.faxes):
+        start = time.perf_counter()
+        score_candidates(cases, features, fax_date="2026-03-05")
+        samples.append(time.perf_counter() - start)
+    _report(f"score {args.candidates} candidates", samples)
+
+
+def _online(args: argparse.Namespace) -> None:
+    database_url = os.environ.get("DATABASE_URL", "")
+    if not database_url:
+        raise SystemExit("DATABASE_URL is required (or pass --offline)")
+    rng = random.Random(args.seed)
+    engine = create_engine(build_psycopg_url(database_url))
+    tenant_id = str(uuid.uuid4())
+
+    # Never committed: closing the session rolls the synthetic tenant back.
+    with Session(engine) as db:
+        db.execute(text("SELECT set_config('app.tenant_id', :tid, true)"), {"tid": tenant_id})
+        start = time.perf_counter()
+        db.execute(
+            text(_SEED_SQL),
+            {"tid": tenant_id, "first": FIRST, "last": LAST, "nfirst": len(FIRST),
+             "nlast": len(LAST), "n": args.cases},
+        )
+        db.execute(text("ANALYZE billing_cases"))
+        print(f"seeded {args.cases} cases in {time.perf_counter() - start:.1f}s")
+
+        sample = db.execute(
+            text(
+                "SELECT data FROM billing_cases WHERE tenant_id = :tid "
+                "ORDER BY random() LIMIT :n"
+            ),
+            {"tid": tenant_id, "n": args.faxes},
+        ).scalars().all()
+        faxes = [_fax_text(rng, case) for case in sample]
+
+        legacy, indexed = [], []
+        matcher = ClaimMatcher(db, tenant_id)
+        for ocr_text in faxes:
+            features = extract_fax_features(ocr_text)
+            start = time.perf_counter()
+            rows: list[dict] = []
+            for name in features.names[:3]:
+                rows.extend(
+                    dict(r)
+                    for r in db.execute(text(_LEGACY_SQL), {"tid": tenant_id, "name": name})
+                    .mappings()
+                    .all()
+                )
+            score_candidates(rows, features)
+            legacy.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            matcher.match_claim_probabilistic(ocr_text)
+            indexed.append(time.perf_counter() - start)
+
+        _report("legacy per-name similarity", legacy)
+        _report("indexed candidate query", indexed)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--faxes", type=int, default=200)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--offline", action="store_true")
+    args = parser.parse_args()
+    if args.offline:
+        _offline(args)
+    else:
+        _online(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for completeness scoring on the ePCR PATCH path.
+
+Times what ``update_chart`` does per PATCH of one field: a full
+``score_chart`` against the incremental ``rescore`` that resumes from the
+stored ``completeness_state``, each followed by ``completeness_fields``.  The
+chart carries ``--vitals`` vital sets and a ``--narrative``-character
+narrative so field size is realistic; neither should affect ``rescore``.
+
+Usage (from ``backend/``):
+    python scripts/bench_completeness.py [--vitals 30] [--narrative 4000] [--mode als]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from core_app.epcr.completeness_engine import (  # noqa: E402
+    CompletenessEngine,
+    completeness_fields,
+)
+
+
+def build_chart(vitals: int, narrative: int) -> dict:
+    return {
+        "chart_id": "PCR-1",
+        "dispatch": {
+            "incident_number": "I-1",
+            "psap_call_time": "2026-10-16T10:00:00Z",
+            "arrived_scene_time": "2026-10-16T10:10:00Z",
+            "patient_contact_time": "2026-10-16T10:12:00Z",
+            "responding_unit": "M1",
+        },
+        "patient": {"dob": "1970-01-01", "last_name": "Doe", "first_name": "Pat", "gender": "female"},
+        "assessments": [{"chief_complaint": "Chest pain", "findings": ["diaphoretic"] * 20}],
+        "narrative": ("Pt found seated, alert and oriented. " * narrative)[:narrative],
+        "disposition": {"patient_disposition_code": "4212033"},
+        "vitals": [
+            {"heart_rate": 80 + i, "spo2": 97, "bp": "120/80", "taken_at": f"10:{i:02d}"}
+            for i in range(vitals)
+        ],
+    }
+
+
+def time_us(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6 / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vitals", type=int, default=30)
+    parser.add_argument("--narrative", type=int, default=4000)
+    parser.add_argument("--mode", default="als")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    engine = CompletenessEngine()
+    chart = build_chart(args.vitals, args.narrative)
+    stored = {**chart, **completeness_fields(engine.score_chart(chart, args.mode), args.mode, 7)}
+    patch = {"narrative": chart["narrative"] + " Transported without incident."}
+    merged = {**stored, **patch}
+
+    def full() -> None:
+        completeness_fields(engine.score_chart(merged, args.mode), args.mode, 8)
+
+    def incremental() -> None:
+        result = engine.rescore(merged, patch.keys(), args.mode, record_version=7)
+        completeness_fields(result, args.mode, 8)
+
+    assert engine.rescore(merged, patch.keys(), args.mode, record_version=7) == engine.score_chart(
+        merged, args.mode
+    )
+    full_us = time_us(full, args.repeat)
+    incremental_us = time_us(incremental, args.repeat)
+    print(f"{'path':<12} {'us/PATCH':>9}")
+    print(f"{'score_chart':<12} {full_us:>9.2f}")
+    print(f"{'rescore':<12} {incremental_us:>9.2f}  ({full_us / incremental_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
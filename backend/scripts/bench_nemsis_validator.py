@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for ``NEMSISValidator`` on multi-PCR EMSDataSet files.
+
+Builds EMSDataSet documents with ``--sizes`` PatientCareReports (each PCR
+repeats the sample record in ``compliance/nemsis/samples``) and times
+``validate_xml_bytes`` with the WI stages enabled.  The time per PCR should
+stay flat as the file grows.  With ``--baseline PATH`` the same documents are
+also validated by an older ``validator.py`` (for example one extracted with
+``git show <rev>:backend/core_app/nemsis/validator.py``) for comparison.
+
+Usage (from ``backend/``):
+    python scripts/bench_nemsis_validator.py [--sizes 1,10,100,1000] [--baseline old.py]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import re
+import sys
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from core_app.nemsis.validator import NEMSISValidator  # noqa: E402
+
+SAMPLE = BACKEND / "compliance" / "nemsis" / "samples" / "sample_ems_minimal.xml"
+
+
+def build_dataset(pcrs: int) -> bytes:
+    sample = SAMPLE.read_text(encoding="utf-8")
+    pcr = re.search(r"<PatientCareReport>.*?</PatientCareReport>", sample, re.S).group(0)
+    body = "".join(pcr.replace("SAMPLE-001", f"SAMPLE-{i:06d}") for i in range(pcrs))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<EMSDataSet xmlns="http://www.nemsis.org">'
+        f"<Header>{body}</Header></EMSDataSet>"
+    ).encode()
+
+
+def load_baseline(path: Path):
+    spec = importlib.util.spec_from_file_location("baseline_validator", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # dataclasses resolve annotations through sys.modules
+    spec.loader.exec_module(module)
+    return module.NEMSISValidator()
+
+
+def time_ms(validator, xml: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        validator.validate_xml_bytes(xml, "WI")
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,10,100,1000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path)
+    args = parser.parse_args()
+
+    current = NEMSISValidator()
+    baseline = load_baseline(args.baseline) if args.baseline else None
+    header = f"{'PCRs':>6} {'current ms':>11} {'us/PCR':>8}"
+    if baseline:
+        header += f" {'baseline ms':>12} {'us/PCR':>8}"
+    print(header)
+    for pcrs in (int(s) for s in args.sizes.split(",")):
+        xml = build_dataset(pcrs)
+        ms = time_ms(current, xml, args.repeat)
+        row = f"{pcrs:>6} {ms:>11.2f} {ms * 1000 / pcrs:>8.1f}"
+        if baseline:
+            base_ms = time_ms(baseline, xml, args.repeat)
+            row += f" {base_ms:>12.2f} {base_ms * 1000 / pcrs:>8.1f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for NEMSIS XSD validation throughput.
+
+Compares validations per second for the legacy path (locate and compile the
+XSD on every validation) against ``NEMSISXSDValidator`` with the process-wide
+compiled-schema registry, single-threaded and from ``--threads`` threads.
+
+By default a synthetic NEMSIS-shaped schema is generated: one dataset XSD
+that includes ``--sections`` section XSDs of ``--elements`` enumerated
+elements each.  Point ``--xsd-dir`` at the NEMSIS v3.5.1 XSD directory, with
+``--sample`` set to an EMS dataset XML file, to measure the real schemas.
+
+Usage (from ``backend/``):
+    python scripts/bench_xsd_validator.py [--validations 200] [--threads 8]
+    python scripts/bench_xsd_validator.py --xsd-dir ../nemsis/xsd --sample pcr.xml
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND))
+
+from lxml import etree  # noqa: E402
+
+from core_app.nemsis.xsd_validator import (  # noqa: E402
+    NEMSISXSDValidator,
+    SchemaKey,
+    SchemaRegistry,
+    _find_xsd,
+)
+
+NS = "http://www.nemsis.org"
+HEADER = (
+    '<?xml version="1.0"?>\n<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" '
+    f'targetNamespace="{NS}" xmlns="{NS}" elementFormDefault="qualified">\n'
+)
+
+
+def write_synthetic_schema(root: Path, sections: int, elements: int) -> str:
+    """Write the XSD tree under ``root`` and return a matching valid EMS document."""
+    (root / "common").mkdir()
+    refs = []
+    for s in range(sections):
+        body = [HEADER]
+        children = []
+        for e in range(elements):
+            name = f"eSection{s}.{e:02d}"
+            body.append(f'<xs:simpleType name="{name}Type"><xs:restriction base="xs:string">')
+            body.extend(f'<xs:enumeration value="{s}{e}{v}"/>' for v in range(20))
+            body.append("</xs:restriction></xs:simpleType>\n")
+            body.append(f'<xs:element name="{name}" type="{name}Type"/>\n')
+            children.append(f'<xs:element ref="{name}"/>')
+        body.append(
+            f'<xs:element name="eSection{s}"><xs:complexType><xs:sequence>'
+            f'{"".join(children)}</xs:sequence></xs:complexType></xs:element>\n</xs:schema>\n'
+        )
+        (root / "common" / f"eSection{s}_v3.xsd").write_text("".join(body))
+        refs.append(s)
+    dataset = [HEADER]
+    dataset.extend(f'<xs:include schemaLocation="common/eSection{s}_v3.xsd"/>\n' for s in refs)
+    dataset.append(
+        '<xs:element name="EMSDataSet"><xs:complexType><xs:sequence>'
+        + "".join(f'<xs:element ref="eSection{s}"/>' for s in refs)
+        + "</xs:sequence></xs:complexType></xs:element>\n</xs:schema>\n"
+    )
+    (root / "EMSDataSet_v3.xsd").write_text("".join(dataset))
+    sections_xml = "".join(
+        f"<eSection{s}>"
+        + "".join(f"<eSection{s}.{e:02d}>{s}{e}0</eSection{s}.{e:02d}>" for e in range(elements))
+        + f"</eSection{s}>"
+        for s in refs
+    )
+    return f'<EMSDataSet xmlns="{NS}">{sections_xml}</EMSDataSet>'
+
+
+def legacy_validate(xsd_dir: Path, xml: bytes) -> bool:
+    """The pre-registry behaviour: locate and compile the XSD on every validation."""
+    doc = etree.fromstring(xml)
+    schema = etree.XMLSchema(etree.parse(str(_find_xsd(xsd_dir, SchemaKey("EMS")))))
+    return schema.validate(doc)
+
+
+def rate(fn, xml: bytes, n: int, threads: int) -> float:
+    start = time.perf_counter()
+    if threads <= 1:
+        for _ in range(n):
+            fn(xml)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(fn, [xml] * n))
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--xsd-dir", type=Path)
+    parser.add_argument("--sample", type=Path, help="EMS dataset XML (required with --xsd-dir)")
+    parser.add_argument("--sections", type=int, default=40)
+    parser.add_argument("--elements", type=int, default=30)
+    parser.add_argument("--validations", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.xsd_dir:
+            xsd_dir, xml = args.xsd_dir, args.sample.read_bytes()
+        else:
+            xsd_dir = Path(tmp)
+            xml = write_synthetic_schema(xsd_dir, args.sections, args.elements).encode()
+
+        validator = NEMSISXSDValidator(str(xsd_dir), registry=SchemaRegistry())
+        start = time.perf_counter()
+        result = validator.validate_ems_dataset(xml)
+        first_ms = (time.perf_counter() - start) * 1000
+        if result.warnings or result.errors:
+            print(f"warning: sample did not validate cleanly: {result.to_dict()}")
+
+        legacy_n = max(1, args.validations // 10)
+        rows = [
+            ("legacy (compile per call)", rate(lambda x: legacy_validate(xsd_dir, x), xml, legacy_n, 1)),
+            ("registry", rate(validator.validate_ems_dataset, xml, args.validations, 1)),
+            (
+                f"registry x{args.threads} threads",
+                rate(validator.validate_ems_dataset, xml, args.validations, args.threads),
+            ),
+        ]
+
+    print(f"first validation (compile + validate): {first_ms:.1f} ms")
+    for name, per_second in rows:
+        print(f"{name:<28} {per_second:>10.1f} validations/s")
+    print(f"speed-up: {rows[1][1] / rows[0][1]:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Generate an Alembic migration for new ``_TABLE_INDEXED_PATHS`` entries.
+
+Scans ``alembic/versions`` for index names that already exist, renders the
+DDL for every registry entry that is not yet covered and writes a frozen
+migration (literal SQL, no imports from ``core_app``) chained to the current
+head revision.
+
+Usage (from ``backend/``):
+    python scripts/generate_jsonb_index_migration.py [--slug jsonb_path_indexes]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+VERSIONS = BACKEND / "alembic" / "versions"
+sys.path.insert(0, str(BACKEND))
+
+from core_app.repositories.domination_repository import (  # noqa: E402
+    _TABLE_INDEXED_PATHS,
+    indexed_path_ddl,
+    indexed_path_index_name,
+)
+
+_REVISION_RE = re.compile(r'^revision\s*=\s*"([^"]+)"', re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r'^down_revision\s*=\s*"([^"]+)"', re.MULTILINE)
+
+_TEMPLATE = '''"""{title}
+
+Revision ID: {revision}
+Revises: {down_revision}
+Create Date: {create_date}
+
+Generated by scripts/generate_jsonb_index_migration.py from
+_TABLE_INDEXED_PATHS in core_app/repositories/domination_repository.py.
+
+{summary}
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "{revision}"
+down_revision = "{down_revision}"
+branch_labels = None
+depends_on = None
+
+UPGRADE_STATEMENTS: list[str] = [
+{upgrade}
+]
+
+DOWNGRADE_STATEMENTS: list[str] = [
+{downgrade}
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    with op.get_context().autocommit_block():
+        for stmt in UPGRADE_STATEMENTS:
+            op.execute(stmt)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for stmt in DOWNGRADE_STATEMENTS:
+            op.execute(stmt)
+'''
+
+
+def _existing_sources() -> str:
+    return "\n".join(p.read_text() for p in sorted(VERSIONS.glob("*.py")))
+
+
+def _head_revision() -> str:
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in VERSIONS.glob("*.py"):
+        source = path.read_text()
+        rev = _REVISION_RE.search(source)
+        if rev:
+            revisions.add(rev.group(1))
+        down = _DOWN_REVISION_RE.search(source)
+        if down:
+            parents.add(down.group(1))
+    heads = sorted(revisions - parents)
+    if len(heads) != 1:
+        raise SystemExit(f"Expected a single alembic head, found: {heads}")
+    return heads[0]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slug", default="jsonb_path_indexes")
+    args = parser.parse_args()
+
+    existing = _existing_sources()
+    upgrade: list[str] = []
+    downgrade: list[str] = []
+    summary: list[str] = []
+    for table in sorted(_TABLE_INDEXED_PATHS):
+        for path, mode in sorted(_TABLE_INDEXED_PATHS[table].items()):
+            if indexed_path_index_name(table, path) in existing:
+                continue
+            up, down = indexed_path_ddl(table, path, mode)
+            upgrade.extend(up)
+            downgrade[:0] = down
+            summary.append(f"  - {table}: data->>'{path}' ({mode})")
+
+    if not upgrade:
+        print("All registry entries already have migrations.")
+        return 0
+
+    head = _head_revision()
+    number = int(head.rsplit("_", 1)[-1]) + 1
+    now = datetime.now(UTC)
+    revision = f"{now:%Y%m%d}_{number:04d}"
+    target = VERSIONS / f"{revision}_{args.slug}.py"
+    target.write_text(
+        _TEMPLATE.format(
+            title="B-tree indexes for hot JSONB paths",
+            revision=revision,
+            down_revision=head,
+            create_date=f"{now:%Y-%m-%d}",
+            summary="Indexes:\n" + "\n".join(summary),
+            upgrade="\n".join(f"    {json.dumps(stmt)}," for stmt in upgrade),
+            downgrade="\n".join(f"    {json.dumps(stmt)}," for stmt in downgrade),
+        )
+    )
+    print(f"Wrote {target.relative_to(BACKEND)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+import uuid
+
+from core_app.middleware import tenant_context
+from core_app.schemas.auth import CurrentUser
+from core_app.services.auth_cache import AuthCache, TenantStatus, TTLCache
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.get_threads: list[threading.Thread] = []
+
+    def get(self, key):
+        self.get_threads.append(threading.current_thread())
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def scan_iter(self, match, count=None):
+        prefix = match.rstrip("*")
+        return [k for k in list(self.store) if k.startswith(prefix)]
+
+
+def _user(tenant_id: uuid.UUID) -> CurrentUser:
+    return CurrentUser(user_id=uuid.uuid4(), tenant_id=tenant_id, role="admin")
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    cache: TTLCache[int] = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    expired: TTLCache[int] = TTLCache(ttl_seconds=0, max_entries=2)
+    expired.set("a", 1)
+    assert expired.get("a") is None
+
+
+def test_invalidate_tenant_drops_status_and_users():
+    tenant = uuid.uuid4()
+    other = uuid.uuid4()
+    cache = AuthCache()
+    user, other_user = _user(tenant), _user(other)
+    cache.set_user(user, user_id=user.user_id)
+    cache.set_user(user, email="A@x.io")
+    cache.set_user(other_user, user_id=other_user.user_id)
+    cache.set_tenant_status(tenant, TenantStatus("active", "signed"))
+
+    assert cache.get_user(tenant, email="a@x.io") == user
+    cache.invalidate_tenant(tenant)
+    assert cache.get_user(tenant, user_id=user.user_id) is None
+    assert cache.get_user(tenant, email="a@x.io") is None
+    assert cache.get_tenant_status(tenant) is None
+    assert cache.get_user(other, user_id=other_user.user_id) == other_user
+
+
+def test_redis_backing_shares_entries_across_processes():
+    redis = FakeRedis()
+    tenant = uuid.uuid4()
+    user = _user(tenant)
+    writer, reader = AuthCache(redis_client=redis), AuthCache(redis_client=redis)
+
+    writer.set_user(user, user_id=user.user_id)
+    writer.set_tenant_status(tenant, TenantStatus("active", None))
+    assert reader.get_user(tenant, user_id=user.user_id) == user
+    assert reader.get_tenant_status(tenant) == TenantStatus("active", None)
+
+    writer.invalidate_user(tenant, user_id=user.user_id)
+    assert not any(":user:" in k for k in redis.store)
+
+
+async def test_tenant_status_redis_lookup_runs_off_the_event_loop(monkeypatch):
+    redis = FakeRedis()
+    tenant = uuid.uuid4()
+    AuthCache(redis_client=redis).set_tenant_status(tenant, TenantStatus("active", None))
+    cache = AuthCache(redis_client=redis)
+    monkeypatch.setattr(tenant_context, "get_auth_cache", lambda: cache)
+
+    assert await tenant_context.resolve_tenant_status(tenant) == TenantStatus("active", None)
+    assert redis.get_threads and threading.main_thread() not in redis.get_threads
+    redis.get_threads.clear()
+    assert await tenant_context.resolve_tenant_status(tenant) == TenantStatus("active", None)
+    assert redis.get_threads == []  # served from the in-process LRU
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import uuid
+from pathlib import Path
+
+from core_app.fax.claim_matcher import (
+    _CLAIM_NUMBER_EXPR,
+    _DOB_EXPR,
+    _MEMBER_ID_EXPR,
+    _NAME_EXPR,
+    ClaimMatcher,
+    extract_fax_features,
+    score_candidates,
+)
+
+OCR = "Patient: Smith John\nDOB: 02/03/1980\nMember ID: ABC123\nClaim 00012345\n"
+
+
+class FakeResult:
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+
+    def mappings(self) -> FakeResult:
+        return self
+
+    def all(self) -> list[dict]:
+        return self._rows
+
+
+class FakeDB:
+    def __init__(self, rows: list[dict]) -> None:
+        self.rows = rows
+        self.statements: list[tuple[str, dict]] = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((str(sql), params or {}))
+        return FakeResult(self.rows)
+
+
+def test_extract_features_normalizes_blocking_keys():
+    features = extract_fax_features(OCR)
+    assert features.names == ("smith john",)
+    assert features.dobs == ("02-03-1980", "1980-02-03")
+    assert features.member_ids == frozenset({"abc123"})
+    assert features.claim_numbers == ("00012345",)
+
+
+def test_candidates_fetched_in_one_query_and_scored():
+    case = {
+        "id": uuid.uuid4(),
+        "data": {
+            "patient_last_name": "Smith",
+            "patient_first_name": "John",
+            "patient_dob": "1980-02-03",
+            "member_id": "abc123",
+        },
+    }
+    nameless = {"id": uuid.uuid4(), "data": {"patient_dob": "1999-01-01"}}
+    db = FakeDB([case, nameless])
+    results = ClaimMatcher(db, str(uuid.uuid4())).match_claim_probabilistic(OCR)
+
+    selects = [s for s, _ in db.statements if "FROM billing_cases" in s]
+    assert len(selects) == 1
+    for expr in (_NAME_EXPR, _DOB_EXPR, _MEMBER_ID_EXPR, _CLAIM_NUMBER_EXPR):
+        assert expr in selects[0]
+    assert [r["claim_id"] for r in results] == [str(case["id"])]
+    assert results[0]["score"] == 90
+    assert results[0]["match_fields"] == ["patient_name", "dob", "member_id"]
+
+
+def test_candidate_expressions_match_migration_indexes():
+    migration = (
+        Path(__file__).resolve().parent.parent
+        / "alembic/versions/20261016_0027_billing_case_match_indexes.py"
+    )
+    module: dict = {}
+    exec(compile(migration.read_text(), str(migration), "exec"), module)
+    ddl = "\n".join(module["UPGRADE_STATEMENTS"])
+    for expr in (_NAME_EXPR, _DOB_EXPR, _MEMBER_ID_EXPR, _CLAIM_NUMBER_EXPR):
+        assert expr in ddl
+
+
+def test_score_candidates_dedupes():
+    features = extract_fax_features(OCR)
+    case = {"id": "1", "data": {"patient_last_name": "Smith", "patient_first_name": "John"}}
+    assert len(score_candidates([case, case], features)) == 1
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from core_app.services import cognito_jwt
+from core_app.services.cognito_jwt import CognitoAuthError, JWKSManager
+
+
+def _keypair(kid: str) -> tuple[str, dict]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public = jwk.construct(
+        private.public_key()
+        .public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+        .decode(),
+        "RS256",
+    ).to_dict()
+    return pem, {**public, "kid": kid, "alg": "RS256", "use": "sig"}
+
+
+class CountingManager(JWKSManager):
+    def __init__(self, key_sets: list[list[dict]], **kwargs) -> None:
+        super().__init__("https://example.invalid/jwks.json", **kwargs)
+        self.key_sets = key_sets
+        self.fetches = 0
+
+    def refresh(self) -> None:
+        self._last_fetch = time.monotonic()
+        self._install({"keys": self.key_sets[min(self.fetches, len(self.key_sets) - 1)]})
+        self.fetches += 1
+
+
+def test_unknown_kid_triggers_single_rate_limited_refetch():
+    _, old = _keypair("old")
+    _, new = _keypair("new")
+    manager = CountingManager([[old], [old, new]], min_refetch_seconds=0)
+    manager.refresh()
+
+    assert manager.key_for("old") is manager.key_for("old")
+    assert manager.fetches == 1
+    assert manager.key_for("new") is not None
+    assert manager.fetches == 2
+
+    manager.min_refetch_seconds = 60
+    with pytest.raises(CognitoAuthError, match="Unknown signing key"):
+        manager.key_for("missing")
+    assert manager.fetches == 2
+
+
+def test_verify_uses_cached_key(monkeypatch):
+    pem, public = _keypair("k1")
+    manager = CountingManager([[public]])
+    manager.refresh()
+    monkeypatch.setattr(cognito_jwt, "_jwks_manager", manager)
+
+    settings = cognito_jwt.get_settings()
+    monkeypatch.setattr(settings, "cognito_app_client_id", "client")
+    monkeypatch.setattr(settings, "cognito_issuer", "https://issuer")
+    token = jwt.encode(
+        {
+            "sub": "u1",
+            "aud": "client",
+            "iss": "https://issuer",
+            "exp": int(time.time()) + 60,
+            "custom:tenant_id": "t1",
+        },
+        pem,
+        algorithm="RS256",
+        headers={"kid": "k1"},
+    )
+    claims = cognito_jwt.verify_cognito_jwt(token)
+    assert claims.tenant_id == "t1"
+    assert manager.fetches == 1
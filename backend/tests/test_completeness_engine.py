@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import pytest
+
+from core_app.epcr.completeness_engine import (
+    CompletenessEngine,
+    CompletenessRule,
+    compile_path,
+    completeness_fields,
+)
+
+COMPLETE = {
+    "chart_id": "PCR-1",
+    "dispatch": {
+        "incident_number": "I-1",
+        "psap_call_time": "10:00",
+        "arrived_scene_time": "10:10",
+        "patient_contact_time": "10:12",
+        "responding_unit": "M1",
+    },
+    "patient": {"dob": "1970-01-01", "last_name": "Doe", "first_name": "Pat", "gender": "female"},
+    "assessments": [{"chief_complaint": "Chest pain"}],
+    "narrative": "Transported.",
+    "disposition": {"patient_disposition_code": "4212033"},
+    "vitals": [{"heart_rate": 80}],
+    "hems": {"wheels_up_time": "10:20", "wheels_down_time": "10:50", "mission_number": "H-7"},
+}
+
+
+@pytest.fixture
+def evaluated(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    present = CompletenessRule.present
+
+    def counting(self, chart):
+        calls.append(self.element_id)
+        return present(self, chart)
+
+    monkeypatch.setattr(CompletenessRule, "present", counting)
+    return calls
+
+
+def _stored(chart: dict, mode: str, version: int = 1) -> dict:
+    return {**chart, **completeness_fields(CompletenessEngine().score_chart(chart, mode), mode, version)}
+
+
+def test_compile_path():
+    assert compile_path("assessments[0].chief_complaint") == ("assessments", 0, "chief_complaint")
+    assert compile_path("narrative") == ("narrative",)
+
+
+def test_mode_extras_count_towards_the_score():
+    engine = CompletenessEngine()
+    assert engine.score_chart(COMPLETE, "hems")["score"] == 100.0
+    partial = engine.score_chart({**COMPLETE, "hems": {"mission_number": " "}}, "hems")
+    assert [m["element_id"] for m in partial["missing"]] == [
+        "hems.wheels_up_time",
+        "hems.wheels_down_time",
+        "hems.mission_number",
+    ]
+    assert partial["warning_count"] == 3
+
+
+def test_patch_rescores_only_rules_reading_the_patched_fields(evaluated):
+    engine = CompletenessEngine()
+    stored = _stored({**COMPLETE, "narrative": ""}, "als")
+    evaluated.clear()
+
+    patch = {"narrative": "Pt stable.", "patient": {**COMPLETE["patient"], "gender": ""}}
+    merged = {**stored, **patch}
+    result = engine.rescore(merged, patch.keys(), "als", record_version=1)
+
+    assert sorted(evaluated) == [
+        "eNarrative.01",
+        "ePatient.02",
+        "ePatient.03",
+        "ePatient.04",
+        "ePatient.13",
+    ]
+    assert result == engine.score_chart(merged, "als")
+    assert [m["element_id"] for m in result["missing"]] == ["ePatient.13"]
+
+
+def test_untrusted_or_stale_state_falls_back_to_a_full_score(evaluated):
+    engine = CompletenessEngine()
+    stored = _stored(COMPLETE, "bls")
+    full = len(engine.score_chart(COMPLETE, "bls")["present"])
+
+    for chart, changed, mode in [
+        ({**stored, "chart_mode": "acls"}, ["chart_mode"], "acls"),
+        ({**stored, "completeness_state": {"rules": "old", "mode": "bls"}}, ["narrative"], "bls"),
+        (
+            {**stored, "completeness_state": {**stored["completeness_state"], "missing": []}},
+            ["completeness_state"],
+            "bls",
+        ),
+        ({k: v for k, v in stored.items() if k != "completeness_state"}, ["narrative"], "bls"),
+    ]:
+        evaluated.clear()
+        engine.rescore(chart, changed, mode, record_version=1)
+        assert len(evaluated) >= full
+
+    assert engine.is_stale(stored, 1, "acls") and not engine.is_stale(stored, 1, "bls")
+
+
+def test_a_write_outside_a_rescore_forces_a_full_score(evaluated):
+    engine = CompletenessEngine()
+    stored = _stored({**COMPLETE, "vitals": []}, "bls", version=3)
+    assert not engine.is_stale(stored, 3, "bls")
+
+    # add_vital appends without re-scoring; the write still bumps the record version.
+    with_vital = {**stored, "vitals": [{"heart_rate": 88}]}
+    assert engine.is_stale(with_vital, 4, "bls")
+
+    evaluated.clear()
+    merged = {**with_vital, "narrative": "Pt stable."}
+    result = engine.rescore(merged, ["narrative"], "bls", record_version=4)
+    assert len(evaluated) == len(result["present"]) + len(result["missing"])
+    assert result == engine.score_chart(merged, "bls")
+    assert "eVitals" not in [m["element_id"] for m in result["missing"]]
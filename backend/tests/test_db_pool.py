@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from prometheus_client import REGISTRY
+from sqlalchemy.pool import QueuePool
+
+from core_app.db.pool import PoolConfig, _engine_kwargs, build_engine, worker_pool_config
+
+
+def test_statement_timeout_uses_startup_option_unless_pgbouncer():
+    direct = _engine_kwargs(PoolConfig(statement_timeout_ms=5000), QueuePool, "t")
+    assert direct["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    bouncer = _engine_kwargs(PoolConfig(pgbouncer=True), QueuePool, "t")
+    assert bouncer["connect_args"] == {"prepare_threshold": None}
+
+
+def test_worker_pool_config_reads_env():
+    config = worker_pool_config(
+        {"DB_WORKER_POOL_SIZE": "3", "DB_WORKER_STATEMENT_TIMEOUT_MS": "60000", "DB_PGBOUNCER": "true"}
+    )
+    assert config == PoolConfig(
+        pool_size=3, max_overflow=0, statement_timeout_ms=60000, pgbouncer=True
+    )
+
+
+def test_pool_gauges_track_checkouts():
+    engine = build_engine("sqlite://", PoolConfig(pool_size=2, statement_timeout_ms=0), name="test")
+    conn = engine.connect()
+    try:
+        assert REGISTRY.get_sample_value("db_pool_checked_out", {"pool": "test"}) == 1
+        assert REGISTRY.get_sample_value("db_pool_size", {"pool": "test"}) == 2
+        assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", {"pool": "test"}) >= 1
+    finally:
+        conn.close()
+    assert REGISTRY.get_sample_value("db_pool_checked_out", {"pool": "test"}) == 0
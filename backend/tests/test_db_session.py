@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+from core_app.db.session import bind_tenant
+
+
+def _engine_and_statements():
+    engine = create_engine("sqlite://")
+    statements: list[str] = []
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, record):
+        dbapi_conn.create_function("set_config", 3, lambda name, value, local: value)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return engine, statements
+
+
+def test_set_config_runs_once_at_the_start_of_each_transaction():
+    engine, statements = _engine_and_statements()
+    tenant = uuid.uuid4()
+    with Session(engine) as db:
+        bind_tenant(db, tenant)
+        assert statements == []  # nothing is sent until the request queries
+
+        for _ in range(3):
+            db.execute(text("SELECT 1"))
+        db.commit()
+        db.execute(text("SELECT 2"))
+
+    rls = [s for s in statements if "set_config" in s]
+    assert len(rls) == 2  # one per transaction, not one per statement
+    assert len(statements) == 4 + len(rls)
+    assert statements[0] == rls[0] and statements[4] == rls[1]
+
+
+def test_binding_inside_an_open_transaction_applies_immediately():
+    engine, statements = _engine_and_statements()
+    with Session(engine) as db:
+        db.execute(text("SELECT 1"))
+        bind_tenant(db, uuid.uuid4())
+    assert statements[0] == "SELECT 1" and "set_config" in statements[1]
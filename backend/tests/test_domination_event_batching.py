@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import UTC, datetime
+
+from core_app.realtime.streams import stream_key
+from core_app.services.domination_service import DominationService
+from core_app.services.event_publisher import (
+    EventPublisher,
+    PendingEvent,
+    RedisEventPublisher,
+    RedisStreamEventPublisher,
+)
+
+
+class FakeDB:
+    def __init__(self) -> None:
+        self.commits = 0
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+class FakeRepository:
+    def create(self, *, tenant_id, data, typed_columns=None):
+        now = datetime.now(UTC)
+        return {"id": uuid.uuid4(), "tenant_id": tenant_id, "version": 1,
+                "created_at": now, "updated_at": now, "data": data}
+
+
+class FakeAudit:
+    def log_mutation(self, **kwargs) -> None:
+        pass
+
+
+class FakePublisher(EventPublisher):
+    def __init__(self) -> None:
+        self.single: list[str] = []
+        self.batches: list[list[PendingEvent]] = []
+
+    async def publish(self, event_name, tenant_id, entity_id, payload, *, entity_type=None,
+                      correlation_id=None):
+        self.single.append(event_name)
+
+    async def publish_many(self, events):
+        self.batches.append(list(events))
+
+
+def _service(publisher: EventPublisher, **kwargs) -> DominationService:
+    svc = DominationService(FakeDB(), publisher, **kwargs)
+    svc.audit = FakeAudit()
+    svc._repo_cache["ar_statements"] = FakeRepository()
+    return svc
+
+
+async def _create(svc: DominationService, n: int) -> dict:
+    return await svc.create(
+        table="ar_statements",
+        tenant_id=uuid.uuid4(),
+        actor_user_id=None,
+        data={"n": n, "balance_cents": 100},
+        correlation_id=None,
+    )
+
+
+async def test_batch_events_flushes_once_after_commits():
+    publisher = FakePublisher()
+    svc = _service(publisher, compact_events=False)
+    async with svc.batch_events():
+        for n in range(3):
+            await _create(svc, n)
+        assert publisher.batches == []
+    assert svc.db.commits == 3
+    assert publisher.single == []
+    assert [len(b) for b in publisher.batches] == [3]
+    assert publisher.batches[0][0].payload["record"]["data"] == {"n": 0, "balance_cents": 100}
+
+    await _create(svc, 9)
+    assert publisher.single == ["ar_statements.created"]
+
+
+async def test_compact_payload_carries_ids_and_changes_only():
+    publisher = FakePublisher()
+    svc = _service(publisher, compact_events=True)
+    async with svc.batch_events():
+        rec = await _create(svc, 1)
+    payload = publisher.batches[0][0].payload
+    assert payload["changes"] == {"n": 1, "balance_cents": 100}
+    assert payload["record"]["id"] == str(rec["id"])
+    assert payload["record"]["version"] == 1
+    assert "data" not in payload["record"]
+
+
+class FakePipeline:
+    def __init__(self, sent: list) -> None:
+        self.sent = sent
+        self.executed = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def publish(self, topic, data):
+        self.sent.append((topic, json.loads(data)))
+
+    async def execute(self):
+        self.executed += 1
+
+
+class FakeScript:
+    def __init__(self, registered_client) -> None:
+        self.registered_client = registered_client
+        self.calls: list = []
+
+    async def __call__(self, keys=None, args=None, client=None):
+        self.calls.append((keys, args, client or self.registered_client))
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.sent: list = []
+        self.pipelines: list[FakePipeline] = []
+        self.scripts: list[FakeScript] = []
+
+    def register_script(self, script):
+        self.scripts.append(FakeScript(self))
+        return self.scripts[-1]
+
+    def pipeline(self, transaction=True):
+        pipe = FakePipeline(self.sent)
+        self.pipelines.append(pipe)
+        return pipe
+
+
+async def test_redis_publish_many_uses_one_pipeline():
+    publisher = RedisEventPublisher()
+    publisher._client = FakeRedis()
+    tenant = uuid.uuid4()
+    events = [
+        PendingEvent(f"thing.e{i}", tenant, uuid.uuid4(), {"i": i}, "thing") for i in range(5)
+    ]
+    await publisher.publish_many(events)
+    assert len(publisher._client.pipelines) == 1
+    assert publisher._client.pipelines[0].executed == 1
+    assert [topic for topic, _ in publisher._client.sent] == [
+        f"tenant.{tenant}.thing.e{i}" for i in range(5)
+    ]
+    assert publisher._client.sent[2][1]["payload"] == {"i": 2}
+
+
+async def test_stream_publish_many_runs_the_script_on_the_pipeline():
+    publisher = RedisStreamEventPublisher(maxlen=50)
+    redis = publisher._client = FakeRedis()
+    tenant = uuid.uuid4()
+    events = [
+        PendingEvent(f"thing.e{i}", tenant, uuid.uuid4(), {"i": i}, "thing") for i in range(3)
+    ]
+    await publisher.publish_many(events)
+    await publisher.publish_many(events[:1])
+
+    (script,) = redis.scripts  # registered once, on the connection rather than a pipeline
+    first, second = redis.pipelines
+    assert [client for _, _, client in script.calls] == [first] * 3 + [second]
+    assert (first.executed, second.executed) == (1, 1)
+    keys, args, _ = script.calls[2]
+    assert keys == [stream_key(str(tenant))]
+    assert args[:2] == [50, f"tenant.{tenant}.thing.e2"]
+    assert json.loads(args[2])["payload"] == {"i": 2}
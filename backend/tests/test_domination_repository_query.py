@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import re
+import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from core_app.repositories.domination_repository import (
+    _CAST_GUARDS,
+    _TABLE_INDEXED_PATHS,
+    Aggregate,
+    AsyncDominationRepository,
+    DateBucket,
+    DominationRepository,
+    QueryFilter,
+    _decode_cursor,
+    indexed_path_ddl,
+)
+
+
+class FakeResult:
+    def __init__(self, rows: list[dict]) -> None:
+        self._rows = rows
+
+    def mappings(self) -> FakeResult:
+        return self
+
+    def all(self) -> list[dict]:
+        return self._rows
+
+    def scalar_one(self) -> int:
+        return len(self._rows)
+
+
+class FakeDB:
+    def __init__(self, rows: list[dict] | None = None) -> None:
+        self.rows = rows or []
+        self.statements: list[tuple[str, dict]] = []
+
+    def execute(self, sql, params):
+        self.statements.append((str(sql), params))
+        return FakeResult(self.rows)
+
+
+class FakeAsyncDB(FakeDB):
+    async def execute(self, sql, params):
+        return FakeDB.execute(self, sql, params)
+
+
+TENANT = uuid.uuid4()
+
+
+def test_json_filters_are_pushed_down_as_literal_paths():
+    db = FakeDB()
+    repo = DominationRepository(db, table="export_jobs")
+    repo.query(
+        tenant_id=TENANT,
+        filters=[
+            QueryFilter("data.status", "in", ["queued", "processing"]),
+            QueryFilter("data.attempts", "gte", 3),
+            QueryFilter("data.payer.name", "eq", "Medicare"),
+            QueryFilter("data.failed_at", "missing"),
+        ],
+    )
+    sql, params = db.statements[0]
+    assert "(data->>'status') = ANY(CAST(:_f0 AS text[]))" in sql
+    assert "THEN CAST((data->>'attempts') AS numeric) END) >= :_f1" in sql
+    assert "(data#>>'{payer,name}') = :_f2" in sql
+    assert "NOT (data ? 'failed_at')" in sql
+    assert params["_f0"] == ["queued", "processing"]
+    assert params["_f1"] == 3
+    assert params["tenant_id"] == str(TENANT)
+
+
+def test_typed_column_filter_and_unknown_column_rejected():
+    db = FakeDB()
+    repo = DominationRepository(db, table="epcr_charts")
+    repo.count(tenant_id=TENANT, filters=[QueryFilter("status", "eq", "submitted")])
+    assert "status = :_f0" in db.statements[0][0]
+
+    with pytest.raises(ValueError, match="Unknown column"):
+        repo.count(tenant_id=TENANT, filters=[QueryFilter("pcr_number", "eq", "1")])
+    with pytest.raises(ValueError, match="Invalid field name"):
+        repo.count(tenant_id=TENANT, filters=[QueryFilter("data.status'--", "eq", "x")])
+    with pytest.raises(ValueError, match="Unsupported filter op"):
+        repo.count(tenant_id=TENANT, filters=[QueryFilter("data.status", "like", "x")])
+
+
+def test_projection_rebuilds_partial_data_dict():
+    rid = uuid.uuid4()
+    db = FakeDB(rows=[{"id": rid, "_p0": "queued", "_p1": "Medicare", "_order_key": None}])
+    repo = DominationRepository(db, table="export_jobs")
+    page = repo.query(tenant_id=TENANT, fields=["data.status", "data.payer.name"])
+    assert page.items == [{"id": rid, "data": {"status": "queued", "payer": {"name": "Medicare"}}}]
+    assert page.next_cursor is None
+
+
+def test_keyset_cursor_round_trip():
+    created = datetime(2026, 1, 1, tzinfo=UTC)
+    rows = [
+        {"id": uuid.uuid4(), "created_at": created, "_order_key": created} for _ in range(3)
+    ]
+    db = FakeDB(rows=rows)
+    repo = DominationRepository(db, table="export_jobs")
+    page = repo.query(tenant_id=TENANT, limit=2)
+    assert len(page.items) == 2
+    assert "_order_key" not in page.items[0]
+    assert _decode_cursor(page.next_cursor) == (created.isoformat(), str(rows[1]["id"]))
+
+    repo.query(tenant_id=TENANT, limit=2, cursor=page.next_cursor)
+    sql, params = db.statements[-1]
+    assert "(created_at, id) < (CAST(:_cursor_value AS timestamptz)" in sql
+    assert params["_cursor_id"] == str(rows[1]["id"])
+
+
+def test_aggregate_builds_grouped_filtered_metrics():
+    db = FakeDB(
+        rows=[
+            {"_g0": "failed", "_g1": datetime(2026, 1, 1, tzinfo=UTC), "_m0": 4, "_m1": Decimal("1500.5"), "_m2": ["MN", "WI"], "_m3": 2},
+        ]
+    )
+    repo = DominationRepository(db, table="export_jobs")
+    rows = repo.aggregate(
+        tenant_id=TENANT,
+        group_by=["data.status", DateBucket("data.created_at", "day", name="day")],
+        metrics=[
+            Aggregate("count"),
+            Aggregate("p95_ms", "percentile", "data.completed_at", since="data.started_at", percentile=0.95),
+            Aggregate("states", "distinct", "data.state"),
+            Aggregate("retried", filters=[QueryFilter("data.attempts", "gt", 1)]),
+        ],
+    )
+    sql, params = db.statements[0]
+    assert "date_trunc('day', (CASE WHEN (data->>'created_at') ~ '^[0-9]{4}-" in sql
+    assert "THEN CAST((data->>'created_at') AS timestamptz) END)) AS _g1" in sql
+    assert "percentile_disc(0.95) WITHIN GROUP (ORDER BY (EXTRACT(EPOCH FROM" in sql
+    assert "array_agg(DISTINCT (data->>'state') ORDER BY (data->>'state'))" in sql
+    assert "COUNT(*) FILTER (WHERE (CASE WHEN (data->>'attempts') ~ '" in sql
+    assert "THEN CAST((data->>'attempts') AS numeric) END) > :_m3_0)" in sql
+    assert "GROUP BY 1, 2 ORDER BY 1, 2" in sql
+    assert params["_m3_0"] == 1
+    assert rows == [
+        {
+            "status": "failed",
+            "day": datetime(2026, 1, 1, tzinfo=UTC),
+            "count": 4,
+            "p95_ms": 1500.5,
+            "states": ["MN", "WI"],
+            "retried": 2,
+        }
+    ]
+
+
+@pytest.mark.parametrize(
+    ("cast", "value", "ok"),
+    [
+        ("timestamptz", "2026-01-31T10:15:00+00:00", True),
+        ("timestamptz", "2026-01-31T10:15:00.123Z", True),
+        ("timestamptz", "2026-01-31 10:15:00-0500", True),
+        ("timestamptz", "2026-01-31", True),
+        ("timestamptz", "not-a-date", False),
+        ("timestamptz", "2026-13-01T00:00:00Z", False),
+        ("timestamptz", "", False),
+        ("numeric", "-12.5e3", True),
+        ("numeric", "12,5", False),
+    ],
+)
+def test_malformed_values_are_guarded_before_the_cast(cast, value, ok):
+    # Postgres evaluates the same pattern with ``~``; a value that fails it
+    # becomes NULL and is skipped instead of failing the aggregate with a 500.
+    assert bool(re.fullmatch(_CAST_GUARDS[cast], value)) is ok
+
+    db = FakeDB(rows=[{"_m0": 1}])
+    DominationRepository(db, table="export_jobs").aggregate(
+        tenant_id=TENANT,
+        metrics=[Aggregate("avg_ms", "avg", "data.completed_at", since="data.started_at")],
+    )
+    sql, _ = db.statements[0]
+    assert "CAST((data->>'started_at') AS timestamptz)" in sql
+    assert "CAST(NULLIF" not in sql and sql.count("CASE WHEN") == 2
+
+
+def test_numeric_range_filters_skip_malformed_values():
+    db = FakeDB()
+    DominationRepository(db, table="ar_accounts").query(
+        tenant_id=TENANT, filters=[QueryFilter("data.days_past_due", "gte", 30)]
+    )
+    sql, _ = db.statements[0]
+    guard = _CAST_GUARDS["numeric"]
+    assert (
+        f"(CASE WHEN (data->>'days_past_due') ~ '{guard}' "
+        "THEN CAST((data->>'days_past_due') AS numeric) END) >= :_f0"
+    ) in sql
+    assert sql.count("CAST(") == 1
+
+
+def test_aggregate_rejects_unknown_func_and_bucket():
+    repo = DominationRepository(FakeDB(), table="export_jobs")
+    with pytest.raises(ValueError, match="Unsupported aggregate func"):
+        repo.aggregate(tenant_id=TENANT, metrics=[Aggregate("x", "median", "data.amount")])
+    with pytest.raises(ValueError, match="Unsupported bucket unit"):
+        repo.aggregate(
+            tenant_id=TENANT,
+            group_by=[DateBucket("created_at", "fortnight")],
+            metrics=[Aggregate("count")],
+        )
+
+
+def test_none_comparisons_use_is_null():
+    db = FakeDB()
+    repo = DominationRepository(db, table="nemsis_validation_results")
+    repo.count(tenant_id=TENANT, filters=[QueryFilter("data.pcr_number", "eq", None)])
+    repo.count(tenant_id=TENANT, filters=[QueryFilter("data.pcr_number", "ne", None)])
+    repo.count(tenant_id=TENANT, filters=[QueryFilter("data.pcr_number", "eq", "PCR-1")])
+    assert "(data->>'pcr_number') IS NULL" in db.statements[0][0]
+    assert "(data->>'pcr_number') IS NOT NULL" in db.statements[1][0]
+    assert "(data->>'pcr_number') = :_f0" in db.statements[2][0]
+    assert all("_f0" not in params for _, params in db.statements[:2])
+
+
+def test_indexed_path_ddl_matches_repository_predicates():
+    upgrade, downgrade = indexed_path_ddl("export_jobs", "status", "expression")
+    assert upgrade == [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_export_jobs_data_status "
+        "ON export_jobs (tenant_id, (data->>'status')) WHERE deleted_at IS NULL"
+    ]
+    assert downgrade == ["DROP INDEX CONCURRENTLY IF EXISTS ix_export_jobs_data_status"]
+
+    with pytest.raises(ValueError, match="Unsupported indexed path mode"):
+        indexed_path_ddl("nemsis_validation_results", "pcr_number", "generated")
+
+    for table, paths in _TABLE_INDEXED_PATHS.items():
+        for path, mode in paths.items():
+            indexed_path_ddl(table, path, mode)
+
+
+async def test_async_repository_emits_same_sql_as_sync():
+    rows = [{"id": uuid.uuid4(), "_order_key": None}]
+    sync_db, async_db = FakeDB(rows=rows), FakeAsyncDB(rows=rows)
+    filters = [QueryFilter("data.status", "eq", "failed")]
+    sync_repo = DominationRepository(sync_db, table="export_jobs")
+    async_repo = AsyncDominationRepository(async_db, table="export_jobs")
+
+    sync_page = sync_repo.query(tenant_id=TENANT, filters=filters, fields=["data.status"])
+    async_page = await async_repo.query(tenant_id=TENANT, filters=filters, fields=["data.status"])
+    assert async_page == sync_page
+    assert await async_repo.count(tenant_id=TENANT, filters=filters) == 1
+    sync_repo.count(tenant_id=TENANT, filters=filters)
+    assert async_db.statements == sync_db.statements
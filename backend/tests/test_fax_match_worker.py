@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from core_app.workers import fax_match_worker
+
+
+def _event(*bodies: str) -> dict:
+    return {"Records": [{"messageId": f"m{i}", "body": b} for i, b in enumerate(bodies)]}
+
+
+def test_batch_raises_after_processing_every_record(monkeypatch):
+    seen: list[str] = []
+
+    def process(message, *, processed):
+        seen.append(message["fax_id"])
+        if message["fax_id"] == "bad":
+            raise RuntimeError("db down")
+
+    monkeypatch.setattr(fax_match_worker, "process_fax_match", process)
+    monkeypatch.setattr(fax_match_worker, "_already_processed", lambda keys: set())
+    body = lambda fax_id: json.dumps({"fax_id": fax_id, "tenant_id": "t"})  # noqa: E731
+
+    fax_match_worker.lambda_handler(_event(body("a"), body("b")), None)
+    with pytest.raises(RuntimeError, match=r"2 record\(s\): m2, m1"):
+        fax_match_worker.lambda_handler(_event(body("c"), body("bad"), "{not json"), None)
+    assert seen == ["a", "b", "c", "bad"]
+
+
+TENANT = "00000000-0000-0000-0000-000000000001"
+
+
+class FakeDB:
+    def __init__(self, statuses: dict[str, str]) -> None:
+        self.statuses = statuses
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def begin(self):
+        return self
+
+    def execute(self, sql, params):
+        assert "FROM fax_documents" in str(sql)
+        rows = [
+            SimpleNamespace(fax_id=fax_id, tenant_id=TENANT)
+            for fax_id, status in self.statuses.items()
+            if fax_id in params["fids"] and status in params["statuses"]
+        ]
+        return SimpleNamespace(fetchall=lambda: rows)
+
+
+def test_retried_batch_skips_faxes_the_first_attempt_matched(monkeypatch):
+    statuses = {"a": "pending_fetch", "b": "pending_fetch", "flaky": "pending_fetch"}
+    attached: list[str] = []
+
+    def match_and_persist(db, *, fax_id, **kwargs):
+        if fax_id == "flaky" and "flaky" not in attached:
+            attached.append(fax_id)
+            raise RuntimeError("db down")
+        attached.append(fax_id)
+        db.statuses[fax_id] = "auto_matched"
+
+    monkeypatch.setattr(fax_match_worker, "_Session", lambda: FakeDB(statuses))
+    monkeypatch.setattr(fax_match_worker, "_match_and_persist", match_and_persist)
+    event = _event(
+        *(json.dumps({"fax_id": f, "tenant_id": TENANT}) for f in ("a", "flaky", "b"))
+    )
+
+    with pytest.raises(RuntimeError, match=r"1 record\(s\): m1"):
+        fax_match_worker.lambda_handler(event, None)
+    fax_match_worker.lambda_handler(event, None)  # SQS redelivers the whole batch
+
+    assert attached == ["a", "flaky", "b", "flaky"]
+    assert set(statuses.values()) == {"auto_matched"}
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import timedelta
+
+from core_app.api import system_health_router
+from core_app.core.config import Settings
+from core_app.schemas.auth import CurrentUser
+from core_app.services import health_metrics
+from core_app.services.health_metrics import (
+    CloudWatchMetricsProvider,
+    HealthMetricsCollector,
+    LocalMetricsProvider,
+    build_queries,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingProvider(LocalMetricsProvider):
+    def __init__(self, values) -> None:
+        super().__init__(values)
+        self.fetches = 0
+        self.fail = False
+
+    async def fetch(self, queries):
+        self.fetches += 1
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("cloudwatch down")
+        return await super().fetch(queries)
+
+
+class FakeCloudWatch:
+    def __init__(self) -> None:
+        self.requests: list[dict] = []
+
+    def get_metric_data(self, **request):
+        self.requests.append(request)
+        end = request["EndTime"]
+
+        def series(metric_id, *points):  # (minutes ago, value), newest first
+            return {
+                "Id": metric_id,
+                "Timestamps": [end - timedelta(minutes=ago) for ago, _ in points],
+                "Values": [value for _, value in points],
+            }
+
+        if "NextToken" not in request:
+            return {
+                "MetricDataResults": [
+                    series("ecs_cpu", (1, 41.234), (2, 12.0)),
+                    series("ecs_memory"),
+                    series("ecs_cpu_1d", (600, 30.0)),
+                    series("alb_latency", (90, 0.2)),  # outside its 10-minute window
+                ],
+                "NextToken": "page-2",
+            }
+        return {"MetricDataResults": [series("ecs_memory", (3, 63.0))]}
+
+
+def _settings(**overrides) -> Settings:
+    return Settings(
+        database_url="postgresql://x:y@localhost/z",
+        ecs_cluster_name="core",
+        ecs_backend_service="api",
+        **overrides,
+    )
+
+
+async def test_concurrent_reads_share_one_fetch_and_are_served_from_memory():
+    provider = CountingProvider({"ecs_cpu": 42.0, "ecs_memory": 55.0})
+    collector = HealthMetricsCollector(provider, build_queries(_settings()), clock=FakeClock())
+
+    values = await asyncio.gather(*(collector.get("ecs_cpu") for _ in range(5)))
+    assert values == [42.0] * 5
+    assert await collector.get("ecs_memory") == 55.0
+    assert await collector.get("rds_connections") is None  # not configured
+    assert provider.fetches == 1
+    await collector.close()
+
+
+async def test_stale_snapshot_reads_as_unavailable_after_failures():
+    clock = FakeClock()
+    provider = CountingProvider({"ecs_cpu": 42.0})
+    collector = HealthMetricsCollector(
+        provider, build_queries(_settings()), ttl_seconds=180, clock=clock
+    )
+    assert await collector.get("ecs_cpu") == 42.0
+
+    provider.fail = True
+    clock.now += 120
+    assert await collector.get("ecs_cpu") == 42.0  # within TTL, no fetch
+    clock.now += 120
+    assert await collector.get("ecs_cpu") is None
+    assert provider.fetches == 2
+    await collector.close()
+
+
+async def test_cloudwatch_provider_batches_every_query_into_get_metric_data():
+    cw = FakeCloudWatch()
+    queries = build_queries(_settings())
+    values = await CloudWatchMetricsProvider(client=cw).fetch(queries.values())
+
+    first = cw.requests[0]
+    assert {q["Id"] for q in first["MetricDataQueries"]} == set(queries)
+    # Widest window: one day, for the resource-forecast series.
+    assert first["EndTime"] - first["StartTime"] == timedelta(days=1)
+    assert cw.requests[1]["NextToken"] == "page-2"
+    assert values["ecs_cpu"] == 41.23
+    assert values["ecs_memory"] == 63.0
+    assert values["ecs_cpu_1d"] == 30.0
+    # A day-old datapoint from the shared window is not reported as current.
+    assert values["alb_latency"] is None
+
+
+async def test_dashboard_endpoints_read_the_snapshot(monkeypatch):
+    provider = CountingProvider(
+        {"ecs_cpu": 91.0, "alb_latency": 0.12, "redis_hits": 3.0, "redis_misses": 1.0}
+    )
+    collector = HealthMetricsCollector(
+        provider, build_queries(_settings(redis_cluster_id="cache")), clock=FakeClock()
+    )
+    monkeypatch.setattr(health_metrics, "_collector", collector)
+    current = CurrentUser(user_id=uuid.uuid4(), tenant_id=uuid.uuid4(), role="founder")
+
+    cpu = await system_health_router.cpu_metrics(current=current)
+    latency = await system_health_router.api_latency(current=current)
+    ratio = await system_health_router.cache_hit_ratio(current=current)
+    db = await system_health_router.db_connections(current=current)
+
+    assert (cpu["value"], cpu["status"]) == (91.0, "alert")
+    assert latency["value"] == 120.0
+    assert ratio["value"] == 0.75
+    assert db["rds"]["active_connections"] == 0
+    assert provider.fetches == 1
+    await collector.close()
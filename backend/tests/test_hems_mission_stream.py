@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+
+from core_app.api import hems_router
+from core_app.realtime import hub as hub_module
+from core_app.realtime.hub import RealtimeHub
+from core_app.schemas.auth import CurrentUser
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeRedis:
+    def pubsub(self):
+        return self
+
+    async def psubscribe(self, *patterns):
+        pass
+
+    async def punsubscribe(self, *patterns):
+        pass
+
+    async def get_message(self, **kwargs):
+        await asyncio.Event().wait()
+
+    async def close(self):
+        pass
+
+
+def _row(table: str, n: int, event_type: str | None = None) -> dict:
+    data = {"n": n}
+    if event_type:
+        data["event_type"] = event_type
+    return {"id": f"{table}-{n}", "version": 1, "data": data}
+
+
+def _envelope(tenant: str, table: str, record: dict, **payload_extra) -> str:
+    return json.dumps({
+        "stream_id": "5-0",
+        "topic": f"tenant.{tenant}.{table}.created",
+        "entity_type": table,
+        "payload": {"record": record, **payload_extra},
+    })
+
+
+async def test_snapshot_then_live_events_without_holding_the_session(monkeypatch):
+    tenant = uuid.uuid4()
+    rows = {
+        "hems_mission_events": [_row("m", 2, "wheels_up"), _row("m", 1, "acknowledgment")],
+        "aircraft_readiness_events": [_row("r", 1)],
+        "hems_weather_briefs": [],
+    }
+
+    class FakeRepo:
+        def __init__(self, db, table):
+            self.table = table
+
+        async def list(self, *, tenant_id, limit=50, offset=0):
+            return rows[self.table]
+
+    hub = RealtimeHub(FakeRedis())
+    monkeypatch.setattr(hub_module, "_hub", hub)
+    monkeypatch.setattr(hems_router, "AsyncDominationRepository", FakeRepo)
+    db = FakeSession()
+    current = CurrentUser(user_id=uuid.uuid4(), tenant_id=tenant, role="pilot")
+
+    response = await hems_router.mission_stream(current=current, db=db, last_event_id=None)
+    assert db.closed
+
+    t = str(tenant)
+    # Duplicate of a snapshot row (written while the snapshot was read): skipped.
+    hub.dispatch(f"tenant.{t}.hems_mission_events.created",
+                 _envelope(t, "hems_mission_events", _row("m", 2, "wheels_up")))
+    hub.dispatch(f"tenant.{t}.hems_mission_events.created",
+                 _envelope(t, "hems_mission_events", {"id": "m-3", "version": 1},
+                           changes={"event_type": "wheels_down"}))
+    hub.dispatch(f"tenant.{t}.billing_cases.created", _envelope(t, "billing_cases", _row("b", 1)))
+
+    chunks = []
+    stream = response.body_iterator
+    for _ in range(4):
+        chunks.append(await stream.__anext__())
+    await stream.aclose()
+
+    assert [c.split("\n")[0] for c in chunks[:3]] == [
+        "event: acknowledgment",
+        "event: wheels_up",
+        "event: aircraft-readiness-events",
+    ]
+    assert chunks[3].startswith("id: 5-0\nevent: wheels_down\n")
+    assert json.loads(chunks[3].split("data: ", 1)[1])["data"] == {"event_type": "wheels_down"}
+    assert list(hub.subscriptions()) == []
+    await hub.close()
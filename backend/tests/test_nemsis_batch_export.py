@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import io
+import json
+import uuid
+
+import pytest
+from lxml import etree
+
+from core_app.documents.s3_storage import S3MultipartWriter
+from core_app.epcr.nemsis_batch_exporter import NEMSISBatchExporter
+from core_app.repositories.domination_repository import QueryPage
+from core_app.workers import nemsis_export_worker
+
+NS = {"n": "http://www.nemsis.org"}
+TENANT = uuid.uuid4()
+
+
+class FakeWriter(io.BytesIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.state = "open"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.state = "completed" if exc_type is None else "aborted"
+
+
+class FakeWriters(dict):
+    def __call__(self, key: str, content_type: str) -> FakeWriter:
+        self[key] = FakeWriter()
+        return self[key]
+
+    def body(self, suffix: str) -> bytes:
+        return next(w.getvalue() for k, w in self.items() if k.endswith(suffix))
+
+
+class FakeChartsRepo:
+    def __init__(self, charts: dict[str, dict], writers: FakeWriters | None = None) -> None:
+        self.charts = charts
+        self.writers = writers
+        self.streamed_before_page: list[int] = []
+
+    def query(self, *, tenant_id, filters, order_by, limit, cursor):
+        if self.writers is not None:
+            self.streamed_before_page.append(
+                sum(len(w.getvalue()) for k, w in self.writers.items() if k.endswith(".xml"))
+            )
+        (flt,) = filters
+        if flt.field == "id":
+            wanted = {str(v) for v in flt.value}
+            hits = [cid for cid in self.charts if cid in wanted]
+        else:
+            wanted = set(flt.value)
+            hits = [
+                cid
+                for cid, c in self.charts.items()
+                if (c.get("dispatch") or {}).get("cad_incident_id") in wanted
+            ]
+        # Return in a different order than requested, like Postgres would.
+        return QueryPage(
+            items=[{"id": cid, "data": self.charts[cid]} for cid in sorted(hits)], next_cursor=None
+        )
+
+
+def _chart(incident: str = "", **extra) -> dict:
+    return {
+        "patient": {"first_name": "Pat", "gender": "female"},
+        "dispatch": {"incident_number": "I-1", "cad_incident_id": incident},
+        "narrative": "Transported.",
+        **extra,
+    }
+
+
+def test_batch_streams_one_document_per_state_in_batch_order():
+    ids = [str(uuid.uuid4()) for _ in range(5)]
+    charts = {cid: _chart() for cid in ids}
+    charts[ids[3]] = _chart(state_code="mn")
+    charts[ids[4]] = _chart(incident="CAD-9")
+    missing = str(uuid.uuid4())
+    writers = FakeWriters()
+    repo = FakeChartsRepo(charts, writers)
+
+    summary = NEMSISBatchExporter(repo, open_writer=writers, page_size=2).run(
+        tenant_id=TENANT,
+        batch_id="b1",
+        batch={
+            "chart_ids": [ids[2], ids[0], missing, ids[1], ids[3]],
+            "incident_ids": ["CAD-9", "CAD-404"],
+            "state_code": "wi",
+            "agency_info": {"name": "Test EMS"},
+        },
+    )
+
+    wi = etree.fromstring(writers.body("EMSDataSet_WI.xml"))
+    pcr_ids = [p.get("id") for p in wi.iterfind("n:Header/n:PatientCareReport", NS)]
+    assert pcr_ids == [ids[2], ids[0], ids[1], ids[4]]
+    assert wi.findtext("n:Header/n:DemographicGroup//n:dAgency.03", namespaces=NS) == "Test EMS"
+    mn = etree.fromstring(writers.body("EMSDataSet_MN.xml"))
+    assert mn.findtext(".//n:dAgency.04", namespaces=NS) == "MN"
+    assert len(mn.findall("n:Header/n:PatientCareReport", NS)) == 1
+
+    results = [json.loads(line) for line in writers.body("results.jsonl").splitlines()]
+    assert [r["chart_id"] for r in results] == [ids[2], ids[0], ids[1], ids[3], ids[4]]
+    assert summary.pcr_total == 5
+    assert summary.pcr_valid + summary.pcr_invalid == 5
+    assert summary.missing_ids == [missing, "CAD-404"]
+    assert summary.documents["WI"]["pcr_count"] == 4
+    assert summary.documents["WI"]["s3_key"] == f"nemsis/exports/{TENANT}/b1/EMSDataSet_WI.xml"
+    assert {w.state for w in writers.values()} == {"completed"}
+    # PCRs reach the writer while later pages are still being loaded.
+    assert repo.streamed_before_page[-1] > 0
+
+
+def test_incident_lookup_tolerates_charts_without_dispatch():
+    ids = [str(uuid.uuid4()) for _ in range(2)]
+    charts = {ids[0]: _chart(incident="CAD-1"), ids[1]: {**_chart(), "dispatch": None}}
+    writers = FakeWriters()
+
+    class UnfilteredRepo(FakeChartsRepo):
+        def query(self, **kwargs):  # e.g. a loose match on the JSONB path
+            return QueryPage(
+                items=[{"id": cid, "data": c} for cid, c in self.charts.items()], next_cursor=None
+            )
+
+    summary = NEMSISBatchExporter(UnfilteredRepo(charts), open_writer=writers).run(
+        tenant_id=TENANT, batch_id="b3", batch={"incident_ids": ["CAD-1"]}
+    )
+    assert summary.pcr_total == 1
+    assert summary.missing_ids == []
+
+
+def test_failed_export_aborts_every_upload():
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    writers = FakeWriters()
+
+    class BrokenRepo(FakeChartsRepo):
+        def query(self, **kwargs):
+            if self.streamed_before_page:
+                raise RuntimeError("database went away")
+            return super().query(**kwargs)
+
+    exporter = NEMSISBatchExporter(
+        BrokenRepo({cid: _chart() for cid in ids}, writers), open_writer=writers, page_size=1
+    )
+    with pytest.raises(RuntimeError):
+        exporter.run(tenant_id=TENANT, batch_id="b2", batch={"chart_ids": ids})
+    assert {w.state for w in writers.values()} == {"aborted"}
+
+
+def test_process_pool_renders_the_same_document():
+    ids = [str(uuid.uuid4()) for _ in range(6)]
+    charts = {cid: _chart() for cid in ids}
+    inline, pooled = FakeWriters(), FakeWriters()
+    batch = {"chart_ids": ids}
+    NEMSISBatchExporter(FakeChartsRepo(charts), open_writer=inline).run(
+        tenant_id=TENANT, batch_id="b", batch=batch
+    )
+    NEMSISBatchExporter(FakeChartsRepo(charts), open_writer=pooled, processes=2).run(
+        tenant_id=TENANT, batch_id="b", batch=batch
+    )
+    assert pooled.body("EMSDataSet_WI.xml") == inline.body("EMSDataSet_WI.xml")
+
+
+class FakeS3:
+    def __init__(self) -> None:
+        self.parts: list[int] = []
+        self.completed = self.aborted = False
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "u1"}
+
+    def upload_part(self, *, PartNumber, Body, **kwargs):
+        self.parts.append(len(Body))
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, *, MultipartUpload, **kwargs):
+        self.completed = [p["PartNumber"] for p in MultipartUpload["Parts"]]
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+def test_multipart_writer_buffers_at_most_one_part():
+    s3 = FakeS3()
+    mib = 1024 * 1024
+    with S3MultipartWriter(bucket="b", key="k", part_size=5 * mib, client=s3) as writer:
+        for _ in range(12):
+            writer.write(b"x" * mib)
+    assert s3.parts == [5 * mib, 5 * mib, 2 * mib]
+    assert s3.completed == [1, 2, 3]
+
+    s3 = FakeS3()
+    with pytest.raises(ValueError), S3MultipartWriter(bucket="b", key="k", client=s3) as writer:
+        writer.write(b"partial")
+        raise ValueError("boom")
+    assert s3.aborted and not s3.completed
+
+
+class FakeBatchService:
+    def __init__(self, batch: dict, charts: dict) -> None:
+        self.batch = batch
+        self.charts = FakeChartsRepo(charts)
+        self.updates: list[dict] = []
+
+    def repo(self, table):
+        if table == "epcr_charts":
+            return self.charts
+        batch = self.batch
+
+        class _Batches:
+            def list_raw_by_field(self, field, value, limit):
+                return [batch] if batch["data"]["status"] == value else []
+
+        return _Batches()
+
+    async def update(self, *, expected_version, patch, **kwargs):
+        if expected_version != self.batch["version"]:
+            return None
+        self.updates.append(patch)
+        self.batch = {
+            **self.batch,
+            "version": self.batch["version"] + 1,
+            "data": {**self.batch["data"], **patch},
+        }
+        return self.batch
+
+
+async def test_worker_claims_and_completes_a_queued_batch():
+    cid = str(uuid.uuid4())
+    svc = FakeBatchService(
+        {
+            "id": str(uuid.uuid4()),
+            "tenant_id": str(TENANT),
+            "version": 1,
+            "created_at": "2026-10-01",
+            "data": {"status": "queued", "chart_ids": [cid], "state_code": "WI"},
+        },
+        {cid: _chart()},
+    )
+    writers = FakeWriters()
+
+    done = await nemsis_export_worker.export_next_batch(svc, open_writer=writers, processes=0)
+
+    assert [u["status"] for u in svc.updates] == ["running", "completed"]
+    assert done["data"]["pcr_total"] == 1
+    assert done["data"]["documents"]["WI"]["pcr_count"] == 1
+    assert await nemsis_export_worker.export_next_batch(svc, open_writer=writers) is None
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from core_app.nemsis.validator import ElementIndex, NEMSISValidator
+
+SAMPLE = Path(__file__).resolve().parent.parent / "compliance" / "nemsis" / "samples"
+
+
+def _rule_ids(result) -> list[str]:
+    return [i.rule_id for i in result.issues]
+
+
+def test_sample_pcr_issues_by_stage():
+    xml = (SAMPLE / "sample_ems_minimal.xml").read_bytes()
+    result = NEMSISValidator().validate_xml_bytes(xml, state_code="WI")
+
+    assert _rule_ids(result) == ["NEMSIS-002", "NEMSIS-008", "NEMSIS-009", "NEMSIS-007", "WI-006"]
+    assert result.stage_results["wi_schematron"] == {"passed": True, "issue_count": 1}
+    assert result.stage_results["wi_state"] == {"passed": True, "issue_count": 0}
+    agency = result.issues[-1]
+    assert (agency.severity, agency.element_id) == ("warning", "dAgency.04")
+    assert "'55'" in agency.plain_message
+
+
+def test_value_rules_and_non_wi_states():
+    xml = b"""<EMSDataSet xmlns="http://www.nemsis.org"><PatientCareReport>
+        <ePatient><ePatient.13>123</ePatient.13></ePatient>
+        <eTimes><eTimes.01>2024-01-01</eTimes.01></eTimes>
+        <!-- comments are not elements -->
+    </PatientCareReport></EMSDataSet>"""
+    wi = NEMSISValidator().validate_xml_bytes(xml)
+    state = [i for i in wi.issues if i.stage == "wi_state"]
+    assert [(i.rule_id, i.element_id) for i in state] == [
+        ("WI-STATE-001", "ePatient.13"),
+        ("WI-STATE-003", "eTimes.01"),
+    ]
+    assert state[1].plain_message == "PSAP Call Time has an invalid date/time format: '2024-01-01'."
+
+    mn = NEMSISValidator().validate_xml_bytes(xml, state_code="MN")
+    assert set(mn.stage_results) == {"xsd", "national_schematron"}
+
+
+def test_syntax_errors_skip_rule_stages():
+    result = NEMSISValidator().validate_xml_bytes(b"<EMSDataSet><eRecord>")
+    assert not result.valid
+    assert {i.rule_id for i in result.issues} == {"XSD-001"}
+    assert result.stage_results["wi_state"]["skipped"]
+
+
+def test_entities_are_not_expanded_into_messages(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("TOP-SECRET")
+    xml = f"""<?xml version="1.0"?>
+<!DOCTYPE EMSDataSet [<!ENTITY leak SYSTEM "file://{secret}">]>
+<EMSDataSet><dAgency.04>&leak;</dAgency.04></EMSDataSet>""".encode()
+    result = NEMSISValidator().validate_xml_bytes(xml)
+    assert "TOP-SECRET" not in str(result.to_dict())
+
+
+def test_internal_entities_are_not_expanded():
+    xml = b"""<?xml version="1.0"?>
+<!DOCTYPE EMSDataSet [<!ENTITY state "55">]>
+<EMSDataSet><dAgency.04>&state;</dAgency.04></EMSDataSet>"""
+    expanded = NEMSISValidator().validate_xml_bytes(xml.replace(b"&state;", b"55"))
+    assert "WI-006" in _rule_ids(expanded)
+
+    result = NEMSISValidator().validate_xml_bytes(xml)
+    assert "WI-006" not in _rule_ids(result)
+    assert "'55'" not in str(result.to_dict())
+
+
+def test_index_covers_every_pcr_in_one_pass():
+    pcr = "<PatientCareReport><eRecord.01>{}</eRecord.01><eVitals/></PatientCareReport>"
+    xml = (
+        '<EMSDataSet xmlns="http://www.nemsis.org"><Header>'
+        + "".join(pcr.format(f"PCR-{i}") for i in range(500))
+        + "</Header></EMSDataSet>"
+    )
+    from lxml import etree
+
+    index = ElementIndex(etree.fromstring(xml.encode()))
+    assert len(index.all("eVitals")) == 500
+    assert index.text("eRecord.01") == "PCR-0"
+    assert index.text("eRecord.02") is None
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from core_app.db.pool import PoolConfig, build_engine
+from core_app.middleware import rate_limiter
+from core_app.middleware.pipeline import RequestPipelineMiddleware
+from core_app.observability import metrics
+from core_app.observability.metrics import (
+    external_call,
+    instrument_repository,
+    sqs_job,
+    statement_labels,
+)
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class FakeLimiter:
+    async def hit(self, key, limit, window):
+        return True, limit
+
+
+def test_requests_are_labelled_by_route_template(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiter", FakeLimiter())
+    app = FastAPI()
+    app.add_middleware(RequestPipelineMiddleware)
+
+    @app.get("/api/v1/widgets/{widget_id}")
+    async def widget(widget_id: str):
+        return {"id": widget_id}
+
+    routed = {"method": "GET", "route": "/api/v1/widgets/{widget_id}", "status": "200"}
+    unmatched = {"method": "GET", "route": metrics.UNMATCHED_ROUTE, "status": "404"}
+    before = _sample("http_request_duration_seconds_count", routed)
+    before_404 = _sample("http_request_duration_seconds_count", unmatched)
+
+    client = TestClient(app)
+    client.get("/api/v1/widgets/1")
+    client.get("/api/v1/widgets/2")
+    client.get("/api/v1/nope")
+
+    assert _sample("http_request_duration_seconds_count", routed) == before + 2
+    assert _sample("http_request_duration_seconds_count", unmatched) == before_404 + 1
+    assert _sample("http_requests_in_flight", {}) == 0
+
+
+def test_queries_are_labelled_by_table_and_repository_method():
+    engine = build_engine("sqlite://", PoolConfig(statement_timeout_ms=0), name="metrics_test")
+
+    @instrument_repository
+    class WidgetRepository:
+        def __init__(self, conn) -> None:
+            self.conn = conn
+
+        def list(self):
+            return self.conn.execute(text("SELECT * FROM widgets")).all()
+
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE widgets (id INTEGER)"))
+        WidgetRepository(conn).list()
+        conn.execute(text('INSERT INTO "widgets" (id) VALUES (1)'))
+
+    assert _sample(
+        "db_query_duration_seconds_count", {"table": "widgets", "operation": "WidgetRepository.list"}
+    ) == 1
+    assert _sample("db_query_duration_seconds_count", {"table": "widgets", "operation": "insert"}) == 1
+    assert statement_labels("  update Cases SET x = 1") == ("cases", "update")
+
+
+def test_external_call_records_outcome():
+    labels = {"service": "lob", "operation": "test", "outcome": "error"}
+    with pytest.raises(RuntimeError), external_call("lob", "test"):
+        raise RuntimeError("502")
+    with external_call("lob", "test"):
+        pass
+    assert _sample("external_call_duration_seconds_count", labels) == 1
+    assert _sample("external_call_duration_seconds_count", {**labels, "outcome": "ok"}) == 1
+
+
+def test_aws_calls_are_timed_through_botocore_events():
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import EndpointConnectionError
+
+    metrics.instrument_boto3()
+    s3 = boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        endpoint_url="http://127.0.0.1:9",
+        config=Config(retries={"max_attempts": 1}, connect_timeout=1),
+    )
+    labels = {"service": "s3", "operation": "ListBuckets", "outcome": "error"}
+    before = _sample("external_call_duration_seconds_count", labels)
+    with pytest.raises(EndpointConnectionError):
+        s3.list_buckets()
+    assert _sample("external_call_duration_seconds_count", labels) == before + 1
+
+
+def test_sqs_job_records_duration_and_oldest_lag():
+    @sqs_job("metrics_test")
+    def handler(event, context):
+        return len(event["Records"])
+
+    now_ms = int(time.time() * 1000)
+    event = {
+        "Records": [
+            {"attributes": {"SentTimestamp": str(now_ms - 30_000)}},
+            {"attributes": {"SentTimestamp": str(now_ms - 5_000)}},
+        ]
+    }
+    assert handler(event, None) == 2
+    assert _sample("worker_job_duration_seconds_count", {"worker": "metrics_test", "outcome": "ok"}) == 1
+    lag = _sample("worker_queue_lag_seconds_sum", {"worker": "metrics_test"})
+    assert 29 <= lag < 60
+
+
+def test_multiprocess_exposition_labels_process_collectors_with_pid(monkeypatch, tmp_path):
+    build_engine("sqlite://", PoolConfig(statement_timeout_ms=0), name="metrics_mp")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    body = metrics.exposition().decode()
+    assert 'db_pool_size{pid="' in body
+    assert 'pool="metrics_mp"' in body
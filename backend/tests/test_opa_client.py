@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from core_app.services.opa import (
+    OPA_DECISION_CACHE,
+    HttpPolicyEvaluator,
+    OpaClient,
+    OpaError,
+    build_input,
+    rule_from_policy_path,
+)
+
+
+def _counter(result: str) -> float:
+    return OPA_DECISION_CACHE.labels(result=result)._value.get()
+
+
+def _input(role: str = "billing") -> dict:
+    return build_input(
+        tenant_id="t1",
+        user_id="u1",
+        role=role,
+        permission="claims:read",
+        method="GET",
+        path_template="/api/v1/billing/claims/{claim_id}",
+    )
+
+
+async def test_decisions_are_cached_per_key_and_counted():
+    calls: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls.append(body["input"])
+        return httpx.Response(200, json={"result": body["input"]["role"] == "billing"})
+
+    evaluator = HttpPolicyEvaluator(
+        "http://opa/v1/data/fusionems/allow", transport=httpx.MockTransport(handler)
+    )
+    client = OpaClient(evaluator, cache_ttl_seconds=60)
+    hits, misses = _counter("hit"), _counter("miss")
+
+    key = ("t1", "billing", "claims:read", "GET", "/api/v1/billing/claims/{claim_id}")
+    assert await client.is_allowed(key, _input()) is True
+    assert await client.is_allowed(key, _input()) is True
+    denied_key = ("t1", "readonly", "claims:read", "GET", "/api/v1/billing/claims/{claim_id}")
+    assert await client.is_allowed(denied_key, _input("readonly")) is False
+
+    assert len(calls) == 2
+    assert calls[0]["path"] == ["api", "v1", "billing", "claims", "{claim_id}"]
+    assert calls[0]["user"] == {"sub": "u1", "tenant_id": "t1", "role": "billing"}
+    assert _counter("hit") - hits == 1
+    assert _counter("miss") - misses == 2
+    await client.aclose()
+
+
+async def test_errors_raise_and_are_not_cached():
+    status = {"code": 500}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status["code"], json={"result": True})
+
+    client = OpaClient(
+        HttpPolicyEvaluator("http://opa/allow", transport=httpx.MockTransport(handler))
+    )
+    key = ("t1", "admin", "p", "GET", "/x")
+    with pytest.raises(OpaError):
+        await client.is_allowed(key, {})
+    status["code"] = 200
+    assert await client.is_allowed(key, {}) is True
+    await client.aclose()
+
+
+def test_rule_from_policy_path():
+    assert rule_from_policy_path("v1/data/fusionems/allow") == "data.fusionems.allow"
+    assert rule_from_policy_path("/fusionems/allow") == "data.fusionems.allow"
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import pytest
+
+from core_app.core.circuit_breaker import CircuitBreaker
+from core_app.middleware import rate_limiter
+from core_app.middleware.rate_limiter import RateLimiter, _gcra
+
+
+class FakeScript:
+    """Runs the GCRA in Python against a fixed clock, like the Lua script."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.tat: dict[str, float] = {}
+        self.fail = False
+
+    async def __call__(self, *, keys, args):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("redis down")
+        interval, burst, want = args
+        key = keys[0]
+        granted, remaining, tat = _gcra(self.tat.get(key, 0), 0, interval, burst, want)
+        self.tat[key] = tat
+        retry = 0 if granted else tat + interval - burst
+        return [granted, remaining, retry]
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.script = FakeScript()
+
+    def register_script(self, source):
+        return self.script
+
+
+async def test_leases_absorb_most_checks_and_respect_the_limit():
+    redis = FakeRedis()
+    limiter = RateLimiter(redis, lease_fraction=0.1)
+    results = [await limiter.hit("k", 100, 60) for _ in range(105)]
+    assert [allowed for allowed, _ in results] == [True] * 100 + [False] * 5
+    # 10 leases of 10, one denial; the cached denial absorbs the rest.
+    assert redis.script.calls == 11
+    assert results[0][1] == 99
+    assert results[99][1] == 0
+
+
+async def test_open_breaker_skips_redis_and_limits_per_process():
+    redis = FakeRedis()
+    redis.script.fail = True
+    limiter = RateLimiter(redis, breaker=CircuitBreaker(failure_threshold=2, reset_seconds=60))
+    results = [await limiter.hit("k", 3, 60) for _ in range(5)]
+    assert [allowed for allowed, _ in results] == [True, True, True, False, False]
+    assert redis.script.calls == 2
+    assert limiter.breaker.is_open
+
+
+def test_breaker_half_opens_with_a_single_probe(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("core_app.core.circuit_breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10)
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] += 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    now[0] += 10
+    assert breaker.allow()
+    # The probe was cancelled and never reported: another one is let through.
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and not breaker.is_open
+
+
+@pytest.mark.parametrize("limit", [1, 60])
+async def test_no_redis_allows_everything(limit):
+    limiter = RateLimiter(None)
+    assert await limiter.hit("k", limit, 60) == (True, limit)
+
+
+@pytest.mark.parametrize(
+    ("url", "tls"), [("rediss://cache.internal:6379", True), ("redis://localhost:6379", False)]
+)
+def test_limiter_client_uses_the_shared_connection_options(monkeypatch, url, tls):
+    monkeypatch.setattr(rate_limiter, "_limiter", None)
+    monkeypatch.setattr(rate_limiter.get_settings(), "redis_url", url)
+    try:
+        pool = rate_limiter.get_rate_limiter()._redis.connection_pool
+    finally:
+        rate_limiter._limiter = None
+    # TLS without certificate verification, like the event publisher; plain redis:// rejects it.
+    assert pool.connection_kwargs.get("ssl_cert_reqs", "unset") == (None if tls else "unset")
+    assert pool.connection_kwargs["socket_timeout"] == 0.25
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from core_app.realtime.hub import DISCONNECT, RealtimeHub
+from core_app.realtime.streams import parse_stream_id, stream_key, with_stream_id
+
+
+class FakePubSub:
+    def __init__(self) -> None:
+        self.patterns: list[str] = []
+        self.inbox: asyncio.Queue = asyncio.Queue()
+
+    async def psubscribe(self, *patterns):
+        self.patterns.extend(patterns)
+
+    async def punsubscribe(self, *patterns):
+        for p in patterns:
+            self.patterns.remove(p)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        return await self.inbox.get()
+
+    async def close(self):
+        pass
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.ops: list[str] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.ops.append(key)
+
+    async def execute(self):
+        self.redis.round_trips.append(self.ops)
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.pubsubs: list[FakePubSub] = []
+        self.round_trips: list[list[str]] = []
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+
+    def pubsub(self):
+        ps = FakePubSub()
+        self.pubsubs.append(ps)
+        return ps
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        entries = self.streams.get(key, [])
+        if min.startswith("("):
+            floor = parse_stream_id(min[1:])
+            entries = [e for e in entries if parse_stream_id(e[0]) > floor]
+        return entries[:count] if count else entries
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def close(self):
+        pass
+
+
+def _message(channel: str, data: dict) -> dict:
+    return {"type": "pmessage", "channel": channel, "data": json.dumps(data)}
+
+
+async def test_one_subscription_per_tenant_and_pattern_filtering():
+    redis = FakeRedis()
+    hub = RealtimeHub(redis)
+    a = await hub.subscribe("t1", transport="sse")
+    b = await hub.subscribe("t1", ["tenant.t1.cad.*"], transport="ws")
+    other = await hub.subscribe("t2", transport="sse")
+
+    assert len(redis.pubsubs) == 1
+    assert redis.pubsubs[0].patterns == ["tenant.t1.*", "tenant.t2.*"]
+
+    inbox = redis.pubsubs[0].inbox
+    await inbox.put(_message("tenant.t1.cad.unit_updated", {"n": 1}))
+    await inbox.put(_message("tenant.t1.billing.claim", {"n": 2}))
+    assert json.loads((await a.get())[1]) == {"n": 1}
+    assert json.loads((await a.get())[1]) == {"n": 2}
+    assert json.loads((await b.get())[1]) == {"n": 1}
+    assert b.qsize() == 0
+    assert other.qsize() == 0
+
+    await hub.unsubscribe(a)
+    await hub.unsubscribe(b)
+    assert redis.pubsubs[0].patterns == ["tenant.t2.*"]
+    await hub.close()
+
+
+async def test_slow_consumer_policies():
+    hub = RealtimeHub(FakeRedis(), queue_maxsize=2)
+    sub = await hub.subscribe("t1", transport="sse")
+    for n in range(4):
+        hub.dispatch("tenant.t1.x", json.dumps({"n": n}))
+    assert [json.loads((await sub.get())[1])["n"] for _ in range(2)] == [2, 3]
+    assert sub.dropped == 2
+
+    strict = RealtimeHub(FakeRedis(), queue_maxsize=1, overflow_policy=DISCONNECT)
+    sub = await strict.subscribe("t1", transport="ws")
+    strict.dispatch("tenant.t1.x", "{}")
+    strict.dispatch("tenant.t1.x", "{}")
+    assert sub.closed
+    assert await sub.get() is None
+    await hub.close()
+    await strict.close()
+
+
+async def test_presence_is_refcounted_and_pipelined():
+    redis = FakeRedis()
+    hub = RealtimeHub(redis, presence_interval=0.01)
+    s1 = await hub.subscribe("t1", transport="sse", presence=("user", "u1"))
+    s2 = await hub.subscribe("t1", transport="ws", presence=("user", "u1"))
+    await hub.subscribe("t1", transport="ws", presence=("user", "u2"))
+    # Only the first connection of each user writes immediately.
+    assert redis.round_trips == [["tenant.t1.presence.user.u1"], ["tenant.t1.presence.user.u2"]]
+
+    await asyncio.sleep(0.05)
+    batched = redis.round_trips[2]
+    assert sorted(batched) == ["tenant.t1.presence.user.u1", "tenant.t1.presence.user.u2"]
+
+    await hub.unsubscribe(s1)
+    await hub.unsubscribe(s2)
+    redis.round_trips.clear()
+    await asyncio.sleep(0.05)
+    assert redis.round_trips and all(
+        ops == ["tenant.t1.presence.user.u2"] for ops in redis.round_trips
+    )
+    await hub.close()
+
+
+def _entry(n: int, topic: str) -> tuple[str, dict]:
+    return f"100-{n}", {"topic": topic, "data": json.dumps({"topic": topic, "n": n})}
+
+
+async def test_resume_replays_missed_events_then_dedupes_live_feed():
+    redis = FakeRedis()
+    redis.streams[stream_key("t1")] = [
+        _entry(1, "tenant.t1.cad.a"),
+        _entry(2, "tenant.t1.cad.b"),
+        _entry(3, "tenant.t1.billing.c"),
+        _entry(4, "tenant.t1.cad.d"),
+    ]
+    hub = RealtimeHub(redis)
+    sub = await hub.subscribe("t1", ["tenant.t1.cad.*"], transport="sse", after_id="100-1")
+
+    # A live copy of an already replayed entry arrives while replaying.
+    hub.dispatch("tenant.t1.cad.d", with_stream_id("100-4", json.dumps({"n": 4})))
+    hub.dispatch("tenant.t1.cad.e", with_stream_id("100-5", json.dumps({"n": 5})))
+
+    got = [await sub.get() for _ in range(3)]
+    assert [event_id for event_id, _ in got] == ["100-2", "100-4", "100-5"]
+    assert json.loads(got[0][1]) == {"stream_id": "100-2", "topic": "tenant.t1.cad.b", "n": 2}
+    assert sub.qsize() == 0
+    await hub.close()
+
+
+async def test_resume_from_trimmed_cursor_requests_resync():
+    redis = FakeRedis()
+    redis.streams[stream_key("t1")] = [_entry(7, "tenant.t1.cad.a")]
+    hub = RealtimeHub(redis)
+    sub = await hub.subscribe("t1", transport="ws", after_id="100-2")
+    assert json.loads((await sub.get())[1]) == {"eventType": "resync_required"}
+    assert (await sub.get())[0] == "100-7"
+    await hub.close()
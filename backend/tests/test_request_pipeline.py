@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from core_app.core.config import get_settings
+from core_app.middleware import pipeline, rate_limiter
+from core_app.middleware.pipeline import RequestPipelineMiddleware
+from core_app.services.auth_cache import TenantStatus
+
+TENANT = uuid.uuid4()
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestPipelineMiddleware)
+
+    @app.get("/api/v1/things")
+    async def things(request: Request):
+        request.state.tenant_id = TENANT
+        return {"correlation_id": request.state.correlation_id}
+
+    @app.get("/api/v1/epcr/charts")
+    async def charts(request: Request):
+        return {"status": request.state.tenant_status}
+
+    @app.get("/realtime/sse")
+    async def sse():
+        async def gen():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+
+        return StreamingResponse(gen(), media_type="text/event-stream")
+
+    return app
+
+
+def _token(tenant_id: uuid.UUID, key: str | None = None) -> str:
+    settings = get_settings()
+    return jwt.encode(
+        {"sub": "u", "tenant_id": str(tenant_id)},
+        settings.jwt_secret_key if key is None else key,
+        algorithm=settings.jwt_algorithm,
+    )
+
+
+class FakeLimiter:
+    def __init__(self, allowed: bool, remaining: int) -> None:
+        self.allowed = allowed
+        self.remaining = remaining
+        self.hits: list[tuple[str, int]] = []
+
+    async def hit(self, key, limit, window):
+        self.hits.append((key, limit))
+        return self.allowed, self.remaining
+
+
+def _limit(monkeypatch, allowed: bool = True, remaining: int = 1) -> FakeLimiter:
+    limiter = FakeLimiter(allowed, remaining)
+    monkeypatch.setattr(rate_limiter, "_limiter", limiter)
+    return limiter
+
+
+def _tenants(monkeypatch, statuses: dict) -> None:
+    async def fake_resolve(tenant_id):
+        return statuses.get(tenant_id)
+
+    monkeypatch.setattr(pipeline, "resolve_tenant_status", fake_resolve)
+
+
+def test_correlation_tenant_and_rate_limit_headers(monkeypatch):
+    _limit(monkeypatch, remaining=7)
+    client = TestClient(_app())
+    resp = client.get("/api/v1/things", headers={"x-correlation-id": "abc"})
+    assert resp.json() == {"correlation_id": "abc"}
+    assert resp.headers["x-correlation-id"] == "abc"
+    assert resp.headers["x-tenant-id"] == str(TENANT)
+    assert resp.headers["x-ratelimit-remaining"] == "7"
+
+    stream = client.get("/realtime/sse")
+    assert stream.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+    assert "x-correlation-id" in stream.headers
+
+
+def test_rate_limit_rejects(monkeypatch):
+    _limit(monkeypatch, allowed=False, remaining=0)
+    resp = TestClient(_app()).get("/api/v1/things")
+    assert resp.status_code == 429
+    assert resp.json()["error"] == "rate_limit_exceeded"
+    assert resp.headers["retry-after"] == "60"
+
+
+def test_tier_comes_from_the_verified_tenant_record(monkeypatch):
+    limiter = _limit(monkeypatch)
+    _tenants(monkeypatch, {TENANT: TenantStatus("active", "signed", "professional")})
+    client = TestClient(_app())
+
+    resp = client.get("/api/v1/things", headers={"Authorization": f"Bearer {_token(TENANT)}"})
+    assert resp.headers["x-ratelimit-limit"] == "300"
+    assert limiter.hits[-1] == (f"rate:api:{TENANT}:minute", 300)
+
+    # A forged token must not spend the tenant's quota: it falls back to per-IP.
+    forged = _token(TENANT, key="not-the-secret")
+    client.get("/api/v1/things", headers={"Authorization": f"Bearer {forged}"})
+    assert limiter.hits[-1] == ("rate:ip:testclient:minute", rate_limiter.IP_RATE_LIMIT)
+
+
+def test_phi_lock_uses_token_tenant_status(monkeypatch):
+    _limit(monkeypatch)
+    statuses = {
+        TENANT: TenantStatus("active", "signed"),
+    }
+    _tenants(monkeypatch, statuses)
+    client = TestClient(_app())
+
+    ok = client.get("/api/v1/epcr/charts", headers={"Authorization": f"Bearer {_token(TENANT)}"})
+    assert ok.status_code == 200
+    assert ok.json() == {"status": "active"}
+
+    locked = client.get("/api/v1/epcr/charts", headers={"Authorization": f"Bearer {_token(uuid.uuid4())}"})
+    assert locked.status_code == 403
+    assert locked.json()["next_step"] == "complete_onboarding"
+    assert "x-correlation-id" in locked.headers
+
+    statuses[TENANT] = TenantStatus("active", "pending")
+    baa = client.get(f"/api/v1/epcr/charts?token={_token(TENANT)}")
+    assert baa.json()["next_step"] == "sign_baa"
+
+    assert client.get("/api/v1/epcr/charts").status_code == 403
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core_app.api.router_registry import (
+    LazyRouterLoader,
+    LazyRouterMiddleware,
+    RouterSpec,
+    build_manifest,
+    load_manifest,
+)
+
+
+def test_manifest_matches_routers():
+    # Regenerate with: python scripts/import_profile.py --write-manifest
+    assert build_manifest() == load_manifest()
+
+
+@pytest.fixture
+def router_modules(tmp_path, monkeypatch):
+    sources = {
+        "lazy_things": """
+            @router.get("/api/v1/things/{thing_id}")
+            def get_thing(thing_id: str):
+                return {"router": "things", "id": thing_id}
+        """,
+        # Overlaps lazy_things; declared later, so lazy_things must win.
+        "lazy_catchall": """
+            @router.get("/api/v1/things/{thing_id}")
+            def shadowed(thing_id: str):
+                return {"router": "catchall"}
+
+            @router.get("/api/v1/other")
+            def other():
+                return {"router": "catchall"}
+        """,
+    }
+    for name, body in sources.items():
+        (tmp_path / f"{name}.py").write_text(
+            "from fastapi import APIRouter\nrouter = APIRouter()\n" + textwrap.dedent(body)
+        )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield [RouterSpec("lazy_things"), RouterSpec("lazy_catchall")]
+    for name in sources:
+        sys.modules.pop(name, None)
+
+
+def test_lazy_loader_mounts_on_first_match_in_eager_order(router_modules):
+    app = FastAPI()
+    manifest = {
+        "lazy_things": ["/api/v1/things/"],
+        "lazy_catchall": ["/api/v1/other", "/api/v1/things/"],
+    }
+    loader = LazyRouterLoader(app, router_modules, manifest)
+    app.add_middleware(LazyRouterMiddleware, loader=loader)
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    client = TestClient(app)
+    assert client.get("/health").json() == {"status": "ok"}
+    assert "lazy_things" not in sys.modules
+
+    assert client.get("/api/v1/other").json() == {"router": "catchall"}
+    assert loader.pending == (RouterSpec("lazy_things"),)
+
+    # Mounted after lazy_catchall, but still ahead of it in the route table.
+    assert client.get("/api/v1/things/7").json() == {"router": "things", "id": "7"}
+    assert loader.pending == ()
+    paths = [route.path for route in app.router.routes]
+    assert paths.index("/api/v1/things/{thing_id}") < paths.index("/api/v1/other")
+    assert paths[-1] == "/health"
+
+
+def test_openapi_mounts_everything(router_modules):
+    app = FastAPI()
+    loader = LazyRouterLoader(app, router_modules, build_manifest(router_modules))
+    app.add_middleware(LazyRouterMiddleware, loader=loader)
+    schema = TestClient(app).get("/openapi.json").json()
+    assert set(schema["paths"]) == {"/api/v1/things/{thing_id}", "/api/v1/other"}
+    assert loader.pending == ()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from core_app.core.circuit_breaker import CircuitBreaker
+from core_app.telnyx.client import TelnyxApiError, TelnyxClient, TelnyxUnavailable
+from core_app.telnyx.did_directory import DidDirectory
+
+
+def _client(handler, **kwargs) -> TelnyxClient:
+    return TelnyxClient(
+        transport=httpx.MockTransport(handler), backoff_seconds=0, **kwargs
+    )
+
+
+async def test_call_actions_retry_with_the_same_command_id():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(json.loads(request.content))
+        if len(seen) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"data": {"result": "ok"}})
+
+    client = _client(handler)
+    result = await client.call_action(
+        api_key="KEY", call_control_id="cc-1", action="answer", payload={"client_state": "s"}
+    )
+    await client.aclose()
+
+    assert result == {"data": {"result": "ok"}}
+    assert len(seen) == 3
+    assert len({body["command_id"] for body in seen}) == 1
+
+
+async def test_sms_is_not_resent_after_a_read_error():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        raise httpx.ReadTimeout("slow", request=request)
+
+    client = _client(handler)
+    with pytest.raises(TelnyxUnavailable):
+        await client.request("POST", "/messages", api_key="KEY", context="send_sms", json={})
+    await client.aclose()
+    assert calls == 1
+
+
+async def test_breaker_opens_and_fails_fast():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(500, text="boom")
+
+    client = _client(handler, retries=0, breaker=CircuitBreaker(failure_threshold=2))
+    for _ in range(2):
+        with pytest.raises(TelnyxApiError):
+            await client.request("GET", "/x", api_key="KEY", context="x", idempotent=True)
+    with pytest.raises(TelnyxUnavailable):
+        await client.request("GET", "/x", api_key="KEY", context="x", idempotent=True)
+    await client.aclose()
+    assert calls == 2
+
+
+def test_did_directory_caches_hits_and_misses():
+    loads: list[str] = []
+
+    def load(phone):
+        def _load():
+            loads.append(phone)
+            return None if phone == "+1999" else {"tenant_id": "t1"}
+
+        return _load
+
+    directory = DidDirectory(ttl_seconds=60)
+    for _ in range(3):
+        assert directory.lookup("billing_voice", "+1555", load("+1555")) == {"tenant_id": "t1"}
+        assert directory.lookup("billing_voice", "+1999", load("+1999")) is None
+    assert loads == ["+1555", "+1999"]
+
+    directory.invalidate("+1555")
+    directory.lookup("billing_voice", "+1555", load("+1555"))
+    assert loads == ["+1555", "+1999", "+1555"]
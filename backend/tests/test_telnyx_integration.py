@@ -57,6 +57,13 @@ def public_key_b64(keypair):
     return keypair[1]
 
 
+@pytest.fixture(autouse=True)
+def _fresh_did_directory(monkeypatch):
+    from core_app.telnyx import did_directory
+
+    monkeypatch.setattr(did_directory, "_directory", None)
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # Section 1: Ed25519 signature verification unit tests
 # ══════════════════════════════════════════════════════════════════════════════
@@ -356,13 +363,14 @@ class TestSmsWebhook:
 
         with (
             patch("core_app.api.sms_webhook_router.get_settings") as mock_settings,
-            patch("core_app.api.sms_webhook_router.send_sms"),
+            patch("core_app.api.sms_webhook_router.send_sms") as mock_sms,
         ):
             mock_settings.return_value.telnyx_public_key = public_key_b64
             mock_settings.return_value.telnyx_webhook_tolerance_seconds = 300
             mock_settings.return_value.telnyx_api_key = "KEY"
             mock_settings.return_value.telnyx_from_number = "+18005550000"
             mock_settings.return_value.telnyx_messaging_profile_id = "mp-001"
+            mock_sms.return_value = {"id": "sms-003"}
 
             resp = client.post("/webhooks/telnyx/sms", content=body_bytes, headers=headers)
 
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import uuid
+
+from core_app.epcr.nemsis_exporter import NEMSISExporter
+from core_app.epcr.validation_cache import ValidationCache, chart_content_hash, validate_chart
+from core_app.nemsis.validator import NEMSISValidator
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+        self.down = False
+
+    def _check(self) -> None:
+        if self.down:
+            raise ConnectionError("redis down")
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self._check()
+        self.data[key] = value
+
+    def mget(self, *keys):
+        self._check()
+        return [self.data.get(k) for k in keys]
+
+    def incr(self, key):
+        self._check()
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+
+
+CHART = {
+    "chart_id": str(uuid.uuid4()),
+    "chart_mode": "bls",
+    "patient": {"first_name": "Pat", "last_name": "Doe", "gender": "female"},
+    "dispatch": {"incident_number": "I-1", "psap_call_time": "2024-01-01T10:00:00-05:00"},
+    "narrative": "Transported.",
+    "updated_at": "2024-01-01T10:30:00Z",
+}
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self) -> dict:
+        self.calls += 1
+        return {"n": self.calls}
+
+
+def test_cached_result_matches_a_fresh_validation():
+    cache = ValidationCache()
+    xml, result = validate_chart(CHART, cache=cache)
+    again_xml, again = validate_chart({**CHART, "updated_at": "later"}, cache=cache)
+
+    fresh_xml = NEMSISExporter().export_chart(CHART, agency_info={})
+    fresh = NEMSISValidator().validate_xml_bytes(fresh_xml)
+    assert xml == again_xml == fresh_xml
+    assert [i.to_dict() for i in again.issues] == [i.to_dict() for i in fresh.issues]
+    assert (again.valid, again.stage_results) == (fresh.valid, fresh.stage_results)
+
+
+def test_cache_hits_are_stamped_when_served():
+    cache = ValidationCache()
+    _, first = validate_chart(CHART, cache=cache)
+    key = cache._key("nemsis", chart_content_hash(CHART, agency={}), "WI")
+    stored = json.loads(cache._local.get(key))
+    cache._local.set(key, json.dumps({**stored, "validated_at": "2020-01-01T00:00:00+00:00"}))
+
+    _, again = validate_chart(CHART, cache=cache)
+    assert again.validated_at > first.validated_at
+    assert [i.to_dict() for i in again.issues] == [i.to_dict() for i in first.issues]
+
+
+def test_key_covers_content_state_and_pack_generation():
+    cache = ValidationCache()
+    compute = Counter()
+    h = chart_content_hash(CHART)
+    assert h == chart_content_hash({**CHART, "updated_at": "later", "chart_status": "locked"})
+    edited = chart_content_hash({**CHART, "narrative": "Transported, stable."})
+
+    assert cache.get_or_compute("nemsis", h, "WI", compute) == {"n": 1}
+    assert cache.get_or_compute("nemsis", h, "wi", compute) == {"n": 1}
+    assert cache.get_or_compute("nemsis", edited, "WI", compute) == {"n": 2}
+    assert cache.get_or_compute("nemsis", h, "MN", compute) == {"n": 3}
+
+    cache.invalidate("MN")
+    assert cache.get_or_compute("nemsis", h, "WI", compute) == {"n": 1}
+    assert cache.get_or_compute("nemsis", h, "MN", compute) == {"n": 4}
+    cache.invalidate(None)  # national pack
+    assert cache.get_or_compute("nemsis", h, "WI", compute) == {"n": 5}
+
+
+def test_redis_shares_results_and_invalidations_across_processes():
+    redis = FakeRedis()
+    api, worker = ValidationCache(redis_client=redis), ValidationCache(redis_client=redis)
+    compute = Counter()
+    h = chart_content_hash(CHART)
+
+    assert api.get_or_compute("nemsis", h, "WI", compute) == {"n": 1}
+    assert worker.get_or_compute("nemsis", h, "WI", compute) == {"n": 1}
+    worker.invalidate("WI")
+    assert api.get_or_compute("nemsis", h, "WI", compute) == {"n": 2}
+
+    redis.down = True  # cannot see invalidations, so nothing is served
+    assert api.get_or_compute("nemsis", h, "WI", compute) == {"n": 3}
+    assert api.get_or_compute("nemsis", h, "WI", compute) == {"n": 4}
+
+
+def test_unhashable_charts_are_not_cached():
+    cache = ValidationCache()
+    compute = Counter()
+    assert chart_content_hash({**CHART, "vitals": [{"spo2": float("nan")}]}) is None
+    cache.get_or_compute("nemsis", None, "WI", compute)
+    cache.get_or_compute("nemsis", None, "WI", compute)
+    assert compute.calls == 2
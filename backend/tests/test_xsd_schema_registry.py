@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from core_app.nemsis import xsd_validator
+from core_app.nemsis.pack_manager import PackManager
+from core_app.nemsis.xsd_validator import NEMSISXSDValidator, SchemaKey, SchemaRegistry
+
+NS = "http://www.nemsis.org"
+
+DATASET_XSD = f"""<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="{NS}"
+           xmlns="{NS}" elementFormDefault="qualified">
+  <xs:include schemaLocation="common/eRecord.xsd"/>
+  <xs:element name="EMSDataSet">
+    <xs:complexType><xs:sequence><xs:element ref="eRecord"/></xs:sequence></xs:complexType>
+  </xs:element>
+</xs:schema>
+"""
+
+RECORD_XSD = f"""<?xml version="1.0"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" targetNamespace="{NS}"
+           xmlns="{NS}" elementFormDefault="qualified">
+  <xs:element name="eRecord" type="xs:integer"/>
+</xs:schema>
+"""
+
+VALID = f'<EMSDataSet xmlns="{NS}"><eRecord>1</eRecord></EMSDataSet>'
+INVALID = f'<EMSDataSet xmlns="{NS}"><eRecord>x</eRecord></EMSDataSet>'
+
+
+def _xsd_dir(tmp_path):
+    (tmp_path / "common").mkdir()
+    (tmp_path / "EMSDataSet_v3.xsd").write_text(DATASET_XSD)
+    (tmp_path / "common" / "eRecord.xsd").write_text(RECORD_XSD)
+    return tmp_path
+
+
+def _counting_compile(monkeypatch) -> list[SchemaKey]:
+    compiled: list[SchemaKey] = []
+    original = xsd_validator._compile
+
+    def _compile(xsd_dir, key):
+        compiled.append(key)
+        return original(xsd_dir, key)
+
+    monkeypatch.setattr(xsd_validator, "_compile", _compile)
+    return compiled
+
+
+def test_schema_is_compiled_once_and_shared_across_threads(tmp_path, monkeypatch):
+    compiled = _counting_compile(monkeypatch)
+    validator = NEMSISXSDValidator(str(_xsd_dir(tmp_path)), registry=SchemaRegistry())
+
+    docs = [VALID, INVALID] * 50
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(validator.validate_ems_dataset, docs))
+
+    assert [r.valid for r in results] == [True, False] * 50
+    assert all(len(r.errors) == 1 and "eRecord" in r.errors[0] for r in results[1::2])
+    assert compiled == [SchemaKey("EMS")]
+
+
+def test_changed_xsd_and_invalidation_trigger_recompile(tmp_path, monkeypatch):
+    compiled = _counting_compile(monkeypatch)
+    xsd_dir = _xsd_dir(tmp_path)
+    registry = SchemaRegistry()
+    national = NEMSISXSDValidator(str(xsd_dir), registry=registry)
+    wisconsin = NEMSISXSDValidator(str(xsd_dir), state_code="wi", registry=registry)
+    national.validate_ems_dataset(VALID)
+    wisconsin.validate_ems_dataset(VALID)
+
+    assert registry.invalidate(state_code="WI") == 1
+    wisconsin.validate_ems_dataset(VALID)
+    national.validate_ems_dataset(VALID)
+    wi = SchemaKey("EMS", state_code="WI")
+    assert compiled == [SchemaKey("EMS"), wi, wi]
+
+    path = xsd_dir / "EMSDataSet_v3.xsd"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    national.validate_ems_dataset(VALID)
+    assert compiled[-1] == SchemaKey("EMS")
+    assert len(compiled) == 4
+
+
+def test_missing_xsd_is_reported_once_per_key(tmp_path, monkeypatch):
+    compiled = _counting_compile(monkeypatch)
+    validator = NEMSISXSDValidator(str(tmp_path), registry=SchemaRegistry())
+    for _ in range(3):
+        result = validator.validate_dem_dataset("<DEMDataSet/>")
+    assert result.valid
+    assert result.warnings == [f"No XSD file found for DEM dataset in {tmp_path}"]
+    assert compiled == [SchemaKey("DEM")]
+
+
+class FakeService:
+    def __init__(self, pack: dict) -> None:
+        self.pack = pack
+
+    def repo(self, table):
+        pack = self.pack
+
+        class _Repo:
+            def get(self, tenant_id, record_id):
+                return pack
+
+            def list(self, tenant_id):
+                return [pack]
+
+        return _Repo()
+
+    async def update(self, **kwargs):
+        return {**self.pack, "data": {**self.pack["data"], **kwargs["patch"]}}
+
+
+async def test_activating_a_pack_invalidates_its_state_schemas(monkeypatch):
+    registry = SchemaRegistry()
+    registry._entries = {
+        (SchemaKey("EMS"), xsd_validator.XSD_BASE): object(),
+        (SchemaKey("EMS", state_code="WI"), xsd_validator.XSD_BASE): object(),
+    }
+    monkeypatch.setattr(xsd_validator, "_registry", registry)
+    pack_id = str(uuid.uuid4())
+    manager = PackManager.__new__(PackManager)
+    manager._svc = FakeService(
+        {
+            "id": pack_id,
+            "version": 1,
+            "data": {"nemsis_version": "3.5.1", "state_code": "WI", "pack_type": "wi_schematron"},
+        }
+    )
+    manager._tenant_id = manager._actor_user_id = uuid.uuid4()
+
+    await manager.activate_pack(pack_id, actor_user_id="u")
+
+    assert [k.state_code for k, _ in registry._entries] == [""]
+
+
+def test_schema_lookup_follows_the_nemsis_version(tmp_path):
+    current, older = tmp_path / "v3.5.1", tmp_path / "v3.5.0"
+    for version_dir in (current, older):
+        version_dir.mkdir()
+        _xsd_dir(version_dir)
+    registry = SchemaRegistry()
+
+    assert registry.get(SchemaKey("EMS"), current).path == current / "EMSDataSet_v3.xsd"
+    assert registry.get(SchemaKey("EMS", "3.5.0"), current).path == older / "EMSDataSet_v3.xsd"
+    assert registry.get(SchemaKey("EMS", "3.5.0"), tmp_path).path == older / "EMSDataSet_v3.xsd"
+
+    missing = registry.get(SchemaKey("EMS", "3.4.0"), current)
+    assert missing.schema is None
+    assert missing.warning == f"No NEMSIS 3.4.0 XSD file found for EMS dataset in {current}"
+
+
+async def test_shutdown_cancels_an_unfinished_warmup(monkeypatch):
+    from core_app import main
+
+    release = threading.Event()
+    monkeypatch.setattr(main, "warm_schema_cache", lambda states: release.wait(5))
+    monkeypatch.setattr(main.settings, "nemsis_schema_warmup", True)
+    try:
+        async with main._lifespan(main.app):
+            warmup = main.app.state.schema_warmup
+        assert warmup.cancelled()
+    finally:
+        release.set()